@@ -0,0 +1,87 @@
+# app/api/deps/auth.py
+
+"""
+🔐 Authentication / authorization dependencies.
+
+Both dependencies work purely from the access token: the signature check,
+revocation pre-check (Bloom filter) and privilege lookup run in memory, so
+protected endpoints normally cost zero queries for authorization.
+
+Usage:
+    @router.get("/reports", dependencies=[Depends(require_privileges("view_reports"))])
+    async def reports(principal: Principal = Depends(get_current_principal)): ...
+"""
+
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.api.domains.user.services.audit_service import set_audit_actor
+from app.api.domains.user.services.privilege_catalog import privilege_catalog
+from app.api.domains.user.services.revocation_service import get_revocation_store
+from app.api.domains.user.services.token_service import (
+    InvalidTokenError,
+    Principal,
+    get_token_service,
+)
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+async def get_current_principal(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> Principal:
+    """
+    Resolve the caller from the `Authorization: Bearer <token>` header.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    try:
+        principal = get_token_service().verify_access_token(credentials.credentials)
+    except InvalidTokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # 🚫 In-memory Bloom filter check; only a filter hit costs a query
+    if await get_revocation_store().is_revoked(
+        principal.user_id, principal.token_id, principal.issued_at
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # 📜 Attribute audited changes made while handling this request
+    set_audit_actor(principal.user_id)
+    return principal
+
+
+def require_privileges(*names: str) -> Callable[..., Awaitable[Principal]]:
+    """
+    Build a dependency that requires every named privilege.
+
+    Unknown privilege names are treated as not granted (fail closed).
+    """
+
+    async def dependency(
+        principal: Principal = Depends(get_current_principal),
+    ) -> Principal:
+        await privilege_catalog.ensure_loaded()
+        required = privilege_catalog.resolve(names)
+        if required is None or not principal.has_privileges(required):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient privileges",
+            )
+        return principal
+
+    return dependency
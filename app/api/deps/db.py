@@ -0,0 +1,19 @@
+# app/api/deps/db.py
+
+"""
+🗄️ Database session dependency.
+"""
+
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.session import session_scope
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency yielding a request-scoped `AsyncSession`.
+    """
+    async for session in session_scope():
+        yield session
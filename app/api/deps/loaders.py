@@ -0,0 +1,21 @@
+# app/api/deps/loaders.py
+
+"""
+📦 Request-scoped batching loader dependency.
+"""
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps.db import get_db
+from app.api.domains.user.repositories.loaders import UserLoaders
+
+
+def get_user_loaders(session: AsyncSession = Depends(get_db)) -> UserLoaders:
+    """
+    Return the loaders for this request.
+
+    FastAPI caches dependencies per request, so every consumer in one request
+    shares the same loaders (and memoized results) and the same session.
+    """
+    return UserLoaders(session)
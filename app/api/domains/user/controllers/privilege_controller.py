@@ -0,0 +1,89 @@
+# app/api/domains/user/controllers/privilege_controller.py
+
+"""
+🔐 Privilege read endpoints.
+
+Both endpoints support conditional GET: the ETag is the row version (list:
+count, sum of versions and `max(updated_at)`), so a matching
+`If-None-Match` / `If-Modified-Since` is answered with 304 from an
+aggregate query alone.
+"""
+
+from typing import Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps.auth import require_privileges
+from app.api.deps.db import get_db
+from app.api.domains.user.repositories.privilege_repository import (
+    get_privilege_list_validators,
+    get_privilege_row,
+    list_privileges,
+)
+from app.api.domains.user.schemas.privilege import PrivilegeList, PrivilegeRead
+from app.api.utils.preconditions import (
+    Validators,
+    digest_etag,
+    latest,
+    version_etag,
+)
+
+router = APIRouter(
+    prefix="/privileges",
+    tags=["privileges"],
+    dependencies=[Depends(require_privileges("view_roles"))],
+)
+
+
+@router.get("", response_model=PrivilegeList)
+async def get_privileges(
+    request: Request,
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_db),
+) -> Union[PrivilegeList, Response]:
+    """
+    List live privileges by name.
+    """
+    state = await get_privilege_list_validators(session)
+    validators = Validators(
+        etag=digest_etag(*state, offset, limit, weak=True),
+        last_modified=latest(*state),
+    )
+    if validators.not_modified(request):
+        return validators.not_modified_response()
+
+    rows = await list_privileges(session, offset=offset, limit=limit)
+    validators.apply(response)
+    return PrivilegeList(
+        items=[PrivilegeRead.model_validate(row) for row in rows],
+        offset=offset,
+        limit=limit,
+    )
+
+
+@router.get("/{privilege_id}", response_model=PrivilegeRead)
+async def get_privilege(
+    privilege_id: int,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_db),
+) -> Union[PrivilegeRead, Response]:
+    """
+    Return one live privilege.
+    """
+    row = await get_privilege_row(session, privilege_id)
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Privilege not found"
+        )
+
+    validators = Validators(
+        etag=version_etag(row.version_id), last_modified=row.updated_at
+    )
+    if validators.not_modified(request):
+        return validators.not_modified_response()
+    validators.apply(response)
+    return PrivilegeRead.model_validate(row)
@@ -0,0 +1,232 @@
+# app/api/domains/user/controllers/role_controller.py
+
+"""
+🛡️ Role listing, detail and update endpoints.
+
+Every response is built from column queries plus one grouped `COUNT` per
+page, so listing roles costs a constant number of queries no matter how
+many users are assigned to them.
+
+Reads support conditional GET: validators come from one aggregate query over
+`version_id` / `updated_at` (role, privilege links, members), and a matching
+`If-None-Match` / `If-Modified-Since` is answered with 304 before anything
+else is queried. The detail `ETag` starts with the role version; `PATCH`
+requires it in `If-Match` and answers 412 if the role changed in between.
+"""
+
+from typing import Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps.auth import require_privileges
+from app.api.deps.db import get_db
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.repositories.role_repository import (
+    MemberCounts,
+    get_role_list_validators,
+    get_role_member_counts,
+    get_role_privilege_names,
+    get_role_row,
+    get_role_validators,
+    list_role_members,
+    list_roles,
+    set_role_privileges,
+)
+from app.api.domains.user.schemas.read_models import RoleDetailView, RoleMemberView
+from app.api.domains.user.schemas.role import (
+    RoleDetail,
+    RoleList,
+    RolePrivilegePolicy,
+    RolePrivilegeSyncResult,
+    RoleSummary,
+    RoleUpdate,
+)
+from app.api.domains.user.services.invalidation_bus import record_changes
+from app.api.domains.user.services.token_service import Principal
+from app.api.utils.preconditions import (
+    Validators,
+    digest_etag,
+    latest,
+    require_if_match,
+    version_etag,
+)
+from app.api.utils.responses import FastJSONResponse
+from app.database.versioning import (
+    RecordNotFoundError,
+    VersionConflictError,
+    update_versioned,
+)
+
+router = APIRouter(
+    prefix="/roles",
+    tags=["roles"],
+    dependencies=[Depends(require_privileges("view_roles"))],
+)
+
+
+@router.get("", response_model=RoleList)
+async def get_roles(
+    request: Request,
+    response: Response,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    session: AsyncSession = Depends(get_db),
+) -> Union[RoleList, Response]:
+    """
+    List live roles with member counts (3 queries per page, 2 when unchanged).
+    """
+    rows = await list_roles(session, offset=offset, limit=limit)
+    role_ids = [row.id for row in rows]
+    state = await get_role_list_validators(session, role_ids)
+    validators = Validators(
+        etag=digest_etag(*state, role_ids, weak=True),
+        last_modified=latest(*state),
+    )
+    if validators.not_modified(request):
+        return validators.not_modified_response()
+
+    counts = await get_role_member_counts(session, role_ids)
+    items = []
+    for row in rows:
+        count = counts.get(row.id, MemberCounts())
+        items.append(
+            RoleSummary(
+                id=row.id,
+                name=row.name,
+                description=row.description,
+                member_count=count.total,
+                active_member_count=count.active,
+            )
+        )
+    validators.apply(response)
+    return RoleList(items=items, offset=offset, limit=limit)
+
+
+@router.get("/{role_id}", response_model=RoleDetail)
+async def get_role(
+    role_id: int,
+    request: Request,
+    include_users: bool = Query(False, description="Include a page of members"),
+    users_offset: int = Query(0, ge=0),
+    users_limit: int = Query(100, ge=1, le=1000),
+    session: AsyncSession = Depends(get_db),
+) -> Response:
+    """
+    Return a role with privileges and member counts; members only on request.
+    """
+    state = await get_role_validators(session, role_id)
+    if state is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Role not found"
+        )
+    validators = Validators(
+        etag=version_etag(
+            state.version_id, *state[1:], include_users, users_offset, users_limit
+        ),
+        last_modified=latest(*state),
+    )
+    if validators.not_modified(request):
+        return validators.not_modified_response()
+
+    row = await get_role_row(session, role_id)
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Role not found"
+        )
+
+    count = (await get_role_member_counts(session, [role_id])).get(
+        role_id, MemberCounts()
+    )
+    users = None
+    if include_users:
+        members = await list_role_members(
+            session, role_id, offset=users_offset, limit=users_limit
+        )
+        users = [RoleMemberView(**member._mapping) for member in members]
+
+    # ⚡ Member pages can be large: rows → slotted views → orjson
+    return FastJSONResponse(
+        RoleDetailView(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            member_count=count.total,
+            active_member_count=count.active,
+            privileges=await get_role_privilege_names(session, role_id),
+            users=users,
+            version_id=row.version_id,
+        ),
+        headers=validators.headers,
+    )
+
+
+@router.patch("/{role_id}", response_model=RoleSummary)
+async def patch_role(
+    role_id: int,
+    body: RoleUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(require_if_match),
+    principal: Principal = Depends(require_privileges("manage_roles")),
+    session: AsyncSession = Depends(get_db),
+) -> RoleSummary:
+    """
+    Rename / re-describe a role if it is still at the `If-Match` version.
+    """
+    try:
+        role = await update_versioned(
+            session,
+            Role,
+            role_id,
+            expected_version,
+            body.model_dump(exclude_unset=True),
+            actor_id=principal.user_id,
+        )
+        await session.commit()
+    except RecordNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Role not found"
+        )
+    except VersionConflictError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+        )
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Role name already exists"
+        )
+
+    count = (await get_role_member_counts(session, [role_id])).get(
+        role_id, MemberCounts()
+    )
+    response.headers["ETag"] = version_etag(role.version_id)
+    return RoleSummary(
+        id=role.id,
+        name=role.name,
+        description=role.description,
+        member_count=count.total,
+        active_member_count=count.active,
+    )
+
+
+@router.put("/privileges", response_model=RolePrivilegeSyncResult)
+async def put_role_privileges(
+    policy: RolePrivilegePolicy,
+    principal: Principal = Depends(require_privileges("manage_roles")),
+    session: AsyncSession = Depends(get_db),
+) -> RolePrivilegeSyncResult:
+    """
+    Replace the privilege sets of one or many roles in a single transaction.
+
+    Takes effect for existing sessions at their next token refresh.
+    """
+    result = await set_role_privileges(
+        session, policy.roles, actor_id=principal.user_id
+    )
+    await record_changes(session, "role", policy.roles.keys())
+    await session.commit()
+    return RolePrivilegeSyncResult(
+        roles=result.roles, granted=result.granted, revoked=result.revoked
+    )
@@ -0,0 +1,325 @@
+# app/api/domains/user/controllers/user_controller.py
+
+"""
+👤 User endpoints.
+
+Reads support conditional GET: validators come from `version_id` /
+`updated_at` (lists: aggregates over the page's users and their selected
+relations, plus the page's IDs), so a matching
+`If-None-Match` / `If-Modified-Since` is answered with 304 without loading
+any user. The single-user `ETag` is the row version; `PATCH` requires it in
+`If-Match` and answers 412 if the user changed in between.
+
+`GET /users/search` ranks users by name / identity fragments from the
+`user_search` full-text index (see `user_search_repository`).
+
+Selected `identities` / `auth` / `role` fields are resolved through the
+request's batching loaders (`Depends(get_user_loaders)`): one `IN (…)`
+query per relationship, however many users are rendered.
+"""
+
+from typing import Any, Optional, Tuple, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import Row, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
+from app.api.deps.auth import require_privileges
+from app.api.deps.db import get_db
+from app.api.deps.loaders import get_user_loaders
+from app.api.domains.user.models.user import User
+from app.api.domains.user.repositories.loaders import UserLoaders
+from app.api.domains.user.repositories.user_repository import (
+    DEFAULT_USER_FIELDS,
+    get_user_list_validators,
+    get_user_validators,
+    get_users_by_ids,
+    list_user_ids,
+)
+from app.api.domains.user.repositories.user_search_repository import (
+    MIN_TERM_LENGTH,
+    SearchQueryError,
+    search_users,
+)
+from app.api.domains.user.schemas.read_models import UserPageView
+from app.api.domains.user.schemas.user import (
+    BulkDeactivation,
+    BulkRoleReassignment,
+    BulkUpdateResponse,
+    UserPage,
+    UserRead,
+    UserUpdate,
+)
+from app.api.domains.user.services.token_service import Principal
+from app.api.domains.user.services.user_bulk_service import (
+    RoleNotFoundError,
+    deactivate_users,
+    reassign_role,
+)
+from app.api.utils.preconditions import (
+    Validators,
+    digest_etag,
+    latest,
+    require_if_match,
+    version_etag,
+)
+from app.api.utils.responses import FastJSONResponse
+from app.database.fieldsets import FieldSelection, InvalidFieldError
+from app.database.versioning import (
+    RecordNotFoundError,
+    VersionConflictError,
+    update_versioned,
+)
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+@router.get(
+    "",
+    response_model=UserPage,
+    dependencies=[Depends(require_privileges("view_users"))],
+)
+async def get_users(
+    request: Request,
+    fields: str = Query(
+        DEFAULT_USER_FIELDS,
+        description="Comma-separated fields, e.g. id,first_name,role.name,identities.value",
+    ),
+    role_id: Optional[int] = Query(None),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    session: AsyncSession = Depends(get_db),
+    loaders: UserLoaders = Depends(get_user_loaders),
+) -> Response:
+    """
+    List live users, fetching and returning only the requested fields
+    (3 queries per page plus one per selected relationship, 2 when unchanged).
+    """
+    try:
+        selection = FieldSelection.parse(User, fields)
+    except InvalidFieldError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    user_ids = await list_user_ids(session, offset=offset, limit=limit, role_id=role_id)
+    state = await get_user_list_validators(session, selection, user_ids)
+    validators = Validators(
+        etag=digest_etag(*state, selection.paths, user_ids, weak=True),
+        last_modified=latest(*state),
+    )
+    if validators.not_modified(request):
+        return validators.not_modified_response()
+
+    items = await get_users_by_ids(session, selection, user_ids, loaders)
+    # ⚡ Projected dicts go straight to orjson (no model validation/encoding)
+    return FastJSONResponse(
+        UserPageView(items=items, fields=selection.paths, offset=offset, limit=limit),
+        headers=validators.headers,
+    )
+
+
+@router.get(
+    "/search",
+    response_model=UserPage,
+    dependencies=[Depends(require_privileges("view_users"))],
+)
+async def get_user_search(
+    q: str = Query(
+        ...,
+        min_length=MIN_TERM_LENGTH,
+        max_length=200,
+        description="Name or email/phone fragments, e.g. 'john smi' or '0412'",
+    ),
+    mode: str = Query("substring", pattern="^(substring|fuzzy)$"),
+    fields: str = Query(DEFAULT_USER_FIELDS),
+    offset: int = Query(0, ge=0, le=1000),
+    limit: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_db),
+    loaders: UserLoaders = Depends(get_user_loaders),
+) -> Response:
+    """
+    Ranked search over names and identity values (best match first).
+    """
+    try:
+        selection = FieldSelection.parse(User, fields)
+        hits = await search_users(session, q, mode=mode, offset=offset, limit=limit)
+    except (InvalidFieldError, SearchQueryError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+    items = await get_users_by_ids(
+        session, selection, [hit.user_id for hit in hits], loaders
+    )
+    return FastJSONResponse(
+        UserPageView(items=items, fields=selection.paths, offset=offset, limit=limit)
+    )
+
+
+@router.post("/bulk/reassign-role", response_model=BulkUpdateResponse)
+async def bulk_reassign_role(
+    body: BulkRoleReassignment,
+    principal: Principal = Depends(require_privileges("manage_users")),
+    session: AsyncSession = Depends(get_db),
+) -> BulkUpdateResponse:
+    """
+    Move users to another role in keyset-sized, separately committed chunks.
+    """
+    try:
+        result = await reassign_role(
+            session,
+            to_role_id=body.to_role_id,
+            from_role_id=body.from_role_id,
+            user_ids=body.user_ids,
+            actor_id=principal.user_id,
+        )
+    except RoleNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+    return BulkUpdateResponse(affected=result.affected, chunks=result.chunks)
+
+
+@router.post("/bulk/deactivate", response_model=BulkUpdateResponse)
+async def bulk_deactivate(
+    body: BulkDeactivation,
+    principal: Principal = Depends(require_privileges("manage_users")),
+    session: AsyncSession = Depends(get_db),
+) -> BulkUpdateResponse:
+    """
+    Deactivate users in keyset-sized, separately committed chunks.
+    """
+    result = await deactivate_users(
+        session,
+        role_id=body.role_id,
+        user_ids=body.user_ids,
+        actor_id=principal.user_id,
+    )
+    return BulkUpdateResponse(affected=result.affected, chunks=result.chunks)
+
+
+@router.get(
+    "/{user_id}",
+    response_model=UserRead,
+    dependencies=[Depends(require_privileges("view_users"))],
+)
+async def get_user(
+    user_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated fields, e.g. id,first_name,role.name (default: all columns)",
+    ),
+    session: AsyncSession = Depends(get_db),
+    loaders: UserLoaders = Depends(get_user_loaders),
+) -> Union[UserRead, Response]:
+    """
+    Return one live user; the `ETag` is its current version (suffixed with
+    a digest of the selected relationships' state when `fields` embeds any).
+    """
+    selection = None
+    if fields is not None:
+        try:
+            selection = FieldSelection.parse(User, fields)
+        except InvalidFieldError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+            )
+
+    state = await get_user_validators(session, user_id)
+    if state is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    if selection is not None:
+        return await _get_user_fields(
+            session, loaders, request, selection, user_id, state
+        )
+
+    validators = Validators(
+        etag=version_etag(state.version_id), last_modified=state.updated_at
+    )
+    if validators.not_modified(request):
+        return validators.not_modified_response()
+
+    user = await session.scalar(
+        select(User)
+        .where(User.id == user_id, User.deleted_at.is_(None))
+        .options(raiseload("*"))
+    )
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    # Re-derived from the loaded row in case it changed since the check
+    Validators(etag=version_etag(user.version_id), last_modified=user.updated_at).apply(
+        response
+    )
+    return UserRead.model_validate(user)
+
+
+async def _get_user_fields(
+    session: AsyncSession,
+    loaders: UserLoaders,
+    request: Request,
+    selection: FieldSelection,
+    user_id: int,
+    state: Row[Any],
+) -> Response:
+    """`GET /users/{id}?fields=…`: the projected user, as one list item."""
+    parts: Tuple[Any, ...] = (selection.paths,)
+    if not selection.columns_only:
+        parts += tuple(await get_user_list_validators(session, selection, [user_id]))
+    validators = Validators(
+        etag=version_etag(state.version_id, *parts),
+        last_modified=latest(state.updated_at, *parts),
+    )
+    if validators.not_modified(request):
+        return validators.not_modified_response()
+
+    items = await get_users_by_ids(session, selection, [user_id], loaders)
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    return FastJSONResponse(items[0], headers=validators.headers)
+
+
+@router.patch("/{user_id}", response_model=UserRead)
+async def patch_user(
+    user_id: int,
+    body: UserUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(require_if_match),
+    principal: Principal = Depends(require_privileges("manage_users")),
+    session: AsyncSession = Depends(get_db),
+) -> UserRead:
+    """
+    Update a user's profile if it is still at the `If-Match` version.
+
+    Lock-free: the UPDATE itself is conditional on the version.
+    """
+    try:
+        user = await update_versioned(
+            session,
+            User,
+            user_id,
+            expected_version,
+            body.model_dump(exclude_unset=True),
+            actor_id=principal.user_id,
+        )
+        await session.commit()
+    except RecordNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+    except VersionConflictError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED, detail=str(exc)
+        )
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Update violates a user constraint",
+        )
+    response.headers["ETag"] = version_etag(user.version_id)
+    return UserRead.model_validate(user)
@@ -0,0 +1,5 @@
+# app/api/domains/user/models/__init__.py
+
+# Importing the shared base first registers every model in a safe order, so
+# any single model module can be imported directly without circular imports.
+import app.database.base  # noqa: F401
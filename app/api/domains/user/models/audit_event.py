@@ -0,0 +1,101 @@
+# app/api/domains/user/models/audit_event.py
+
+"""
+📜 Database model for the append-only audit event log.
+
+`TimestampMixin` only keeps the *last* `created_by` / `updated_by`; this table
+keeps the full history. Each row records one insert, update or delete of a
+user-domain row, with the changed columns as `{column: [old, new]}`.
+
+Rows are written asynchronously in batches (see `services/audit_service.py`)
+and are never updated or deleted by the application. `actor_id` is a plain
+integer (no FK) so history survives user deletion and inserts stay cheap.
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from sqlalchemy import JSON, BigInteger, DateTime, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+from app.database.types import SmallIntEnum
+
+
+# --------------------------------
+# 📛 Enum for audited operations
+# --------------------------------
+class AuditAction(str, Enum):
+    INSERT = "insert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+# 🔢 Stable storage codes for `AuditAction`
+AUDIT_ACTION_CODES = {
+    AuditAction.INSERT: 1,
+    AuditAction.UPDATE: 2,
+    AuditAction.DELETE: 3,
+}
+
+
+# ---------------------------------
+# 📜 AuditEvent Table Definition
+# ---------------------------------
+class AuditEvent(Base):
+    """
+    The `audit_event` table is an append-only change log.
+    """
+
+    __tablename__ = "audit_event"
+
+    __table_args__ = (
+        # 🔍 History of a single entity, newest last
+        Index("ix_audit_event_entity_entity_id", "entity", "entity_id", "occurred_at"),
+        # 🕒 Time-range scans and retention
+        Index("ix_audit_event_occurred_at", "occurred_at"),
+    )
+
+    # 🔑 Primary key (BIGINT; plain INTEGER on SQLite for rowid autoincrement)
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+        doc="Primary key ID",
+    )
+
+    # 🕒 When the change was committed
+    occurred_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        doc="Commit time of the audited change",
+    )
+
+    # 👤 Who made the change (request principal or `updated_by`)
+    actor_id: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True, doc="User ID of the actor, if known"
+    )
+
+    # 🏷️ Table name of the changed row (e.g. 'user', 'role_privilege')
+    entity: Mapped[str] = mapped_column(
+        String(64), nullable=False, doc="Table name of the audited row"
+    )
+
+    # 🔑 Primary key of the changed row
+    entity_id: Mapped[str] = mapped_column(
+        String(64), nullable=False, doc="Primary key of the audited row"
+    )
+
+    # 🔁 Insert / update / delete
+    action: Mapped[AuditAction] = mapped_column(
+        SmallIntEnum(AuditAction, AUDIT_ACTION_CODES),
+        nullable=False,
+        doc="INSERT, UPDATE or DELETE",
+    )
+
+    # 📝 Changed columns: {column: [old, new]}
+    changes: Mapped[Dict[str, Any]] = mapped_column(
+        JSON, nullable=False, doc="Changed columns as {column: [old, new]}"
+    )
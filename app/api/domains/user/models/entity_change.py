@@ -0,0 +1,75 @@
+# app/api/domains/user/models/entity_change.py
+
+"""
+📣 Database model for the short-lived entity change feed.
+
+Every write transaction that touches cached user-domain rows appends one row
+per changed entity here, in the same transaction (see
+`services/invalidation_bus.py`). Workers on the same node are normally told
+about a commit over a Unix datagram socket; this table is the fallback they
+poll (by `changed_at`) so a lost datagram, another node or a CLI script can
+never leave a cache stale for longer than one poll interval.
+
+Rows of one transaction share `(origin, seq)`, which is also the
+deduplication key between the two delivery paths. Rows are pruned after
+`invalidation_change_retention_seconds`.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+
+# ---------------------------------
+# 📣 EntityChange Table Definition
+# ---------------------------------
+class EntityChange(Base):
+    """
+    The `entity_change` table is an append-only, pruned change feed.
+    """
+
+    __tablename__ = "entity_change"
+
+    __table_args__ = (
+        # 🕒 Polling window and pruning
+        Index("ix_entity_change_changed_at", "changed_at"),
+    )
+
+    # 🔑 Primary key (BIGINT; plain INTEGER on SQLite for rowid autoincrement)
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+        doc="Primary key ID",
+    )
+
+    # 🧭 Writing process (host:pid:nonce)
+    origin: Mapped[str] = mapped_column(
+        String(64), nullable=False, doc="Process that committed the change"
+    )
+
+    # 🔢 Transaction sequence number within `origin`
+    seq: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, doc="Per-origin transaction sequence number"
+    )
+
+    # 🏷️ Cache entity (table name, e.g. 'user', 'role')
+    entity: Mapped[str] = mapped_column(
+        String(64), nullable=False, doc="Changed entity (table name)"
+    )
+
+    # 🔑 Primary key of the changed row
+    entity_id: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, doc="Primary key of the changed row"
+    )
+
+    # 🕒 Database time of the change (the row's new `updated_at`)
+    changed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        doc="Database time of the change",
+    )
@@ -0,0 +1,142 @@
+# app/api/domains/user/models/identity_shard.py
+
+"""
+🧭 Global identity → shard index.
+
+With sharding on (`app/database/sharding.py`), `user_identity` rows live on
+their user's shard, but logins and OTP flows look identities up by
+`lookup_key` before any user ID is known. This small table on the global
+database maps every identity's `lookup_key` to its `user_id`, so such a
+lookup costs one primary-key probe on the global database plus one query
+on a single shard, instead of one query on every shard.
+
+- Statements filtering `user_identity.lookup_key` (`==` / `IN`) are routed
+  through it (`register_shard_resolver`)
+- Its primary key makes identities unique across shards; per-shard
+  `uq_user_identity_lookup_key` alone could not
+- Rows are written by an `after_flush` hook in the flushing session's
+  transaction on the global database, for identities inserted, re-keyed,
+  moved to another user or deleted through the ORM
+
+Soft-deleted identities keep their entry, as they keep their unique key.
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Set, cast
+
+from sqlalchemy import (
+    Index,
+    Integer,
+    Table,
+    bindparam,
+    delete,
+    event,
+    insert,
+    inspect,
+    select,
+    update,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, Session, UOWTransaction, mapped_column
+
+from app.api.domains.user.models.user_identity import UserIdentity
+from app.database.base import Base
+from app.database.sharding import (
+    GLOBAL_SHARD,
+    ShardRoutingSession,
+    register_shard_resolver,
+)
+from app.database.types import fixed_binary
+
+
+# ---------------------------------
+# 🧭 IdentityShard Table Definition
+# ---------------------------------
+class IdentityShard(Base):
+    """
+    The `identity_shard` table maps identity lookup keys to user IDs
+    (global database only; the user ID picks the shard).
+    """
+
+    __tablename__ = "identity_shard"
+
+    __table_args__ = (
+        # 👤 Entries of one user (re-homing or removing a user)
+        Index("ix_identity_shard_user_id", "user_id"),
+    )
+
+    # 🔑 Same 16-byte key as `user_identity.lookup_key`
+    lookup_key: Mapped[bytes] = mapped_column(
+        fixed_binary(16),
+        primary_key=True,
+        doc="Lookup key of the identity (see `identity_lookup_key`)",
+    )
+
+    # 👤 Owner of the identity (no FK: the user lives on a shard)
+    user_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, doc="User ID owning the identity"
+    )
+
+
+_index = cast(Table, IdentityShard.__table__)
+
+
+# ---------------------------------
+# 🧭 Routing by lookup key
+# ---------------------------------
+def _user_ids_for_keys(connection: Connection, keys: Sequence[Any]) -> Iterable[int]:
+    return connection.execute(
+        select(_index.c.user_id).where(_index.c.lookup_key.in_(keys))
+    ).scalars()
+
+
+register_shard_resolver(
+    cast(Table, UserIdentity.__table__).c.lookup_key, _user_ids_for_keys
+)
+
+
+# ------------------------------------------------------
+# 🔁 Keep the index in sync with ORM writes
+# ------------------------------------------------------
+@event.listens_for(ShardRoutingSession, "after_flush")
+def _index_identities(session: Session, flush_context: UOWTransaction) -> None:
+    """
+    Insert, re-key, re-point or delete the entries of identities flushed
+    in this session; a key taken on any shard fails the flush.
+    """
+    assert isinstance(session, ShardRoutingSession)
+    added: List[Dict[str, Any]] = []
+    moved: List[Dict[str, Any]] = []
+    removed: Set[bytes] = set()
+    for obj in session.new:
+        if isinstance(obj, UserIdentity):
+            added.append({"lookup_key": obj.lookup_key, "user_id": obj.user_id})
+    for obj in session.dirty:
+        if not isinstance(obj, UserIdentity):
+            continue
+        attrs = inspect(obj).attrs
+        old_keys = attrs.lookup_key.history.deleted
+        if old_keys and old_keys[0] != obj.lookup_key:
+            removed.add(old_keys[0])
+            added.append({"lookup_key": obj.lookup_key, "user_id": obj.user_id})
+        elif attrs.user_id.history.has_changes():
+            moved.append({"_key": obj.lookup_key, "_user_id": obj.user_id})
+    for obj in session.deleted:
+        if isinstance(obj, UserIdentity):
+            key = inspect(obj).dict.get("lookup_key")
+            if key is not None:
+                removed.add(key)
+
+    if not (added or moved or removed):
+        return
+    connection = session.connection_for_shard(GLOBAL_SHARD)
+    if removed:
+        connection.execute(delete(_index).where(_index.c.lookup_key.in_(removed)))
+    if added:
+        connection.execute(insert(_index), added)
+    if moved:
+        connection.execute(
+            update(_index)
+            .where(_index.c.lookup_key == bindparam("_key"))
+            .values(user_id=bindparam("_user_id")),
+            moved,
+        )
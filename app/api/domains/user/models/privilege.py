@@ -11,15 +11,17 @@ This model supports:
 - Soft deletion with `deleted_at`
 - Many-to-many mapping to `Role` via the `role_privilege` join table
 - Optional descriptions for better admin UI clarity
+- A stable token bit position (`bit`), reserved once at insert
 """
 
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, List, Optional
 
-from sqlalchemy import Index, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Connection, Index, Integer, String, event
+from sqlalchemy.orm import Mapped, Mapper, mapped_column, relationship
 
 from app.database.base import Base
-from app.database.mixins import TimestampMixin
+from app.database.id_blocks import get_id_allocator
+from app.database.mixins import TimestampMixin, VersionedMixin
 
 # Forward declaration to avoid circular imports during model load
 if TYPE_CHECKING:
@@ -29,7 +31,7 @@ if TYPE_CHECKING:
 # -----------------------------
 # 🔐 Privilege Table Definition
 # -----------------------------
-class Privilege(Base, TimestampMixin):
+class Privilege(Base, TimestampMixin, VersionedMixin):
     """
     The `privilege` table defines fine-grained access rights in the system.
 
@@ -48,6 +50,8 @@ class Privilege(Base, TimestampMixin):
     __table_args__ = (
         # ✅ Index to allow fast filtering of soft-deleted rows
         Index("ix_privilege_deleted_at", "deleted_at"),
+        # 🪞 Written globally, copied to every user shard (shard_replication.py)
+        {"info": {"replicated": True}},
     )
 
     # 🔑 Primary Key — auto-incremented integer
@@ -70,12 +74,41 @@ class Privilege(Base, TimestampMixin):
         doc="Optional description explaining the permission's purpose",
     )
 
+    # 🔢 Token bit position — reserved at insert, never changed or reused
+    bit: Mapped[int] = mapped_column(
+        Integer,
+        unique=True,
+        nullable=False,
+        doc="Position of the privilege in access token bitmaps",
+    )
+
     # 🔁 Many-to-many relationship to `Role`
-    # Implemented via join table: `role_privilege`
+    # Implemented via join table: `role_privilege` (live links only)
     roles: Mapped[List["Role"]] = relationship(
         "Role",
         secondary="role_privilege",
+        primaryjoin="and_(Privilege.id == RolePrivilege.privilege_id, RolePrivilege.deleted_at.is_(None))",
+        secondaryjoin="Role.id == RolePrivilege.role_id",
         back_populates="privileges",
         lazy="selectin",
         doc="List of roles that include this privilege",
     )
+
+
+# --------------------------------------
+# 🔢 Bit positions
+# --------------------------------------
+@event.listens_for(Privilege, "before_insert")
+def _reserve_bit(
+    mapper: Mapper[Any], connection: Connection, target: Privilege
+) -> None:
+    """
+    Take the next position from the `privilege_bit` counter in `id_block`,
+    in the inserting transaction. The counter only grows, so a position is
+    never handed out twice, even if its privilege is deleted.
+    """
+    if target.bit is None:
+        # Counters start at 1, positions at 0
+        target.bit = (
+            get_id_allocator().allocate_in(connection, "privilege_bit", 1)[0] - 1
+        )
@@ -0,0 +1,148 @@
+# app/api/domains/user/models/revoked_token.py
+
+"""
+🚫 Database model for revoked tokens and per-user token epochs.
+
+Access tokens are stateless, so revocation is recorded here and checked
+from an in-memory mirror (see `services/revocation_service.py`).
+
+Two kinds of entries exist:
+- TOKEN: a single token (by `jti`) is revoked, e.g. on logout
+- USER: every token of a user issued at or before `not_before` is revoked,
+  e.g. when the user is deactivated, soft-deleted or changes role
+
+Rows are append-only and can be pruned once `expires_at` has passed, since
+no token they could match is still valid by then.
+"""
+
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import DateTime, Index, String, event, inspect
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.api.config.settings import settings
+from app.api.domains.user.models.user import User
+from app.api.utils.clock import utcnow
+from app.database.base import Base
+from app.database.mixins import TimestampMixin
+from app.database.types import SmallIntEnum
+
+
+# --------------------------------
+# 📛 Enum for revocation entry kinds
+# --------------------------------
+class RevocationKind(str, Enum):
+    TOKEN = "token"
+    USER = "user"
+
+
+# 🔢 Stable storage codes for `RevocationKind`
+REVOCATION_KIND_CODES = {
+    RevocationKind.TOKEN: 1,
+    RevocationKind.USER: 2,
+}
+
+
+# ---------------------------------
+# 🚫 RevokedToken Table Definition
+# ---------------------------------
+class RevokedToken(Base, TimestampMixin):
+    """
+    The `revoked_token` table is the authoritative revocation list.
+
+    `subject` holds the token's `jti` for TOKEN entries and the user ID
+    (as a string) for USER entries.
+    """
+
+    __tablename__ = "revoked_token"
+
+    __table_args__ = (
+        # 🔍 Authoritative lookup after a Bloom filter hit
+        Index("ix_revoked_token_kind_subject", "kind", "subject"),
+        # 🧹 Pruning of entries that can no longer match a live token
+        Index("ix_revoked_token_expires_at", "expires_at"),
+        # 🔁 Incremental filter refresh (overlapping `created_at` window)
+        Index("ix_revoked_token_created_at", "created_at"),
+    )
+
+    # 🔑 Primary key
+    id: Mapped[int] = mapped_column(
+        primary_key=True, autoincrement=True, doc="Primary key ID"
+    )
+
+    # 🏷️ Entry kind: single token or whole-user epoch
+    kind: Mapped[RevocationKind] = mapped_column(
+        SmallIntEnum(RevocationKind, REVOCATION_KIND_CODES),
+        nullable=False,
+        doc="TOKEN (single jti) or USER (all tokens up to not_before)",
+    )
+
+    # 🎯 Token jti or user ID
+    subject: Mapped[str] = mapped_column(
+        String(64), nullable=False, doc="Token jti or user ID, depending on kind"
+    )
+
+    # ⏱️ Tokens issued at or before this instant are revoked (USER entries)
+    not_before: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="Revocation instant; USER entries revoke tokens issued at or before it",
+    )
+
+    # 🧹 After this instant the entry can no longer match a valid token
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        doc="When the entry can be pruned",
+    )
+
+    # 📝 Optional reason (e.g. 'logout', 'deactivated', 'role_changed')
+    reason: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, doc="Why the token(s) were revoked"
+    )
+
+
+# ------------------------------------------------------
+# 🔁 Revoke a user's tokens when their access state changes
+# ------------------------------------------------------
+# Attribute → (predicate on the new value, revocation reason)
+_REVOKING_CHANGES: Dict[str, Tuple[Callable[[Any], bool], str]] = {
+    "is_active": (lambda value: value is False, "deactivated"),
+    "deleted_at": (lambda value: value is not None, "deleted"),
+    "role_id": (lambda value: True, "role_changed"),
+    "role": (lambda value: True, "role_changed"),
+}
+
+
+@event.listens_for(Session, "before_flush")
+def _revoke_on_user_state_change(
+    session: Session, flush_context: Any, instances: Any
+) -> None:
+    """
+    Append a USER revocation entry, in the same transaction, whenever a
+    `User` is deactivated, soft-deleted or moved to another role via the ORM.
+
+    Set-based Core UPDATEs bypass this hook and must call
+    `revocation_service.revoke_users` themselves.
+    """
+    now = utcnow()
+    for obj in list(session.dirty):
+        if not isinstance(obj, User):
+            continue
+        state = inspect(obj)
+        for attr, (predicate, reason) in _REVOKING_CHANGES.items():
+            added = state.attrs[attr].history.added
+            if added and predicate(added[0]):
+                session.add(
+                    RevokedToken(
+                        kind=RevocationKind.USER,
+                        subject=str(obj.id),
+                        not_before=now,
+                        expires_at=now
+                        + timedelta(seconds=settings.refresh_token_ttl_seconds),
+                        reason=reason,
+                    )
+                )
+                break
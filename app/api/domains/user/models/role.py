@@ -14,7 +14,7 @@ a user can access or modify, via many-to-many links to `Privilege`.
 Supports:
 - Unique role names
 - Soft-deletion for audit-friendly revocation
-- Backrefs to associated users and privileges
+- Backrefs to associated users and privileges (users are loaded explicitly only)
 """
 
 from typing import TYPE_CHECKING, List, Optional
@@ -23,7 +23,7 @@ from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
-from app.database.mixins import TimestampMixin
+from app.database.mixins import TimestampMixin, VersionedMixin
 
 # 🔁 Forward imports to avoid circular references at runtime
 if TYPE_CHECKING:
@@ -34,7 +34,7 @@ if TYPE_CHECKING:
 # --------------------------
 # 🛡️ Role Table Definition
 # --------------------------
-class Role(Base, TimestampMixin):
+class Role(Base, TimestampMixin, VersionedMixin):
     """
     The `role` table defines named collections of access privileges.
 
@@ -51,6 +51,8 @@ class Role(Base, TimestampMixin):
     __table_args__ = (
         # ✅ Used to efficiently filter soft-deleted roles
         Index("ix_role_deleted_at", "deleted_at"),
+        # 🪞 Written globally, copied to every user shard (shard_replication.py)
+        {"info": {"replicated": True}},
     )
 
     # 🔑 Primary key — unique identifier for the role
@@ -74,20 +76,29 @@ class Role(Base, TimestampMixin):
     )
 
     # 🔁 Many-to-many relationship: roles ↔ privileges
+    # (soft-deleted links are excluded; bulk changes go through
+    # `role_repository.set_role_privileges` rather than this collection)
     privileges: Mapped[List["Privilege"]] = relationship(
         "Privilege",
         secondary="role_privilege",
+        primaryjoin="and_(Role.id == RolePrivilege.role_id, RolePrivilege.deleted_at.is_(None))",
+        secondaryjoin="Privilege.id == RolePrivilege.privilege_id",
         back_populates="roles",
         lazy="selectin",
         doc="List of privileges assigned to this role",
     )
 
     # 🔄 One-to-many relationship: role → users
+    # (never loaded implicitly: a role can have any number of users, and
+    # every `User.role` / `Privilege.roles` load would otherwise pull them all.
+    # Use `selectinload(Role.users)` when the members are really needed, or
+    # `role_repository.get_role_member_counts` for counts.)
     users: Mapped[List["User"]] = relationship(
         "User",
         back_populates="role",
-        lazy="selectin",
-        doc="Users assigned to this role",
+        foreign_keys="User.role_id",
+        lazy="raise",
+        doc="Users assigned to this role (load explicitly)",
     )
 
     # 📋 Utility: List of privilege names associated with this role
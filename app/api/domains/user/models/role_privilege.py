@@ -39,6 +39,8 @@ class RolePrivilege(Base, TimestampMixin):
         UniqueConstraint("role_id", "privilege_id", name="uq_role_privilege"),
         # ✅ Support soft-deletion queries
         Index("ix_role_privilege_deleted_at", "deleted_at"),
+        # 🪞 Written globally, copied to every user shard (shard_replication.py)
+        {"info": {"replicated": True}},
     )
 
     # 🔑 Primary key
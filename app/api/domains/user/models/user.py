@@ -19,11 +19,11 @@ from enum import Enum
 from typing import TYPE_CHECKING, List, Optional
 
 from sqlalchemy import Boolean, Date, ForeignKey, Index, String
-from sqlalchemy import Enum as SQLAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
-from app.database.mixins import TimestampMixin
+from app.database.mixins import TimestampMixin, VersionedMixin
+from app.database.types import SmallIntEnum
 
 # --------------------------------------------
 # 🔁 Forward references to avoid circular import
@@ -44,10 +44,19 @@ class Gender(str, Enum):
     prefer_not_to_say = "prefer_not_to_say"
 
 
+# 🔢 Stable storage codes for `Gender` (never renumber existing codes)
+GENDER_CODES = {
+    Gender.male: 1,
+    Gender.female: 2,
+    Gender.other: 3,
+    Gender.prefer_not_to_say: 4,
+}
+
+
 # ----------------------
 # 👤 User Table Definition
 # ----------------------
-class User(Base, TimestampMixin):
+class User(Base, TimestampMixin, VersionedMixin):
     """
     The `user` table holds essential profile and authorization data,
     and connects to:
@@ -61,9 +70,10 @@ class User(Base, TimestampMixin):
     __table_args__ = (
         # ✅ For soft-deletion-aware queries
         Index("ix_user_deleted_at", "deleted_at"),
-        # ✅ To support filtered queries by role and status
-        Index("ix_user_role_id", "role_id"),
-        Index("ix_user_is_active", "is_active"),
+        # ✅ "Active users in role X"; also serves plain role_id lookups and the FK
+        Index("ix_user_role_id_is_active", "role_id", "is_active"),
+        # 🧩 Partitioned across user shards by its own ID (app/database/sharding.py)
+        {"info": {"shard_key": "id"}},
     )
 
     # 🔑 Primary key
@@ -86,9 +96,11 @@ class User(Base, TimestampMixin):
         String(128), nullable=True, doc="Optional job title or designation"
     )
 
-    # ⚧️ Gender enum (optional)
+    # ⚧️ Gender enum (optional, stored as a small integer code)
     gender: Mapped[Optional[Gender]] = mapped_column(
-        SQLAEnum(Gender), nullable=True, doc="User's gender (enum, optional)"
+        SmallIntEnum(Gender, GENDER_CODES),
+        nullable=True,
+        doc="User's gender (enum, optional)",
     )
 
     # 🎂 Date of birth (optional)
@@ -118,13 +130,18 @@ class User(Base, TimestampMixin):
 
     # 🔁 Many-to-one: user.role → Role.users
     role: Mapped["Role"] = relationship(
-        "Role", back_populates="users", lazy="joined", doc="Assigned role object"
+        "Role",
+        back_populates="users",
+        foreign_keys=[role_id],
+        lazy="joined",
+        doc="Assigned role object",
     )
 
     # 🔐 One-to-one: user.auth ↔ UserAuth.user
     auth: Mapped[Optional["UserAuth"]] = relationship(
         "UserAuth",
         back_populates="user",
+        foreign_keys="UserAuth.user_id",
         uselist=False,
         lazy="joined",
         doc="Authentication credentials object",
@@ -134,6 +151,7 @@ class User(Base, TimestampMixin):
     identities: Mapped[List["UserIdentity"]] = relationship(
         "UserIdentity",
         back_populates="user",
+        foreign_keys="UserIdentity.user_id",
         cascade="all, delete-orphan",
         lazy="selectin",
         doc="List of email/mobile/OAuth identities",
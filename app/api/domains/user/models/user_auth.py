@@ -21,7 +21,7 @@ from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
-from app.database.mixins import TimestampMixin
+from app.database.mixins import TimestampMixin, VersionedMixin
 
 # 🔁 Forward reference to avoid circular import
 if TYPE_CHECKING:
@@ -31,7 +31,7 @@ if TYPE_CHECKING:
 # ---------------------------------------
 # 🧾 UserAuth Table Definition (1:1 Login)
 # ---------------------------------------
-class UserAuth(Base, TimestampMixin):
+class UserAuth(Base, TimestampMixin, VersionedMixin):
     """
     The `user_auth` table stores login credentials and metadata for users.
 
@@ -49,6 +49,8 @@ class UserAuth(Base, TimestampMixin):
         Index("ix_user_auth_deleted_at", "deleted_at"),
         # ✅ For quickly resolving user ID lookups (foreign key)
         Index("ix_user_auth_user_id", "user_id"),
+        # 🧩 Lives on its user's shard (app/database/sharding.py)
+        {"info": {"shard_key": "user_id"}},
     )
 
     # 🔑 Primary key
@@ -106,6 +108,7 @@ class UserAuth(Base, TimestampMixin):
     user: Mapped["User"] = relationship(
         "User",
         back_populates="auth",
+        foreign_keys=[user_id],
         lazy="joined",
         doc="Back-reference to the owning user (1:1)",
     )
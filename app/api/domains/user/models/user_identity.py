@@ -9,11 +9,14 @@ or third-party OAuth UIDs. Identities support:
 - Primary identity designation (e.g., primary email or phone)
 - OTP-based login and rate-limiting
 - Soft-deletion and full audit trail
+- A compact, fixed-width `lookup_key` used for identity lookups and uniqueness
 """
 
+import hashlib
+import re
 from datetime import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from sqlalchemy import (
     Boolean,
@@ -23,14 +26,13 @@ from sqlalchemy import (
     Integer,
     String,
     UniqueConstraint,
-)
-from sqlalchemy import (
-    Enum as SQLEnum,
+    event,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.base import Base
-from app.database.mixins import TimestampMixin
+from app.database.mixins import TimestampMixin, VersionedMixin
+from app.database.types import SmallIntEnum, fixed_binary
 
 # 🔁 Avoid circular imports during runtime
 if TYPE_CHECKING:
@@ -46,10 +48,57 @@ class IdentityType(str, Enum):
     OAUTH = "oauth"
 
 
+# 🔢 Stable storage codes for `IdentityType` (never renumber existing codes)
+IDENTITY_TYPE_CODES = {
+    IdentityType.EMAIL: 1,
+    IdentityType.MOBILE: 2,
+    IdentityType.OAUTH: 3,
+}
+
+# Characters stripped from mobile numbers before hashing (spaces, dashes, etc.)
+_MOBILE_NOISE = re.compile(r"[\s\-().]")
+
+
+# ------------------------------------------
+# 🔑 Fixed-width identity lookup key (16 bytes)
+# ------------------------------------------
+def normalize_identity_value(type: IdentityType, value: str) -> str:
+    """
+    Normalize an identity value before hashing.
+
+    - Emails are case-insensitive
+    - Mobile numbers ignore formatting characters
+    - OAuth UIDs are opaque and only trimmed
+    """
+    value = value.strip()
+    if type == IdentityType.EMAIL:
+        return value.lower()
+    if type == IdentityType.MOBILE:
+        return _MOBILE_NOISE.sub("", value)
+    return value
+
+
+def identity_lookup_key(
+    type: IdentityType, value: str, oauth_provider: Optional[str] = None
+) -> bytes:
+    """
+    Compute the 16-byte lookup key for an identity.
+
+    The key is a BLAKE2b digest of the normalized (type, provider, value)
+    triple. A missing provider hashes as an empty string, so uniqueness holds
+    even where the database treats NULLs as distinct (e.g. MySQL).
+    """
+    type = IdentityType(type)
+    provider = (oauth_provider or "").strip().lower()
+    normalized = normalize_identity_value(type, value)
+    material = "\x1f".join((type.value, provider, normalized))
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).digest()
+
+
 # -----------------------------------------------
 # 📇 UserIdentity Table Definition (email/mobile)
 # -----------------------------------------------
-class UserIdentity(Base, TimestampMixin):
+class UserIdentity(Base, TimestampMixin, VersionedMixin):
     """
     The `user_identity` table stores one or more identity records
     for each user (email, phone number, or OAuth UID).
@@ -63,15 +112,16 @@ class UserIdentity(Base, TimestampMixin):
     __tablename__ = "user_identity"
 
     __table_args__ = (
-        # 🚫 Ensure uniqueness across identity types and providers
-        UniqueConstraint("type", "value", "oauth_provider", name="uq_identity_value"),
+        # 🚫 Uniqueness across identity types and providers, via the hashed key
+        UniqueConstraint("lookup_key", name="uq_user_identity_lookup_key"),
         # ✅ Soft-deletion index
         Index("ix_user_identity_deleted_at", "deleted_at"),
-        # ⚡ Indexed flags for filtering
-        Index("ix_user_identity_is_verified", "is_verified"),
-        Index("ix_user_identity_is_primary", "is_primary"),
-        # 🔗 Fast lookup for identities belonging to a user
-        Index("ix_user_identity_user_id", "user_id"),
+        # 🔗 Identities of a user / "primary identity of user" (also backs the FK)
+        Index("ix_user_identity_user_id_is_primary", "user_id", "is_primary"),
+        # 🧹 Range scans by the OTP expiry sweeper (NULLs are never scanned)
+        Index("ix_user_identity_otp_generated_at", "otp_generated_at"),
+        # 🧩 Lives on its user's shard; found by lookup key via `identity_shard`
+        {"info": {"shard_key": "user_id"}},
     )
 
     # 🔑 Primary key
@@ -88,9 +138,9 @@ class UserIdentity(Base, TimestampMixin):
         doc="Foreign key to the user who owns this identity",
     )
 
-    # 🧾 Identity type: email / mobile / oauth
+    # 🧾 Identity type: email / mobile / oauth (stored as a small integer code)
     type: Mapped[IdentityType] = mapped_column(
-        SQLEnum(IdentityType, name="identity_type"),
+        SmallIntEnum(IdentityType, IDENTITY_TYPE_CODES),
         nullable=False,
         doc="Type of identity: email, mobile, or oauth",
     )
@@ -102,6 +152,13 @@ class UserIdentity(Base, TimestampMixin):
         doc="Actual identity value (email address, phone number, or OAuth UID)",
     )
 
+    # 🔑 Hash of normalized (type, provider, value); maintained automatically
+    lookup_key: Mapped[bytes] = mapped_column(
+        fixed_binary(16),
+        nullable=False,
+        doc="16-byte BLAKE2b key of the normalized identity, used for lookups",
+    )
+
     # ✅ Whether this identity has been verified (OTP or OAuth)
     is_verified: Mapped[Optional[bool]] = mapped_column(
         Boolean,
@@ -123,9 +180,9 @@ class UserIdentity(Base, TimestampMixin):
         String(50), nullable=True, doc="OAuth provider name if type is 'oauth'"
     )
 
-    # 🔐 OTP used for verification (mobile/email)
-    otp_code: Mapped[Optional[str]] = mapped_column(
-        String(10), nullable=True, doc="Last OTP code sent to this identity"
+    # 🔐 Keyed hash (HMAC-SHA256, hex) of the last OTP sent; never the code itself
+    otp_hash: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, doc="HMAC of the last OTP sent to this identity"
     )
 
     otp_generated_at: Mapped[Optional[datetime]] = mapped_column(
@@ -151,6 +208,24 @@ class UserIdentity(Base, TimestampMixin):
     user: Mapped["User"] = relationship(
         "User",
         back_populates="identities",
+        foreign_keys=[user_id],
         lazy="joined",
         doc="Back-reference to the owning user",
     )
+
+
+# ------------------------------------------
+# 🔁 Keep `lookup_key` in sync with its source columns
+# ------------------------------------------
+@event.listens_for(UserIdentity, "before_insert")
+@event.listens_for(UserIdentity, "before_update")
+def _set_lookup_key(mapper: Any, connection: Any, target: UserIdentity) -> None:
+    """
+    Recompute `lookup_key` whenever an identity is flushed through the ORM.
+
+    Bulk Core UPDATEs that touch `type`, `value` or `oauth_provider` bypass
+    this hook and must set `lookup_key` themselves via `identity_lookup_key`.
+    """
+    target.lookup_key = identity_lookup_key(
+        target.type, target.value, target.oauth_provider
+    )
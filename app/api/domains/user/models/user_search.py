@@ -0,0 +1,228 @@
+# app/api/domains/user/models/user_search.py
+
+"""
+🔎 Full-text search index over user names and identity values.
+
+One document per live user: `name` ("first last") and `identities` (all
+live identity values, space-separated). The index is a database-native
+structure and not an ORM model, so it lives outside `Base.metadata`:
+
+- SQLite: an FTS5 virtual table with the `trigram` tokenizer, so any
+  substring of 3+ characters is an index lookup (`rowid` = user ID; ranked
+  by BM25 with names weighted 2:1 over identities)
+- MySQL: an InnoDB table with a FULLTEXT index using the `ngram` parser
+
+Documents are rebuilt in the flushing transaction whenever a user's name,
+soft-deletion or identities change through the ORM (`after_flush`), on the
+user's shard when sharded. Set-based Core writes to those columns bypass
+the hook and must call `reindex_users`.
+The DDL is attached to `Base.metadata`, so `create_all` (schema bootstrap)
+creates the index too; Alembic comparisons skip it via `include_object`.
+"""
+
+from typing import Any, Iterable, Optional, Set
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Connection,
+    Integer,
+    MetaData,
+    Select,
+    String,
+    Table,
+    Text,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy.orm import Session, UOWTransaction
+
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_identity import UserIdentity
+from app.database.base import Base
+from app.database.sharding import shard_connections
+
+SEARCH_TABLE = "user_search"
+
+# 🔢 IDs per DELETE / INSERT … SELECT statement
+_REINDEX_CHUNK = 1000
+
+# ---------------------------------
+# 🔎 Index tables (per dialect)
+# ---------------------------------
+_sqlite_index = Table(
+    SEARCH_TABLE,
+    MetaData(),
+    Column("rowid", Integer, primary_key=True),
+    Column("name", Text),
+    Column("identities", Text),
+    info={"shard_key": "rowid"},
+)
+
+_mysql_index = Table(
+    SEARCH_TABLE,
+    MetaData(),
+    Column("user_id", BigInteger, primary_key=True),
+    Column("name", String(255)),
+    Column("identities", Text),
+    info={"shard_key": "user_id"},
+)
+
+_INDEXES = {"sqlite": _sqlite_index, "mysql": _mysql_index}
+
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(name, identities, tokenize='trigram')",
+    f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rank) VALUES ('rank', 'bm25(2.0, 1.0)')",
+)
+MYSQL_DDL = (
+    f"CREATE TABLE {SEARCH_TABLE} ("
+    " user_id BIGINT NOT NULL PRIMARY KEY,"
+    " name VARCHAR(255) NOT NULL,"
+    " identities TEXT NOT NULL,"
+    f" FULLTEXT KEY ft_{SEARCH_TABLE} (name, identities) WITH PARSER ngram"
+    ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4",
+)
+
+
+def search_table(dialect: str) -> Optional[Table]:
+    """The index table for `dialect`, or None where search is unsupported."""
+    return _INDEXES.get(dialect)
+
+
+def search_key(table: Table) -> Column[Any]:
+    """The user ID column of an index table."""
+    return next(iter(table.primary_key))
+
+
+def is_search_table(name: Optional[str]) -> bool:
+    """True for the index and its FTS5 shadow tables."""
+    return name is not None and (
+        name == SEARCH_TABLE or name.startswith(f"{SEARCH_TABLE}_")
+    )
+
+
+def include_object(
+    obj: Any, name: Optional[str], type_: str, reflected: bool, compare_to: Any
+) -> bool:
+    """Alembic `include_object` hook: the search index is managed by hand."""
+    return not (type_ == "table" and is_search_table(name))
+
+
+_DDL = {"sqlite": SQLITE_DDL, "mysql": MYSQL_DDL}
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_index(target: MetaData, connection: Connection, **kw: Any) -> None:
+    for statement in _DDL.get(connection.dialect.name, ()):
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_index(target: MetaData, connection: Connection, **kw: Any) -> None:
+    if connection.dialect.name in _DDL:
+        connection.exec_driver_sql(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+# ---------------------------------
+# 🧾 Documents
+# ---------------------------------
+def _documents(user_ids: Iterable[int]) -> Select[Any]:
+    """`(user id, name, identities)` of the given live users."""
+    identities = (
+        select(func.aggregate_strings(UserIdentity.value, " "))
+        .where(UserIdentity.user_id == User.id, UserIdentity.deleted_at.is_(None))
+        .scalar_subquery()
+    )
+    name = func.trim(
+        func.coalesce(User.first_name, "") + " " + func.coalesce(User.last_name, "")
+    )
+    return select(User.id, name, func.coalesce(identities, "")).where(
+        User.id.in_(user_ids), User.deleted_at.is_(None)
+    )
+
+
+def reindex_users(connection: Connection, user_ids: Iterable[int]) -> int:
+    """
+    Rebuild the documents of `user_ids` (removed for deleted users).
+
+    Sync and transaction-neutral: runs on the caller's connection and
+    transaction. Returns the number of documents written.
+    """
+    table = search_table(connection.dialect.name)
+    ids = sorted(set(user_ids))
+    if table is None or not ids:
+        return 0
+    key = search_key(table)
+    written = 0
+    for start in range(0, len(ids), _REINDEX_CHUNK):
+        chunk = ids[start : start + _REINDEX_CHUNK]
+        connection.execute(delete(table).where(key.in_(chunk)))
+        result = connection.execute(
+            insert(table).from_select(
+                [key.name, "name", "identities"], _documents(chunk)
+            )
+        )
+        written += result.rowcount or 0
+    return written
+
+
+def optimize_index(connection: Connection) -> None:
+    """
+    Merge the index into as few segments as possible (SQLite FTS5 only).
+
+    Worth running after a bulk (re)index: queries then read one posting
+    list per trigram instead of one per segment.
+    """
+    if connection.dialect.name == "sqlite":
+        connection.exec_driver_sql(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')"
+        )
+
+
+# ------------------------------------------------------
+# 🔁 Keep documents in sync with ORM writes
+# ------------------------------------------------------
+_USER_FIELDS = ("first_name", "last_name", "deleted_at")
+_IDENTITY_FIELDS = ("value", "deleted_at", "user_id")
+
+
+def _changed(obj: Any, fields: Iterable[str]) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[field].history.has_changes() for field in fields)
+
+
+@event.listens_for(Session, "after_flush")
+def _reindex_on_flush(session: Session, flush_context: UOWTransaction) -> None:
+    """
+    Rebuild the search documents of users whose name, soft-deletion or
+    identities were inserted, changed or deleted in this flush.
+    """
+    user_ids: Set[int] = set()
+    for obj in session.new:
+        if isinstance(obj, User):
+            user_ids.add(obj.id)
+        elif isinstance(obj, UserIdentity):
+            user_ids.add(obj.user_id)
+    for obj in session.dirty:
+        if isinstance(obj, User) and _changed(obj, _USER_FIELDS):
+            user_ids.add(obj.id)
+        elif isinstance(obj, UserIdentity) and _changed(obj, _IDENTITY_FIELDS):
+            history = inspect(obj).attrs.user_id.history
+            user_ids.update(history.deleted or ())
+            user_ids.add(obj.user_id)
+    for obj in session.deleted:
+        # Loaded state only: a deleted object must not trigger a refresh
+        if isinstance(obj, User):
+            deleted_id = inspect(obj).dict.get("id")
+        elif isinstance(obj, UserIdentity):
+            deleted_id = inspect(obj).dict.get("user_id")
+        else:
+            continue
+        if deleted_id is not None:
+            user_ids.add(deleted_id)
+    for connection, ids in shard_connections(session, user_ids):
+        reindex_users(connection, ids)
@@ -0,0 +1,126 @@
+# app/api/domains/user/repositories/loaders.py
+
+"""
+📦 Request-scoped batching loaders for user-domain relationships.
+
+Instead of touching `user.identities` / `user.auth` / `user.role` per object
+(one query each unless every caller adds eager options), code asks the
+loaders; all keys requested in the same event-loop tick are fetched with a
+single `WHERE … IN (…)` per relationship and memoized for the request.
+
+Usage (inside an endpoint):
+    loaders: UserLoaders = Depends(get_user_loaders)
+    identities = await asyncio.gather(
+        *(loaders.identities_by_user.load(user_id) for user_id in user_ids)
+    )
+
+`attach(users, names)` fills `User.identities` / `User.auth` / `User.role`
+on already-loaded users from the loaders, so `FieldSelection.project` (the
+user list, search and detail endpoints) reads them without lazy loads.
+
+Loaded objects carry `raiseload("*")`: their own relationships must also go
+through a loader, never through implicit lazy loads.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_auth import UserAuth
+from app.api.domains.user.models.user_identity import UserIdentity
+from app.api.utils.batch_loader import BatchLoader
+
+# 🔗 Sets a relationship's loaded value without a load or a change event
+_set_loaded: Callable[[Any, str, Any], None] = set_committed_value
+
+
+class UserLoaders:
+    """
+    One set of loaders per request, sharing the request's session.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        # 🔒 Batches of different loaders share one session, so never overlap
+        lock = asyncio.Lock()
+        self.identities_by_user: BatchLoader[int, List[UserIdentity]] = BatchLoader(
+            self._identities_by_user, default=list, lock=lock
+        )
+        self.auth_by_user: BatchLoader[int, Optional[UserAuth]] = BatchLoader(
+            self._auth_by_user, lock=lock
+        )
+        self.role_by_id: BatchLoader[int, Role] = BatchLoader(
+            self._role_by_id, lock=lock
+        )
+
+    def _relations(self) -> Dict[str, Tuple[BatchLoader[int, Any], str]]:
+        """`User` relationship → (loader, user attribute holding its key)."""
+        return {
+            "identities": (self.identities_by_user, "id"),
+            "auth": (self.auth_by_user, "id"),
+            "role": (self.role_by_id, "role_id"),
+        }
+
+    def batches(self, name: str) -> bool:
+        """True if the `User` relationship `name` can be filled by `attach`."""
+        return name in self._relations()
+
+    async def attach(self, users: Sequence[User], names: Iterable[str]) -> None:
+        """
+        Load the named relationships of `users` through the loaders (one
+        `IN (…)` query per relationship, all in the same tick) and set them
+        as the users' loaded state.
+        """
+        relations = self._relations()
+        pending = [
+            (user, name, relations[name][0].load(getattr(user, relations[name][1])))
+            for name in names
+            for user in users
+        ]
+        values = await asyncio.gather(*(future for _, _, future in pending))
+        for (user, name, _), value in zip(pending, values):
+            _set_loaded(user, name, value)
+
+    async def _identities_by_user(
+        self, user_ids: List[int]
+    ) -> Dict[int, List[UserIdentity]]:
+        """Live identities per user ID (primary first)."""
+        stmt = (
+            select(UserIdentity)
+            .where(
+                UserIdentity.user_id.in_(user_ids),
+                UserIdentity.deleted_at.is_(None),
+            )
+            .order_by(
+                UserIdentity.user_id,
+                UserIdentity.is_primary.desc(),
+                UserIdentity.id,
+            )
+            .options(raiseload("*"))
+        )
+        grouped: Dict[int, List[UserIdentity]] = {}
+        for identity in (await self.session.execute(stmt)).scalars():
+            grouped.setdefault(identity.user_id, []).append(identity)
+        return grouped
+
+    async def _auth_by_user(self, user_ids: List[int]) -> Dict[int, Optional[UserAuth]]:
+        """Live credentials per user ID (absent → None)."""
+        stmt = (
+            select(UserAuth)
+            .where(UserAuth.user_id.in_(user_ids), UserAuth.deleted_at.is_(None))
+            .options(raiseload("*"))
+        )
+        return {
+            auth.user_id: auth for auth in (await self.session.execute(stmt)).scalars()
+        }
+
+    async def _role_by_id(self, role_ids: List[int]) -> Dict[int, Role]:
+        """Roles by ID (including soft-deleted ones users may still reference)."""
+        stmt = select(Role).where(Role.id.in_(role_ids)).options(raiseload("*"))
+        return {role.id: role for role in (await self.session.execute(stmt)).scalars()}
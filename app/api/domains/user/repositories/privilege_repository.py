@@ -0,0 +1,62 @@
+# app/api/domains/user/repositories/privilege_repository.py
+
+"""
+🔐 Data-access helpers for `Privilege` reads.
+
+Privileges are small rows; reads select plain columns (never hydrating
+`Privilege` and its eager `roles` relationship) including `version_id` and
+`updated_at`, which the endpoints turn into cache validators.
+"""
+
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import Row, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.domains.user.models.privilege import Privilege
+
+
+async def list_privileges(
+    session: AsyncSession, offset: int = 0, limit: int = 100
+) -> Sequence[Row[Any]]:
+    """
+    Return one page of live privileges (`id`, `name`, `description`) by name.
+    """
+    stmt = (
+        select(Privilege.id, Privilege.name, Privilege.description)
+        .where(Privilege.deleted_at.is_(None))
+        .order_by(Privilege.name)
+        .offset(offset)
+        .limit(limit)
+    )
+    return (await session.execute(stmt)).all()
+
+
+async def get_privilege_row(
+    session: AsyncSession, privilege_id: int
+) -> Optional[Row[Any]]:
+    """
+    Return a live privilege (`id`, `name`, `description`, `version_id`,
+    `updated_at`), or None.
+    """
+    stmt = select(
+        Privilege.id,
+        Privilege.name,
+        Privilege.description,
+        Privilege.version_id,
+        Privilege.updated_at,
+    ).where(Privilege.id == privilege_id, Privilege.deleted_at.is_(None))
+    return (await session.execute(stmt)).first()
+
+
+async def get_privilege_list_validators(session: AsyncSession) -> Row[Any]:
+    """
+    Return `privilege_count`, `privilege_versions` (sum of `version_id`) and
+    `privileges_changed_at` over live privileges.
+    """
+    stmt = select(
+        func.count().label("privilege_count"),
+        func.coalesce(func.sum(Privilege.version_id), 0).label("privilege_versions"),
+        func.max(Privilege.updated_at).label("privileges_changed_at"),
+    ).where(Privilege.deleted_at.is_(None))
+    return (await session.execute(stmt)).one()
@@ -0,0 +1,539 @@
+# app/api/domains/user/repositories/role_repository.py
+
+"""
+🛡️ Data-access helpers for `Role` and its privilege links.
+
+These queries select plain columns instead of hydrating `Role` objects, so
+they never trigger the eager `privileges` relationship load, and membership
+is reported as grouped `COUNT`s rather than by loading `Role.users`.
+
+When sharded, role tables are read from the global database, or from a
+shard's copy when joined with users; per-shard member aggregates are added up.
+"""
+
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
+
+from sqlalchemy import (
+    Column,
+    ColumnElement,
+    Insert,
+    Integer,
+    MetaData,
+    Row,
+    Select,
+    Table,
+    and_,
+    case,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.domains.user.models.privilege import Privilege
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.role_privilege import RolePrivilege
+from app.api.domains.user.models.user import User
+from app.api.domains.user.services.audit_service import record_audit
+from app.database.sharding import fetch_page, merge_aggregates
+
+
+@dataclass(frozen=True, slots=True)
+class MemberCounts:
+    """Number of (non soft-deleted) users assigned to a role."""
+
+    total: int = 0
+    active: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class PrivilegeSyncResult:
+    """Outcome of `set_role_privileges`."""
+
+    roles: int
+    granted: int  # links inserted or revived
+    revoked: int  # live links soft-deleted
+
+
+async def get_role_privilege_ids(session: AsyncSession, role_id: int) -> FrozenSet[int]:
+    """
+    Return the IDs of all live (non soft-deleted) privileges granted to a role.
+    """
+    stmt = (
+        select(RolePrivilege.privilege_id)
+        .join(Privilege, Privilege.id == RolePrivilege.privilege_id)
+        .where(
+            RolePrivilege.role_id == role_id,
+            RolePrivilege.deleted_at.is_(None),
+            Privilege.deleted_at.is_(None),
+        )
+    )
+    return frozenset((await session.execute(stmt)).scalars().all())
+
+
+async def get_privilege_name_map(session: AsyncSession) -> Dict[str, int]:
+    """
+    Return a `{privilege name: privilege id}` map of all live privileges.
+    """
+    stmt = select(Privilege.name, Privilege.id).where(Privilege.deleted_at.is_(None))
+    return {name: pid for name, pid in (await session.execute(stmt)).all()}
+
+
+async def get_privilege_bits(session: AsyncSession) -> Dict[int, int]:
+    """
+    Return `{privilege id: token bit position}` for all privileges,
+    soft-deleted ones included (see `privilege_catalog`).
+    """
+    stmt = select(Privilege.id, Privilege.bit)
+    return {pid: bit for pid, bit in (await session.execute(stmt)).all()}
+
+
+async def get_role_privilege_map(session: AsyncSession) -> Dict[int, FrozenSet[int]]:
+    """
+    Return `{role id: live privilege IDs}` for every role with a live grant
+    (`get_role_privilege_ids` for all roles, in one query).
+    """
+    stmt = (
+        select(RolePrivilege.role_id, RolePrivilege.privilege_id)
+        .join(Privilege, Privilege.id == RolePrivilege.privilege_id)
+        .where(RolePrivilege.deleted_at.is_(None), Privilege.deleted_at.is_(None))
+    )
+    grouped: Dict[int, Set[int]] = {}
+    for role_id, privilege_id in (await session.execute(stmt)).all():
+        grouped.setdefault(role_id, set()).add(privilege_id)
+    return {role_id: frozenset(ids) for role_id, ids in grouped.items()}
+
+
+async def get_authz_version(session: AsyncSession) -> Row[Any]:
+    """
+    Return one row of aggregates that changes whenever the role / privilege
+    graph may have changed: counts, `max(updated_at)` per table and the sums
+    of `Role.version_id` (bumped by `set_role_privileges` for every role whose
+    link set changes, so same-second grant changes are seen too) and
+    `Privilege.version_id` (same-second renames).
+    """
+    stmt = select(
+        select(func.count()).select_from(Role).scalar_subquery().label("roles"),
+        select(func.coalesce(func.sum(Role.version_id), 0))
+        .scalar_subquery()
+        .label("role_versions"),
+        select(func.max(Role.updated_at)).scalar_subquery().label("roles_changed_at"),
+        select(func.count())
+        .select_from(Privilege)
+        .scalar_subquery()
+        .label("privileges"),
+        select(func.coalesce(func.sum(Privilege.version_id), 0))
+        .scalar_subquery()
+        .label("privilege_versions"),
+        select(func.max(Privilege.updated_at))
+        .scalar_subquery()
+        .label("privileges_changed_at"),
+        select(func.count())
+        .select_from(RolePrivilege)
+        .scalar_subquery()
+        .label("links"),
+        select(func.max(RolePrivilege.updated_at))
+        .scalar_subquery()
+        .label("links_changed_at"),
+    )
+    return (await session.execute(stmt)).one()
+
+
+# --------------------------------------
+# 👥 Role membership (aggregates, never `Role.users`)
+# --------------------------------------
+async def get_role_member_counts(
+    session: AsyncSession, role_ids: Optional[Iterable[int]] = None
+) -> Dict[int, MemberCounts]:
+    """
+    Return `{role id: MemberCounts}` via one grouped aggregate query.
+
+    Restricting `role_ids` lets the count walk `ix_user_role_id_is_active`
+    for just those roles. Roles without users are absent from the result.
+    """
+    stmt = (
+        select(
+            User.role_id,
+            func.count(),
+            func.coalesce(func.sum(case((User.is_active.is_(True), 1), else_=0)), 0),
+        )
+        .where(User.deleted_at.is_(None))
+        .group_by(User.role_id)
+    )
+    if role_ids is not None:
+        ids = list(role_ids)
+        if not ids:
+            return {}
+        stmt = stmt.where(User.role_id.in_(ids))
+    # One row per role and shard when sharded
+    counts: Dict[int, MemberCounts] = {}
+    for role_id, total, active in (await session.execute(stmt)).all():
+        seen = counts.get(role_id, MemberCounts())
+        counts[role_id] = MemberCounts(
+            total=seen.total + total, active=seen.active + int(active)
+        )
+    return counts
+
+
+async def list_roles(
+    session: AsyncSession, offset: int = 0, limit: int = 50
+) -> Sequence[Row[Any]]:
+    """
+    Return one page of live roles as column rows (`id`, `name`, `description`).
+    """
+    stmt = (
+        select(Role.id, Role.name, Role.description)
+        .where(Role.deleted_at.is_(None))
+        .order_by(Role.id)
+        .offset(offset)
+        .limit(limit)
+    )
+    return (await session.execute(stmt)).all()
+
+
+async def get_role_row(session: AsyncSession, role_id: int) -> Optional[Row[Any]]:
+    """
+    Return a single live role as a column row (incl. `version_id`), or None.
+    """
+    stmt = select(Role.id, Role.name, Role.description, Role.version_id).where(
+        Role.id == role_id, Role.deleted_at.is_(None)
+    )
+    return (await session.execute(stmt)).first()
+
+
+# --------------------------------------
+# 🏷️ Cache validators (aggregates only, nothing hydrated)
+# --------------------------------------
+async def get_role_validators(
+    session: AsyncSession, role_id: int
+) -> Optional[Row[Any]]:
+    """
+    Return what a role detail depends on, in one column-only query, or None.
+
+    Row fields: `version_id` (bumped by privilege grants / revocations too),
+    `updated_at`, `links_changed_at`, `privileges_changed_at`,
+    `privilege_versions` (of the granted privileges), and over every
+    user that has the role, soft-deleted or not (so moves out of it change the
+    count): `member_count`, `member_versions` (sum of `version_id`, which
+    moves on every write even within one `updated_at` second) and
+    `members_changed_at`.
+    """
+    in_role = User.role_id == role_id
+    stmt = select(
+        Role.version_id,
+        Role.updated_at,
+        select(func.max(RolePrivilege.updated_at))
+        .where(RolePrivilege.role_id == role_id)
+        .scalar_subquery()
+        .label("links_changed_at"),
+        select(func.max(Privilege.updated_at))
+        .join(RolePrivilege, RolePrivilege.privilege_id == Privilege.id)
+        .where(RolePrivilege.role_id == role_id, RolePrivilege.deleted_at.is_(None))
+        .scalar_subquery()
+        .label("privileges_changed_at"),
+        select(func.coalesce(func.sum(Privilege.version_id), 0))
+        .join(RolePrivilege, RolePrivilege.privilege_id == Privilege.id)
+        .where(RolePrivilege.role_id == role_id, RolePrivilege.deleted_at.is_(None))
+        .scalar_subquery()
+        .label("privilege_versions"),
+        select(func.count()).where(in_role).scalar_subquery().label("member_count"),
+        select(func.coalesce(func.sum(User.version_id), 0))
+        .where(in_role)
+        .scalar_subquery()
+        .label("member_versions"),
+        select(func.max(User.updated_at))
+        .where(in_role)
+        .scalar_subquery()
+        .label("members_changed_at"),
+    ).where(Role.id == role_id, Role.deleted_at.is_(None))
+    return merge_aggregates(
+        (await session.execute(stmt)).all(), sums=("member_count", "member_versions")
+    )
+
+
+async def get_role_list_validators(
+    session: AsyncSession, role_ids: Sequence[int]
+) -> Row[Any]:
+    """
+    Return the aggregates one page of the role list depends on, in one query.
+
+    Row fields over the page's roles (see `list_roles`): `role_count`,
+    `role_versions` (sum of `version_id`), `roles_changed_at`, and over their
+    members (through `ix_user_role_id_is_active`, never the whole `user`
+    table): `member_count`, `member_versions`, `members_changed_at`.
+    """
+    live = and_(Role.id.in_(role_ids), Role.deleted_at.is_(None))
+    members = User.role_id.in_(role_ids)
+    stmt = select(
+        select(func.count()).where(live).scalar_subquery().label("role_count"),
+        select(func.coalesce(func.sum(Role.version_id), 0))
+        .where(live)
+        .scalar_subquery()
+        .label("role_versions"),
+        select(func.max(Role.updated_at))
+        .where(live)
+        .scalar_subquery()
+        .label("roles_changed_at"),
+        select(func.count()).where(members).scalar_subquery().label("member_count"),
+        select(func.coalesce(func.sum(User.version_id), 0))
+        .where(members)
+        .scalar_subquery()
+        .label("member_versions"),
+        select(func.max(User.updated_at))
+        .where(members)
+        .scalar_subquery()
+        .label("members_changed_at"),
+    )
+    # Sharded: one row per shard, each with the same (replicated) role aggregates
+    merged = merge_aggregates(
+        (await session.execute(stmt)).all(), sums=("member_count", "member_versions")
+    )
+    assert merged is not None  # no GROUP BY: one row per database
+    return merged
+
+
+async def get_role_privilege_names(session: AsyncSession, role_id: int) -> List[str]:
+    """
+    Return the sorted names of all live privileges granted to a role.
+    """
+    stmt = (
+        select(Privilege.name)
+        .join(RolePrivilege, RolePrivilege.privilege_id == Privilege.id)
+        .where(
+            RolePrivilege.role_id == role_id,
+            RolePrivilege.deleted_at.is_(None),
+            Privilege.deleted_at.is_(None),
+        )
+        .order_by(Privilege.name)
+    )
+    return list((await session.execute(stmt)).scalars().all())
+
+
+async def list_role_members(
+    session: AsyncSession, role_id: int, offset: int = 0, limit: int = 100
+) -> Sequence[Row[Any]]:
+    """
+    Return one page of a role's (non soft-deleted) users as column rows.
+
+    This is the explicit, bounded replacement for iterating `Role.users`.
+    """
+    stmt = (
+        select(User.id, User.first_name, User.last_name, User.is_active)
+        .where(User.role_id == role_id, User.deleted_at.is_(None))
+        .order_by(User.id)
+    )
+    return await fetch_page(session, stmt, offset, limit, key=lambda row: row.id)
+
+
+# --------------------------------------
+# 🔁 Bulk privilege policy (set-based diff + upsert)
+# --------------------------------------
+# Scratch table holding the desired (role, privilege) pairs for one call.
+# TEMPORARY tables are private to the connection and vanish with it.
+_desired_pairs = Table(
+    "tmp_desired_role_privilege",
+    MetaData(),
+    # 🔑 Composite PK so the NOT EXISTS probe in step 3 is an index lookup
+    Column("role_id", Integer, primary_key=True, autoincrement=False),
+    Column("privilege_id", Integer, primary_key=True, autoincrement=False),
+    prefixes=["TEMPORARY"],
+)
+
+
+def _upsert_links(dialect: str, actor_id: Optional[int]) -> Insert:
+    """
+    `INSERT … SELECT` of desired pairs into `role_privilege` that revives
+    soft-deleted links on conflict instead of failing on `uq_role_privilege`.
+
+    Only live roles/privileges are linked; unknown IDs are ignored.
+    """
+    link = cast(Table, RolePrivilege.__table__)
+    source = (
+        select(
+            _desired_pairs.c.role_id,
+            _desired_pairs.c.privilege_id,
+            literal(actor_id, Integer),
+            literal(actor_id, Integer),
+        )
+        .join(Role, Role.id == _desired_pairs.c.role_id)
+        .join(Privilege, Privilege.id == _desired_pairs.c.privilege_id)
+        # 📌 A WHERE clause is also what lets SQLite parse `INSERT … SELECT … ON CONFLICT`
+        .where(Role.deleted_at.is_(None), Privilege.deleted_at.is_(None))
+    )
+    columns = ["role_id", "privilege_id", "created_by", "updated_by"]
+
+    if dialect == "sqlite":
+        upsert = sqlite_insert(link).from_select(columns, source)
+        return upsert.on_conflict_do_update(
+            index_elements=[link.c.role_id, link.c.privilege_id],
+            set_={
+                "deleted_at": None,
+                "updated_at": func.now(),
+                "updated_by": upsert.excluded.updated_by,
+            },
+            where=link.c.deleted_at.is_not(None),
+        )
+    if dialect == "mysql":
+        duplicate = mysql_insert(link).from_select(columns, source)
+        # MySQL applies assignments left to right, so test `deleted_at`
+        # before clearing it; live links are left untouched.
+        revived = link.c.deleted_at.is_not(None)
+        return duplicate.on_duplicate_key_update(
+            [
+                ("updated_at", case((revived, func.now()), else_=link.c.updated_at)),
+                (
+                    "updated_by",
+                    case(
+                        (revived, duplicate.inserted.updated_by),
+                        else_=link.c.updated_by,
+                    ),
+                ),
+                ("deleted_at", None),
+            ]
+        )
+    raise NotImplementedError(f"Bulk privilege upsert is not supported on {dialect}")
+
+
+def _links_to_grant() -> Select[Any]:
+    """
+    Desired (role, privilege) pairs of live roles and privileges that have no
+    live link yet: the pairs the upsert inserts or revives.
+    """
+    desired = _desired_pairs.c
+    linked = exists().where(
+        RolePrivilege.role_id == desired.role_id,
+        RolePrivilege.privilege_id == desired.privilege_id,
+        RolePrivilege.deleted_at.is_(None),
+    )
+    return (
+        select(desired.role_id, desired.privilege_id)
+        .join(Role, Role.id == desired.role_id)
+        .join(Privilege, Privilege.id == desired.privilege_id)
+        .where(Role.deleted_at.is_(None), Privilege.deleted_at.is_(None), ~linked)
+    )
+
+
+def _still_desired() -> ColumnElement[bool]:
+    """True for a `RolePrivilege` (correlated) that is among the desired pairs."""
+    return exists().where(
+        _desired_pairs.c.role_id == RolePrivilege.role_id,
+        _desired_pairs.c.privilege_id == RolePrivilege.privilege_id,
+    )
+
+
+async def set_role_privileges(
+    session: AsyncSession,
+    policy: Mapping[int, Iterable[int]],
+    actor_id: Optional[int] = None,
+) -> PrivilegeSyncResult:
+    """
+    Make each role's live privileges exactly the given set.
+
+    `policy` maps role ID → desired privilege IDs (an empty set revokes all).
+    The diff is computed in SQL against a temporary table of desired pairs:
+
+    1. batched INSERT of the pairs into the temporary table
+    2. two SELECTs of the diff: pairs to grant, live links to revoke
+    3. one UPDATE bumping `version_id` of roles whose link set changes
+       (their detail `ETag` covers the privilege list)
+    4. one `INSERT … SELECT` upsert: new links inserted, soft-deleted ones revived
+    5. one UPDATE soft-deleting live links that are no longer desired
+
+    Steps 3–5 only run when the diff has work for them. Each changed role
+    gets one audit event listing the privilege IDs granted and revoked. Each statement reads
+    the temporary table at most once, which MySQL requires of TEMPORARY
+    tables. So applying a 500-privilege policy to 200 roles is a handful of
+    statements regardless of the current state. `granted` / `revoked` are
+    the diff's sizes (MySQL's upsert rowcount counts a revived row twice).
+
+    The caller commits the session; `Role` objects already loaded in it
+    should be refreshed to see the new links.
+    """
+    role_ids = sorted({int(role_id) for role_id in policy})
+    if not role_ids:
+        return PrivilegeSyncResult(roles=0, granted=0, revoked=0)
+    pairs = [
+        {"role_id": int(role_id), "privilege_id": int(privilege_id)}
+        for role_id, privilege_ids in policy.items()
+        for privilege_id in set(privilege_ids)
+    ]
+
+    connection = await session.connection()
+    dialect = connection.dialect.name
+    await connection.run_sync(_desired_pairs.create, checkfirst=False)
+    try:
+        if pairs:
+            await session.execute(insert(_desired_pairs), pairs)
+
+        undesired = (
+            RolePrivilege.role_id.in_(role_ids),
+            RolePrivilege.deleted_at.is_(None),
+            ~_still_desired(),
+        )
+        grants = (await session.execute(_links_to_grant())).all()
+        revokes = (
+            await session.execute(
+                select(RolePrivilege.role_id, RolePrivilege.privilege_id).where(
+                    *undesired
+                )
+            )
+        ).all()
+
+        changed_roles = {row.role_id for row in grants} | {
+            row.role_id for row in revokes
+        }
+        if changed_roles:
+            await session.execute(
+                update(Role)
+                .where(Role.id.in_(sorted(changed_roles)))
+                .values(version_id=Role.version_id + 1, updated_by=actor_id)
+                .execution_options(synchronize_session=False)
+            )
+        if grants:
+            await session.execute(_upsert_links(dialect, actor_id))
+        if revokes:
+            await session.execute(
+                update(RolePrivilege)
+                .where(*undesired)
+                .values(deleted_at=func.now(), updated_by=actor_id)
+                .execution_options(synchronize_session=False)
+            )
+    finally:
+        await connection.run_sync(_desired_pairs.drop, checkfirst=False)
+
+    # 📜 One event per changed role: granted IDs as new values, revoked as old
+    granted: Dict[int, List[int]] = {}
+    revoked: Dict[int, List[int]] = {}
+    for row in grants:
+        granted.setdefault(row.role_id, []).append(row.privilege_id)
+    for row in revokes:
+        revoked.setdefault(row.role_id, []).append(row.privilege_id)
+    audit: Dict[int, Dict[str, Tuple[Any, Any]]] = {
+        role_id: {
+            "granted_privilege_ids": (None, sorted(granted.get(role_id, [])) or None),
+            "revoked_privilege_ids": (sorted(revoked.get(role_id, [])) or None, None),
+        }
+        for role_id in sorted(changed_roles)
+    }
+    record_audit(session, "role", audit, actor_id=actor_id)
+    return PrivilegeSyncResult(
+        roles=len(role_ids), granted=len(grants), revoked=len(revokes)
+    )
@@ -0,0 +1,61 @@
+# app/api/domains/user/repositories/user_identity_repository.py
+
+"""
+📇 Data-access helpers for `UserIdentity`.
+
+Identity lookups go through the fixed-width `lookup_key` unique index rather
+than the (type, value, oauth_provider) columns, so the hot lookup path only
+ever touches a 16-byte key.
+"""
+
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.domains.user.models.user_identity import (
+    IdentityType,
+    UserIdentity,
+    identity_lookup_key,
+)
+
+
+async def get_identity(
+    session: AsyncSession,
+    type: IdentityType,
+    value: str,
+    oauth_provider: Optional[str] = None,
+    include_deleted: bool = False,
+) -> Optional[UserIdentity]:
+    """
+    Fetch an identity by its (type, value, provider) triple.
+
+    Args:
+        session: Active async session.
+        type: Identity type (email / mobile / oauth).
+        value: Raw identity value; normalized before hashing.
+        oauth_provider: Provider name for OAuth identities.
+        include_deleted: Also return soft-deleted identities.
+    """
+    stmt = select(UserIdentity).where(
+        UserIdentity.lookup_key == identity_lookup_key(type, value, oauth_provider)
+    )
+    if not include_deleted:
+        stmt = stmt.where(UserIdentity.deleted_at.is_(None))
+    return (await session.execute(stmt)).scalars().first()
+
+
+async def identity_exists(
+    session: AsyncSession,
+    type: IdentityType,
+    value: str,
+    oauth_provider: Optional[str] = None,
+) -> bool:
+    """
+    Return True if the identity is already taken (including soft-deleted rows,
+    which still hold the unique key).
+    """
+    stmt = select(UserIdentity.id).where(
+        UserIdentity.lookup_key == identity_lookup_key(type, value, oauth_provider)
+    )
+    return (await session.execute(stmt.limit(1))).first() is not None
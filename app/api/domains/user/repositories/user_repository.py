@@ -0,0 +1,199 @@
+# app/api/domains/user/repositories/user_repository.py
+
+"""
+👤 Data-access helpers for `User` reads.
+
+Reads take a `FieldSelection` (see `app/database/fieldsets.py`) so only the
+requested columns and relationships are fetched and serialized.
+
+`get_user_validators` / `get_user_list_validators` answer "has this changed?"
+from `version_id` / `updated_at` aggregates without building any `User`. A
+list page is addressed by its IDs (`list_user_ids`), so its validators and
+its rows only ever touch that page's users.
+
+Lists and aggregates span every shard when sharded (`fetch_page`,
+`merge_aggregates`); single-user reads go to the user's shard.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import ColumnElement, Row, Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_auth import UserAuth
+from app.api.domains.user.repositories.loaders import UserLoaders
+from app.database.fieldsets import FieldSelection
+from app.database.mixins import VersionedMixin
+from app.database.sharding import fetch_page, merge_aggregates
+
+# 📋 Fields returned when the caller does not choose
+DEFAULT_USER_FIELDS = "id,first_name,last_name,is_active,role_id"
+
+
+def _filtered(stmt: Select[Any], role_id: Optional[int]) -> Select[Any]:
+    stmt = stmt.where(User.deleted_at.is_(None))
+    if role_id is not None:
+        stmt = stmt.where(User.role_id == role_id)
+    return stmt
+
+
+async def list_user_ids(
+    session: AsyncSession,
+    offset: int = 0,
+    limit: int = 50,
+    role_id: Optional[int] = None,
+) -> List[int]:
+    """
+    Return the IDs of one page of live users, in ID order.
+
+    Selects `id` alone, so the page is cut from the primary key (or
+    `ix_user_role_id_is_active` with `role_id`) without reading user rows;
+    pass the result to `get_user_list_validators` and `get_users_by_ids`.
+    """
+    stmt = _filtered(select(User.id), role_id).order_by(User.id)
+    rows = await fetch_page(session, stmt, offset, limit, key=lambda row: row.id)
+    return [row.id for row in rows]
+
+
+async def get_users_by_ids(
+    session: AsyncSession,
+    selection: FieldSelection,
+    user_ids: Sequence[int],
+    loaders: Optional[UserLoaders] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Return the live users among `user_ids`, projected, in the given order
+    (e.g. search rank). Missing or deleted IDs are skipped.
+
+    Selected `identities` / `auth` / `role` fields come from `loaders` (the
+    request's, or a fresh set): one `IN (…)` query per relationship, whatever
+    the number of users. Relationships with nested selections are loaded
+    by the selection's own loader options.
+    """
+    if not user_ids:
+        return []
+    position = {user_id: index for index, user_id in enumerate(user_ids)}
+    if selection.columns_only:
+        stmt = _filtered(select(User.id.label("_key"), *selection.columns()), None)
+        rows = (
+            (await session.execute(stmt.where(User.id.in_(user_ids)))).mappings().all()
+        )
+        rows = sorted(rows, key=lambda row: position[row["_key"]])
+        return [selection.project_row(row) for row in rows]
+
+    loaders = loaders or UserLoaders(session)
+    batched = [
+        name
+        for name, sub in selection.relations.items()
+        if sub.columns_only and loaders.batches(name)
+    ]
+    stmt = _filtered(select(User).options(*selection.loader_options(batched)), None)
+    users = (
+        (await session.execute(stmt.where(User.id.in_(user_ids))))
+        .unique()
+        .scalars()
+        .all()
+    )
+    users = sorted(users, key=lambda user: position[user.id])
+    await loaders.attach(users, batched)
+    return [selection.project(user) for user in users]
+
+
+# --------------------------------------
+# 🏷️ Cache validators
+# --------------------------------------
+async def get_user_validators(
+    session: AsyncSession, user_id: int
+) -> Optional[Row[Any]]:
+    """
+    Return `version_id` and `updated_at` of a live user (PK lookup), or None.
+    """
+    stmt = select(User.version_id, User.updated_at).where(
+        User.id == user_id, User.deleted_at.is_(None)
+    )
+    return (await session.execute(stmt)).first()
+
+
+def _relation_aggregates(
+    selection: FieldSelection,
+    user_ids: Sequence[int],
+    parent: Any = User,
+    joins: Tuple[Any, ...] = (),
+    prefix: str = "",
+) -> List[ColumnElement[Any]]:
+    """
+    `COUNT`, `MAX(updated_at)` and, for versioned models, `SUM(version_id)` of
+    the related rows behind each selected relationship path (e.g. `role`,
+    `identities`), joined from the given users.
+    """
+    columns: List[ColumnElement[Any]] = []
+    for name, sub in selection.relations.items():
+        target = aliased(sub.mapper.class_)
+        path = joins + (getattr(parent, name).of_type(target),)
+        label = f"{prefix}{name}"
+        aggregates = [
+            (func.count(), "count"),
+            (func.max(target.updated_at), "changed_at"),
+        ]
+        if issubclass(sub.mapper.class_, VersionedMixin):
+            aggregates.append(
+                (func.coalesce(func.sum(target.version_id), 0), "versions")
+            )
+        for aggregate, suffix in aggregates:
+            stmt = select(aggregate).select_from(User).where(User.id.in_(user_ids))
+            for attribute in path:
+                stmt = stmt.join(attribute)
+            # Uncorrelated: the outer query also selects FROM `user`
+            columns.append(
+                stmt.correlate(None).scalar_subquery().label(f"{label}_{suffix}")
+            )
+        columns.extend(_relation_aggregates(sub, user_ids, target, path, f"{label}_"))
+    return columns
+
+
+async def get_user_list_validators(
+    session: AsyncSession, selection: FieldSelection, user_ids: Sequence[int]
+) -> Row[Any]:
+    """
+    Return aggregates over one page of users (see `list_user_ids`), in one
+    query of primary-key lookups.
+
+    Row fields: `user_count`, `user_versions` (sum of `version_id`, which moves
+    on every write even within one `updated_at` second), `users_changed_at`,
+    plus `<relation>_count` / `<relation>_changed_at` / `<relation>_versions`
+    per selected relationship. Every embedded model is versioned, so an edit
+    to a related row always moves the sums. Changes that only reshuffle the
+    page show up in its IDs, which belong in the ETag too.
+    """
+    stmt = select(
+        func.count().label("user_count"),
+        func.coalesce(func.sum(User.version_id), 0).label("user_versions"),
+        func.max(User.updated_at).label("users_changed_at"),
+        *_relation_aggregates(selection, user_ids),
+    ).where(User.id.in_(user_ids))
+    merged = merge_aggregates((await session.execute(stmt)).all())
+    assert merged is not None  # no GROUP BY: one row per database
+    return merged
+
+
+async def get_account_state(session: AsyncSession, user_id: int) -> Optional[Row[Any]]:
+    """
+    Return the columns that decide whether a user may (still) log in.
+
+    Row fields: `role_id`, `is_active`, `deleted_at`, `auth_deleted_at`,
+    `account_locked_until`; None if the user has no credentials row.
+    """
+    stmt = (
+        select(
+            User.role_id,
+            User.is_active,
+            User.deleted_at,
+            UserAuth.deleted_at.label("auth_deleted_at"),
+            UserAuth.account_locked_until,
+        )
+        .join(UserAuth, UserAuth.user_id == User.id)
+        .where(User.id == user_id)
+    )
+    return (await session.execute(stmt)).first()
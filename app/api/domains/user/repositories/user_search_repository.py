@@ -0,0 +1,200 @@
+# app/api/domains/user/repositories/user_search_repository.py
+
+"""
+🔎 Ranked user search over the `user_search` index.
+
+Queries are split into terms of at least `MIN_TERM_LENGTH` characters
+(shorter ones cannot use a trigram index) and run in one of two modes:
+
+- `substring`: every term must occur somewhere in the user's name or
+  identities (prefixes included), e.g. `"john smi"` finds "John Smith" and
+  `john.smithers@example.com`
+- `fuzzy`: any trigram of the terms may match; users sharing more (and
+  rarer) trigrams rank first, so typos and transpositions still find them
+
+SQLite ranks by FTS5 BM25 (names weighted over identities); MySQL by
+FULLTEXT relevance. Other databases have no index and fall back to a
+`LIKE` scan of names and identities, ranked by the terms matched (names
+weighted over identities). Results are user IDs in rank order, ties by ID.
+
+Only the best `settings.user_search_candidates` matches (by rank) are paged
+through, which bounds the rows sorted and returned however common a term
+is: deeper pages of a query that broad are empty, and adding a term
+narrows it. When sharded, every shard ranks its own candidates (with its
+own term statistics) and the pages are merged.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, List, Set
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    Table,
+    and_,
+    case,
+    exists,
+    func,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.config.settings import settings
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_identity import UserIdentity
+from app.api.domains.user.models.user_search import SEARCH_TABLE, search_table
+from app.database.sharding import fetch_page
+
+SEARCH_MODES = ("substring", "fuzzy")
+MIN_TERM_LENGTH = 3
+MAX_TERMS = 8
+
+
+# --------------------------------------
+# 🚫 Errors / results
+# --------------------------------------
+class SearchQueryError(ValueError):
+    """Raised when a query contains no searchable term."""
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    """One ranked match (higher `score` = better)."""
+
+    user_id: int
+    score: float
+
+
+# --------------------------------------
+# 🧩 Query building
+# --------------------------------------
+def search_terms(query: str) -> List[str]:
+    """Lower-cased, de-duplicated terms of `query` that the index can match."""
+    terms: List[str] = []
+    for raw in query.lower().replace('"', " ").split():
+        if len(raw) >= MIN_TERM_LENGTH and raw not in terms:
+            terms.append(raw)
+    if not terms:
+        raise SearchQueryError(
+            f"Search needs at least one term of {MIN_TERM_LENGTH}+ characters"
+        )
+    return terms[:MAX_TERMS]
+
+
+def trigrams(term: str) -> Set[str]:
+    """All 3-character substrings of `term`."""
+    return {term[i : i + 3] for i in range(len(term) - 2)}
+
+
+def fts5_query(terms: List[str], mode: str) -> str:
+    """FTS5 MATCH expression: quoted phrases, AND-ed (substring) or OR-ed trigrams (fuzzy)."""
+    if mode == "fuzzy":
+        grams = sorted({gram for term in terms for gram in trigrams(term)})
+        return " OR ".join(f'"{gram}"' for gram in grams)
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def boolean_query(terms: List[str]) -> str:
+    """MySQL boolean-mode expression: every term required, as an ngram phrase."""
+    return " ".join(f'+"{term}"' for term in terms)
+
+
+# `MATCH … AGAINST` (its constructor is untyped in SQLAlchemy)
+_match: Callable[..., Any] = mysql.match
+
+
+def _index(dialect: str) -> Table:
+    table = search_table(dialect)
+    if table is None:
+        raise NotImplementedError(f"User search is not supported on {dialect}")
+    return table
+
+
+def _sqlite_search(terms: List[str], mode: str) -> Select[Any]:
+    index = _index("sqlite")
+    # `rank` is BM25 (more negative = better)
+    rank: ColumnElement[Any] = literal_column("rank")
+    return (
+        select(index.c.rowid.label("user_id"), (-rank).label("score"))
+        .where(literal_column(SEARCH_TABLE).op("MATCH")(fts5_query(terms, mode)))
+        .order_by(rank, index.c.rowid)
+    )
+
+
+def _mysql_search(terms: List[str], mode: str) -> Select[Any]:
+    index = _index("mysql")
+    if mode == "fuzzy":
+        # Natural language mode: every ngram of the terms is optional
+        relevance = _match(index.c.name, index.c.identities, against=" ".join(terms))
+    else:
+        relevance = _match(
+            index.c.name, index.c.identities, against=boolean_query(terms)
+        ).in_boolean_mode()
+    return (
+        select(index.c.user_id, relevance.label("score"))
+        .where(relevance)
+        .order_by(relevance.desc(), index.c.user_id)
+    )
+
+
+def _like_search(terms: List[str], mode: str) -> Select[Any]:
+    """Unindexed fallback: a scan of live users' names and identities."""
+    name = func.coalesce(User.first_name, "") + " " + func.coalesce(User.last_name, "")
+    matches: List[ColumnElement[bool]] = []
+    weights: List[ColumnElement[Any]] = []
+    for term in terms:
+        in_name = name.icontains(term, autoescape=True)
+        in_identity = exists().where(
+            UserIdentity.user_id == User.id,
+            UserIdentity.deleted_at.is_(None),
+            UserIdentity.value.icontains(term, autoescape=True),
+        )
+        matches.append(or_(in_name, in_identity))
+        weights.append(case((in_name, 2), (in_identity, 1), else_=0))
+    score = sum(weights[1:], weights[0]).label("score")
+    match = and_(*matches) if mode == "substring" else or_(*matches)
+    return (
+        select(User.id.label("user_id"), score)
+        .where(User.deleted_at.is_(None), match)
+        .order_by(score.desc(), User.id)
+    )
+
+
+# Each builder selects `user_id, score`, best match first
+_SEARCHES = {"sqlite": _sqlite_search, "mysql": _mysql_search}
+
+
+# --------------------------------------
+# 🔎 Search
+# --------------------------------------
+async def search_users(
+    session: AsyncSession,
+    query: str,
+    mode: str = "substring",
+    offset: int = 0,
+    limit: int = 20,
+) -> List[SearchHit]:
+    """
+    Return one page of ranked matches for `query`.
+
+    Raises `SearchQueryError` for queries without a searchable term.
+    """
+    if mode not in SEARCH_MODES:
+        raise SearchQueryError(f"Unknown search mode '{mode}'")
+    terms = search_terms(query)
+    dialect = session.get_bind().dialect.name
+    candidates = _SEARCHES.get(dialect, _like_search)(terms, mode)
+    if settings.user_search_candidates > 0:
+        # The best N by rank, not the first N the index happens to return
+        candidates = candidates.limit(settings.user_search_candidates)
+    ranked = candidates.subquery("candidates")
+    stmt = select(ranked.c.user_id, ranked.c.score).order_by(
+        ranked.c.score.desc(), ranked.c.user_id
+    )
+    rows = await fetch_page(
+        session, stmt, offset, limit, key=lambda row: (-row.score, row.user_id)
+    )
+    return [SearchHit(user_id=user_id, score=float(score)) for user_id, score in rows]
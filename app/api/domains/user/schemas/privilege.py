@@ -0,0 +1,27 @@
+# app/api/domains/user/schemas/privilege.py
+
+"""
+🔐 Response schemas for privilege endpoints.
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class PrivilegeRead(BaseModel):
+    """A privilege as shown to administrators."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    description: Optional[str] = None
+
+
+class PrivilegeList(BaseModel):
+    """One page of privileges."""
+
+    items: List[PrivilegeRead]
+    offset: int
+    limit: int
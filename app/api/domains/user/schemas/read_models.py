@@ -0,0 +1,51 @@
+# app/api/domains/user/schemas/read_models.py
+
+"""
+⚡ Slotted read models for high-volume responses.
+
+Pydantic schemas in this package document and validate the API; building
+and re-validating thousands of model instances per response is the
+dominant CPU cost for large user lists, though. These frozen, slotted
+dataclasses are built straight from query rows and serialized natively by
+orjson (`app/api/utils/responses.py`).
+
+Each view mirrors the Pydantic schema named in its docstring; keep the two
+in sync.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+
+@dataclass(frozen=True, slots=True)
+class RoleMemberView:
+    """Mirrors `schemas.role.RoleMember`."""
+
+    id: int
+    first_name: str
+    last_name: Optional[str]
+    is_active: bool
+
+
+@dataclass(frozen=True, slots=True)
+class RoleDetailView:
+    """Mirrors `schemas.role.RoleDetail`."""
+
+    id: int
+    name: str
+    description: Optional[str]
+    member_count: int
+    active_member_count: int
+    privileges: List[str]
+    users: Optional[List[RoleMemberView]]
+    version_id: int
+
+
+@dataclass(frozen=True, slots=True)
+class UserPageView:
+    """Mirrors `schemas.user.UserPage` (items are already-projected dicts)."""
+
+    items: Sequence[Dict[str, Any]]
+    fields: Sequence[str]
+    offset: int
+    limit: int
@@ -0,0 +1,81 @@
+# app/api/domains/user/schemas/role.py
+
+"""
+🛡️ Request / response schemas for role endpoints.
+
+Membership is exposed as counts; member rows are only included when the
+client asks for them explicitly (`?include_users=true`).
+"""
+
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+
+class RoleMember(BaseModel):
+    """A user assigned to a role (minimal projection)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    first_name: str
+    last_name: Optional[str] = None
+    is_active: bool
+
+
+class RoleSummary(BaseModel):
+    """A role with its membership counts."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    description: Optional[str] = None
+    member_count: int = 0
+    active_member_count: int = 0
+
+
+class RoleDetail(RoleSummary):
+    """A role with its privilege names and, on request, a page of members."""
+
+    privileges: List[str] = []
+    users: Optional[List[RoleMember]] = None
+    version_id: int = 1
+
+
+class RoleList(BaseModel):
+    """One page of roles."""
+
+    items: List[RoleSummary]
+    offset: int
+    limit: int
+
+
+class RoleUpdate(BaseModel):
+    """Partial role update; only fields present in the body are changed."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: Optional[str] = Field(None, min_length=1, max_length=64)
+    description: Optional[str] = Field(None, max_length=256)
+
+    @model_validator(mode="after")
+    def _reject_null_name(self) -> "RoleUpdate":
+        # Omitting `name` leaves it unchanged; `null` would violate NOT NULL
+        if "name" in self.model_fields_set and self.name is None:
+            raise ValueError("name cannot be null")
+        return self
+
+
+class RolePrivilegePolicy(BaseModel):
+    """Desired privilege IDs per role ID; an empty list revokes everything."""
+
+    roles: Dict[int, List[int]] = Field(..., min_length=1)
+
+
+class RolePrivilegeSyncResult(BaseModel):
+    """Outcome of applying a `RolePrivilegePolicy`."""
+
+    roles: int
+    granted: int
+    revoked: int
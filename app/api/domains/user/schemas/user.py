@@ -0,0 +1,98 @@
+# app/api/domains/user/schemas/user.py
+
+"""
+👤 Request / response schemas for user endpoints.
+"""
+
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.api.domains.user.models.user import Gender
+
+
+class BulkRoleReassignment(BaseModel):
+    """Move users (by current role and/or explicit IDs) to another role."""
+
+    to_role_id: int
+    from_role_id: Optional[int] = None
+    user_ids: Optional[List[int]] = Field(None, max_length=100_000)
+
+    @model_validator(mode="after")
+    def _require_selector(self) -> "BulkRoleReassignment":
+        if self.from_role_id is None and self.user_ids is None:
+            raise ValueError("Provide from_role_id and/or user_ids")
+        return self
+
+
+class BulkDeactivation(BaseModel):
+    """Deactivate users (by role and/or explicit IDs)."""
+
+    role_id: Optional[int] = None
+    user_ids: Optional[List[int]] = Field(None, max_length=100_000)
+
+    @model_validator(mode="after")
+    def _require_selector(self) -> "BulkDeactivation":
+        if self.role_id is None and self.user_ids is None:
+            raise ValueError("Provide role_id and/or user_ids")
+        return self
+
+
+class BulkUpdateResponse(BaseModel):
+    """Number of users changed and chunks (transactions) used."""
+
+    affected: int
+    chunks: int
+
+
+class UserPage(BaseModel):
+    """One page of users, each limited to the requested fields."""
+
+    items: List[Dict[str, Any]]
+    fields: List[str]
+    offset: int
+    limit: int
+
+
+class UserRead(BaseModel):
+    """A single user's profile (served with its version as ETag)."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    first_name: str
+    last_name: Optional[str] = None
+    job_title: Optional[str] = None
+    gender: Optional[Gender] = None
+    dob: Optional[date] = None
+    profile_image_url: Optional[str] = None
+    is_active: bool
+    role_id: int
+    version_id: int
+
+
+class UserUpdate(BaseModel):
+    """Partial profile update; only fields present in the body are changed."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    first_name: Optional[str] = Field(None, min_length=1, max_length=64)
+    last_name: Optional[str] = Field(None, max_length=64)
+    job_title: Optional[str] = Field(None, max_length=128)
+    gender: Optional[Gender] = None
+    dob: Optional[date] = None
+    profile_image_url: Optional[str] = Field(None, max_length=512)
+    is_active: Optional[bool] = None
+
+    @model_validator(mode="after")
+    def _reject_null_required(self) -> "UserUpdate":
+        # Omitting a field leaves it unchanged; `null` would violate NOT NULL
+        nulls = [
+            name
+            for name in ("first_name", "is_active")
+            if name in self.model_fields_set and getattr(self, name) is None
+        ]
+        if nulls:
+            raise ValueError(f"{', '.join(nulls)} cannot be null")
+        return self
@@ -0,0 +1,397 @@
+# app/api/domains/user/services/audit_service.py
+
+"""
+📜 Asynchronous audit log: capture on flush, write in batches off the request path.
+
+1. `after_flush` records a before/after diff for every inserted, updated or
+   deleted user-domain row (kept on the session until the transaction ends).
+   Set-based Core writes, which bypass the hook, call
+   `record_audit(session, entity, changes)` themselves
+2. `after_commit` hands the diffs to `AuditWriter` (a bounded in-process
+   queue, `put_nowait` only); `after_rollback` discards them. A SAVEPOINT
+   (e.g. one `WriteQueue` job) keeps its diffs for the outer COMMIT on
+   release and discards only its own on rollback
+3. A background task drains the queue and writes multi-row INSERTs into
+   `audit_event` through the group-commit `WriteQueue`, so request latency
+   never includes the audit write
+4. On shutdown (`AuditWriter.stop`, called by the app lifespan) the writer
+   lets an INSERT in flight finish, then writes every event it has collected
+   or still queued before returning, without waiting for `flush_interval`
+
+When the queue is full the `audit_overflow_policy` applies:
+- `drop_oldest`: evict the oldest queued event to make room (default)
+- `drop_new`: discard the incoming event
+Dropped events are counted in `AuditWriter.stats`.
+
+Capture is skipped entirely while the writer is not running (e.g. in CLI
+scripts that never start it).
+"""
+
+import asyncio
+import logging
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, cast
+
+from sqlalchemy import Table, event, insert, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstanceState, Session, SessionTransaction, UOWTransaction
+
+from app.api.config.settings import settings
+from app.api.domains.user.models.audit_event import AuditAction, AuditEvent
+from app.api.domains.user.models.privilege import Privilege
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.role_privilege import RolePrivilege
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_auth import UserAuth
+from app.api.domains.user.models.user_identity import UserIdentity
+from app.api.utils.clock import utcnow
+from app.database.session import get_write_queue
+from app.database.write_queue import WriteQueue
+
+logger = logging.getLogger(__name__)
+
+# 🧾 Models whose changes are audited
+AUDITED_MODELS = (User, UserAuth, UserIdentity, Role, Privilege, RolePrivilege)
+
+# 🙈 Columns whose values never leave the database
+REDACTED = "***"
+_REDACTED_COLUMNS = frozenset({"password_hash", "otp_hash", "lookup_key"})
+
+# ⏭️ Columns that change on every write and carry no information
+_SKIPPED_COLUMNS = frozenset({"updated_at"})
+
+_PENDING_KEY = "audit_pending"
+_SAVEPOINTS_KEY = "audit_savepoints"
+OVERFLOW_POLICIES = ("drop_oldest", "drop_new")
+
+
+# --------------------------------------
+# 👤 Acting user
+# --------------------------------------
+_current_actor: ContextVar[Optional[int]] = ContextVar("audit_actor_id", default=None)
+
+
+def set_audit_actor(user_id: Optional[int]) -> Token[Optional[int]]:
+    """
+    Attribute changes made in the current context to `user_id`.
+
+    Set by the auth dependency; falls back to the row's `updated_by` /
+    `created_by` when unset.
+    """
+    return _current_actor.set(user_id)
+
+
+# --------------------------------------
+# 🔍 Diff capture
+# --------------------------------------
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.hex()
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return str(value)
+
+
+def _value(column: str, value: Any) -> Any:
+    if column in _REDACTED_COLUMNS and value is not None:
+        return REDACTED
+    return _jsonable(value)
+
+
+def _describe(
+    state: InstanceState[Any], action: AuditAction
+) -> Optional[Dict[str, Any]]:
+    """
+    Build an audit event from already-loaded state (never triggers a load).
+    """
+    mapper = state.mapper
+    loaded = state.dict
+    changes: Dict[str, List[Any]] = {}
+
+    for prop in mapper.column_attrs:
+        key = prop.key
+        if key in _SKIPPED_COLUMNS:
+            continue
+        if action is AuditAction.UPDATE:
+            history = state.attrs[key].history
+            if not history.added and not history.deleted:
+                continue
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+            if old == new:
+                continue
+            changes[key] = [_value(key, old), _value(key, new)]
+        elif key in loaded and loaded[key] is not None:
+            value = _value(key, loaded[key])
+            changes[key] = (
+                [None, value] if action is AuditAction.INSERT else [value, None]
+            )
+
+    if not changes:
+        return None
+
+    pk = ":".join(
+        str(loaded.get(mapper.get_property_by_column(column).key))
+        for column in mapper.primary_key
+    )
+    actor = _current_actor.get()
+    if actor is None:
+        actor = loaded.get("updated_by") or loaded.get("created_by")
+    return {
+        "actor_id": actor,
+        "entity": cast(Table, mapper.local_table).name,
+        "entity_id": pk,
+        "action": action,
+        "changes": changes,
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _capture_changes(session: Session, flush_context: UOWTransaction) -> None:
+    if not get_audit_writer().running:
+        return
+    pending: List[Dict[str, Any]] = session.info.setdefault(_PENDING_KEY, [])
+    for objects, action in (
+        (session.new, AuditAction.INSERT),
+        (session.dirty, AuditAction.UPDATE),
+        (session.deleted, AuditAction.DELETE),
+    ):
+        for obj in objects:
+            if isinstance(obj, AUDITED_MODELS):
+                entry = _describe(inspect(obj), action)
+                if entry is not None:
+                    pending.append(entry)
+
+
+def record_audit(
+    session: AsyncSession,
+    entity: str,
+    changes: Mapping[Any, Mapping[str, Tuple[Any, Any]]],
+    action: AuditAction = AuditAction.UPDATE,
+    actor_id: Optional[int] = None,
+) -> int:
+    """
+    Record audit events for set-based statements (which bypass the flush hook).
+
+    `changes` maps each entity ID to `{column: (old, new)}`; unchanged columns
+    are skipped. Call before committing; the events are queued after the
+    commit like captured ones. Returns the number of events recorded.
+    """
+    if not get_audit_writer().running:
+        return 0
+    actor = _current_actor.get()
+    if actor is None:
+        actor = actor_id
+    pending: List[Dict[str, Any]] = session.info.setdefault(_PENDING_KEY, [])
+    recorded = 0
+    for entity_id, columns in changes.items():
+        diff = {
+            key: [_value(key, old), _value(key, new)]
+            for key, (old, new) in columns.items()
+            if old != new
+        }
+        if diff:
+            pending.append(
+                {
+                    "actor_id": actor,
+                    "entity": entity,
+                    "entity_id": str(entity_id),
+                    "action": action,
+                    "changes": diff,
+                }
+            )
+            recorded += 1
+    return recorded
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _mark_savepoint(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.nested:
+        marks = session.info.setdefault(_SAVEPOINTS_KEY, {})
+        marks[transaction] = len(session.info.get(_PENDING_KEY, ()))
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed(session: Session) -> None:
+    savepoint = session.get_nested_transaction()
+    if savepoint is not None:
+        # RELEASE SAVEPOINT: the diffs wait for the outer COMMIT
+        session.info.get(_SAVEPOINTS_KEY, {}).pop(savepoint, None)
+        return
+    session.info.pop(_SAVEPOINTS_KEY, None)
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        get_audit_writer().submit(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    savepoint = session.get_nested_transaction()
+    if savepoint is not None:
+        # ROLLBACK TO SAVEPOINT: only the diffs recorded since it are undone
+        mark = session.info.get(_SAVEPOINTS_KEY, {}).pop(savepoint, None)
+        pending = session.info.get(_PENDING_KEY)
+        if mark is not None and pending is not None:
+            del pending[mark:]
+        return
+    session.info.pop(_SAVEPOINTS_KEY, None)
+    session.info.pop(_PENDING_KEY, None)
+
+
+# --------------------------------------
+# 📊 Counters
+# --------------------------------------
+@dataclass
+class AuditStats:
+    """Counters for observing the writer."""
+
+    enqueued: int = 0
+    written: int = 0
+    batches: int = 0
+    dropped: int = 0
+    failed: int = 0
+
+
+# --------------------------------------
+# ✍️ Batched writer
+# --------------------------------------
+class AuditWriter:
+    """
+    Bounded queue of audit events drained by one background task.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow: str,
+        writes: Optional[WriteQueue] = None,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown audit overflow policy '{overflow}'")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.stats = AuditStats()
+        self._writes = writes
+        self._queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=maxsize)
+        self._batch: List[Dict[str, Any]] = []  # taken off the queue, not written
+        self._writing = asyncio.Lock()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    def from_settings(cls) -> "AuditWriter":
+        return cls(
+            maxsize=settings.audit_queue_size,
+            batch_size=settings.audit_batch_size,
+            flush_interval=settings.audit_flush_interval_seconds,
+            overflow=settings.audit_overflow_policy,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Spawn the writer task (call from a running event loop)."""
+        if settings.audit_enabled and not self.running:
+            self._task = asyncio.create_task(self._run(), name="audit-writer")
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Stop the writer task; with `drain`, write out every collected and
+        queued event first (also when the task has died).
+        """
+        if self._task is None:
+            return
+        async with self._writing:  # never cancel an INSERT half-way
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if drain:
+            await self._drain()
+
+    def submit(self, events: Iterable[Dict[str, Any]]) -> None:
+        """
+        Queue committed events without waiting, applying the overflow policy.
+        """
+        if not self.running:
+            return
+        occurred_at = utcnow()
+        for entry in events:
+            entry["occurred_at"] = occurred_at
+            if self._queue.full():
+                self.stats.dropped += 1
+                if self.overflow == "drop_new":
+                    continue
+                self._queue.get_nowait()
+            self._queue.put_nowait(entry)
+            self.stats.enqueued += 1
+
+    async def _collect(self) -> None:
+        """Wait for one event, then collect up to `batch_size` within `flush_interval`."""
+        loop = asyncio.get_running_loop()
+        self._batch.append(await self._queue.get())
+        deadline = loop.time() + self.flush_interval
+        while len(self._batch) < self.batch_size:
+            if not self._queue.empty():
+                self._batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                # In this task (not `wait_for`): cancelling `stop` never loses an event
+                async with asyncio.timeout(timeout):
+                    self._batch.append(await self._queue.get())
+            except TimeoutError:
+                break
+
+    async def _write(self, writes: WriteQueue) -> None:
+        """INSERT the collected batch as one write job; a failed batch is dropped."""
+        batch, self._batch = self._batch, []
+
+        async def insert_events(session: AsyncSession) -> None:
+            # Core executemany (sharded sessions have no ORM bulk INSERT)
+            connection = await session.connection()
+            await connection.execute(insert(AuditEvent), batch)
+
+        try:
+            await writes.submit(insert_events)
+            self.stats.written += len(batch)
+            self.stats.batches += 1
+        except Exception:
+            self.stats.failed += len(batch)
+            logger.exception("Failed to write %d audit events", len(batch))
+
+    async def _run(self) -> None:
+        writes = self._writes or get_write_queue()
+        while True:
+            await self._collect()
+            async with self._writing:
+                await self._write(writes)
+
+    async def _drain(self) -> None:
+        """Write what the stopped task left behind, `batch_size` rows at a time."""
+        writes = self._writes or get_write_queue()
+        while self._batch or not self._queue.empty():
+            while len(self._batch) < self.batch_size and not self._queue.empty():
+                self._batch.append(self._queue.get_nowait())
+            await self._write(writes)
+
+
+@lru_cache(maxsize=1)
+def get_audit_writer() -> AuditWriter:
+    """Return the process-wide audit writer."""
+    return AuditWriter.from_settings()
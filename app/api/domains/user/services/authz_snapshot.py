@@ -0,0 +1,321 @@
+# app/api/domains/user/services/authz_snapshot.py
+
+"""
+🗺️ Warm-start snapshot of the role / privilege graph.
+
+A cold worker must read `privilege`, `role_privilege` and `role` before it
+can authorize anything, and a fleet restart does that in every worker at
+once. Instead each worker boots from a local snapshot file:
+
+1. **start**: one file read (orjson) installs the graph: the privilege
+   catalog (name → ID, used by `require_privileges`, and ID → token bit
+   position), and the role → privilege IDs used when
+   issuing tokens. Requests are authorized from memory at once
+2. **reconcile** (background): one aggregate query (`get_authz_version`)
+   compares the snapshot's version with the database; on a mismatch (or no
+   snapshot) the graph is reloaded in three queries, installed, and the file
+   is rewritten atomically (temporary file + rename)
+3. **changes**: writers publish `"role"` / `"privilege"` invalidations after
+   committing; the local worker reconciles before `publish` returns. Other
+   workers are notified by the invalidation bus, and the periodic check
+   (`authz_snapshot_refresh_seconds`) is the backstop
+
+Snapshot file (`authz_snapshot_path`, default: one file per database URL in
+the app's cache directory, `$XDG_CACHE_HOME/<app>` or `~/.cache/<app>`,
+created with mode 0700). The file is written with mode 0600 and only
+loaded if it is owned by the current user and writable by no one else:
+    {"format": 3, "version": "<hex>", "privileges": {"view_users": 3, ...},
+     "privilege_bits": {"1": 0, "2": 1, ...}, "roles": {"1": [1, 2, 3], ...}}
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import stat
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+import orjson
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.config.settings import settings
+from app.api.domains.user.repositories.role_repository import (
+    get_authz_version,
+    get_privilege_bits,
+    get_privilege_name_map,
+    get_role_privilege_map,
+)
+from app.api.domains.user.services.privilege_catalog import privilege_catalog
+from app.api.utils.invalidation import invalidation_hub
+from app.database.session import get_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 3
+
+
+def authz_version(row: Row[Any]) -> str:
+    """Stable digest of a `get_authz_version` row."""
+    return hashlib.blake2b(repr(tuple(row)).encode(), digest_size=8).hexdigest()
+
+
+# --------------------------------------
+# 🗺️ Graph
+# --------------------------------------
+@dataclass(frozen=True, slots=True)
+class AuthzGraph:
+    """Immutable role / privilege graph at one database version."""
+
+    version: str
+    privileges: Dict[str, int]
+    privilege_bits: Dict[int, int]  # all privileges, soft-deleted included
+    role_privileges: Dict[int, FrozenSet[int]]
+
+    def dumps(self) -> bytes:
+        return orjson.dumps(
+            {
+                "format": SNAPSHOT_FORMAT,
+                "version": self.version,
+                "privileges": self.privileges,
+                "privilege_bits": {
+                    str(pid): bit for pid, bit in self.privilege_bits.items()
+                },
+                "roles": {
+                    str(role): sorted(ids) for role, ids in self.role_privileges.items()
+                },
+            }
+        )
+
+    @classmethod
+    def loads(cls, data: bytes) -> "AuthzGraph":
+        """Parse a snapshot; raises `ValueError` for other formats or bad content."""
+        payload = orjson.loads(data)
+        if not isinstance(payload, dict) or payload.get("format") != SNAPSHOT_FORMAT:
+            raise ValueError("Unsupported snapshot format")
+        try:
+            return cls(
+                version=str(payload["version"]),
+                privileges={
+                    str(name): int(pid) for name, pid in payload["privileges"].items()
+                },
+                privilege_bits={
+                    int(pid): int(bit) for pid, bit in payload["privilege_bits"].items()
+                },
+                role_privileges={
+                    int(role): frozenset(int(pid) for pid in ids)
+                    for role, ids in payload["roles"].items()
+                },
+            )
+        except (KeyError, AttributeError, TypeError) as exc:
+            raise ValueError(f"Malformed snapshot: {exc}") from exc
+
+
+async def load_graph(session: AsyncSession) -> AuthzGraph:
+    """Read the graph from the database (version first, so a concurrent change
+    leaves the snapshot older than its data and forces another reload)."""
+    version = authz_version(await get_authz_version(session))
+    return AuthzGraph(
+        version=version,
+        privileges=await get_privilege_name_map(session),
+        privilege_bits=await get_privilege_bits(session),
+        role_privileges=await get_role_privilege_map(session),
+    )
+
+
+# --------------------------------------
+# 💾 Snapshot file
+# --------------------------------------
+APP_DIR_NAME = "fastapi-microservice-starter-kit"
+
+
+def app_cache_dir() -> Path:
+    """
+    The app's own cache directory, created with mode 0700 (and tightened to
+    it if it already exists). Raises `PermissionError` if another user owns it.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    directory = Path(base) / APP_DIR_NAME
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = directory.stat()
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"{directory} is owned by another user")
+    if stat.S_IMODE(info.st_mode) != 0o700:
+        directory.chmod(0o700)
+    return directory
+
+
+def default_snapshot_path() -> Path:
+    """Per-database file in `app_cache_dir()` (URLs never appear in the name)."""
+    digest = hashlib.blake2b(settings.database_url.encode(), digest_size=6).hexdigest()
+    return app_cache_dir() / f"authz-snapshot-{digest}.json"
+
+
+def read_snapshot(path: Path) -> Optional[AuthzGraph]:
+    """
+    Load the snapshot file, or None if missing, unreadable, not owned by
+    the current user or writable by group / others.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_NOFOLLOW)
+    except FileNotFoundError:
+        return None
+    except OSError as exc:
+        logger.warning("Ignoring authz snapshot %s: %s", path, exc)
+        return None
+    with os.fdopen(fd, "rb") as file:
+        info = os.fstat(fd)
+        if info.st_uid != os.getuid() or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            logger.warning(
+                "Ignoring authz snapshot %s: owner %d, mode %o",
+                path,
+                info.st_uid,
+                stat.S_IMODE(info.st_mode),
+            )
+            return None
+        try:
+            return AuthzGraph.loads(file.read())
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring authz snapshot %s: %s", path, exc)
+            return None
+
+
+def write_snapshot(path: Path, graph: AuthzGraph) -> None:
+    """
+    Write atomically: readers see the old file or the new one, never half.
+    The file is private to the current user (mode 0600).
+    """
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(graph.dumps())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# --------------------------------------
+# 📊 Counters
+# --------------------------------------
+@dataclass
+class SnapshotStats:
+    """Counters for observing warm starts and reconciliation."""
+
+    file_loads: int = 0
+    checks: int = 0
+    db_loads: int = 0
+    writes: int = 0
+    failures: int = 0
+
+
+# --------------------------------------
+# 🔁 Warm start + reconciliation
+# --------------------------------------
+class AuthzSnapshot:
+    """
+    Holds the installed graph and keeps it (and the file) in sync.
+    """
+
+    def __init__(self, path: Path, refresh_interval: float) -> None:
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.stats = SnapshotStats()
+        self._graph: Optional[AuthzGraph] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    def from_settings(cls) -> "AuthzSnapshot":
+        path = (
+            Path(settings.authz_snapshot_path) if settings.authz_snapshot_path else None
+        )
+        return cls(
+            path=path or default_snapshot_path(),
+            refresh_interval=settings.authz_snapshot_refresh_seconds,
+        )
+
+    @property
+    def graph(self) -> Optional[AuthzGraph]:
+        return self._graph
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def install(self, graph: AuthzGraph) -> None:
+        """Make `graph` the process-wide authorization data."""
+        self._graph = graph
+        privilege_catalog.replace(graph.privileges, graph.privilege_bits)
+
+    def role_privilege_ids(self, role_id: int) -> Optional[FrozenSet[int]]:
+        """Installed privilege IDs of a role; None if nothing is installed."""
+        if self._graph is None:
+            return None
+        return self._graph.role_privileges.get(role_id, frozenset())
+
+    async def reconcile(self) -> bool:
+        """
+        Compare with the database and reload + rewrite on a mismatch.
+
+        Returns True if a new graph was installed.
+        """
+        async with self._lock:
+            self.stats.checks += 1
+            async with get_sessionmaker()() as session:
+                version = authz_version(await get_authz_version(session))
+                if self._graph is not None and self._graph.version == version:
+                    return False
+                graph = await load_graph(session)
+            self.install(graph)
+            self.stats.db_loads += 1
+            try:
+                write_snapshot(self.path, graph)
+                self.stats.writes += 1
+            except OSError as exc:
+                logger.warning("Could not write authz snapshot %s: %s", self.path, exc)
+            return True
+
+    async def _on_change(self, entity: str, ids: Iterable[int]) -> None:
+        await self.reconcile()
+
+    async def start(self) -> None:
+        """Install the snapshot file (if any) and start reconciling in the background."""
+        if not settings.authz_snapshot_enabled or self.running:
+            return
+        graph = read_snapshot(self.path)
+        if graph is not None:
+            self.install(graph)
+            self.stats.file_loads += 1
+        invalidation_hub.subscribe("role", self._on_change)
+        invalidation_hub.subscribe("privilege", self._on_change)
+        self._task = asyncio.create_task(self._run(), name="authz-snapshot")
+
+    async def stop(self) -> None:
+        invalidation_hub.unsubscribe("role", self._on_change)
+        invalidation_hub.unsubscribe("privilege", self._on_change)
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.reconcile()
+            except Exception:
+                self.stats.failures += 1
+                logger.exception("Authz snapshot reconciliation failed")
+            await asyncio.sleep(self.refresh_interval)
+
+
+@lru_cache(maxsize=1)
+def get_authz_snapshot() -> AuthzSnapshot:
+    """Return the process-wide authz snapshot."""
+    return AuthzSnapshot.from_settings()
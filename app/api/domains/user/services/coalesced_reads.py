@@ -0,0 +1,60 @@
+# app/api/domains/user/services/coalesced_reads.py
+
+"""
+🛬 Single-flight wrappers around hot user-domain reads.
+
+During a login burst (or when every worker's tokens expire together) many
+coroutines ask for the same role's privileges or the same account state at
+once. These wrappers let concurrent callers for the same key share one
+query; each execution uses its own short-lived session, and results are
+immutable (frozensets / rows) so sharing them is safe.
+
+Role privileges are answered from the installed authz snapshot (see
+`authz_snapshot`) when there is one; the query is the cold-start fallback.
+
+`read_metrics()` reports how many calls were coalesced per read.
+"""
+
+from typing import Any, Dict, FrozenSet, Optional
+
+from sqlalchemy import Row
+
+from app.api.domains.user.repositories.role_repository import get_role_privilege_ids
+from app.api.domains.user.repositories.user_repository import get_account_state
+from app.api.domains.user.services.authz_snapshot import get_authz_snapshot
+from app.api.utils.single_flight import SingleFlight
+from app.database.session import get_sessionmaker
+
+_role_privileges: SingleFlight[int, FrozenSet[int]] = SingleFlight("role_privilege_ids")
+_account_states: SingleFlight[int, Optional[Row[Any]]] = SingleFlight("account_state")
+
+
+async def role_privilege_ids(role_id: int) -> FrozenSet[int]:
+    """Snapshot lookup, else coalesced `role_repository.get_role_privilege_ids`."""
+    installed = get_authz_snapshot().role_privilege_ids(role_id)
+    if installed is not None:
+        return installed
+
+    async def fetch() -> FrozenSet[int]:
+        async with get_sessionmaker()() as session:
+            return await get_role_privilege_ids(session, role_id)
+
+    return await _role_privileges.do(role_id, fetch)
+
+
+async def account_state(user_id: int) -> Optional[Row[Any]]:
+    """Coalesced `user_repository.get_account_state`."""
+
+    async def fetch() -> Optional[Row[Any]]:
+        async with get_sessionmaker()() as session:
+            return await get_account_state(session, user_id)
+
+    return await _account_states.do(user_id, fetch)
+
+
+def read_metrics() -> Dict[str, Dict[str, int]]:
+    """Per-read counters: calls, executions, coalesced, errors."""
+    return {
+        flight.name: flight.stats.as_dict()
+        for flight in (_role_privileges, _account_states)
+    }
@@ -0,0 +1,525 @@
+# app/api/domains/user/services/invalidation_bus.py
+
+"""
+📣 Cross-worker invalidation bus: Unix datagrams, `entity_change` as fallback.
+
+`invalidation_hub` only reaches listeners in the process that committed the
+change. With many workers per node, every other worker's caches would stay
+stale, so committed changes are carried to all of them:
+
+1. `after_flush` records `(entity, id)` for every inserted, updated or
+   deleted cached row (`User`, `UserIdentity`, `Role`, `Privilege`; link
+   changes count as a `"role"` change) and appends one `entity_change` row
+   per entity in the same transaction. Set-based Core writes, which bypass
+   the hook, call `record_changes(session, entity, ids)` themselves and never
+   publish directly: the commit delivers them, locally too
+2. `after_commit` hands the changes to the bus: one orjson datagram
+   `{"o": origin, "s": seq, "t": sent_at, "u": updated_at, "c": [[entity, id], ...]}`
+   is sent to every peer socket in `invalidation_bus_dir` (one socket per
+   worker), and the local hub is notified. `updated_at` (epoch seconds) is
+   the database time read once per transaction, which is also the rows'
+   `changed_at` and, within that transaction, their new `updated_at`
+3. each worker publishes received changes on its own `invalidation_hub`
+4. every `invalidation_poll_seconds` each worker also reads the
+   `entity_change` rows of the last `invalidation_poll_lookback_seconds`
+   written by other processes, and delivers any transaction it has not seen
+   yet (a dropped datagram, another node, a CLI script)
+
+Delivery is at-least-once: a transaction `(origin, seq)` is delivered once
+per path at most, but listeners must tolerate repeats (evicting twice is
+harmless). Datagrams are best-effort and never block a commit; a full peer
+buffer or an oversized transaction just leaves it to the poll. Lag (commit →
+delivery) is measured per path in `InvalidationBus.stats`.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import secrets
+import socket
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import count
+from pathlib import Path
+from typing import Any, Coroutine, Dict, Iterable, List, Optional, Set, Tuple
+
+import orjson
+from sqlalchemy import delete, event, func, insert, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, UOWTransaction
+
+from app.api.config.settings import settings
+from app.api.domains.user.models.entity_change import EntityChange
+from app.api.domains.user.models.privilege import Privilege
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.role_privilege import RolePrivilege
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_identity import UserIdentity
+from app.api.utils.clock import as_utc
+from app.api.utils.invalidation import InvalidationHub, invalidation_hub
+from app.database.session import get_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+Change = Tuple[str, int]
+TransactionKey = Tuple[str, int]
+
+# 🧾 Cached model → (entity, attribute holding the entity's ID)
+TRACKED_MODELS = {
+    User: ("user", "id"),
+    UserIdentity: ("user_identity", "id"),
+    Role: ("role", "id"),
+    Privilege: ("privilege", "id"),
+    RolePrivilege: ("role", "role_id"),
+}
+
+_PENDING_KEY = "invalidation_pending"
+_SEQ_KEY = "invalidation_seq"
+_AT_KEY = "invalidation_at"
+
+# 📦 Larger transactions are left to the poll (keeps datagrams well under 200 KiB)
+_MAX_DATAGRAM_CHANGES = 4096
+_RECV_BUFFER = 256 * 1024
+_PEER_REFRESH_SECONDS = 1.0
+
+
+# --------------------------------------
+# 🔍 Change capture
+# --------------------------------------
+def _append_changes(session: Session, changed: Set[Change]) -> None:
+    """Write `entity_change` rows for `changed` and remember them until commit."""
+    bus = get_invalidation_bus()
+    seq = session.info.get(_SEQ_KEY)
+    if seq is None:
+        seq = session.info[_SEQ_KEY] = bus.next_seq()
+        # 🕒 One database time per transaction: the feed's `changed_at` and
+        # the payload's `updated_at`
+        session.info[_AT_KEY] = (
+            session.connection().execute(select(func.now())).scalar_one()
+        )
+    session.connection().execute(
+        insert(EntityChange),
+        [
+            {
+                "origin": bus.origin,
+                "seq": seq,
+                "entity": entity,
+                "entity_id": entity_id,
+                "changed_at": session.info[_AT_KEY],
+            }
+            for entity, entity_id in sorted(changed)
+        ],
+    )
+    session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_flush")
+def _capture_changes(session: Session, flush_context: UOWTransaction) -> None:
+    if not settings.invalidation_bus_enabled:
+        return
+    changed: Set[Change] = set()
+    for objects, modified_only in (
+        (session.new, False),
+        (session.dirty, True),
+        (session.deleted, False),
+    ):
+        for obj in objects:
+            tracked = TRACKED_MODELS.get(type(obj))
+            if tracked is None:
+                continue
+            if modified_only and not session.is_modified(
+                obj, include_collections=False
+            ):
+                continue
+            entity, attr = tracked
+            entity_id = inspect(obj).dict.get(attr)
+            if entity_id is not None:
+                changed.add((entity, entity_id))
+    if changed:
+        _append_changes(session, changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _broadcast_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    seq = session.info.pop(_SEQ_KEY, None)
+    updated_at = session.info.pop(_AT_KEY, None)
+    if pending and seq is not None:
+        get_invalidation_bus().committed(seq, pending, updated_at)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_SEQ_KEY, None)
+    session.info.pop(_AT_KEY, None)
+
+
+async def record_changes(
+    session: AsyncSession, entity: str, ids: Iterable[int]
+) -> None:
+    """
+    Record changes made by set-based statements (which bypass the flush hook).
+
+    Call before committing; delivery follows the commit like ORM changes.
+    """
+    changed = {(entity, int(entity_id)) for entity_id in ids}
+    if changed and settings.invalidation_bus_enabled:
+        await session.run_sync(_append_changes, changed)
+
+
+# --------------------------------------
+# 📊 Counters
+# --------------------------------------
+@dataclass
+class LagStats:
+    """Commit → delivery latency of one delivery path."""
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def observe(self, lag_ms: float) -> None:
+        lag_ms = max(lag_ms, 0.0)
+        self.count += 1
+        self.total_ms += lag_ms
+        self.max_ms = max(self.max_ms, lag_ms)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+@dataclass
+class InvalidationBusStats:
+    """Counters for observing both delivery paths."""
+
+    transactions: int = 0
+    sent: int = 0
+    send_failed: int = 0
+    received: int = 0
+    malformed: int = 0
+    duplicates: int = 0
+    polled: int = 0
+    poll_failures: int = 0
+    delivered: int = 0
+    datagram_lag: LagStats = field(default_factory=LagStats)
+    poll_lag: LagStats = field(default_factory=LagStats)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# --------------------------------------
+# 📡 Bus
+# --------------------------------------
+def default_bus_dir() -> Path:
+    """Per-database socket directory in the temp dir (URLs never appear in the name)."""
+    digest = hashlib.blake2b(settings.database_url.encode(), digest_size=6).hexdigest()
+    return Path(tempfile.gettempdir()) / f"invalidation-{digest}"
+
+
+class InvalidationBus:
+    """
+    One worker's end of the bus: a datagram socket plus the polling fallback.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        poll_interval: float,
+        lookback: float,
+        retention: float,
+        hub: InvalidationHub = invalidation_hub,
+        session_factory: Optional[async_sessionmaker[AsyncSession]] = None,
+    ) -> None:
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.lookback = timedelta(seconds=lookback)
+        self.retention = timedelta(seconds=retention)
+        self.stats = InvalidationBusStats()
+        self._hub = hub
+        self._session_factory = session_factory
+        self._origin: Optional[str] = None
+        self._origin_pid = 0
+        self._nonce = ""
+        self._seq = count(1)
+        self._sock: Optional[socket.socket] = None
+        self._path: Optional[Path] = None
+        self._peers: List[str] = []
+        self._peers_at = float("-inf")
+        self._seen: Dict[TransactionKey, float] = {}
+        self._since: Optional[datetime] = None
+        self._pruned_at = float("-inf")
+        self._deliveries: Set["asyncio.Task[None]"] = set()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    def from_settings(cls) -> "InvalidationBus":
+        directory = settings.invalidation_bus_dir
+        return cls(
+            directory=Path(directory) if directory else default_bus_dir(),
+            poll_interval=settings.invalidation_poll_seconds,
+            lookback=settings.invalidation_poll_lookback_seconds,
+            retention=settings.invalidation_change_retention_seconds,
+        )
+
+    # ---------- identity ----------
+    def _check_process(self) -> str:
+        """
+        New origin and sequence in a forked child (pre-fork workers);
+        returns the origin.
+        """
+        pid = os.getpid()
+        if self._origin is None or self._origin_pid != pid:
+            self._nonce = secrets.token_hex(3)
+            self._origin = f"{socket.gethostname()[:40]}:{pid}:{self._nonce}"
+            self._origin_pid = pid
+            self._seq = count(1)
+        return self._origin
+
+    @property
+    def origin(self) -> str:
+        """`host:pid:nonce` of the current process."""
+        return self._check_process()
+
+    def next_seq(self) -> int:
+        self._check_process()
+        return next(self._seq)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ---------- lifecycle ----------
+    async def start(self) -> None:
+        """Open this worker's socket and start polling (call from a running event loop)."""
+        if not settings.invalidation_bus_enabled or self.running:
+            return
+        try:
+            self._open_socket()
+        except OSError as exc:
+            # Still correct without datagrams, only slower (poll interval)
+            logger.warning("Invalidation bus socket unavailable, polling only: %s", exc)
+        self._task = asyncio.create_task(self._run(), name="invalidation-bus")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._close_socket()
+        if self._deliveries:
+            await asyncio.gather(*self._deliveries, return_exceptions=True)
+
+    def _open_socket(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._check_process()
+        path = self.directory / f"{self._origin_pid}-{self._nonce}.sock"
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            sock.bind(str(path))
+            sock.setblocking(False)
+        except OSError:
+            sock.close()
+            raise
+        asyncio.get_running_loop().add_reader(sock.fileno(), self._on_readable)
+        self._sock, self._path = sock, path
+
+    def _close_socket(self) -> None:
+        if self._sock is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._sock.fileno())
+        except RuntimeError:
+            pass
+        self._sock.close()
+        self._sock = None
+        if self._path is not None:
+            self._path.unlink(missing_ok=True)
+            self._path = None
+
+    # ---------- sending ----------
+    def committed(
+        self, seq: int, changes: Set[Change], updated_at: Optional[datetime]
+    ) -> None:
+        """Deliver a committed transaction locally and to every peer (never blocks)."""
+        if not self.running:
+            return
+        self.stats.transactions += 1
+        self._spawn(self._deliver(changes, updated_at))
+        if self._sock is None or len(changes) > _MAX_DATAGRAM_CHANGES:
+            return
+        data = orjson.dumps(
+            {
+                "o": self.origin,
+                "s": seq,
+                "t": time.time(),
+                "u": as_utc(updated_at).timestamp() if updated_at else None,
+                "c": sorted(changes),
+            }
+        )
+        for peer in self._peer_paths():
+            try:
+                self._sock.sendto(data, peer)
+                self.stats.sent += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Worker gone: forget its socket
+                Path(peer).unlink(missing_ok=True)
+                self._peers_at = float("-inf")
+            except OSError:
+                # Full buffer / too large: the poll delivers it
+                self.stats.send_failed += 1
+
+    def _peer_paths(self) -> List[str]:
+        now = time.monotonic()
+        if now - self._peers_at > _PEER_REFRESH_SECONDS:
+            own = str(self._path)
+            self._peers = [
+                str(path) for path in self.directory.glob("*.sock") if str(path) != own
+            ]
+            self._peers_at = now
+        return self._peers
+
+    # ---------- receiving ----------
+    def _on_readable(self) -> None:
+        while self._sock is not None:
+            try:
+                data = self._sock.recv(_RECV_BUFFER)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                logger.exception("Invalidation bus receive failed")
+                return
+            try:
+                message = orjson.loads(data)
+                key = (str(message["o"]), int(message["s"]))
+                sent_at = float(message["t"])
+                updated_at = (
+                    datetime.fromtimestamp(float(message["u"]), timezone.utc)
+                    if message.get("u") is not None
+                    else None
+                )
+                changes = [
+                    (str(entity), int(entity_id)) for entity, entity_id in message["c"]
+                ]
+            except (ValueError, KeyError, TypeError):
+                self.stats.malformed += 1
+                continue
+            self.stats.received += 1
+            if not self._remember(key):
+                self.stats.duplicates += 1
+                continue
+            self.stats.datagram_lag.observe((time.time() - sent_at) * 1000)
+            self._spawn(self._deliver(changes, updated_at))
+
+    # ---------- polling fallback ----------
+    async def poll(self) -> int:
+        """
+        Deliver unseen transactions from `entity_change`; returns how many.
+
+        The window starts `lookback` before the previous successful poll, so a
+        transaction that committed late is still found.
+        """
+        session_factory = self._session_factory or get_sessionmaker()
+        async with session_factory() as session:
+            now = (await session.execute(select(func.now()))).scalar_one()
+            if self._since is None:
+                # First poll: only changes from now on matter
+                self._since = now
+                return 0
+            rows = (
+                await session.execute(
+                    select(
+                        EntityChange.origin,
+                        EntityChange.seq,
+                        EntityChange.entity,
+                        EntityChange.entity_id,
+                        EntityChange.changed_at,
+                    ).where(
+                        EntityChange.changed_at >= self._since - self.lookback,
+                        EntityChange.origin != self.origin,
+                    )
+                )
+            ).all()
+
+        transactions: Dict[TransactionKey, Tuple[List[Change], datetime]] = {}
+        for origin, seq, entity, entity_id, changed_at in rows:
+            changes, _ = transactions.setdefault((origin, seq), ([], changed_at))
+            changes.append((entity, entity_id))
+
+        delivered = 0
+        for key, (changes, changed_at) in transactions.items():
+            if not self._remember(key):
+                continue
+            self.stats.polled += 1
+            self.stats.poll_lag.observe((now - changed_at).total_seconds() * 1000)
+            await self._deliver(changes, changed_at)
+            delivered += 1
+        self._since = now
+        await self._maybe_prune(now)
+        return delivered
+
+    async def _maybe_prune(self, now: datetime) -> None:
+        """Drop feed rows past retention (at most every tenth of it) and old seen keys."""
+        moment = time.monotonic()
+        ttl = 2 * (self.lookback.total_seconds() + self.poll_interval)
+        self._seen = {key: at for key, at in self._seen.items() if moment - at < ttl}
+        if moment - self._pruned_at < self.retention.total_seconds() / 10:
+            return
+        self._pruned_at = moment
+        session_factory = self._session_factory or get_sessionmaker()
+        async with session_factory() as session:
+            await session.execute(
+                delete(EntityChange).where(
+                    EntityChange.changed_at < now - self.retention
+                )
+            )
+            await session.commit()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll()
+            except Exception:
+                # `_since` is unchanged, so the next poll covers this window too
+                self.stats.poll_failures += 1
+                logger.exception("Invalidation bus poll failed")
+            await asyncio.sleep(self.poll_interval)
+
+    # ---------- delivery ----------
+    def _remember(self, key: TransactionKey) -> bool:
+        """True the first time `key` is seen (within the dedup window)."""
+        if key in self._seen:
+            return False
+        self._seen[key] = time.monotonic()
+        return True
+
+    async def _deliver(
+        self, changes: Iterable[Change], updated_at: Optional[datetime]
+    ) -> None:
+        by_entity: Dict[str, Set[int]] = {}
+        for entity, entity_id in changes:
+            by_entity.setdefault(entity, set()).add(entity_id)
+        for entity, ids in by_entity.items():
+            await self._hub.publish(entity, ids, updated_at)
+            self.stats.delivered += len(ids)
+
+    def _spawn(self, delivery: Coroutine[Any, Any, None]) -> None:
+        try:
+            task = asyncio.get_running_loop().create_task(delivery)
+        except RuntimeError:
+            delivery.close()  # committed outside the event loop: the poll covers peers
+            return
+        self._deliveries.add(task)
+        task.add_done_callback(self._deliveries.discard)
+
+
+@lru_cache(maxsize=1)
+def get_invalidation_bus() -> InvalidationBus:
+    """Return the process-wide invalidation bus."""
+    return InvalidationBus.from_settings()
@@ -0,0 +1,439 @@
+# app/api/domains/user/services/otp_service.py
+
+"""
+🔢 One-time password issuance, verification, expiry sweeping and dispatch.
+
+- Codes are stored as an HMAC (keyed with `settings.otp_secret_key` and bound
+  to the identity ID), never in plaintext
+- Verification is a single conditional UPDATE; a failed attempt is a second
+  conditional UPDATE that counts the failure and applies the lockout
+- Issue and verify are small, hot writes: each runs as one job on the
+  group-commit `WriteQueue`, sharing a COMMIT with concurrent writes
+- Failed attempts count across re-issued codes: only a verified code or a
+  served lockout resets them, so requesting a new code never buys more
+  guesses. Issuing is throttled to one code per `otp_resend_seconds`
+- Every change is recorded with `record_audit` (the conditional UPDATEs
+  bypass the flush hook); while auditing, old and new values are read back
+  by primary key
+- Expired codes are cleared by a sweeper walking `ix_user_identity_otp_generated_at`
+  in small batches instead of scanning the table
+- Delivery goes through an in-process queue drained by background workers,
+  so request latency never includes the email/SMS provider
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import secrets
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+from sqlalchemy import ColumnElement, Row, and_, case, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.config.settings import settings
+from app.api.domains.user.models.user_identity import IdentityType, UserIdentity
+from app.api.domains.user.services.audit_service import get_audit_writer, record_audit
+from app.api.utils.clock import utcnow
+from app.database.session import get_write_queue
+from app.database.write_queue import WriteQueue
+
+logger = logging.getLogger(__name__)
+
+
+# --------------------------------------
+# 🚫 Errors
+# --------------------------------------
+class OtpUnavailableError(Exception):
+    """Raised when an OTP cannot be issued (unknown/deleted or locked identity)."""
+
+
+class OtpDispatchError(Exception):
+    """Raised when the dispatch queue is full and a code cannot be delivered."""
+
+
+# --------------------------------------
+# 📤 Delivery
+# --------------------------------------
+@dataclass(frozen=True, slots=True)
+class OtpMessage:
+    """A code to deliver to an email address or mobile number."""
+
+    identity_id: int
+    type: IdentityType
+    destination: str
+    code: str
+
+
+class OtpSender(Protocol):
+    """Pluggable delivery backend (email provider, SMS gateway, ...)."""
+
+    async def send(self, message: OtpMessage) -> None: ...
+
+
+class LoggingOtpSender:
+    """
+    Local stub sender: logs deliveries and keeps them in memory.
+
+    Intended for local development and tests (`sender.sent[-1].code`).
+    """
+
+    def __init__(self) -> None:
+        self.sent: List[OtpMessage] = []
+
+    async def send(self, message: OtpMessage) -> None:
+        self.sent.append(message)
+        logger.info(
+            "OTP for identity %s (%s) queued to %s",
+            message.identity_id,
+            message.type.value,
+            message.destination,
+        )
+
+
+class OtpDispatcher:
+    """
+    Bounded in-process queue drained by `workers` background tasks.
+    """
+
+    def __init__(self, sender: OtpSender, maxsize: int, workers: int) -> None:
+        self.sender = sender
+        self.workers = workers
+        self._queue: "asyncio.Queue[OtpMessage]" = asyncio.Queue(maxsize=maxsize)
+        self._tasks: List["asyncio.Task[None]"] = []
+
+    def start(self) -> None:
+        """Spawn the worker tasks (call from a running event loop)."""
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker(), name=f"otp-dispatch-{i}")
+                for i in range(self.workers)
+            ]
+
+    async def stop(self, drain: bool = True) -> None:
+        """Optionally wait for queued messages, then cancel the workers."""
+        if drain and self._tasks:
+            await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def enqueue(self, message: OtpMessage) -> None:
+        """Queue a message without waiting; raises `OtpDispatchError` when full."""
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull as exc:
+            raise OtpDispatchError("OTP dispatch queue is full") from exc
+
+    async def _worker(self) -> None:
+        while True:
+            message = await self._queue.get()
+            try:
+                await self.sender.send(message)
+            except Exception:
+                logger.exception(
+                    "OTP delivery failed for identity %s", message.identity_id
+                )
+            finally:
+                self._queue.task_done()
+
+
+# --------------------------------------
+# 🔐 Hashing
+# --------------------------------------
+def hash_otp(identity_id: int, code: str, secret: Optional[str] = None) -> str:
+    """
+    Keyed hash of a code, bound to the identity it was issued for.
+    """
+    key = (settings.otp_secret_key if secret is None else secret).encode("utf-8")
+    if not key:
+        raise RuntimeError("OTP secret key is not configured")
+    message = f"{identity_id}:{code}".encode("utf-8")
+    return hmac.new(key, message, hashlib.sha256).hexdigest()
+
+
+def _not_locked(now: datetime) -> ColumnElement[bool]:
+    """SQL predicate: OTP entry is not currently locked."""
+    return or_(
+        UserIdentity.otp_locked_until.is_(None),
+        UserIdentity.otp_locked_until <= now,
+    )
+
+
+# 📜 OTP columns recorded in the audit trail (`otp_hash` is redacted)
+_AUDITED = (
+    UserIdentity.otp_hash,
+    UserIdentity.otp_generated_at,
+    UserIdentity.wrong_otp_count,
+    UserIdentity.otp_locked_until,
+    UserIdentity.is_verified,
+)
+
+
+async def _audit_state(session: AsyncSession, identity_id: int) -> Optional[Row[Any]]:
+    """Audited OTP columns of one identity; `None` while not auditing."""
+    if not get_audit_writer().running:
+        return None
+    return (
+        await session.execute(select(*_AUDITED).where(UserIdentity.id == identity_id))
+    ).first()
+
+
+async def _audit_change(
+    session: AsyncSession, identity_id: int, before: Optional[Row[Any]]
+) -> None:
+    """Record the change since `before` (a no-op while not auditing)."""
+    after = await _audit_state(session, identity_id)
+    if before is None or after is None:
+        return
+    record_audit(
+        session,
+        "user_identity",
+        {
+            identity_id: {
+                column.key: (getattr(before, column.key), getattr(after, column.key))
+                for column in _AUDITED
+            }
+        },
+    )
+
+
+def generate_code(length: int) -> str:
+    """Uniformly random numeric code of `length` digits (zero-padded)."""
+    return str(secrets.randbelow(10**length)).zfill(length)
+
+
+# --------------------------------------
+# 🔢 OTP service
+# --------------------------------------
+class OtpService:
+    """
+    Issues and verifies OTPs for `UserIdentity` rows.
+    """
+
+    def __init__(
+        self, dispatcher: OtpDispatcher, writes: Optional[WriteQueue] = None
+    ) -> None:
+        self.dispatcher = dispatcher
+        self._writes = writes
+
+    @property
+    def writes(self) -> WriteQueue:
+        return self._writes or get_write_queue()
+
+    async def issue(self, identity_id: int) -> None:
+        """
+        Generate a new code, store its hash and queue delivery.
+
+        Delivery is queued once the code is committed. Raises
+        `OtpUnavailableError` if the identity is unknown, deleted,
+        not an email/mobile identity, currently locked, or was sent a code
+        less than `otp_resend_seconds` ago. `wrong_otp_count` carries over
+        to the new code unless a lockout has been served since.
+        """
+        message = await self.writes.submit(
+            partial(self._issue, identity_id=identity_id)
+        )
+        self.dispatcher.enqueue(message)
+
+    async def verify(self, identity_id: int, code: str) -> bool:
+        """
+        Check a submitted code; marks the identity verified on success.
+
+        Success costs exactly one conditional UPDATE (plus two primary-key
+        reads while auditing). On failure, a second
+        UPDATE increments `wrong_otp_count` and, at `otp_max_attempts`, locks
+        OTP entry for `otp_lock_seconds` and discards the outstanding code.
+        Returns once the outcome is committed.
+        """
+        return await self.writes.submit(
+            partial(self._verify, identity_id=identity_id, code=code)
+        )
+
+    async def _issue(self, session: AsyncSession, identity_id: int) -> OtpMessage:
+        target = (
+            await session.execute(
+                select(UserIdentity.type, UserIdentity.value).where(
+                    UserIdentity.id == identity_id,
+                    UserIdentity.deleted_at.is_(None),
+                )
+            )
+        ).first()
+        if target is None or target.type == IdentityType.OAUTH:
+            raise OtpUnavailableError("Identity cannot receive OTPs")
+
+        now = utcnow()
+        resend_after = now - timedelta(seconds=settings.otp_resend_seconds)
+        lock_served = and_(
+            UserIdentity.otp_locked_until.is_not(None),
+            UserIdentity.otp_locked_until <= now,
+        )
+        code = generate_code(settings.otp_length)
+        before = await _audit_state(session, identity_id)
+        result = await session.execute(
+            update(UserIdentity)
+            .where(
+                UserIdentity.id == identity_id,
+                _not_locked(now),
+                or_(
+                    UserIdentity.otp_generated_at.is_(None),
+                    UserIdentity.otp_generated_at <= resend_after,
+                ),
+            )
+            .values(
+                otp_hash=hash_otp(identity_id, code),
+                otp_generated_at=now,
+                wrong_otp_count=case(
+                    (lock_served, 0), else_=UserIdentity.wrong_otp_count
+                ),
+                otp_locked_until=None,
+                version_id=UserIdentity.version_id + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            raise OtpUnavailableError("OTP entry is locked or a code was just sent")
+        await _audit_change(session, identity_id, before)
+        return OtpMessage(identity_id, target.type, target.value, code)
+
+    async def _verify(self, session: AsyncSession, identity_id: int, code: str) -> bool:
+        now = utcnow()
+        cutoff = now - timedelta(seconds=settings.otp_ttl_seconds)
+        not_locked = _not_locked(now)
+        before = await _audit_state(session, identity_id)
+
+        success = await session.execute(
+            update(UserIdentity)
+            .where(
+                UserIdentity.id == identity_id,
+                UserIdentity.deleted_at.is_(None),
+                UserIdentity.otp_hash == hash_otp(identity_id, code),
+                UserIdentity.otp_generated_at >= cutoff,
+                not_locked,
+            )
+            .values(
+                is_verified=True,
+                otp_hash=None,
+                otp_generated_at=None,
+                wrong_otp_count=0,
+                otp_locked_until=None,
+                version_id=UserIdentity.version_id + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if success.rowcount == 1:
+            await _audit_change(session, identity_id, before)
+            return True
+
+        exhausted = UserIdentity.wrong_otp_count + 1 >= settings.otp_max_attempts
+        await session.execute(
+            update(UserIdentity)
+            .where(
+                UserIdentity.id == identity_id,
+                UserIdentity.otp_hash.is_not(None),
+                not_locked,
+            )
+            .values(
+                wrong_otp_count=UserIdentity.wrong_otp_count + 1,
+                otp_locked_until=case(
+                    (exhausted, now + timedelta(seconds=settings.otp_lock_seconds)),
+                    else_=UserIdentity.otp_locked_until,
+                ),
+                otp_hash=case((exhausted, None), else_=UserIdentity.otp_hash),
+                version_id=UserIdentity.version_id + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await _audit_change(session, identity_id, before)
+        return False
+
+    async def sweep_expired(
+        self, session: AsyncSession, batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Clear expired codes in small batches; returns the number cleared.
+
+        Each batch selects the oldest codes through the `otp_generated_at` index
+        and updates them by primary key, committing between batches so locks
+        stay short. `wrong_otp_count` is kept: an expired code resets nothing.
+        """
+        batch_size = batch_size or settings.otp_sweep_batch_size
+        cutoff = utcnow() - timedelta(seconds=settings.otp_ttl_seconds)
+        cleared = 0
+        while True:
+            rows = (
+                await session.execute(
+                    select(
+                        UserIdentity.id,
+                        UserIdentity.otp_hash,
+                        UserIdentity.otp_generated_at,
+                    )
+                    .where(UserIdentity.otp_generated_at < cutoff)
+                    .order_by(UserIdentity.otp_generated_at)
+                    .limit(batch_size)
+                )
+            ).all()
+            if not rows:
+                return cleared
+            ids = [row.id for row in rows]
+            await session.execute(
+                update(UserIdentity)
+                .where(UserIdentity.id.in_(ids))
+                .values(
+                    otp_hash=None,
+                    otp_generated_at=None,
+                    version_id=UserIdentity.version_id + 1,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            expired: Dict[int, Dict[str, Tuple[Any, Any]]] = {
+                row.id: {
+                    "otp_hash": (row.otp_hash, None),
+                    "otp_generated_at": (row.otp_generated_at, None),
+                }
+                for row in rows
+            }
+            record_audit(session, "user_identity", expired)
+            await session.commit()
+            cleared += len(ids)
+            if len(ids) < batch_size:
+                return cleared
+
+    async def run_sweeper(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval: Optional[float] = None,
+    ) -> None:
+        """
+        Periodically call `sweep_expired` until cancelled.
+        """
+        interval = interval or settings.otp_sweep_interval_seconds
+        while True:
+            try:
+                async with session_factory() as session:
+                    cleared = await self.sweep_expired(session)
+                if cleared:
+                    logger.info("OTP sweeper cleared %d expired codes", cleared)
+            except Exception:
+                logger.exception("OTP sweep failed")
+            await asyncio.sleep(interval)
+
+
+@lru_cache(maxsize=1)
+def get_otp_service() -> OtpService:
+    """
+    Return the process-wide OTP service.
+
+    Uses `LoggingOtpSender` until a real sender is wired in at startup, e.g.
+    `get_otp_service().dispatcher.sender = SmsGatewaySender(...)`.
+    """
+    dispatcher = OtpDispatcher(
+        LoggingOtpSender(),
+        maxsize=settings.otp_dispatch_queue_size,
+        workers=settings.otp_dispatch_workers,
+    )
+    return OtpService(dispatcher)
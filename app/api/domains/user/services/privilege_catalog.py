@@ -0,0 +1,132 @@
+# app/api/domains/user/services/privilege_catalog.py
+
+"""
+📚 In-process privilege catalog: names, IDs and token bit positions.
+
+Access tokens carry a bitmap of privileges (see `token_service`), while code
+declares requirements by name (e.g. `require_privileges("edit_users")`). The
+catalog resolves both from memory:
+
+- `{name: id}` of live privileges, for `require_privileges`
+- the bit position of every privilege ID, soft-deleted ones included.
+  Positions are stored on the row (`Privilege.bit`), reserved from a
+  counter that only grows when the privilege is created: they never move
+  and are never reused, so a worker with an older catalog still reads every
+  position it knows correctly. Token size follows the number of privileges
+  ever created, not the largest ID
+
+It is installed by the authz snapshot (`authz_snapshot.py`) when that runs,
+and otherwise loaded from the database on first use. Either way it reloads
+after a `"privilege"` invalidation, when older than
+`privilege_catalog_refresh_seconds`, and when asked to encode an ID it does
+not know yet.
+"""
+
+import asyncio
+import time
+from typing import Dict, Iterable, Mapping, Optional
+
+from app.api.config.settings import settings
+from app.api.domains.user.repositories.role_repository import (
+    get_privilege_bits,
+    get_privilege_name_map,
+)
+from app.api.utils.invalidation import invalidation_hub
+from app.database.session import get_sessionmaker
+
+
+class PrivilegeCatalog:
+    """
+    Holds the `{name: id}` map of live privileges and the bit position of
+    every privilege ID.
+    """
+
+    def __init__(self, max_age: float) -> None:
+        self.max_age = max_age
+        self._ids: Optional[Dict[str, int]] = None
+        self._positions: Dict[int, int] = {}
+        self._loaded_at = 0.0
+        self._stale = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        """True once the catalog has been populated."""
+        return self._ids is not None
+
+    @property
+    def fresh(self) -> bool:
+        """Loaded, not invalidated and younger than `max_age`."""
+        return (
+            self._ids is not None
+            and not self._stale
+            and time.monotonic() - self._loaded_at < self.max_age
+        )
+
+    def replace(self, name_to_id: Dict[str, int], positions: Mapping[int, int]) -> None:
+        """
+        Swap in a new name → ID map and the ID → bit position map of all
+        privileges, live or soft-deleted (atomic reference swap).
+        """
+        self._positions = dict(positions)
+        self._ids = dict(name_to_id)
+        self._loaded_at = time.monotonic()
+        self._stale = False
+
+    def mark_stale(self) -> None:
+        """Reload on next use."""
+        self._stale = True
+
+    async def reload(self) -> None:
+        """Load the catalog from the database (two queries)."""
+        async with self._lock:
+            await self._load()
+
+    async def _load(self) -> None:
+        async with get_sessionmaker()() as session:
+            name_to_id = await get_privilege_name_map(session)
+            positions = await get_privilege_bits(session)
+        self.replace(name_to_id, positions)
+
+    async def ensure_loaded(self) -> None:
+        """Load or reload the catalog unless it is fresh."""
+        if self.fresh:
+            return
+        async with self._lock:
+            if not self.fresh:
+                await self._load()
+
+    async def ensure_positions(self, privilege_ids: Iterable[int]) -> None:
+        """Make sure every ID has a bit position, reloading once if not."""
+        await self.ensure_loaded()
+        if self.bitmap(privilege_ids) is None:
+            await self.reload()
+
+    def resolve(self, names: Iterable[str]) -> Optional[int]:
+        """
+        Map privilege names to a bitmap of their positions.
+
+        Returns `None` if any name is unknown, so callers fail closed.
+        """
+        ids = self._ids or {}
+        try:
+            return self.bitmap(ids[name] for name in names)
+        except KeyError:
+            return None
+
+    def bitmap(self, privilege_ids: Iterable[int]) -> Optional[int]:
+        """Bitmap of the IDs' positions; `None` if any ID has no position."""
+        bits = 0
+        for pid in privilege_ids:
+            position = self._positions.get(pid)
+            if position is None:
+                return None
+            bits |= 1 << position
+        return bits
+
+
+# 👇 Process-wide catalog used by request dependencies and token issuing
+privilege_catalog = PrivilegeCatalog(settings.privilege_catalog_refresh_seconds)
+invalidation_hub.subscribe(
+    "privilege", lambda entity, ids: privilege_catalog.mark_stale()
+)
@@ -0,0 +1,349 @@
+# app/api/domains/user/services/revocation_service.py
+
+"""
+🚫 Token revocation checks from memory: a Bloom filter of revoked token IDs
+and a map of per-user revocations.
+
+The `revoked_token` table is authoritative; each process mirrors it:
+
+- TOKEN entries go into a Bloom filter. A filter miss means "definitely not
+  revoked" (no I/O, the common case); a hit is confirmed with one indexed
+  query on `revoked_token`
+- USER entries go into `{user id: not_before}`, but only while an access
+  token issued before `not_before` can still be valid: entries older than
+  `access_token_ttl_seconds` are dropped. Within that window the map is
+  exact, so user revocations cost no query and never crowd the filter.
+  Tokens issued before the window (refresh tokens, which live for
+  `refresh_token_ttl_seconds`) are checked against the table instead
+
+The mirror is refreshed incrementally at most every
+`revocation_refresh_seconds`: each refresh re-reads the rows created in the
+last `revocation_lookback_seconds` before the newest one seen, and adds those
+whose IDs it has not seen yet. A revocation whose transaction commits after
+one with a higher ID is therefore still picked up (IDs are assigned at
+INSERT, not at commit). The filter is rebuilt from scratch when it fills up
+and every `revocation_rebuild_seconds`, which also drops expired entries.
+
+Note: token `iat` has one-second resolution, so a token issued in the same
+second as a USER revocation is treated as revoked (fail closed).
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.config.settings import settings
+from app.api.domains.user.models.revoked_token import RevocationKind, RevokedToken
+from app.api.utils.bloom import BloomFilter
+from app.api.utils.clock import as_utc, utcnow
+from app.database.session import get_sessionmaker, get_write_queue
+from app.database.write_queue import WriteQueue
+
+
+# --------------------------------------
+# 📊 Counters
+# --------------------------------------
+@dataclass
+class RevocationStats:
+    """Counters for observing filter effectiveness."""
+
+    checks: int = 0
+    filter_hits: int = 0
+    confirmed: int = 0
+    refreshes: int = 0
+    rebuilds: int = 0
+
+
+# --------------------------------------
+# 🚫 Revocation store
+# --------------------------------------
+class RevocationStore:
+    """
+    Process-local revocation cache over the `revoked_token` table.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        refresh_interval: float,
+        lookback: float = 10.0,
+        rebuild_interval: float = 3600.0,
+        user_window: float = 300.0,
+        writes: Optional[WriteQueue] = None,
+    ) -> None:
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.lookback = timedelta(seconds=lookback)
+        self.rebuild_interval = rebuild_interval
+        self.stats = RevocationStats()
+        self.user_window = timedelta(seconds=user_window)
+        self._filter = BloomFilter(capacity, error_rate)
+        self._not_before: Dict[int, datetime] = {}  # USER entries inside the window
+        self._since: Optional[datetime] = None  # start of the re-read window
+        self._recent: Dict[int, datetime] = {}  # IDs seen inside the window
+        self._refreshed_at: Optional[float] = None
+        self._rebuilt_at = 0.0
+        self._lock = asyncio.Lock()
+        self._writes = writes
+
+    @classmethod
+    def from_settings(cls) -> "RevocationStore":
+        return cls(
+            capacity=settings.revocation_filter_capacity,
+            error_rate=settings.revocation_filter_error_rate,
+            refresh_interval=settings.revocation_refresh_seconds,
+            lookback=settings.revocation_lookback_seconds,
+            rebuild_interval=settings.revocation_rebuild_seconds,
+            user_window=settings.access_token_ttl_seconds,
+        )
+
+    # ---------- mirror maintenance ----------
+    def _horizon(self) -> datetime:
+        """Tokens issued after this are covered by the `not_before` map."""
+        return utcnow() - self.user_window
+
+    def _mirror(self, kind: RevocationKind, subject: str, not_before: datetime) -> None:
+        """Add one `revoked_token` entry to the filter or the user map."""
+        if kind == RevocationKind.TOKEN:
+            self._filter.add(subject)
+            return
+        not_before = as_utc(not_before)
+        if not_before <= self._horizon():
+            return  # every token it revokes has expired or is a refresh token
+        user_id = int(subject)
+        current = self._not_before.get(user_id)
+        if current is None or not_before > current:
+            self._not_before[user_id] = not_before
+
+    def _prune_users(self) -> None:
+        horizon = self._horizon()
+        self._not_before = {
+            user_id: at for user_id, at in self._not_before.items() if at > horizon
+        }
+
+    def _slide_window(self, newest: Optional[datetime]) -> None:
+        """Start the next re-read `lookback` before the newest entry seen."""
+        if newest is None:
+            return
+        since = newest - self.lookback
+        self._since = since
+        self._recent = {
+            row_id: at for row_id, at in self._recent.items() if at >= since
+        }
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """Reload every unexpired entry into a freshly sized filter and map."""
+        newest = (
+            await session.execute(select(func.max(RevokedToken.created_at)))
+        ).scalar_one()
+        stmt = select(
+            RevokedToken.id,
+            RevokedToken.kind,
+            RevokedToken.subject,
+            RevokedToken.not_before,
+            RevokedToken.created_at,
+        ).where(RevokedToken.expires_at > utcnow())
+        rows = (await session.execute(stmt)).all()
+
+        tokens = sum(1 for row in rows if row.kind == RevocationKind.TOKEN)
+        self._filter = BloomFilter(max(self.capacity, 2 * tokens), self.error_rate)
+        self._not_before = {}
+        for _, kind, subject, not_before, _ in rows:
+            self._mirror(kind, subject, not_before)
+
+        self._since = None
+        self._recent = {row.id: row.created_at for row in rows}
+        self._slide_window(newest)
+        self._refreshed_at = self._rebuilt_at = time.monotonic()
+        self.stats.rebuilds += 1
+
+    async def refresh(self, session: AsyncSession) -> None:
+        """
+        Add entries created since the last refresh (by any process), re-reading
+        the `lookback` window for transactions that committed late.
+        """
+        stmt = select(
+            RevokedToken.id,
+            RevokedToken.kind,
+            RevokedToken.subject,
+            RevokedToken.not_before,
+            RevokedToken.created_at,
+        )
+        if self._since is not None:
+            stmt = stmt.where(RevokedToken.created_at >= self._since)
+        newest = None
+        rows = (await session.execute(stmt)).all()
+        for row_id, kind, subject, not_before, created_at in rows:
+            newest = created_at if newest is None else max(newest, created_at)
+            if row_id in self._recent:
+                continue
+            self._mirror(kind, subject, not_before)
+            self._recent[row_id] = created_at
+        self._slide_window(newest)
+        self._prune_users()
+        self._refreshed_at = time.monotonic()
+        self.stats.refreshes += 1
+        if self._filter.saturated:
+            await self.rebuild(session)
+
+    async def _maybe_refresh(self, session: Optional[AsyncSession]) -> None:
+        """Refresh if the filter is older than `refresh_interval` (or never loaded)."""
+        refreshed_at = self._refreshed_at
+        now = time.monotonic()
+        if refreshed_at is not None and now - refreshed_at < self.refresh_interval:
+            return
+        async with self._lock:
+            if self._refreshed_at != refreshed_at:
+                return  # another coroutine refreshed while we waited
+            full = (
+                refreshed_at is None or now - self._rebuilt_at >= self.rebuild_interval
+            )
+            if session is not None:
+                await self._refresh_with(session, full)
+            else:
+                async with get_sessionmaker()() as own:
+                    await self._refresh_with(own, full)
+
+    async def _refresh_with(self, session: AsyncSession, full: bool) -> None:
+        if full:
+            await self.rebuild(session)
+        else:
+            await self.refresh(session)
+
+    # ---------- checks ----------
+    async def is_revoked(
+        self,
+        user_id: int,
+        token_id: str,
+        issued_at: int,
+        session: Optional[AsyncSession] = None,
+    ) -> bool:
+        """
+        Return True if the token or all of the user's tokens are revoked.
+
+        Only a Bloom filter hit, or a token issued before the user map's
+        window (a refresh token), costs a query.
+        """
+        await self._maybe_refresh(session)
+        self.stats.checks += 1
+
+        issued = datetime.fromtimestamp(issued_at, timezone.utc)
+        not_before = self._not_before.get(user_id)
+        if not_before is not None and not_before >= issued:
+            return True
+
+        conditions = []
+        if token_id in self._filter:
+            self.stats.filter_hits += 1
+            conditions.append(
+                and_(
+                    RevokedToken.kind == RevocationKind.TOKEN,
+                    RevokedToken.subject == token_id,
+                )
+            )
+        if issued <= self._horizon():
+            conditions.append(
+                and_(
+                    RevokedToken.kind == RevocationKind.USER,
+                    RevokedToken.subject == str(user_id),
+                    RevokedToken.not_before >= issued,
+                )
+            )
+        if not conditions:
+            return False
+
+        stmt = select(RevokedToken.id).where(or_(*conditions)).limit(1)
+        if session is not None:
+            revoked = (await session.execute(stmt)).first() is not None
+        else:
+            async with get_sessionmaker()() as own:
+                revoked = (await own.execute(stmt)).first() is not None
+        if revoked:
+            self.stats.confirmed += 1
+        return revoked
+
+    # ---------- writes ----------
+    async def revoke_token(
+        self,
+        token_id: str,
+        expires_at: datetime,
+        reason: str = "logout",
+        actor_id: Optional[int] = None,
+    ) -> None:
+        """
+        Revoke a single token; returns once the revocation is committed
+        (one job on the group-commit `WriteQueue`).
+        """
+
+        async def add_entry(session: AsyncSession) -> None:
+            session.add(
+                RevokedToken(
+                    kind=RevocationKind.TOKEN,
+                    subject=token_id,
+                    not_before=utcnow(),
+                    expires_at=expires_at,
+                    reason=reason,
+                    created_by=actor_id,
+                )
+            )
+
+        await (self._writes or get_write_queue()).submit(add_entry)
+        # Mirror locally right away; other workers pick it up on refresh
+        self._filter.add(token_id)
+
+    async def revoke_users(
+        self,
+        session: AsyncSession,
+        user_ids: Iterable[int],
+        reason: str,
+        actor_id: Optional[int] = None,
+    ) -> int:
+        """
+        Revoke every token issued so far for each user (one multi-row INSERT).
+
+        Used by set-based operations that bypass the ORM flush hook in
+        `models/revoked_token.py`. The caller commits the session: unlike
+        `revoke_token` this is not queued, so the revocation commits (or
+        rolls back) together with the change that caused it.
+        """
+        now = utcnow()
+        expires_at = now + timedelta(seconds=settings.refresh_token_ttl_seconds)
+        rows = [
+            {
+                "kind": RevocationKind.USER,
+                "subject": str(user_id),
+                "not_before": now,
+                "expires_at": expires_at,
+                "reason": reason,
+                "created_by": actor_id,
+            }
+            for user_id in user_ids
+        ]
+        if rows:
+            # Core executemany (sharded sessions have no ORM bulk INSERT)
+            connection = await session.connection()
+            await connection.execute(insert(RevokedToken), rows)
+            for row in rows:
+                self._mirror(RevocationKind.USER, str(row["subject"]), now)
+        return len(rows)
+
+    async def prune(self, session: AsyncSession) -> int:
+        """Delete entries that can no longer match a valid token."""
+        result = await session.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= utcnow())
+        )
+        return result.rowcount or 0
+
+
+@lru_cache(maxsize=1)
+def get_revocation_store() -> RevocationStore:
+    """Return the process-wide revocation store."""
+    return RevocationStore.from_settings()
@@ -0,0 +1,223 @@
+# app/api/domains/user/services/shard_replication.py
+
+"""
+🪞 Copies of the role / privilege tables on every user shard.
+
+With sharding on (`app/database/sharding.py`), `role`, `privilege` and
+`role_privilege` are written to the global database only. Every shard keeps
+a copy, so `user.role_id` can stay a real foreign key and user queries can
+join roles without leaving the shard.
+
+`ReferenceReplicator` compares each shard's `get_authz_version` with the
+global one and, where they differ, rewrites the shard's copy in one
+transaction: rows are updated or inserted by primary key, and rows gone
+from the global database are deleted (children first). It syncs:
+
+- once at startup, before the app serves requests
+- after every `"role"` / `"privilege"` invalidation, unconditionally (the
+  invalidation bus also delivers those from other workers)
+- every `shard_replication_refresh_seconds` as the backstop
+
+Until the sync after its commit, a new role cannot be assigned to users;
+locally that is a few milliseconds.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import Connection, Table, bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.api.config.settings import settings
+from app.api.domains.user.repositories.role_repository import get_authz_version
+from app.api.domains.user.services.authz_snapshot import authz_version
+from app.api.utils.invalidation import invalidation_hub
+from app.database.base import Base
+from app.database.session import get_engine, get_shard_engines
+from app.database.sharding import GLOBAL_SHARD, replicated_tables
+
+logger = logging.getLogger(__name__)
+
+Snapshot = Dict[str, List[Dict[str, Any]]]
+
+
+# --------------------------------------
+# 📋 Table copies
+# --------------------------------------
+def read_reference_rows(connection: Connection) -> Snapshot:
+    """All rows of the replicated tables, by table name (sync)."""
+    return {
+        table.name: [dict(row) for row in connection.execute(select(table)).mappings()]
+        for table in replicated_tables(Base.metadata)
+    }
+
+
+def _key(table: Table) -> Any:
+    (column,) = table.primary_key.columns
+    return column
+
+
+def write_reference_rows(connection: Connection, snapshot: Snapshot) -> int:
+    """
+    Make the replicated tables behind `connection` equal to `snapshot`
+    (sync; the caller commits). Returns the number of rows written.
+    """
+    tables = replicated_tables(Base.metadata)
+    wanted = {
+        table.name: {row[_key(table).name] for row in snapshot[table.name]}
+        for table in tables
+    }
+    written = 0
+    for table in reversed(tables):
+        key = _key(table)
+        stale = set(connection.execute(select(key)).scalars()) - wanted[table.name]
+        if stale:
+            written += (
+                connection.execute(delete(table).where(key.in_(stale))).rowcount or 0
+            )
+    for table in tables:
+        key = _key(table)
+        rows = snapshot[table.name]
+        present = set(connection.execute(select(key)).scalars())
+        new_rows = [row for row in rows if row[key.name] not in present]
+        old_rows = [
+            {**row, "_key": row[key.name]} for row in rows if row[key.name] in present
+        ]
+        if new_rows:
+            connection.execute(insert(table), new_rows)
+        if old_rows:
+            connection.execute(
+                update(table)
+                .where(key == bindparam("_key"))
+                .values(
+                    {column.name: bindparam(column.name) for column in table.columns}
+                ),
+                old_rows,
+            )
+        written += len(rows)
+    return written
+
+
+# --------------------------------------
+# 📊 Stats
+# --------------------------------------
+@dataclass
+class ReplicationStats:
+    """Counters since start."""
+
+    checks: int = 0
+    syncs: int = 0
+    rows_written: int = 0
+    failures: int = 0
+
+
+# --------------------------------------
+# 🪞 Replicator
+# --------------------------------------
+class ReferenceReplicator:
+    """
+    Keeps every shard's reference tables equal to the global database's.
+    """
+
+    def __init__(
+        self,
+        source: AsyncEngine,
+        shards: Dict[str, AsyncEngine],
+        refresh_interval: float,
+    ) -> None:
+        self.source = source
+        self.shards = shards
+        self.refresh_interval = refresh_interval
+        self.stats = ReplicationStats()
+        self._lock = asyncio.Lock()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    def from_settings(cls) -> "ReferenceReplicator":
+        shards = {
+            name: engine
+            for name, engine in get_shard_engines().items()
+            if name != GLOBAL_SHARD
+        }
+        return cls(
+            source=get_engine(),
+            shards=shards,
+            refresh_interval=settings.shard_replication_refresh_seconds,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def _version(self, engine: AsyncEngine) -> str:
+        async with AsyncSession(engine) as session:
+            return authz_version(await get_authz_version(session))
+
+    async def sync(self, force: bool = False) -> List[str]:
+        """
+        Bring every out-of-date shard (every shard with `force`) up to date.
+
+        Returns the names of the shards rewritten.
+        """
+        async with self._lock:
+            self.stats.checks += 1
+            version = await self._version(self.source)
+            stale = [
+                name
+                for name, engine in self.shards.items()
+                if force or await self._version(engine) != version
+            ]
+            if not stale:
+                return []
+            async with self.source.connect() as connection:
+                snapshot = await connection.run_sync(read_reference_rows)
+            for name in stale:
+                async with self.shards[name].begin() as connection:
+                    self.stats.rows_written += await connection.run_sync(
+                        write_reference_rows, snapshot
+                    )
+                self.stats.syncs += 1
+            return stale
+
+    async def _on_change(self, entity: str, ids: Iterable[int]) -> None:
+        try:
+            await self.sync(force=True)
+        except Exception:
+            self.stats.failures += 1
+            logger.exception("Reference table replication failed")
+
+    async def start(self) -> None:
+        """Sync once, then follow role / privilege changes in the background."""
+        if not self.shards or self.running:
+            return
+        await self.sync()
+        invalidation_hub.subscribe("role", self._on_change)
+        invalidation_hub.subscribe("privilege", self._on_change)
+        self._task = asyncio.create_task(self._run(), name="shard-replication")
+
+    async def stop(self) -> None:
+        invalidation_hub.unsubscribe("role", self._on_change)
+        invalidation_hub.unsubscribe("privilege", self._on_change)
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.sync()
+            except Exception:
+                self.stats.failures += 1
+                logger.exception("Reference table replication failed")
+
+
+@lru_cache(maxsize=1)
+def get_reference_replicator() -> ReferenceReplicator:
+    """Return the process-wide replicator (idle when sharding is off)."""
+    return ReferenceReplicator.from_settings()
@@ -0,0 +1,290 @@
+# app/api/domains/user/services/token_service.py
+
+"""
+🎟️ JWT issuance and verification with embedded authorization claims.
+
+Access tokens carry everything needed to authorize a request:
+- `sub`: user ID
+- `rid`: role ID
+- `prv`: compact privilege encoding (bitmap over the dense bit positions of
+  `privilege_catalog`, base64url)
+
+so verifying a request costs a signature check and zero database queries.
+Access tokens are short-lived; refresh tokens are exchanged for a new pair
+after re-checking `User` / `UserAuth` state and re-reading role privileges.
+"""
+
+import base64
+import time
+import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable
+
+import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.config.settings import settings
+from app.api.domains.user.models.user import User
+from app.api.domains.user.services.coalesced_reads import (
+    account_state,
+    role_privilege_ids,
+)
+from app.api.domains.user.services.privilege_catalog import privilege_catalog
+from app.api.domains.user.services.revocation_service import get_revocation_store
+from app.api.utils.clock import as_utc, utcnow
+
+ACCESS_TOKEN = "access"
+REFRESH_TOKEN = "refresh"
+
+
+# --------------------------------------
+# 🚫 Errors
+# --------------------------------------
+class InvalidTokenError(Exception):
+    """Raised when a token is malformed, expired, forged or of the wrong type."""
+
+
+class RefreshDeniedError(InvalidTokenError):
+    """Raised when a refresh token is valid but the account may no longer log in."""
+
+
+# --------------------------------------
+# 🧮 Compact privilege encoding
+# --------------------------------------
+def encode_privilege_bitmap(bitmap: int) -> str:
+    """
+    Encode a privilege bitmap little-endian, base64url without padding.
+
+    Bit `n` is set when the privilege at catalog position `n` is granted;
+    200 privileges fit in ~34 characters regardless of how many are granted.
+    """
+    raw = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_privilege_bitmap(encoded: str) -> int:
+    """Inverse of `encode_privilege_bitmap`."""
+    raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+    return int.from_bytes(raw, "little")
+
+
+# --------------------------------------
+# 📦 Value objects
+# --------------------------------------
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """
+    The authenticated caller, decoded from an access token.
+    """
+
+    user_id: int
+    role_id: int
+    privilege_bits: int
+    token_id: str
+    issued_at: int
+    expires_at: int
+
+    def has_privileges(self, required: int) -> bool:
+        """Return True if every privilege in the `required` bitmap is granted."""
+        return self.privilege_bits & required == required
+
+
+@dataclass(frozen=True, slots=True)
+class TokenPair:
+    """An access/refresh token pair as returned to clients."""
+
+    access_token: str
+    refresh_token: str
+    expires_in: int
+    token_type: str = "bearer"
+
+
+# --------------------------------------
+# 🔑 Key handling (parsed once, then cached)
+# --------------------------------------
+@lru_cache(maxsize=8)
+def _prepare_key(algorithm: str, material: str) -> Any:
+    """
+    Parse key material for an algorithm once.
+
+    PEM parsing for RSA/EC keys is far more expensive than the signature check
+    itself, so parsed key objects are memoized per (algorithm, material).
+    """
+    return jwt.get_algorithm_by_name(algorithm).prepare_key(material)
+
+
+# --------------------------------------
+# 🎟️ Token service
+# --------------------------------------
+class TokenService:
+    """
+    Issues and verifies signed access/refresh tokens.
+
+    Verification never touches the database. Only `issue_for_user` and
+    `refresh` read privileges / account state.
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        signing_key: str,
+        verification_key: str,
+        issuer: str,
+        access_ttl: int,
+        refresh_ttl: int,
+    ) -> None:
+        if not signing_key and not verification_key:
+            raise RuntimeError("JWT key material is not configured")
+        self.algorithm = algorithm
+        self.issuer = issuer
+        self.access_ttl = access_ttl
+        self.refresh_ttl = refresh_ttl
+        self._signing_key = signing_key
+        self._verification_key = verification_key
+
+    @classmethod
+    def from_settings(cls) -> "TokenService":
+        """Build a service from `settings` (symmetric or asymmetric keys)."""
+        symmetric = settings.jwt_algorithm.upper().startswith("HS")
+        return cls(
+            algorithm=settings.jwt_algorithm,
+            signing_key=(
+                settings.jwt_secret_key if symmetric else settings.jwt_private_key
+            ),
+            verification_key=(
+                settings.jwt_secret_key if symmetric else settings.jwt_public_key
+            ),
+            issuer=settings.jwt_issuer,
+            access_ttl=settings.access_token_ttl_seconds,
+            refresh_ttl=settings.refresh_token_ttl_seconds,
+        )
+
+    # ---------- encoding ----------
+    def _encode(self, claims: Dict[str, Any]) -> str:
+        if not self._signing_key:
+            raise RuntimeError("This TokenService has no signing key")
+        key = _prepare_key(self.algorithm, self._signing_key)
+        return jwt.encode(claims, key, algorithm=self.algorithm)
+
+    def issue_pair(
+        self, user_id: int, role_id: int, privilege_ids: Iterable[int]
+    ) -> TokenPair:
+        """
+        Issue an access/refresh pair for already-known authorization data.
+
+        Every privilege ID needs a catalog position; async callers ensure that
+        with `privilege_catalog.ensure_positions` first.
+        """
+        bitmap = privilege_catalog.bitmap(privilege_ids)
+        if bitmap is None:
+            raise RuntimeError("Privilege catalog does not cover the granted IDs")
+        now = int(time.time())
+        access_claims = {
+            "iss": self.issuer,
+            "sub": str(user_id),
+            "typ": ACCESS_TOKEN,
+            "jti": uuid.uuid4().hex,
+            "iat": now,
+            "exp": now + self.access_ttl,
+            "rid": role_id,
+            "prv": encode_privilege_bitmap(bitmap),
+        }
+        refresh_claims = {
+            "iss": self.issuer,
+            "sub": str(user_id),
+            "typ": REFRESH_TOKEN,
+            "jti": uuid.uuid4().hex,
+            "iat": now,
+            "exp": now + self.refresh_ttl,
+        }
+        return TokenPair(
+            access_token=self._encode(access_claims),
+            refresh_token=self._encode(refresh_claims),
+            expires_in=self.access_ttl,
+        )
+
+    async def issue_for_user(self, user: User) -> TokenPair:
+        """
+        Issue a pair for a freshly authenticated user (e.g. after login).
+
+        Concurrent logins for the same role share one privilege query, run
+        on its own session.
+        """
+        privilege_ids = await role_privilege_ids(user.role_id)
+        await privilege_catalog.ensure_positions(privilege_ids)
+        return self.issue_pair(user.id, user.role_id, privilege_ids)
+
+    # ---------- decoding ----------
+    def _decode(self, token: str, expected_type: str) -> Dict[str, Any]:
+        key = _prepare_key(self.algorithm, self._verification_key)
+        try:
+            claims: Dict[str, Any] = jwt.decode(
+                token,
+                key,
+                algorithms=[self.algorithm],
+                issuer=self.issuer,
+                options={"require": ["exp", "iat", "sub", "jti", "typ"]},
+            )
+        except jwt.PyJWTError as exc:
+            raise InvalidTokenError(str(exc)) from exc
+        if claims.get("typ") != expected_type:
+            raise InvalidTokenError(f"Expected token type '{expected_type}'")
+        return claims
+
+    def verify_access_token(self, token: str) -> Principal:
+        """
+        Validate an access token and return the embedded principal.
+
+        Pure CPU work: no database or network access.
+        """
+        claims = self._decode(token, ACCESS_TOKEN)
+        try:
+            return Principal(
+                user_id=int(claims["sub"]),
+                role_id=int(claims["rid"]),
+                privilege_bits=decode_privilege_bitmap(claims["prv"]),
+                token_id=claims["jti"],
+                issued_at=int(claims["iat"]),
+                expires_at=int(claims["exp"]),
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise InvalidTokenError("Malformed access token claims") from exc
+
+    async def refresh(self, session: AsyncSession, refresh_token: str) -> TokenPair:
+        """
+        Exchange a refresh token for a new pair.
+
+        Rejects revoked refresh tokens, re-checks the account against
+        `UserAuth` / `User` (deleted, inactive, locked) and re-reads the role's
+        privileges, so privilege changes take effect at the latest one
+        access-token lifetime later.
+        """
+        claims = self._decode(refresh_token, REFRESH_TOKEN)
+        user_id = int(claims["sub"])
+        if await get_revocation_store().is_revoked(
+            user_id, claims["jti"], int(claims["iat"]), session=session
+        ):
+            raise RefreshDeniedError("Refresh token has been revoked")
+
+        # 🛬 Concurrent refreshes for the same user / role share one query
+        row = await account_state(user_id)
+        if row is None:
+            raise RefreshDeniedError("Unknown user")
+        if not row.is_active or row.deleted_at is not None:
+            raise RefreshDeniedError("User is inactive")
+        if row.auth_deleted_at is not None:
+            raise RefreshDeniedError("Credentials revoked")
+        locked_until = as_utc(row.account_locked_until)
+        if locked_until is not None and locked_until > utcnow():
+            raise RefreshDeniedError("Account is locked")
+
+        privilege_ids = await role_privilege_ids(row.role_id)
+        await privilege_catalog.ensure_positions(privilege_ids)
+        return self.issue_pair(user_id, row.role_id, privilege_ids)
+
+
+@lru_cache(maxsize=1)
+def get_token_service() -> TokenService:
+    """Return the process-wide `TokenService` built from settings."""
+    return TokenService.from_settings()
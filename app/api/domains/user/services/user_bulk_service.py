@@ -0,0 +1,212 @@
+# app/api/domains/user/services/user_bulk_service.py
+
+"""
+📦 Set-based bulk operations on users (role reassignment, deactivation).
+
+Nothing here loads `User` objects (and with them the joined `role` / `auth`
+and selectin `identities` relationships). Instead each operation walks the
+matching users in primary-key order and, per chunk of
+`bulk_update_chunk_size` IDs:
+
+1. selects the next matching IDs with a keyset query (`id > last ORDER BY id
+   LIMIT n`), or the matching slice of an explicit ID list
+2. applies one `UPDATE … WHERE id IN (…)` that re-checks the filter
+3. revokes the affected users' tokens (one multi-row INSERT), records the
+   chunk in the `entity_change` feed for other workers and queues one audit
+   event per user (old values come from the keyset query)
+4. commits; the commit delivers the `"user"` invalidation, locally and to
+   the other workers
+
+Committing per chunk keeps transactions and lock times short, so reassigning
+50k+ users never holds one huge transaction. When sharded, each chunk's IDs
+are merged across shards and its UPDATE runs only on the shards holding them.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import ColumnElement, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.config.settings import settings
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.user import User
+from app.api.domains.user.services.audit_service import record_audit
+from app.api.domains.user.services.invalidation_bus import record_changes
+from app.api.domains.user.services.revocation_service import get_revocation_store
+from app.database.sharding import fetch_page
+
+
+# --------------------------------------
+# 🚫 Errors
+# --------------------------------------
+class RoleNotFoundError(Exception):
+    """Raised when the target role does not exist or is soft-deleted."""
+
+
+# --------------------------------------
+# 📊 Result
+# --------------------------------------
+@dataclass(frozen=True, slots=True)
+class BulkUpdateResult:
+    """Outcome of a bulk user operation."""
+
+    affected: int
+    chunks: int
+
+
+# --------------------------------------
+# 🔁 Chunked UPDATE driver
+# --------------------------------------
+async def _apply_in_chunks(
+    session: AsyncSession,
+    criteria: Sequence[ColumnElement[bool]],
+    values: Dict[str, Any],
+    reason: str,
+    user_ids: Optional[Iterable[int]],
+    actor_id: Optional[int],
+    chunk_size: Optional[int],
+) -> BulkUpdateResult:
+    chunk_size = chunk_size or settings.bulk_update_chunk_size
+    audited = {key: getattr(User, key) for key in values}
+    values = {
+        **values,
+        "updated_by": actor_id,
+        "updated_at": func.now(),
+        # Core UPDATEs bypass `version_id_col`; keep ETags honest
+        "version_id": User.version_id + 1,
+    }
+    explicit = sorted(set(user_ids)) if user_ids is not None else None
+
+    affected = chunks = 0
+    last_id = position = 0
+    while True:
+        # 🔑 Next chunk of matching IDs, in primary-key order
+        stmt = select(User.id, *audited.values()).where(*criteria).order_by(User.id)
+        if explicit is not None:
+            candidates = explicit[position : position + chunk_size]
+            if not candidates:
+                break
+            position += chunk_size
+            stmt = stmt.where(User.id.in_(candidates))
+        else:
+            stmt = stmt.where(User.id > last_id)
+        rows = await fetch_page(session, stmt, 0, chunk_size, key=lambda row: row.id)
+        ids: List[int] = [row.id for row in rows]
+        if not ids:
+            if explicit is not None:
+                continue
+            break
+        last_id = ids[-1]
+
+        result = await session.execute(
+            update(User)
+            .where(User.id.in_(ids), *criteria)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        count = result.rowcount or 0
+        if count:
+            # Set-based UPDATEs bypass the ORM flush hook in `revoked_token.py`
+            await get_revocation_store().revoke_users(
+                session, ids, reason=reason, actor_id=actor_id
+            )
+            await record_changes(session, "user", ids)
+            record_audit(
+                session,
+                "user",
+                {
+                    row.id: {key: (getattr(row, key), values[key]) for key in audited}
+                    for row in rows
+                },
+                actor_id=actor_id,
+            )
+        await session.commit()
+
+        affected += count
+        chunks += 1
+        if explicit is None and len(ids) < chunk_size:
+            break
+
+    return BulkUpdateResult(affected=affected, chunks=chunks)
+
+
+def _scope(
+    role_id: Optional[int], user_ids: Optional[Iterable[int]]
+) -> Optional[Iterable[int]]:
+    if role_id is None and user_ids is None:
+        raise ValueError("Select users by role_id and/or user_ids")
+    return user_ids
+
+
+# --------------------------------------
+# 🛡️ Role reassignment
+# --------------------------------------
+async def reassign_role(
+    session: AsyncSession,
+    to_role_id: int,
+    from_role_id: Optional[int] = None,
+    user_ids: Optional[Iterable[int]] = None,
+    actor_id: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> BulkUpdateResult:
+    """
+    Move users to `to_role_id`.
+
+    Users are selected by `from_role_id` and/or explicit `user_ids`;
+    soft-deleted users and users already in the target role are skipped.
+    Raises `RoleNotFoundError` if the target role is missing or deleted.
+    """
+    scoped_ids = _scope(from_role_id, user_ids)
+    target = await session.scalar(
+        select(Role.id).where(Role.id == to_role_id, Role.deleted_at.is_(None))
+    )
+    if target is None:
+        raise RoleNotFoundError(f"Role {to_role_id} not found")
+
+    criteria = [User.deleted_at.is_(None), User.role_id != to_role_id]
+    if from_role_id is not None:
+        criteria.append(User.role_id == from_role_id)
+    return await _apply_in_chunks(
+        session,
+        criteria,
+        {"role_id": to_role_id},
+        reason="role_changed",
+        user_ids=scoped_ids,
+        actor_id=actor_id,
+        chunk_size=chunk_size,
+    )
+
+
+# --------------------------------------
+# ⛔ Deactivation
+# --------------------------------------
+async def deactivate_users(
+    session: AsyncSession,
+    role_id: Optional[int] = None,
+    user_ids: Optional[Iterable[int]] = None,
+    actor_id: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> BulkUpdateResult:
+    """
+    Deactivate users selected by `role_id` and/or explicit `user_ids`.
+
+    Already inactive and soft-deleted users are skipped; with `role_id` the
+    scan walks `ix_user_role_id_is_active`.
+    """
+    scoped_ids = _scope(role_id, user_ids)
+    criteria: List[ColumnElement[bool]] = [
+        User.deleted_at.is_(None),
+        User.is_active.is_(True),
+    ]
+    if role_id is not None:
+        criteria.append(User.role_id == role_id)
+    return await _apply_in_chunks(
+        session,
+        criteria,
+        {"is_active": False},
+        reason="deactivated",
+        user_ids=scoped_ids,
+        actor_id=actor_id,
+        chunk_size=chunk_size,
+    )
@@ -0,0 +1,82 @@
+# app/api/domains/user/services/warmup.py
+
+"""
+🔥 Warm the user domain's hot read statements before serving traffic.
+
+The first execution of a statement pays for mapper configuration (once per
+process), cache-key generation and SQL compilation; later executions hit
+the engine's compiled-statement cache. `warm_user_queries` runs every hot
+read once against a key that matches nothing, so the cache is populated
+without depending on the data. The pre-fork server (`scripts/serve.py`)
+runs it in the master, so every forked worker starts warm.
+"""
+
+from functools import partial
+from typing import Any, Awaitable, Callable, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.domains.user.models.user import User
+from app.api.domains.user.repositories.privilege_repository import (
+    get_privilege_list_validators,
+    get_privilege_row,
+    list_privileges,
+)
+from app.api.domains.user.repositories.role_repository import (
+    get_privilege_name_map,
+    get_role_list_validators,
+    get_role_member_counts,
+    get_role_privilege_ids,
+    get_role_privilege_names,
+    get_role_row,
+    get_role_validators,
+    list_role_members,
+    list_roles,
+)
+from app.api.domains.user.repositories.user_repository import (
+    DEFAULT_USER_FIELDS,
+    get_account_state,
+    get_user_list_validators,
+    get_user_validators,
+    get_users_by_ids,
+    list_user_ids,
+)
+from app.database.fieldsets import FieldSelection
+
+# 🔑 Matches no row (IDs start at 1)
+_NO_ID = 0
+
+
+async def warm_user_queries(session: AsyncSession) -> int:
+    """
+    Execute each hot user-domain read once; returns the number of reads run.
+
+    Read-only; the caller owns (and closes) the session.
+    """
+    selection = FieldSelection.parse(User, DEFAULT_USER_FIELDS)
+    reads: List[Callable[[], Awaitable[Any]]] = [
+        # 🔐 Per-request auth path
+        partial(get_role_privilege_ids, session, _NO_ID),
+        partial(get_account_state, session, _NO_ID),
+        partial(get_privilege_name_map, session),
+        # 👤 Users
+        partial(list_user_ids, session, limit=1),
+        partial(get_user_list_validators, session, selection, [_NO_ID]),
+        partial(get_users_by_ids, session, selection, [_NO_ID]),
+        partial(get_user_validators, session, _NO_ID),
+        # 🛡️ Roles
+        partial(get_role_list_validators, session, [_NO_ID]),
+        partial(list_roles, session, limit=1),
+        partial(get_role_member_counts, session, [_NO_ID]),
+        partial(get_role_validators, session, _NO_ID),
+        partial(get_role_row, session, _NO_ID),
+        partial(get_role_privilege_names, session, _NO_ID),
+        partial(list_role_members, session, _NO_ID, limit=1),
+        # 🔑 Privileges
+        partial(get_privilege_list_validators, session),
+        partial(list_privileges, session, limit=1),
+        partial(get_privilege_row, session, _NO_ID),
+    ]
+    for read in reads:
+        await read()  # one at a time: a session runs one statement at a time
+    return len(reads)
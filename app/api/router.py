@@ -0,0 +1,21 @@
+# app/api/router.py
+
+"""
+🧭 Single entrypoint for all API routes.
+
+Each domain exposes an `APIRouter` from its `controllers` package; they are
+mounted here and the result is included by `app/main.py`.
+"""
+
+from fastapi import APIRouter
+
+from app.api.domains.user.controllers.privilege_controller import (
+    router as privilege_router,
+)
+from app.api.domains.user.controllers.role_controller import router as role_router
+from app.api.domains.user.controllers.user_controller import router as user_router
+
+api_router = APIRouter()
+api_router.include_router(privilege_router)
+api_router.include_router(role_router)
+api_router.include_router(user_router)
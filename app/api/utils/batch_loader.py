@@ -0,0 +1,123 @@
+# app/api/utils/batch_loader.py
+
+"""
+📦 DataLoader-style request-scoped batching.
+
+Every `load(key)` issued during the same event-loop tick is collected and
+resolved by one call to the batch function, and results are memoized for
+the lifetime of the loader (one request). N independent lookups therefore
+cost one query per relationship, however the call sites are written.
+
+Usage:
+    loader = BatchLoader(fetch_roles_by_id)
+    roles = await asyncio.gather(*(loader.load(u.role_id) for u in users))
+"""
+
+import asyncio
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Receives unique keys, returns {key: value}; missing keys resolve to `default`
+BatchFn = Callable[[List[K]], Awaitable[Mapping[K, V]]]
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Collects keys for one tick, then resolves them in batches of `max_batch_size`.
+
+    Pass the same `lock` to every loader sharing a database session: batches
+    scheduled in the same tick then run one after another, since an
+    `AsyncSession` must not run concurrent statements.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFn[K, V],
+        default: Optional[Callable[[], V]] = None,
+        max_batch_size: int = 500,
+        lock: Optional[asyncio.Lock] = None,
+    ) -> None:
+        self._batch_fn = batch_fn
+        self._default = default
+        self._max_batch_size = max_batch_size
+        self._lock = lock or asyncio.Lock()
+        self._cache: Dict[K, "asyncio.Future[V]"] = {}
+        self._queue: List[Tuple[K, "asyncio.Future[V]"]] = []
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self.batches = 0  # number of batch function calls (observability)
+
+    def load(self, key: K) -> "asyncio.Future[V]":
+        """Return a future for `key`, scheduling it for the next batch if new."""
+        future = self._cache.get(key)
+        if future is not None:
+            return future
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._cache[key] = future
+        if not self._queue:
+            loop.call_soon(self._dispatch)
+        self._queue.append((key, future))
+        return future
+
+    async def load_many(self, keys: Iterable[K]) -> List[V]:
+        """Load several keys at once (same batch)."""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, key: K, value: V) -> None:
+        """Seed the cache with an already-known value (no-op if present)."""
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    def clear(self, key: Optional[K] = None) -> None:
+        """Forget one memoized key, or all of them."""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _dispatch(self) -> None:
+        pending, self._queue = self._queue, []
+        for start in range(0, len(pending), self._max_batch_size):
+            task = asyncio.ensure_future(
+                self._run(pending[start : start + self._max_batch_size])
+            )
+            # Keep a reference until done so the task is not garbage-collected
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: List[Tuple[K, "asyncio.Future[V]"]]) -> None:
+        try:
+            async with self._lock:
+                self.batches += 1
+                results = await self._batch_fn([key for key, _ in pending])
+        except Exception as exc:
+            for key, future in pending:
+                if self._cache.get(key) is future:
+                    del self._cache[key]  # let a later load retry
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for key, future in pending:
+            if future.done():
+                continue
+            if key in results:
+                future.set_result(results[key])
+            else:
+                future.set_result(self._default() if self._default else None)  # type: ignore[arg-type]
@@ -0,0 +1,63 @@
+# app/api/utils/bloom.py
+
+"""
+🌸 Minimal Bloom filter for in-process membership pre-checks.
+
+A Bloom filter answers "definitely not present" or "maybe present" using a
+fixed bit array. Negative answers are exact, so it can short-circuit the
+common case (e.g. "this token is not revoked") without touching the database;
+only "maybe" answers need an authoritative lookup.
+"""
+
+import math
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter sized for `capacity` items at `error_rate`.
+
+    Positions come from double hashing over the two halves of Python's
+    built-in 64-bit `hash()`, which is fast but salted per process: a filter
+    is only meaningful inside the process that built it and must never be
+    persisted or shared.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        bits = -capacity * math.log(error_rate) / (math.log(2) ** 2)
+        self.num_bits = max(8, int(bits))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str) -> range:
+        # Split one 64-bit hash into the two halves used for double hashing
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return range(h1, h1 + self.num_hashes * h2, h2)
+
+    def add(self, key: str) -> None:
+        """Insert a key."""
+        for h in self._positions(key):
+            bit = h % self.num_bits
+            self._bits[bit >> 3] |= 1 << (bit & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        """False means definitely absent; True means possibly present."""
+        bits, num_bits = self._bits, self.num_bits
+        for h in self._positions(key):
+            bit = h % num_bits
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+        return True
+
+    @property
+    def saturated(self) -> bool:
+        """True once more keys were added than the filter was sized for."""
+        return self.count > self.capacity
@@ -0,0 +1,34 @@
+# app/api/utils/clock.py
+
+"""
+🕒 Timezone helpers.
+
+SQLite returns naive datetimes even for `DateTime(timezone=True)` columns,
+while MySQL/Python code may produce aware ones. All comparisons in services
+go through these helpers so both are treated as UTC.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional, overload
+
+
+def utcnow() -> datetime:
+    """Return the current time as an aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
+@overload
+def as_utc(value: datetime) -> datetime: ...
+
+
+@overload
+def as_utc(value: None) -> None: ...
+
+
+def as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Interpret a naive datetime as UTC; convert aware ones to UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
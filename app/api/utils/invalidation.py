@@ -0,0 +1,81 @@
+# app/api/utils/invalidation.py
+
+"""
+📣 In-process invalidation hub.
+
+Writers publish "these IDs of this entity changed" (and the rows' new
+`updated_at`) after their transaction commits; caches subscribe and drop or
+refresh the affected entries, and can compare cached `updated_at` values
+with `changed_at(entity)`.
+Changes committed by other workers (or processes) arrive here through the
+invalidation bus (`services/invalidation_bus.py`).
+
+Usage:
+    invalidation_hub.subscribe("user", lambda entity, ids: cache.evict(ids))
+    await invalidation_hub.publish("user", {1, 2, 3})
+"""
+
+import inspect
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, FrozenSet, Iterable, List, Optional, Union
+
+from app.api.utils.clock import as_utc
+
+logger = logging.getLogger(__name__)
+
+# Listener(entity, ids); may be sync or async
+Listener = Callable[[str, FrozenSet[int]], Union[None, Awaitable[None]]]
+
+
+class InvalidationHub:
+    """
+    Fan-out of change notifications to subscribed listeners.
+
+    Listener failures are logged and never propagate to the writer.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: Dict[str, List[Listener]] = {}
+        self._changed_at: Dict[str, datetime] = {}
+
+    def subscribe(self, entity: str, listener: Listener) -> None:
+        """Call `listener` whenever IDs of `entity` are published."""
+        self._listeners.setdefault(entity, []).append(listener)
+
+    def unsubscribe(self, entity: str, listener: Listener) -> None:
+        """Remove a previously subscribed listener (no-op if absent)."""
+        listeners = self._listeners.get(entity, [])
+        if listener in listeners:
+            listeners.remove(listener)
+
+    def changed_at(self, entity: str) -> Optional[datetime]:
+        """Newest `updated_at` published for `entity` (UTC), if any."""
+        return self._changed_at.get(entity)
+
+    async def publish(
+        self,
+        entity: str,
+        ids: Iterable[int],
+        updated_at: Optional[datetime] = None,
+    ) -> None:
+        """Notify every listener of `entity` that `ids` changed at `updated_at`."""
+        changed = frozenset(ids)
+        if not changed:
+            return
+        if updated_at is not None:
+            updated_at = as_utc(updated_at)
+            previous = self._changed_at.get(entity)
+            if previous is None or updated_at > previous:
+                self._changed_at[entity] = updated_at
+        for listener in list(self._listeners.get(entity, ())):
+            try:
+                result: Optional[Awaitable[None]] = listener(entity, changed)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Invalidation listener failed for %s", entity)
+
+
+# 👇 Process-wide hub
+invalidation_hub = InvalidationHub()
@@ -0,0 +1,160 @@
+# app/api/utils/preconditions.py
+
+"""
+🏷️ ETag / Last-Modified helpers for conditional requests.
+
+Writes: a resource's ETag starts with its `version_id` (`"3"`, or `"3.<digest>"`
+when the representation also embeds related rows). Clients send it back in
+`If-Match`; a version mismatch means someone else changed the resource in
+between and the write is rejected with 412.
+
+Reads: endpoints compute `Validators` from a column-only query (`updated_at`,
+`version_id`, counts) and answer `If-None-Match` / `If-Modified-Since` with
+304 before loading or serializing anything:
+
+    validators = Validators(etag=version_etag(row.version_id), last_modified=row.updated_at)
+    if validators.not_modified(request):
+        return validators.not_modified_response()
+    validators.apply(response)
+"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Header, HTTPException, Request, Response, status
+
+from app.api.utils.clock import as_utc
+
+
+# --------------------------------------
+# 🏷️ Entity tags
+# --------------------------------------
+def version_etag(version_id: int, *parts: Any) -> str:
+    """
+    Strong ETag for a row version, optionally suffixed with a digest of
+    `parts` (state of embedded related rows). Only the version takes part
+    in `If-Match`.
+    """
+    if not parts:
+        return f'"{version_id}"'
+    return f'"{version_id}.{_digest(parts)}"'
+
+
+def digest_etag(*parts: Any, weak: bool = False) -> str:
+    """ETag from a digest of `parts` (e.g. id + `updated_at`, or list aggregates)."""
+    tag = f'"{_digest(parts)}"'
+    return f"W/{tag}" if weak else tag
+
+
+def _digest(parts: Any) -> str:
+    raw = "|".join(
+        as_utc(part).isoformat() if isinstance(part, datetime) else repr(part)
+        for part in parts
+    )
+    return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+
+def latest(*values: Any) -> Optional[datetime]:
+    """Most recent timestamp among `values` (naive = UTC; non-datetimes ignored)."""
+    present = [as_utc(value) for value in values if isinstance(value, datetime)]
+    return max(present) if present else None
+
+
+# --------------------------------------
+# 🔁 Conditional GET
+# --------------------------------------
+@dataclass(frozen=True, slots=True)
+class Validators:
+    """Cache validators of one representation."""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                as_utc(self.last_modified).replace(microsecond=0), usegmt=True
+            )
+        return headers
+
+    def not_modified(self, request: Request) -> bool:
+        """
+        Evaluate `If-None-Match` (weak comparison), falling back to
+        `If-Modified-Since` only when no `If-None-Match` is sent (RFC 9110).
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if if_none_match.strip() == "*":
+                return True
+            ours = _opaque(self.etag)
+            return any(_opaque(tag) == ours for tag in if_none_match.split(","))
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False  # unparsable dates are ignored
+        if since.tzinfo is None:
+            return False
+        return as_utc(self.last_modified).replace(microsecond=0) <= since
+
+    def not_modified_response(self) -> Response:
+        """Empty 304 carrying the validators."""
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers)
+
+    def apply(self, response: Response) -> None:
+        """Attach the validators to a 200 response."""
+        response.headers.update(self.headers)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+# --------------------------------------
+# 🔒 If-Match
+# --------------------------------------
+def parse_if_match(value: str) -> Optional[int]:
+    """
+    Return the version in an `If-Match` value, or None for `*`.
+
+    Raises `ValueError` for weak or malformed tags, or a list of tags.
+    """
+    value = value.strip()
+    if value == "*":
+        return None
+    if value.startswith("W/") or "," in value:
+        raise ValueError("If-Match must be a single strong ETag")
+    if len(value) < 3 or not (value[0] == value[-1] == '"'):
+        raise ValueError("Malformed ETag")
+    try:
+        return int(value[1:-1].split(".", 1)[0])
+    except ValueError:
+        raise ValueError("Malformed ETag") from None
+
+
+def require_if_match(
+    if_match: Optional[str] = Header(None, alias="If-Match"),
+) -> Optional[int]:
+    """
+    Dependency: the expected version from `If-Match` (None for `*`).
+
+    Missing → 428 Precondition Required; malformed → 400.
+    """
+    if if_match is None:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="If-Match header is required",
+        )
+    try:
+        return parse_if_match(if_match)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
@@ -0,0 +1,47 @@
+# app/api/utils/responses.py
+
+"""
+⚡ Fast JSON responses for large payloads.
+
+`FastJSONResponse` renders with orjson, which natively serializes dicts,
+slotted dataclasses, enums, `date` / `datetime` and SQLAlchemy column rows'
+`_asdict()` output. Endpoints that return many rows hand it plain data (row
+projections or the read models in `schemas/read_models.py`) and return it
+directly, skipping response-model validation and generic encoding.
+
+Keep `response_model=` on such routes for the OpenAPI schema; the read model
+must mirror it.
+
+Usage:
+    return FastJSONResponse(UserPageView(items=items, ...), headers=validators.headers)
+"""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import Row
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types orjson does not know natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Row):
+        return value._asdict()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize `content` to JSON bytes (same rules as `FastJSONResponse`)."""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """`application/json` response rendered by orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
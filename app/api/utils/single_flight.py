@@ -0,0 +1,69 @@
+# app/api/utils/single_flight.py
+
+"""
+🛬 Single-flight: concurrent callers for the same key share one execution.
+
+While a call for `key` is in flight, further callers await the same future
+instead of starting their own. Nothing is cached once the call completes,
+so results are never staler than a direct read.
+
+The leader runs as its own task and callers await it through
+`asyncio.shield`, so one cancelled caller never cancels the others. Because
+the result object is shared, functions should return immutable plain data
+(tuples, frozensets, rows) and use their own database session.
+"""
+
+import asyncio
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters: `coalesced` calls were served by another caller's execution."""
+
+    calls: int = 0
+    executions: int = 0
+    coalesced: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class SingleFlight(Generic[K, T]):
+    """
+    A named group of deduplicated calls.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.stats = SingleFlightStats()
+        self._inflight: Dict[K, "asyncio.Future[T]"] = {}
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn()` for `key`, or join the execution already in flight."""
+        self.stats.calls += 1
+        future = self._inflight.get(key)
+        if future is None:
+            self.stats.executions += 1
+            future = asyncio.ensure_future(fn())
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(future)
+
+    def _forget(self, key: K, future: "asyncio.Future[Any]") -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        # Marks the exception as retrieved even if every caller was cancelled
+        if not future.cancelled() and future.exception() is not None:
+            self.stats.errors += 1
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
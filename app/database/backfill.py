@@ -0,0 +1,324 @@
+# app/database/backfill.py
+
+"""
+🚚 Chunked, resumable data backfills for large tables.
+
+Schema and data changes are split so big tables never sit behind one long
+transaction or a table-copying `batch_alter_table`:
+
+1. **expand** revision: additive schema only (nullable column, new table,
+   new index)
+2. **backfill**: a `Backfill` walks the table in primary-key order, one short
+   transaction per chunk, throttled, with a checkpoint row in
+   `data_backfill` after every chunk. It runs inline at the end of a revision
+   or out of band against the live database while the app keeps serving:
+   `python -m scripts.run_backfill <revision>`
+3. **contract** revision: constraints / drops that need the data, guarded by
+   `require_backfill_complete(...)`
+
+Backfills must be idempotent per row: a crash between a chunk and its
+checkpoint replays that chunk.
+
+Usage (inside a revision):
+    from app.database.backfill import Backfill, run_backfills_in_migration
+
+    BACKFILLS = [
+        Backfill.update(
+            "user_identity_trim_values",
+            table=sa.table("user_identity", sa.column("id"), sa.column("value")),
+            values={"value": sa.func.trim(sa.column("value"))},
+            where=sa.column("value") != sa.func.trim(sa.column("value")),
+        ),
+    ]
+
+    def upgrade() -> None:
+        op.add_column(...)                      # schema step
+        run_backfills_in_migration(BACKFILLS)   # data step, chunk-committed
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, cast
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Connection,
+    DateTime,
+    Integer,
+    Row,
+    Select,
+    String,
+    Table,
+    TableClause,
+    func,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+
+logger = logging.getLogger(__name__)
+
+# Applies a change to the rows with these primary keys; returns rows changed
+ChunkFn = Callable[[Connection, Sequence[int]], int]
+
+
+# --------------------------------------
+# 📍 Checkpoint table
+# --------------------------------------
+class DataBackfill(Base):
+    """
+    The `data_backfill` table keeps one progress row per named backfill.
+    """
+
+    __tablename__ = "data_backfill"
+
+    # 🏷️ Unique backfill name (e.g. 'user_identity_trim_values')
+    name: Mapped[str] = mapped_column(
+        String(128), primary_key=True, doc="Unique backfill name"
+    )
+
+    # 📍 Highest primary key processed so far
+    last_key: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, doc="Last processed primary key"
+    )
+
+    # 🔢 Totals so far
+    rows_changed: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, doc="Rows changed so far"
+    )
+    chunks: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, doc="Chunks committed so far"
+    )
+
+    # 🕒 Progress timestamps
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        doc="When the backfill first ran",
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+        doc="When the last chunk was committed",
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, doc="Set once all rows were processed"
+    )
+
+
+_checkpoints = cast(Table, DataBackfill.__table__)
+
+
+class BackfillIncompleteError(RuntimeError):
+    """Raised by `require_backfill_complete` when a backfill has not finished."""
+
+
+# --------------------------------------
+# 🚚 Backfill definition
+# --------------------------------------
+@dataclass(frozen=True)
+class Backfill:
+    """
+    A named, resumable pass over `table` in `key` order.
+
+    `where` narrows the rows considered (e.g. only rows still needing the
+    change), which also makes a replayed chunk a no-op.
+    """
+
+    name: str
+    table: TableClause
+    apply: ChunkFn
+    key: str = "id"
+    where: Optional[ColumnElement[bool]] = None
+
+    @classmethod
+    def update(
+        cls,
+        name: str,
+        table: TableClause,
+        values: Dict[str, Any],
+        where: Optional[ColumnElement[bool]] = None,
+        key: str = "id",
+    ) -> "Backfill":
+        """Backfill applying one set-based `UPDATE … WHERE key IN (chunk)` per chunk."""
+
+        def apply(connection: Connection, keys: Sequence[int]) -> int:
+            stmt = update(table).where(table.c[key].in_(keys)).values(values)
+            if where is not None:
+                stmt = stmt.where(where)
+            return connection.execute(stmt).rowcount or 0
+
+        return cls(name=name, table=table, apply=apply, key=key, where=where)
+
+
+@dataclass
+class BackfillProgress:
+    """Outcome of one `run_backfill` call."""
+
+    name: str
+    rows_changed: int = 0
+    chunks: int = 0
+    last_key: int = 0
+    seconds: float = 0.0
+    completed: bool = False
+
+
+# --------------------------------------
+# 🔁 Runner
+# --------------------------------------
+def _checkpoint_query(name: str) -> Select[Any]:
+    return select(_checkpoints).where(_checkpoints.c.name == name)
+
+
+def _load_checkpoint(connection: Connection, name: str) -> Optional[Row[Any]]:
+    return connection.execute(_checkpoint_query(name)).first()
+
+
+def _open_checkpoint(connection: Connection, name: str) -> Row[Any]:
+    """The checkpoint of `name`, created (and committed) on its first run."""
+    checkpoint = _load_checkpoint(connection, name)
+    if checkpoint is not None:
+        return checkpoint
+    connection.execute(insert(_checkpoints).values(name=name))
+    _commit(connection)
+    return connection.execute(_checkpoint_query(name)).one()
+
+
+def _commit(connection: Connection) -> None:
+    # Under AUTOCOMMIT (Alembic's `autocommit_block`) every statement has
+    # already committed, and the open "transaction" belongs to Alembic
+    if connection.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+        connection.commit()
+
+
+def run_backfill(
+    connection: Connection,
+    backfill: Backfill,
+    chunk_size: int = 1000,
+    pause_seconds: float = 0.0,
+    throttle_ratio: float = 0.0,
+    max_chunks: Optional[int] = None,
+    log_every: int = 10,
+) -> BackfillProgress:
+    """
+    Run (or resume) a backfill, committing after every chunk.
+
+    Throttling: after each chunk sleep `pause_seconds` plus `throttle_ratio`
+    × the chunk's duration (1.0 keeps the database at most ~50% busy with
+    this job). `max_chunks` stops early; the next call resumes from the
+    checkpoint. The connection must not be inside a caller's transaction
+    that has to stay open (use `run_backfills_in_migration` in revisions).
+    """
+    key = backfill.table.c[backfill.key]
+    started = time.perf_counter()
+
+    checkpoint = _open_checkpoint(connection, backfill.name)
+    progress = BackfillProgress(
+        name=backfill.name,
+        rows_changed=checkpoint.rows_changed,
+        chunks=checkpoint.chunks,
+        last_key=checkpoint.last_key,
+        completed=checkpoint.completed_at is not None,
+    )
+    if progress.completed:
+        return progress
+
+    # 📏 Key range for progress reporting (not a row count: no full scan)
+    low, high = connection.execute(select(func.min(key), func.max(key))).one()
+    high = high or 0
+    span = max(high - max(low or 0, progress.last_key), 1)
+    first_key = progress.last_key
+
+    ran = 0
+    while max_chunks is None or ran < max_chunks:
+        chunk_started = time.perf_counter()
+        stmt = (
+            select(key).where(key > progress.last_key).order_by(key).limit(chunk_size)
+        )
+        if backfill.where is not None:
+            stmt = stmt.where(backfill.where)
+        keys: List[int] = list(connection.execute(stmt).scalars())
+
+        done = len(keys) < chunk_size
+        changed = backfill.apply(connection, keys) if keys else 0
+        progress.rows_changed += changed
+        progress.chunks += 1 if keys else 0
+        progress.last_key = keys[-1] if keys else progress.last_key
+        values: Dict[str, Any] = {
+            "last_key": progress.last_key,
+            "rows_changed": progress.rows_changed,
+            "chunks": progress.chunks,
+        }
+        if done:
+            values["completed_at"] = func.now()
+        connection.execute(
+            update(_checkpoints)
+            .where(_checkpoints.c.name == backfill.name)
+            .values(**values)
+        )
+        _commit(connection)  # 🔓 one short transaction per chunk
+        ran += 1
+
+        if done:
+            progress.completed = True
+            break
+        if log_every and ran % log_every == 0:
+            pct = 100.0 * (progress.last_key - first_key) / span
+            logger.info(
+                "🚚 %s: %d chunks, %d rows changed, key %d/%d (~%.1f%% of range)",
+                backfill.name,
+                progress.chunks,
+                progress.rows_changed,
+                progress.last_key,
+                high,
+                min(pct, 100.0),
+            )
+        delay = pause_seconds + throttle_ratio * (time.perf_counter() - chunk_started)
+        if delay > 0:
+            time.sleep(delay)
+
+    progress.seconds = round(time.perf_counter() - started, 3)
+    logger.info(
+        "🚚 %s: %s after %d chunks, %d rows changed (%.1fs this run)",
+        backfill.name,
+        "completed" if progress.completed else "paused",
+        progress.chunks,
+        progress.rows_changed,
+        progress.seconds,
+    )
+    return progress
+
+
+def run_backfills_in_migration(backfills: Iterable[Backfill], **options: Any) -> None:
+    """
+    Run backfills from inside an Alembic revision.
+
+    Commits the revision's schema work so far, then runs each backfill in an
+    autocommit block so every chunk commits on its own instead of inside the
+    migration's single transaction.
+    """
+    from alembic import op
+
+    with op.get_context().autocommit_block():
+        for backfill in backfills:
+            run_backfill(op.get_bind(), backfill, **options)
+
+
+def require_backfill_complete(connection: Connection, name: str) -> None:
+    """
+    Guard for contract revisions: raise unless the named backfill finished.
+    """
+    checkpoint = _load_checkpoint(connection, name)
+    if checkpoint is None or checkpoint.completed_at is None:
+        raise BackfillIncompleteError(
+            f"Backfill '{name}' has not completed; run `python -m scripts.run_backfill`"
+        )
@@ -31,10 +31,20 @@ class Base(DeclarativeBase):
 # --------------------------------------
 # Important: This is required for Alembic to "see" all models when autogenerating migrations.
 # Without this import, Alembic won't detect your models automatically.
+from app.api.domains.user.models.audit_event import AuditEvent
+from app.api.domains.user.models.entity_change import EntityChange
+from app.api.domains.user.models.identity_shard import IdentityShard
 from app.api.domains.user.models.privilege import Privilege
+from app.api.domains.user.models.revoked_token import RevokedToken
 from app.api.domains.user.models.role import Role
 from app.api.domains.user.models.role_privilege import RolePrivilege
 from app.api.domains.user.models.user import User
 from app.api.domains.user.models.user_auth import UserAuth
 from app.api.domains.user.models.user_identity import UserIdentity
 
+# Infrastructure tables (plain module import: also safe when that module is imported first)
+import app.database.backfill  # noqa: E402,F401
+import app.database.id_blocks  # noqa: E402,F401
+
+# Search index (outside the metadata; registers its DDL and flush hook)
+import app.api.domains.user.models.user_search  # noqa: E402,F401
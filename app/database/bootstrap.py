@@ -0,0 +1,268 @@
+# app/database/bootstrap.py
+
+"""
+🧱 Fast schema bootstrap and migration drift detection.
+
+Replaying every Alembic revision is the right way to build a production
+database, but slow for tests and throwaway environments. This module:
+
+- builds the schema straight from `Base.metadata` (`create_all`) and stamps
+  the Alembic head, so later `alembic upgrade` calls still work
+- detects drift: migrates a scratch database through every revision and
+  diffs the result against the models (`compare_metadata`), so the shortcut
+  can never silently diverge from what production gets
+- keeps a SQLite *template* database per schema fingerprint (DDL + head
+  revision) and clones it with the SQLite backup API, to a file or to a
+  shared in-memory database, so each test starts from a clean schema in
+  milliseconds
+
+Usage:
+    # 🧪 Per-test database (e.g. in a pytest fixture)
+    template = SqliteSchemaTemplate()
+    with template.memory() as db:
+        engine = create_engine(db.url)
+        ...
+
+    # 🔍 CI: fail when the migrations and the models disagree
+    assert not migration_drift()
+"""
+
+import hashlib
+import itertools
+import os
+import sqlite3
+import tempfile
+import warnings
+from pathlib import Path
+from typing import Any, List, Optional
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Connection, MetaData, create_engine, exc, pool
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.api.domains.user.models.user_search import include_object
+from app.database.base import Base
+
+ROOT = Path(__file__).resolve().parent.parent.parent
+MIGRATIONS = ROOT / "scripts" / "migrations"
+
+_memory_names = itertools.count(1)
+
+
+# --------------------------------------
+# ⚙️ Alembic plumbing
+# --------------------------------------
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """
+    Alembic config for `scripts/migrations`, optionally bound to `connection`.
+
+    Built without `alembic.ini` so running migrations in-process leaves the
+    caller's logging configuration alone.
+    """
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def head_revision() -> str:
+    """Current head revision of the migration scripts."""
+    head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+    if head is None:
+        raise RuntimeError("No Alembic revisions found")
+    return head
+
+
+# --------------------------------------
+# 🧱 Bootstrap from metadata
+# --------------------------------------
+def create_schema(connection: Connection, metadata: MetaData = Base.metadata) -> str:
+    """
+    Create all tables from `metadata` and stamp the Alembic head.
+
+    Sync (`AsyncConnection.run_sync` friendly); the caller commits.
+    Returns the stamped revision.
+    """
+    metadata.create_all(connection)
+    head = head_revision()
+    MigrationContext.configure(connection).stamp(
+        ScriptDirectory.from_config(alembic_config()), head
+    )
+    return head
+
+
+async def bootstrap_schema(engine: AsyncEngine) -> str:
+    """
+    Create the schema from the models on an empty database and stamp head.
+
+    Raises `RuntimeError` if the database is already under Alembic control.
+    """
+    async with engine.begin() as connection:
+        current = await connection.run_sync(
+            lambda sync_conn: MigrationContext.configure(
+                sync_conn
+            ).get_current_revision()
+        )
+        if current is not None:
+            raise RuntimeError(f"Database is already at revision {current}")
+        return await connection.run_sync(create_schema)
+
+
+def migrate(connection: Connection, revision: str = "head") -> None:
+    """Run `alembic upgrade <revision>` on the given (sync) connection."""
+    command.upgrade(alembic_config(connection), revision)
+
+
+# --------------------------------------
+# 🔍 Drift detection
+# --------------------------------------
+def schema_drift(
+    connection: Connection, metadata: MetaData = Base.metadata
+) -> List[Any]:
+    """
+    Differences between the database behind `connection` and `metadata`.
+
+    Returns Alembic autogenerate diff tuples (empty list = no drift). The
+    hand-managed search index is skipped.
+    """
+    context = MigrationContext.configure(
+        connection, opts={"compare_type": True, "include_object": include_object}
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", exc.SAWarning)
+        return list(compare_metadata(context, metadata))
+
+
+def migration_drift(metadata: MetaData = Base.metadata) -> List[Any]:
+    """
+    Migrate a scratch in-memory SQLite database to head and diff it against
+    `metadata`. Non-empty means the revisions and the models disagree.
+    """
+    engine = create_engine("sqlite://", poolclass=pool.StaticPool)
+    try:
+        with engine.connect() as connection:
+            migrate(connection)
+            connection.commit()
+            return schema_drift(connection, metadata)
+    finally:
+        engine.dispose()
+
+
+# --------------------------------------
+# 🧪 SQLite template databases
+# --------------------------------------
+def schema_fingerprint(metadata: MetaData = Base.metadata) -> str:
+    """Hash of the SQLite DDL for `metadata` plus the head revision."""
+    dialect = create_engine("sqlite://").dialect  # never connects
+    digest = hashlib.sha256(head_revision().encode())
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    return digest.hexdigest()[:16]
+
+
+class MemoryDatabase:
+    """
+    A named, shared-cache in-memory SQLite database.
+
+    The database lives as long as this object holds its keeper connection;
+    `close()` (or leaving the `with` block) discards it.
+    """
+
+    def __init__(self, name: str, keeper: sqlite3.Connection) -> None:
+        self.name = name
+        self._keeper = keeper
+
+    @property
+    def url(self) -> str:
+        """Async (aiosqlite) URL; every connection sees the same database."""
+        return f"sqlite+aiosqlite:///file:{self.name}?mode=memory&cache=shared&uri=true"
+
+    @property
+    def sync_url(self) -> str:
+        return f"sqlite:///file:{self.name}?mode=memory&cache=shared&uri=true"
+
+    def close(self) -> None:
+        self._keeper.close()
+
+    def __enter__(self) -> "MemoryDatabase":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class SqliteSchemaTemplate:
+    """
+    Cached, fully-built SQLite schema that is cloned per test.
+
+    The template file is named after `schema_fingerprint()`, so changing a
+    model or adding a revision builds a new one; unchanged schemas reuse the
+    file across test runs (and across parallel workers: it is written to a
+    temporary name and renamed into place).
+    """
+
+    def __init__(
+        self, directory: Optional[Path] = None, metadata: MetaData = Base.metadata
+    ) -> None:
+        self.directory = Path(
+            directory or Path(tempfile.gettempdir()) / "schema-templates"
+        )
+        self.metadata = metadata
+        self._path: Optional[Path] = None
+
+    @property
+    def path(self) -> Path:
+        """Template file, built on first use."""
+        if self._path is None:
+            path = (
+                self.directory / f"schema-{schema_fingerprint(self.metadata)}.sqlite3"
+            )
+            if not path.exists():
+                self._build(path)
+            self._path = path
+        return self._path
+
+    def _build(self, path: Path) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        engine = create_engine(f"sqlite:///{tmp}", poolclass=pool.NullPool)
+        try:
+            with engine.begin() as connection:
+                create_schema(connection, self.metadata)
+        finally:
+            engine.dispose()
+        os.replace(tmp, path)
+
+    def _copy_into(self, target: sqlite3.Connection) -> None:
+        source = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            source.backup(target)
+        finally:
+            source.close()
+
+    def clone(self, path: Path) -> str:
+        """Copy the template to `path` (replacing it) and return its async URL."""
+        path = Path(path)
+        path.unlink(missing_ok=True)
+        target = sqlite3.connect(path)
+        try:
+            self._copy_into(target)
+        finally:
+            target.close()
+        return f"sqlite+aiosqlite:///{path}"
+
+    def memory(self, name: Optional[str] = None) -> MemoryDatabase:
+        """Copy the template into a fresh shared-cache in-memory database."""
+        name = name or f"schema-{os.getpid()}-{next(_memory_names)}"
+        keeper = sqlite3.connect(f"file:{name}?mode=memory&cache=shared", uri=True)
+        self._copy_into(keeper)
+        return MemoryDatabase(name, keeper)
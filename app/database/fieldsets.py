@@ -0,0 +1,211 @@
+# app/database/fieldsets.py
+
+"""
+🧩 Sparse fieldsets: load and serialize only the fields a caller asks for.
+
+A selection such as `"id,first_name,role.name,identities.value"` is parsed
+and validated against the mapped model, then turned into:
+
+- `load_only(...)` for the requested columns (plus the keys loading needs)
+- `joinedload` / `selectinload` for requested to-one / to-many relationships,
+  each with its own `load_only(...)`
+- `raiseload("*")` everywhere else, so no unrequested relationship is loaded
+  (this also overrides the models' default `joined` / `selectin` loads)
+
+Selections without relationships can skip the ORM entirely via
+`FieldSelection.columns()` and a plain column `select()`.
+
+Usage:
+    selection = FieldSelection.parse(User, "id,first_name,role.name")
+    stmt = select(User).options(*selection.loader_options())
+    users = (await session.execute(stmt)).unique().scalars().all()
+    payload = [selection.project(user) for user in users]
+"""
+
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import (
+    InstrumentedAttribute,
+    Mapper,
+    joinedload,
+    load_only,
+    raiseload,
+    selectinload,
+)
+from sqlalchemy.sql.base import ExecutableOption
+
+# 🙈 Columns that can never be selected, whatever the model
+HIDDEN_COLUMNS = frozenset({"password_hash", "otp_hash", "lookup_key"})
+
+
+class InvalidFieldError(ValueError):
+    """Raised when a requested field does not exist or may not be selected."""
+
+
+@dataclass
+class FieldSelection:
+    """
+    Validated field selection rooted at one mapped class.
+    """
+
+    mapper: Mapper[Any]
+    # Columns to return, in request order
+    requested: List[str] = field(default_factory=list)
+    # Extra columns loading needs (primary / foreign keys), not returned
+    required: List[str] = field(default_factory=list)
+    relations: Dict[str, "FieldSelection"] = field(default_factory=dict)
+
+    # ---------- parsing ----------
+    @classmethod
+    def parse(
+        cls,
+        model: Type[Any],
+        fields: Union[str, Iterable[str]],
+        max_depth: int = 2,
+        hidden: FrozenSet[str] = HIDDEN_COLUMNS,
+    ) -> "FieldSelection":
+        """
+        Parse a comma-separated (or iterable) list of dotted field paths.
+
+        Raises `InvalidFieldError` for unknown, hidden or too deeply nested
+        fields, and for bare relationship names (`role` instead of `role.name`).
+        """
+        paths = fields.split(",") if isinstance(fields, str) else list(fields)
+        paths = [path.strip() for path in paths if path and path.strip()]
+        if not paths:
+            raise InvalidFieldError("No fields selected")
+        return cls._build(
+            inspect(model), [p.split(".") for p in paths], max_depth, hidden, ""
+        )
+
+    @classmethod
+    def _build(
+        cls,
+        mapper: Mapper[Any],
+        paths: List[List[str]],
+        depth: int,
+        hidden: FrozenSet[str],
+        prefix: str,
+    ) -> "FieldSelection":
+        selection = cls(mapper=mapper)
+        nested: Dict[str, List[List[str]]] = {}
+
+        for head, *rest in paths:
+            dotted = f"{prefix}{head}"
+            if head in mapper.relationships:
+                if not rest:
+                    raise InvalidFieldError(
+                        f"Select fields of '{dotted}', e.g. '{dotted}.id'"
+                    )
+                if depth <= 1:
+                    raise InvalidFieldError(f"'{dotted}' is nested too deeply")
+                nested.setdefault(head, []).append(rest)
+            elif head in mapper.column_attrs and head not in hidden:
+                if rest:
+                    raise InvalidFieldError(f"'{dotted}' is not a relationship")
+                if head not in selection.requested:
+                    selection.requested.append(head)
+            else:
+                raise InvalidFieldError(f"Unknown field '{dotted}'")
+
+        # 🔑 Primary key is always loaded (identity map, relationship loading)
+        for column in mapper.primary_key:
+            key = mapper.get_property_by_column(column).key
+            if key not in selection.requested:
+                selection.required.append(key)
+
+        for name, sub_paths in nested.items():
+            relationship = mapper.relationships[name]
+            sub = cls._build(
+                relationship.mapper, sub_paths, depth - 1, hidden, f"{prefix}{name}."
+            )
+            # 🔗 Keys the loader joins on must be loaded on both sides
+            for local in relationship.local_columns:
+                selection._require(mapper, local)
+            for remote in relationship.remote_side:
+                sub._require(relationship.mapper, remote)
+            selection.relations[name] = sub
+
+        return selection
+
+    def _require(self, mapper: Mapper[Any], column: Any) -> None:
+        if column.table not in mapper.tables:
+            return  # association table column (many-to-many `secondary`)
+        prop = mapper.get_property_by_column(column)
+        if prop.key not in self.requested and prop.key not in self.required:
+            self.required.append(prop.key)
+
+    # ---------- query building ----------
+    def _attributes(self) -> List[InstrumentedAttribute[Any]]:
+        entity = self.mapper.class_
+        return [getattr(entity, key) for key in self.requested + self.required]
+
+    def loader_options(self, skip: Iterable[str] = ()) -> List[ExecutableOption]:
+        """
+        Loader options for `select(<root model>)`. Relationships in `skip`
+        are left unloaded (their join keys still are) for the caller to fill.
+        """
+        entity = self.mapper.class_
+        options: List[ExecutableOption] = [load_only(*self._attributes())]
+        for name, sub in self.relations.items():
+            if name in skip:
+                continue
+            attribute = getattr(entity, name)
+            loader = (
+                selectinload(attribute)
+                if self.mapper.relationships[name].uselist
+                else joinedload(attribute)
+            )
+            # Nested options are loader options too (`load_only`, `raiseload`, …)
+            options.append(loader.options(*cast(List[Any], sub.loader_options())))
+        options.append(raiseload("*"))
+        return options
+
+    @property
+    def columns_only(self) -> bool:
+        """True if no relationship is selected (a plain column select suffices)."""
+        return not self.relations
+
+    def columns(self) -> List[InstrumentedAttribute[Any]]:
+        """Requested columns, for `select(*selection.columns())`."""
+        entity = self.mapper.class_
+        return [getattr(entity, key) for key in self.requested]
+
+    # ---------- serialization ----------
+    def project(self, obj: Any) -> Dict[str, Any]:
+        """Return only the requested fields of a loaded object, recursively."""
+        data = {key: getattr(obj, key) for key in self.requested}
+        for name, sub in self.relations.items():
+            value = getattr(obj, name)
+            if self.mapper.relationships[name].uselist:
+                data[name] = [sub.project(item) for item in value]
+            else:
+                data[name] = None if value is None else sub.project(value)
+        return data
+
+    def project_row(self, row: Mapping[Any, Any]) -> Dict[str, Any]:
+        """Return the requested fields of a column-select row mapping."""
+        return {key: row[key] for key in self.requested}
+
+    @property
+    def paths(self) -> Tuple[str, ...]:
+        """Canonical dotted paths of the requested fields."""
+        nested = tuple(
+            f"{name}.{path}"
+            for name, sub in self.relations.items()
+            for path in sub.paths
+        )
+        return tuple(self.requested) + nested
@@ -0,0 +1,132 @@
+# app/database/id_blocks.py
+
+"""
+🔢 Globally unique primary keys for sharded tables.
+
+Rows of sharded tables (see `app/database/sharding.py`) cannot take their
+IDs from a shard's own autoincrement: two shards would hand out the same
+IDs, and a new user's shard depends on its ID, so that ID must be known
+before the INSERT. Instead, `IdAllocator` reserves blocks of IDs on the
+global database's `id_block` table (the hi/lo scheme) and hands them out
+from memory:
+
+- one short transaction of its own per `shard_id_block_size` IDs, so a
+  reservation survives a rollback of the caller and no block is ever
+  handed out twice (IDs left unused are gaps, never duplicates)
+- on SQLite, where that transaction would wait on the database write lock
+  the caller may already hold, the exact IDs needed are reserved inside
+  the caller's transaction instead (nothing is kept for later)
+
+Migration `0010` seeds each table's counter above its current largest ID.
+"""
+
+import os
+from functools import lru_cache
+from typing import Dict, List, Tuple, cast
+
+from sqlalchemy import BigInteger, Connection, String, Table, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.api.config.settings import settings
+from app.database.base import Base
+from app.database.sharding import ShardRoutingError
+
+
+# --------------------------------------
+# 🔢 IdBlock Table Definition
+# --------------------------------------
+class IdBlock(Base):
+    """
+    The `id_block` table keeps the next unreserved ID per sharded table
+    (global database only).
+    """
+
+    __tablename__ = "id_block"
+
+    # 🏷️ Sharded table the IDs are for (e.g. 'user')
+    name: Mapped[str] = mapped_column(
+        String(64), primary_key=True, doc="Table the IDs are allocated for"
+    )
+
+    # 🔢 First ID not yet reserved by any process
+    next_id: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, doc="First unreserved ID"
+    )
+
+
+_blocks = cast(Table, IdBlock.__table__)
+
+
+def _bump(connection: Connection, name: str, size: int) -> int:
+    """Reserve `size` IDs for `name` on `connection`; returns the new `next_id`."""
+    # UPDATE first: it takes the row (MySQL) / write (SQLite) lock
+    bumped = connection.execute(
+        update(_blocks)
+        .where(_blocks.c.name == name)
+        .values(next_id=_blocks.c.next_id + size)
+    ).rowcount
+    if not bumped:
+        connection.execute(insert(_blocks).values(name=name, next_id=1 + size))
+    return int(
+        connection.execute(
+            select(_blocks.c.next_id).where(_blocks.c.name == name)
+        ).scalar_one()
+    )
+
+
+# --------------------------------------
+# 🔢 Allocator
+# --------------------------------------
+class IdAllocator:
+    """
+    Hands out primary keys for sharded tables from blocks reserved on the
+    global database. A forked child drops the block it inherited.
+    """
+
+    def __init__(self, block_size: int = 1000) -> None:
+        self.block_size = block_size
+        self._blocks: Dict[str, Tuple[int, int]] = {}
+        self._pid = os.getpid()
+
+    def allocate(self, engine: Engine, name: str, count: int) -> List[int]:
+        """`count` fresh IDs for table `name`, reserving blocks via `engine` as needed."""
+        if os.getpid() != self._pid:
+            self._blocks.clear()
+            self._pid = os.getpid()
+        ids: List[int] = []
+        while len(ids) < count:
+            next_id, end = self._blocks.get(name, (0, 0))
+            if next_id >= end:
+                next_id, end = self._reserve(
+                    engine, name, max(self.block_size, count - len(ids))
+                )
+            take = min(count - len(ids), end - next_id)
+            ids.extend(range(next_id, next_id + take))
+            self._blocks[name] = (next_id + take, end)
+        return ids
+
+    def allocate_in(self, connection: Connection, name: str, count: int) -> List[int]:
+        """
+        `count` fresh IDs for table `name`, reserved in the transaction of
+        `connection` (they are only spent if that transaction commits).
+        """
+        end = _bump(connection, name, count)
+        return list(range(end - count, end))
+
+    def _reserve(self, engine: Engine, name: str, size: int) -> Tuple[int, int]:
+        for _ in range(2):
+            try:
+                with engine.begin() as connection:
+                    end = _bump(connection, name, size)
+                return end - size, end
+            except IntegrityError:
+                continue  # another process created the row first
+        raise ShardRoutingError(f"Could not reserve IDs for '{name}'")
+
+
+@lru_cache(maxsize=1)
+def get_id_allocator() -> IdAllocator:
+    """Return the process-wide ID allocator."""
+    return IdAllocator(settings.shard_id_block_size)
@@ -0,0 +1,270 @@
+# app/database/index_audit.py
+
+"""
+🔎 Index audit: compare declared indexes with the live database.
+
+The audit walks every table registered on `Base.metadata`, reflects the
+indexes that actually exist in the connected database and reports:
+
+- Indexes declared on the models but missing in the database (and vice versa)
+- On-disk index size, where the backend exposes it
+- Usage statistics (number of index scans), where the backend exposes it
+- Indexes whose leading column is a boolean flag (low selectivity)
+
+Supported statistics sources:
+- SQLite: the `dbstat` virtual table (sizes only; SQLite keeps no usage stats)
+- MySQL: `mysql.innodb_index_stats` (sizes) and
+  `performance_schema.table_io_waits_summary_by_index_usage` (usage)
+
+Statistics are best-effort: if a source is unavailable (compile options,
+missing grants) the corresponding report fields are simply `None`.
+"""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Boolean, MetaData, Table, UniqueConstraint, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Key used to look up per-index statistics: (table name, index name)
+IndexKey = Tuple[str, str]
+
+
+# --------------------------------------
+# 📋 Report row
+# --------------------------------------
+@dataclass
+class IndexReport:
+    """
+    Audit result for a single index or unique constraint.
+
+    `status` is one of:
+    - "ok": declared on the models and present in the database
+    - "missing_in_db": declared on the models but absent from the database
+    - "not_in_metadata": present in the database but unknown to the models
+    """
+
+    table: str
+    name: Optional[str]
+    columns: List[str]
+    unique: bool
+    status: str
+    size_bytes: Optional[int] = None
+    scans: Optional[int] = None
+    warnings: List[str] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the report row as a plain dictionary (for JSON output)."""
+        return asdict(self)
+
+
+# --------------------------------------
+# 📐 Declared (metadata) indexes
+# --------------------------------------
+def _declared_indexes(table: Table) -> List[Tuple[Optional[str], List[str], bool]]:
+    """
+    Return `(name, columns, unique)` for every index and unique constraint
+    declared on a metadata table.
+    """
+    declared: List[Tuple[Optional[str], List[str], bool]] = []
+    for index in table.indexes:
+        declared.append(
+            (index.name, [col.name for col in index.columns], bool(index.unique))
+        )
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint):
+            # `name` may be the unnamed-constraint sentinel rather than None
+            name = constraint.name if isinstance(constraint.name, str) else None
+            declared.append((name, [col.name for col in constraint.columns], True))
+    return declared
+
+
+def _low_selectivity_warnings(table: Table, columns: List[str]) -> List[str]:
+    """
+    Flag indexes whose leading column is a boolean.
+
+    A two-valued leading column is almost never selective enough for the
+    planner to choose the index, while every write still pays to maintain it.
+    """
+    if not columns or columns[0] not in table.c:
+        return []
+    if isinstance(table.c[columns[0]].type, Boolean):
+        return [f"leading column '{columns[0]}' is a boolean flag (low selectivity)"]
+    return []
+
+
+# --------------------------------------
+# 📊 Backend statistics (best-effort)
+# --------------------------------------
+def _sqlite_sizes(conn: Connection) -> Dict[str, int]:
+    """Index sizes in bytes from SQLite's `dbstat` virtual table."""
+    rows = conn.execute(
+        text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+    ).all()
+    return {str(name): int(size) for name, size in rows}
+
+
+def _sqlite_autoindex_names(conn: Connection, table: str) -> Dict[Tuple[str, ...], str]:
+    """
+    Map column tuples to SQLite's internal `sqlite_autoindex_*` names.
+
+    SQLite backs unnamed/inline unique constraints with automatic indexes that
+    reflection does not report by name; sizes are stored under these names.
+    """
+    mapping: Dict[Tuple[str, ...], str] = {}
+    for row in conn.execute(text(f'PRAGMA index_list("{table}")')).all():
+        index_name = str(row[1])
+        if not index_name.startswith("sqlite_autoindex_"):
+            continue
+        cols = conn.execute(text(f'PRAGMA index_info("{index_name}")')).all()
+        mapping[tuple(str(col[2]) for col in cols)] = index_name
+    return mapping
+
+
+def _mysql_sizes(conn: Connection) -> Dict[IndexKey, int]:
+    """Index sizes in bytes from InnoDB persistent statistics."""
+    rows = conn.execute(
+        text(
+            "SELECT table_name, index_name, stat_value * @@innodb_page_size "
+            "FROM mysql.innodb_index_stats "
+            "WHERE database_name = DATABASE() AND stat_name = 'size'"
+        )
+    ).all()
+    return {(str(t), str(i)): int(size) for t, i, size in rows}
+
+
+def _mysql_scans(conn: Connection) -> Dict[IndexKey, int]:
+    """Index read counts from the performance schema."""
+    rows = conn.execute(
+        text(
+            "SELECT object_name, index_name, count_read "
+            "FROM performance_schema.table_io_waits_summary_by_index_usage "
+            "WHERE object_schema = DATABASE() AND index_name IS NOT NULL"
+        )
+    ).all()
+    return {(str(t), str(i)): int(count) for t, i, count in rows}
+
+
+def _safe(fn: Any, conn: Connection) -> Any:
+    """
+    Run a statistics query, returning `None` if the backend refuses it.
+
+    A savepoint keeps a failed query from poisoning the outer transaction.
+    """
+    try:
+        with conn.begin_nested():
+            return fn(conn)
+    except DBAPIError:
+        return None
+
+
+# --------------------------------------
+# 🧮 Audit
+# --------------------------------------
+def audit_indexes(conn: Connection, metadata: MetaData) -> List[IndexReport]:
+    """
+    Audit all metadata tables against the database behind `conn`.
+
+    Intended to be called through `AsyncConnection.run_sync`.
+    """
+    dialect = conn.dialect.name
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+
+    sqlite_sizes: Optional[Dict[str, int]] = None
+    mysql_sizes: Optional[Dict[IndexKey, int]] = None
+    mysql_scans: Optional[Dict[IndexKey, int]] = None
+    if dialect == "sqlite":
+        sqlite_sizes = _safe(_sqlite_sizes, conn)
+    elif dialect == "mysql":
+        mysql_sizes = _safe(_mysql_sizes, conn)
+        mysql_scans = _safe(_mysql_scans, conn)
+
+    reports: List[IndexReport] = []
+    for table in sorted(metadata.tables.values(), key=lambda t: t.name):
+        declared = _declared_indexes(table)
+
+        if table.name not in existing_tables:
+            for name, columns, unique in declared:
+                reports.append(
+                    IndexReport(table.name, name, columns, unique, "missing_in_db")
+                )
+            continue
+
+        # 🔍 Reflect what actually exists
+        reflected: List[Tuple[Optional[str], List[str], bool]] = [
+            (ix["name"], [c for c in ix["column_names"] if c], bool(ix["unique"]))
+            for ix in inspector.get_indexes(table.name)
+            # MySQL reports unique constraints as indexes too; keep one copy
+            if "duplicates_constraint" not in ix
+        ]
+        reflected += [
+            (uc["name"], list(uc["column_names"]), True)
+            for uc in inspector.get_unique_constraints(table.name)
+        ]
+        autoindexes = (
+            _sqlite_autoindex_names(conn, table.name) if dialect == "sqlite" else {}
+        )
+
+        declared_names = {name for name, _, _ in declared if name}
+        declared_unique_cols = {tuple(cols) for _, cols, unique in declared if unique}
+        reflected_names = {name for name, _, _ in reflected if name}
+        reflected_unique_cols = {tuple(cols) for _, cols, unique in reflected if unique}
+
+        for name, columns, unique in reflected:
+            known = (name in declared_names) or (
+                unique and tuple(columns) in declared_unique_cols
+            )
+            storage_name = name
+            if unique and tuple(columns) in autoindexes:
+                storage_name = autoindexes[tuple(columns)]
+
+            size: Optional[int] = None
+            scans: Optional[int] = None
+            if sqlite_sizes is not None and storage_name:
+                size = sqlite_sizes.get(storage_name)
+            if mysql_sizes is not None and storage_name:
+                size = mysql_sizes.get((table.name, storage_name))
+            if mysql_scans is not None and storage_name:
+                scans = mysql_scans.get((table.name, storage_name))
+
+            reports.append(
+                IndexReport(
+                    table=table.name,
+                    name=name,
+                    columns=columns,
+                    unique=unique,
+                    status="ok" if known else "not_in_metadata",
+                    size_bytes=size,
+                    scans=scans,
+                    warnings=_low_selectivity_warnings(table, columns),
+                )
+            )
+
+        for name, columns, unique in declared:
+            present = (name in reflected_names) or (
+                unique and tuple(columns) in reflected_unique_cols
+            )
+            if not present:
+                reports.append(
+                    IndexReport(
+                        table=table.name,
+                        name=name,
+                        columns=columns,
+                        unique=unique,
+                        status="missing_in_db",
+                        warnings=_low_selectivity_warnings(table, columns),
+                    )
+                )
+
+    return reports
+
+
+async def run_index_audit(engine: AsyncEngine, metadata: MetaData) -> List[IndexReport]:
+    """
+    Async entrypoint: open a connection and run `audit_indexes`.
+    """
+    async with engine.connect() as conn:
+        return await conn.run_sync(audit_indexes, metadata)
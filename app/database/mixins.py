@@ -8,13 +8,15 @@ This module defines a reusable TimestampMixin class that:
 - Enables soft-deletion via `deleted_at`
 - Ensures consistent auditability across all tables in your database
 - Designed for SQLAlchemy 2.0-style `Mapped` annotations
+
+and an opt-in VersionedMixin for optimistic concurrency control.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from sqlalchemy import DateTime, ForeignKey, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Integer, Table, func
+from sqlalchemy.orm import Mapped, declared_attr, mapped_column
 
 
 # --------------------------------------
@@ -52,16 +54,17 @@ class TimestampMixin:
         doc="Timestamp when the record was last updated",
     )
 
-    # 👤 Optional user ID of the creator (FK to user.id)
+    # 👤 Optional user ID of the creator (no FK: the user may live on
+    # another shard; users are soft-deleted, so the ID stays meaningful)
     created_by: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("user.id", ondelete="SET NULL"),
+        Integer,
         nullable=True,
         doc="User ID of the record creator",
     )
 
-    # 🛠️ Optional user ID of the last modifier (FK to user.id)
+    # 🛠️ Optional user ID of the last modifier (no FK, as above)
     updated_by: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("user.id", ondelete="SET NULL"),
+        Integer,
         nullable=True,
         doc="User ID of the last record updater",
     )
@@ -71,3 +74,36 @@ class TimestampMixin:
         nullable=True,
         doc="Soft-delete marker; timestamp when the record was logically deleted",
     )
+
+
+# --------------------------------------
+# 🔢 Mixin for optimistic concurrency
+# --------------------------------------
+class VersionedMixin:
+    """
+    Adds a `version_id` counter wired as SQLAlchemy's `version_id_col`.
+
+    Every ORM UPDATE becomes `… WHERE id = :id AND version_id = :expected` and
+    increments the counter; if another writer got there first, no row matches
+    and the flush raises `StaleDataError`. Writers never take row locks.
+
+    Set-based Core UPDATEs must bump it themselves:
+        .values(..., version_id=Model.version_id + 1)
+
+    Usage:
+        class MyModel(Base, TimestampMixin, VersionedMixin):
+            ...
+    """
+
+    # 🔢 Row version, incremented on every UPDATE
+    version_id: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        server_default="1",
+        doc="Row version for optimistic concurrency (ETag)",
+    )
+
+    @declared_attr.directive
+    def __mapper_args__(cls) -> Dict[str, Any]:
+        table: Table = getattr(cls, "__table__")  # set on the mapped subclass
+        return {"version_id_col": table.c.version_id}
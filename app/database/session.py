@@ -0,0 +1,186 @@
+# app/database/session.py
+
+"""
+⚙️ Async engine and session factory.
+
+This module is the single place where the application builds its
+SQLAlchemy `AsyncEngine` and `AsyncSession` factory from `settings`.
+
+- Engines are created lazily so importing models never opens a connection
+- Scripts and tools can build ad-hoc engines for other URLs via `create_engine`
+- SQLite engines get the connection PRAGMA profile from `app/database/sqlite.py`
+- With `sqlite_session_mode = "single_writer"`, sessions read from a pool of
+  read-only connections and write through one writer connection
+- With `shard_urls` set, sessions route user rows across the shard engines
+  and everything else to `database_url` (see `app/database/sharding.py`)
+"""
+
+from dataclasses import replace
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.api.config.settings import settings
+from app.database.id_blocks import get_id_allocator
+from app.database.sharding import (
+    GLOBAL_SHARD,
+    ShardRoutingSession,
+    shard_map_from_settings,
+    sharding_enabled,
+)
+from app.database.sqlite import (
+    SESSION_MODES,
+    RoutingSession,
+    SqlitePragmas,
+    install_single_writer,
+    install_sqlite_pragmas,
+)
+from app.database.write_queue import WriteQueue
+
+
+# --------------------------------------
+# 🏗️ Engine construction
+# --------------------------------------
+def create_engine(
+    url: Optional[str] = None,
+    sqlite_pragmas: Optional[SqlitePragmas] = None,
+    **kwargs: Any,
+) -> AsyncEngine:
+    """
+    Build a new async engine.
+
+    Args:
+        url: Database URL; defaults to `settings.database_url`.
+        sqlite_pragmas: PRAGMA profile for SQLite URLs; defaults to
+            `SqlitePragmas.from_settings()` if `settings.sqlite_pragmas_enabled`.
+        **kwargs: Extra keyword arguments forwarded to `create_async_engine`.
+    """
+    url = url or settings.database_url
+    pragmas = sqlite_pragmas
+    engine = create_async_engine(url, **kwargs)
+    if make_url(url).get_backend_name() == "sqlite":
+        if pragmas is None and settings.sqlite_pragmas_enabled:
+            pragmas = SqlitePragmas.from_settings()
+        if pragmas is not None:
+            install_sqlite_pragmas(engine.sync_engine, pragmas)
+    return engine
+
+
+def single_writer_enabled() -> bool:
+    """True if `settings` select SQLite single-writer mode for a SQLite URL."""
+    if settings.sqlite_session_mode not in SESSION_MODES:
+        raise ValueError(
+            f"Unknown sqlite_session_mode '{settings.sqlite_session_mode}'"
+        )
+    return (
+        settings.sqlite_session_mode == "single_writer"
+        and make_url(settings.database_url).get_backend_name() == "sqlite"
+    )
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """
+    Return the process-wide engine for `settings.database_url`.
+
+    In single-writer mode this is the writer: one connection, transactions
+    opened with `BEGIN IMMEDIATE`, other writers waiting in the pool.
+    """
+    if not single_writer_enabled():
+        return create_engine()
+    engine = create_engine(
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.sqlite_write_timeout_seconds,
+    )
+    install_single_writer(engine.sync_engine)
+    return engine
+
+
+@lru_cache(maxsize=1)
+def get_read_engine() -> AsyncEngine:
+    """
+    Return the engine for reads: `get_engine()`, or in single-writer mode a
+    pool of `query_only` connections.
+    """
+    if not single_writer_enabled():
+        return get_engine()
+    get_engine()  # 🪶 writer first: it switches the file to WAL
+    return create_engine(
+        sqlite_pragmas=replace(
+            SqlitePragmas.from_settings(), journal_mode=None, query_only=True
+        ),
+        pool_size=settings.sqlite_read_pool_size,
+        max_overflow=0,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_shard_engines() -> Dict[str, AsyncEngine]:
+    """
+    Return `{shard name: engine}` for `settings.shard_urls`, plus
+    `get_engine()` under `GLOBAL_SHARD` (only that one when sharding is off).
+    """
+    engines = {GLOBAL_SHARD: get_engine()}
+    for name, url in settings.shard_urls.items():
+        engines[name] = create_engine(url)
+    return engines
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """
+    Return the process-wide `AsyncSession` factory bound to `get_engine()`
+    (routing reads to `get_read_engine()` in single-writer mode, and user
+    rows to `get_shard_engines()` when sharded).
+    """
+    if sharding_enabled():
+        return async_sessionmaker(
+            sync_session_class=ShardRoutingSession,
+            shards={name: e.sync_engine for name, e in get_shard_engines().items()},
+            shard_map=shard_map_from_settings(),
+            allocator=get_id_allocator(),
+            expire_on_commit=False,
+            twophase=settings.shard_twophase,
+        )
+    if single_writer_enabled():
+        return async_sessionmaker(
+            sync_session_class=RoutingSession,
+            writer=get_engine().sync_engine,
+            reader=get_read_engine().sync_engine,
+            expire_on_commit=False,
+        )
+    return async_sessionmaker(get_engine(), expire_on_commit=False)
+
+
+async def dispose_engines() -> None:
+    """Close the pools of every process-wide engine (shutdown, before a fork)."""
+    await get_read_engine().dispose()
+    for engine in get_shard_engines().values():
+        await engine.dispose()
+
+
+@lru_cache(maxsize=1)
+def get_write_queue() -> WriteQueue:
+    """Return the process-wide group-commit write queue."""
+    return WriteQueue.from_settings(get_sessionmaker())
+
+
+# --------------------------------------
+# 🔁 Session scope helper
+# --------------------------------------
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """
+    Yield a session and close it afterwards.
+
+    Suitable as a FastAPI dependency or an `asynccontextmanager` body.
+    """
+    async with get_sessionmaker()() as session:
+        yield session
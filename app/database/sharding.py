@@ -0,0 +1,471 @@
+# app/database/sharding.py
+
+"""
+🧩 Horizontal sharding of user tables by user ID.
+
+With `settings.shard_urls` set, every table whose `info` names a
+`shard_key` (`user`, `user_auth`, `user_identity` and the search index) is
+partitioned across those databases by user ID, and `settings.database_url`
+becomes the *global* database that holds everything else. Tables marked
+`info={"replicated": True}` (`role`, `privilege`, `role_privilege`) are
+written to the global database only, and every shard keeps a copy so user
+rows can reference and join them locally (see
+`services/shard_replication.py`). All databases share one schema and
+revision chain.
+
+- `HashShardMap` / `RangeShardMap`: user ID → shard name (consistent hash
+  ring with virtual nodes, or contiguous ID ranges)
+- primary keys of sharded tables come from blocks reserved on the global
+  database (`IdAllocator`, `app/database/id_blocks.py`), never from a
+  shard's own autoincrement, so IDs are unique across shards and a new
+  user's shard is known before its first INSERT
+- `ShardRoutingSession`: a `ShardedSession` that picks the database per row
+  and per statement:
+  - flushes: sharded rows go to the shard of their key, replicated and
+    global rows to the global database
+  - statements: top-level `key == x` / `key IN (...)` criteria on a
+    sharded table pick its shards; columns with a registered resolver are
+    looked up on the global database first (identity lookup key → user ID);
+    anything else runs on every shard and the results are concatenated
+  - `session.connection()` without a mapper is the global database
+- `fetch_page` / `merge_aggregates`: pagination and aggregates that stay
+  correct when a statement fans out to several shards
+
+Writes to a shard and to the global database in one session commit one
+after the other; with `shard_twophase` (MySQL) they commit with XA.
+"""
+
+import bisect
+import hashlib
+from collections import namedtuple
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
+
+from sqlalchemy import Column, Connection, MetaData, Row, Select, Table, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import Mapper, ORMExecuteState, Session, UOWTransaction
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import (
+    BinaryExpression,
+    BindParameter,
+    BooleanClauseList,
+    ClauseElement,
+)
+from sqlalchemy.sql.util import find_tables
+
+from app.api.config.settings import settings
+
+if TYPE_CHECKING:
+    from app.database.id_blocks import IdAllocator
+
+GLOBAL_SHARD = "global"
+SHARD_STRATEGIES = ("hash", "range")
+
+# Maps filter values of a column to shard keys, using the global database
+Resolver = Callable[[Connection, Sequence[Any]], Iterable[int]]
+
+
+class ShardRoutingError(RuntimeError):
+    """Raised when a row or statement cannot be routed to a shard."""
+
+
+# --------------------------------------
+# 🏷️ Table roles
+# --------------------------------------
+def shard_key(table: Any) -> Optional[Column[Any]]:
+    """The column `table` is sharded by (`info["shard_key"]`), or None."""
+    table = getattr(table, "element", table)  # aliases
+    name = getattr(table, "info", {}).get("shard_key")
+    return table.c[name] if name else None
+
+
+def is_replicated(table: Any) -> bool:
+    """True for reference tables copied from the global database to every shard."""
+    return bool(getattr(table, "info", {}).get("replicated"))
+
+
+def replicated_tables(metadata: MetaData) -> List[Table]:
+    """Replicated tables of `metadata`, parents before children."""
+    return [table for table in metadata.sorted_tables if is_replicated(table)]
+
+
+# --------------------------------------
+# 🗺️ Shard maps
+# --------------------------------------
+def _ring_hash(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class ShardMap:
+    """User ID → shard name."""
+
+    shards: Tuple[str, ...] = ()
+
+    def shard_for(self, key: int) -> str:
+        raise NotImplementedError
+
+    def group(self, keys: Iterable[int]) -> Dict[str, List[int]]:
+        """`keys` grouped by shard."""
+        groups: Dict[str, List[int]] = {}
+        for key in keys:
+            groups.setdefault(self.shard_for(key), []).append(key)
+        return groups
+
+
+class HashShardMap(ShardMap):
+    """
+    Consistent hashing: every shard owns `virtual_nodes` points on a 64-bit
+    ring and a key belongs to the first point at or after its own hash.
+
+    Adding or removing one shard moves only the keys of its ring segments
+    (about 1/N of them); virtual nodes keep the segments evenly sized.
+    """
+
+    def __init__(self, shards: Iterable[str], virtual_nodes: int = 128) -> None:
+        self.shards = tuple(sorted(shards))
+        if not self.shards:
+            raise ValueError("A shard map needs at least one shard")
+        ring = sorted(
+            (_ring_hash(f"{name}#{point}".encode()), name)
+            for name in self.shards
+            for point in range(virtual_nodes)
+        )
+        self._points = [point for point, _ in ring]
+        self._owners = [name for _, name in ring]
+
+    def shard_for(self, key: int) -> str:
+        index = bisect.bisect_left(self._points, _ring_hash(str(int(key)).encode()))
+        return self._owners[index % len(self._owners)]
+
+
+class RangeShardMap(ShardMap):
+    """
+    Contiguous ranges: a shard holds the IDs from its first ID up to the
+    next shard's first ID (the last shard: everything above).
+    """
+
+    def __init__(self, first_ids: Dict[str, int]) -> None:
+        bounds = sorted((first, name) for name, first in first_ids.items())
+        if not bounds or bounds[0][0] > 1:
+            raise ValueError("Shard ranges must start at user ID 1 (or lower)")
+        self.shards = tuple(name for _, name in bounds)
+        self._firsts = [first for first, _ in bounds]
+
+    def shard_for(self, key: int) -> str:
+        return self.shards[max(bisect.bisect_right(self._firsts, int(key)) - 1, 0)]
+
+
+def sharding_enabled() -> bool:
+    """True if `settings.shard_urls` configures any shard."""
+    return bool(settings.shard_urls)
+
+
+def shard_map_from_settings() -> ShardMap:
+    """The shard map configured by `settings.shard_*`."""
+    if GLOBAL_SHARD in settings.shard_urls:
+        raise ValueError(f"'{GLOBAL_SHARD}' is reserved for the global database")
+    if settings.shard_strategy == "hash":
+        return HashShardMap(settings.shard_urls, settings.shard_virtual_nodes)
+    if settings.shard_strategy == "range":
+        if set(settings.shard_ranges) != set(settings.shard_urls):
+            raise ValueError("shard_ranges must name exactly the shards in shard_urls")
+        return RangeShardMap(settings.shard_ranges)
+    raise ValueError(
+        f"Unknown shard_strategy '{settings.shard_strategy}' (one of {SHARD_STRATEGIES})"
+    )
+
+
+# --------------------------------------
+# 🧭 Routing session
+# --------------------------------------
+_resolvers: Dict[Tuple[str, str], Resolver] = {}
+
+
+def register_shard_resolver(column: Column[Any], resolver: Resolver) -> None:
+    """
+    Route statements filtering on `column` (`== x` / `IN (...)`) through
+    `resolver`, which maps the filter values to shard keys on the global
+    database (e.g. identity lookup key → user ID).
+    """
+    _resolvers[(column.table.name, column.name)] = resolver
+
+
+def _conjuncts(clause: Any) -> List[Any]:
+    if clause is None:
+        return []
+    if isinstance(clause, BooleanClauseList) and clause.operator is operators.and_:
+        return [part for inner in clause.clauses for part in _conjuncts(inner)]
+    return [clause]
+
+
+class ShardRoutingSession(ShardedSession):
+    """
+    Session over the global database and the user shards.
+
+    Used as `async_sessionmaker(sync_session_class=ShardRoutingSession,
+    shards=..., shard_map=..., allocator=...)` with sync engines
+    (`AsyncEngine.sync_engine`), the global one under `GLOBAL_SHARD`.
+    """
+
+    def __init__(
+        self,
+        shards: Dict[str, Engine],
+        shard_map: ShardMap,
+        allocator: "IdAllocator",
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            shard_chooser=self._shard_for_row,
+            identity_chooser=self._shards_for_identity,
+            execute_chooser=self._shards_for_statement,
+            shards=shards,
+            **kwargs,
+        )
+        self.shard_map = shard_map
+        self.allocator = allocator
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        *,
+        shard_id: Optional[str] = None,
+        instance: Any = None,
+        clause: Any = None,
+        **kwargs: Any,
+    ) -> Any:
+        if shard_id is None and mapper is None and instance is None:
+            shard_id = GLOBAL_SHARD  # `session.connection()`, dialect checks
+        return super().get_bind(
+            mapper, shard_id=shard_id, instance=instance, clause=clause, **kwargs
+        )
+
+    def connection_callable(
+        self,
+        mapper: Optional[Mapper[Any]] = None,
+        instance: Any = None,
+        shard_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Connection:
+        if mapper is not None and is_replicated(mapper.local_table):
+            shard_id = GLOBAL_SHARD  # even if loaded from a shard's copy
+        return super().connection_callable(
+            mapper, instance, shard_id=shard_id, **kwargs
+        )
+
+    def connection_for_shard(self, shard_id: str) -> Connection:
+        """The connection to `shard_id` in this session's transaction."""
+        return self.connection(bind_arguments={"shard_id": shard_id})
+
+    # 🧭 Choosers
+    def _shard_for_row(
+        self, mapper: Optional[Mapper[Any]], instance: Any, clause: Any = None
+    ) -> str:
+        key = shard_key(mapper.local_table) if mapper is not None else None
+        if mapper is None or key is None:
+            return GLOBAL_SHARD
+        value = None
+        if instance is not None:
+            value = getattr(instance, mapper.get_property_by_column(key).key)
+        if value is None:
+            raise ShardRoutingError(
+                f"A {key.table.name} row needs {key.name} to pick its shard"
+            )
+        return self.shard_map.shard_for(value)
+
+    def _shards_for_identity(
+        self,
+        mapper: Mapper[Any],
+        primary_key: Sequence[Any],
+        *,
+        lazy_loaded_from: Any = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        if lazy_loaded_from is not None and lazy_loaded_from.identity_token is not None:
+            return [lazy_loaded_from.identity_token]
+        key = shard_key(mapper.local_table)
+        if key is None:
+            return [GLOBAL_SHARD]
+        columns = list(mapper.primary_key)
+        if key in columns:
+            return [self.shard_map.shard_for(primary_key[columns.index(key)])]
+        return list(self.shard_map.shards)
+
+    def _shards_for_statement(self, orm_context: ORMExecuteState) -> List[str]:
+        statement = cast(ClauseElement, orm_context.statement)
+        tables = find_tables(statement, include_aliases=True, include_crud=True)
+        if not any(shard_key(table) is not None for table in tables):
+            return [GLOBAL_SHARD]
+        keys = self._routing_keys(statement)
+        if keys is None:
+            if orm_context.is_insert:
+                raise ShardRoutingError(
+                    "INSERTs into sharded tables must go through the ORM"
+                )
+            return list(self.shard_map.shards)
+        shards = sorted({self.shard_map.shard_for(key) for key in keys})
+        return shards or [self.shard_map.shards[0]]  # no key can match: any one shard
+
+    def _routing_keys(self, statement: Any) -> Optional[Set[int]]:
+        """Shard keys the top-level WHERE restricts rows to; None if unrestricted."""
+        keys: Optional[Set[int]] = None
+        for clause in _conjuncts(getattr(statement, "whereclause", None)):
+            found = self._clause_keys(clause)
+            if found is not None:
+                keys = found if keys is None else keys & found
+        return keys
+
+    def _clause_keys(self, clause: Any) -> Optional[Set[int]]:
+        if not (
+            isinstance(clause, BinaryExpression)
+            and isinstance(clause.left, Column)
+            and isinstance(clause.right, BindParameter)
+            and clause.operator in (operators.eq, operators.in_op)
+        ):
+            return None
+        values = clause.right.effective_value
+        if values is None:
+            return None
+        if clause.operator is operators.eq:
+            values = [values]
+        table = getattr(clause.left.table, "element", clause.left.table)
+        key = shard_key(table)
+        if key is not None and clause.left.name == key.name:
+            return {int(value) for value in values}
+        resolver = _resolvers.get((table.name, clause.left.name))
+        if resolver is not None:
+            return set(resolver(self.connection_for_shard(GLOBAL_SHARD), list(values)))
+        return None
+
+
+@event.listens_for(ShardRoutingSession, "before_flush")
+def _allocate_ids(
+    session: Session, flush_context: UOWTransaction, instances: Any
+) -> None:
+    """
+    Give new rows of sharded tables a global primary key, so IDs are unique
+    across shards (`user.id` is also the shard key; identity and auth IDs
+    are addressed directly by OTP and admin flows).
+    """
+    assert isinstance(session, ShardRoutingSession)
+    pending: Dict[str, List[Tuple[Any, str]]] = {}
+    for obj in session.new:
+        mapper = inspect(obj).mapper
+        if shard_key(mapper.local_table) is None or len(mapper.primary_key) != 1:
+            continue
+        attribute = mapper.get_property_by_column(mapper.primary_key[0]).key
+        if getattr(obj, attribute) is None:
+            pending.setdefault(mapper.local_table.name, []).append((obj, attribute))
+    if not pending:
+        return
+    engine = session.get_bind(shard_id=GLOBAL_SHARD)
+    for name, objs in pending.items():
+        if engine.dialect.name == "sqlite":
+            # A separate transaction would wait on the write lock this one may hold
+            ids = session.allocator.allocate_in(
+                session.connection_for_shard(GLOBAL_SHARD), name, len(objs)
+            )
+        else:
+            ids = session.allocator.allocate(engine, name, len(objs))
+        for (obj, attribute), new_id in zip(objs, ids):
+            setattr(obj, attribute, new_id)
+
+
+# --------------------------------------
+# 🔀 Cross-shard helpers
+# --------------------------------------
+def is_sharded(session: Any) -> bool:
+    """True for a (sync or async) session over shards."""
+    return isinstance(getattr(session, "sync_session", session), ShardRoutingSession)
+
+
+def shard_connections(
+    session: Session, keys: Iterable[int]
+) -> Iterator[Tuple[Connection, List[int]]]:
+    """
+    `(connection, keys)` per database holding rows of `keys`, in the
+    session's transaction (one pair, the session's own connection, when
+    not sharded). For flush hooks writing rows that live with their user.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    if not isinstance(session, ShardRoutingSession):
+        yield session.connection(), keys
+        return
+    for shard, group in session.shard_map.group(keys).items():
+        yield session.connection_for_shard(shard), group
+
+
+async def fetch_page(
+    session: AsyncSession,
+    stmt: Select[Any],
+    offset: int,
+    limit: int,
+    key: Callable[[Row[Any]], Any],
+    unique: bool = False,
+) -> List[Row[Any]]:
+    """
+    Rows `offset` … `offset + limit` of the ordered `stmt`.
+
+    Sharded, every shard returns its own first `offset + limit` rows and the
+    page is cut after sorting them by `key`, which must follow the ORDER BY.
+    Deep offsets cost more per shard; keyset pagination (`WHERE id > last`,
+    offset 0) stays cheap. `unique` de-duplicates joined-eager entity rows.
+    """
+    sharded = is_sharded(session)
+    stmt = stmt.limit(offset + limit) if sharded else stmt.offset(offset).limit(limit)
+    result = await session.execute(stmt)
+    rows = list((result.unique() if unique else result).all())
+    if sharded:
+        rows = sorted(rows, key=key)[offset : offset + limit]
+    return rows
+
+
+@lru_cache(maxsize=64)
+def _aggregate_row(fields: Tuple[str, ...]) -> Any:
+    return namedtuple("Aggregates", fields)
+
+
+def merge_aggregates(
+    rows: Sequence[Row[Any]], sums: Optional[Iterable[str]] = None
+) -> Optional[Row[Any]]:
+    """
+    Fold one aggregate row per shard into one: the `sums` fields (default:
+    every `*_count` / `*_versions` field) are added up, every other field
+    takes the largest non-NULL value. Aggregates over replicated tables,
+    equal on every shard, belong in the second group.
+
+    A single row (one database) is returned as is; no rows give None.
+    """
+    if len(rows) <= 1:
+        return rows[0] if rows else None
+    fields = tuple(rows[0]._fields)
+    summed = (
+        set(sums)
+        if sums is not None
+        else {name for name in fields if name.endswith(("_count", "_versions"))}
+    )
+    merged = []
+    for index, name in enumerate(fields):
+        values = [row[index] for row in rows if row[index] is not None]
+        if name in summed:
+            merged.append(sum(values))
+        else:
+            merged.append(max(values) if values else None)
+    # A named tuple: the same attribute / index access as a `Row`
+    return cast(Row[Any], _aggregate_row(fields)(*merged))
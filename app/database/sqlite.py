@@ -0,0 +1,178 @@
+# app/database/sqlite.py
+
+"""
+🪶 SQLite connection profile (PRAGMAs applied on every new connection).
+
+SQLite keeps most tuning per connection, and its defaults suit embedded use
+rather than a server: rollback journal, `synchronous=FULL`, a 2 MiB page
+cache, no busy wait (concurrent writers fail at once with "database is
+locked") and foreign keys *off*, so `ondelete=` rules are not enforced.
+
+`install_sqlite_pragmas` hooks the engine's `connect` event and runs:
+
+- `journal_mode=WAL`: readers never block the writer and vice versa; commits
+  append to the WAL instead of rewriting the database file (persistent, set
+  once per file but re-asserted cheaply)
+- `synchronous=NORMAL`: fsync at checkpoints instead of every commit. Safe
+  against corruption in WAL mode; a power loss may drop the last commits
+- `busy_timeout`: wait for the write lock instead of failing immediately
+- `cache_size` / `mmap_size`: larger page cache and memory-mapped reads
+- `foreign_keys=ON`: enforce `CASCADE` / `SET NULL` / `RESTRICT`
+
+`app/database/session.create_engine` installs it for every SQLite URL,
+configured via `Settings.sqlite_*`. Alembic's `env.py` does not:
+batch migrations recreate tables and must run with foreign keys off.
+
+Single-writer mode (`sqlite_session_mode = "single_writer"`, file databases
+only): SQLite allows one writer at a time, and aiosqlite gives every pooled
+connection its own thread, so concurrent writers on a normal pool mostly
+wait on (or fail with) "database is locked". Instead:
+
+- one writer connection (`pool_size=1`): transactions start with
+  `BEGIN IMMEDIATE`, and waiting writers queue in the pool, in order, rather
+  than spinning on the SQLite lock
+- a pool of `query_only` reader connections; in WAL mode they read a
+  consistent snapshot while the writer commits
+- `RoutingSession` sends SELECTs to a reader and everything else (flushes,
+  DML, DDL, `text()`, bare `session.connection()`) to the writer. After its
+  first write it stays on the writer until the transaction ends, so it
+  reads its own writes
+"""
+
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.api.config.settings import settings
+
+SESSION_MODES = ("pool", "single_writer")
+
+
+@dataclass(frozen=True, slots=True)
+class SqlitePragmas:
+    """PRAGMA values for new SQLite connections."""
+
+    journal_mode: Optional[str] = "WAL"  # None: leave unchanged (reader connections)
+    synchronous: str = "NORMAL"
+    busy_timeout_ms: int = 5000
+    cache_size_kib: int = 64 * 1024
+    mmap_size_bytes: int = 256 * 1024 * 1024
+    foreign_keys: bool = True
+    query_only: bool = False
+
+    @classmethod
+    def from_settings(cls) -> "SqlitePragmas":
+        return cls(
+            journal_mode=settings.sqlite_journal_mode,
+            synchronous=settings.sqlite_synchronous,
+            busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+            cache_size_kib=settings.sqlite_cache_size_kib,
+            mmap_size_bytes=settings.sqlite_mmap_size_bytes,
+            foreign_keys=settings.sqlite_foreign_keys,
+        )
+
+    def statements(self) -> List[str]:
+        """PRAGMA statements in the order they must run."""
+        statements = [
+            # 🕒 First, so the journal switch below can wait for other connections
+            f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}",
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            # Negative cache_size means KiB rather than pages
+            f"PRAGMA cache_size = -{int(self.cache_size_kib)}",
+            f"PRAGMA mmap_size = {int(self.mmap_size_bytes)}",
+            f"PRAGMA foreign_keys = {'ON' if self.foreign_keys else 'OFF'}",
+            f"PRAGMA query_only = {'ON' if self.query_only else 'OFF'}",
+        ]
+        if self.journal_mode is None:
+            statements.pop(1)
+        return statements
+
+
+def install_sqlite_pragmas(engine: Engine, pragmas: SqlitePragmas) -> None:
+    """
+    Run `pragmas` on every new DBAPI connection of `engine`.
+
+    For an `AsyncEngine`, pass `engine.sync_engine`.
+    """
+    statements = pragmas.statements()
+
+    @event.listens_for(engine, "connect")
+    def _apply(dbapi_connection: Any, _record: Any) -> None:
+        # Outside any transaction: journal_mode cannot change inside one
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+# --------------------------------------
+# ✍️ Single-writer mode
+# --------------------------------------
+def install_single_writer(engine: Engine) -> None:
+    """
+    Make every transaction on `engine` start with `BEGIN IMMEDIATE`.
+
+    Takes the write lock up front, so a transaction never fails half-way
+    when upgrading from a read to a write lock. Also disables pysqlite's own
+    transaction handling, which makes SAVEPOINTs (`begin_nested`) work, and
+    rolls back a transaction SQLite kept open after refusing its COMMIT
+    (e.g. a deferred foreign key): SQLAlchemy considers it ended and skips
+    the reset, which would leave the writer connection unusable.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _disable_implicit_begin(dbapi_connection: Any, _record: Any) -> None:
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin_immediate(connection: Any) -> None:
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    @event.listens_for(engine, "checkin")
+    def _end_refused_commit(dbapi_connection: Any, _record: Any) -> None:
+        if dbapi_connection is None:
+            return  # invalidated
+        driver = getattr(dbapi_connection, "driver_connection", dbapi_connection)
+        if driver.in_transaction:
+            dbapi_connection.rollback()
+
+
+class RoutingSession(Session):
+    """
+    Session reading from `reader` and writing through `writer`.
+
+    Used as `async_sessionmaker(sync_session_class=RoutingSession,
+    writer=..., reader=...)` with sync engines (`AsyncEngine.sync_engine`).
+    """
+
+    def __init__(self, writer: Engine, reader: Engine, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._writer = writer
+        self._reader = reader
+        self._writing = False
+
+    def pin_writer(self) -> None:
+        """Route everything to the writer until the transaction ends."""
+        self._writing = True
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Engine:
+        if (
+            not self._writing
+            and not self._flushing
+            and getattr(clause, "is_select", False)
+        ):
+            return self._reader
+        self._writing = True
+        return self._writer
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_writer(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None and isinstance(session, RoutingSession):
+        session._writing = False
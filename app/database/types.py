@@ -0,0 +1,91 @@
+# app/database/types.py
+
+"""
+🧬 Custom SQLAlchemy column types shared across models.
+
+- `SmallIntEnum`: stores a Python `Enum` as a stable small-integer code
+  instead of a native ENUM / VARCHAR, keeping rows and indexes compact
+- `fixed_binary`: fixed-width binary column (hashes, digests)
+"""
+
+from enum import Enum
+from typing import Any, Dict, Mapping, Optional, Tuple, Type, TypeVar
+
+from sqlalchemy import BINARY, LargeBinary, SmallInteger
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+# --------------------------------------
+# 🧱 Fixed-width binary
+# --------------------------------------
+def fixed_binary(length: int) -> TypeEngine[bytes]:
+    """
+    `BINARY(length)` on MySQL, `BLOB` on SQLite.
+
+    SQLite has no BINARY type and reflects it with NUMERIC affinity, which
+    batch-mode table rebuilds would then copy; BLOB round-trips cleanly.
+    """
+    return BINARY(length).with_variant(LargeBinary(length), "sqlite")
+
+
+E = TypeVar("E", bound=Enum)
+
+
+# --------------------------------------
+# 🔢 Enum stored as a small integer code
+# --------------------------------------
+class SmallIntEnum(TypeDecorator[Enum]):
+    """
+    Persist an `Enum` member as an explicit small-integer code.
+
+    Codes are declared explicitly (never derived from member order), so adding
+    or reordering members can never silently change the meaning of stored data.
+
+    Usage:
+        type: Mapped[IdentityType] = mapped_column(
+            SmallIntEnum(IdentityType, {IdentityType.EMAIL: 1, ...})
+        )
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class: Type[E], codes: Mapping[E, int]) -> None:
+        super().__init__()
+        missing = set(enum_class) - set(codes)
+        if missing:
+            raise ValueError(f"No code declared for {sorted(m.name for m in missing)}")
+        if len(set(codes.values())) != len(codes):
+            raise ValueError("Enum codes must be unique")
+
+        self.enum_class = enum_class
+        # Stored as a tuple so the type stays hashable for the statement cache
+        self.codes: Tuple[Tuple[Enum, int], ...] = tuple(codes.items())
+        self._to_code: Dict[Enum, int] = {
+            member: code for member, code in codes.items()
+        }
+        self._to_member: Dict[int, Enum] = {code: m for m, code in codes.items()}
+
+    def _coerce(self, value: Any) -> Enum:
+        """Accept an enum member, its value (e.g. "email") or its name ("EMAIL")."""
+        if isinstance(value, self.enum_class):
+            return value
+        try:
+            return self.enum_class(value)
+        except ValueError:
+            return self.enum_class[value]
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return self._to_code[self._coerce(value)]
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Optional[Enum]:
+        if value is None:
+            return None
+        return self._to_member[int(value)]
+
+    @property
+    def python_type(self) -> Type[Enum]:
+        return self.enum_class
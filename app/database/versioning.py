@@ -0,0 +1,68 @@
+# app/database/versioning.py
+
+"""
+🔢 Optimistic-concurrency updates for `VersionedMixin` models.
+
+`update_versioned` checks the caller's expected version (from `If-Match`),
+applies the changes through the ORM (so flush hooks such as auditing and
+token revocation still run) and relies on `version_id_col`: the UPDATE is
+conditional on the version that was read, so a concurrent writer makes it
+match zero rows instead of being silently overwritten. No row locks are
+taken at any point.
+"""
+
+from typing import Any, Mapping, Optional, Type, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.database.mixins import VersionedMixin
+
+M = TypeVar("M", bound=VersionedMixin)
+
+
+class RecordNotFoundError(LookupError):
+    """Raised when the row does not exist or is soft-deleted."""
+
+
+class VersionConflictError(Exception):
+    """Raised when the row changed since the caller read it."""
+
+    def __init__(self, current_version: Optional[int] = None) -> None:
+        super().__init__("Record was modified by another request")
+        self.current_version = current_version
+
+
+async def update_versioned(
+    session: AsyncSession,
+    model: Type[M],
+    pk: Any,
+    expected_version: Optional[int],
+    changes: Mapping[str, Any],
+    actor_id: Optional[int] = None,
+) -> M:
+    """
+    Apply `changes` to one row if it is still at `expected_version`.
+
+    `expected_version=None` skips the up-front check (e.g. `If-Match: *`);
+    the flush itself is still version-guarded. The session is flushed, not
+    committed. Raises `RecordNotFoundError` or `VersionConflictError`.
+    """
+    obj = await session.get(model, pk, options=[raiseload("*")])
+    if obj is None or getattr(obj, "deleted_at", None) is not None:
+        raise RecordNotFoundError(f"{model.__name__} {pk} not found")
+    if expected_version is not None and obj.version_id != expected_version:
+        raise VersionConflictError(obj.version_id)
+
+    for key, value in changes.items():
+        setattr(obj, key, value)
+    if actor_id is not None and hasattr(obj, "updated_by"):
+        obj.updated_by = actor_id
+
+    try:
+        await session.flush()
+    except StaleDataError as exc:
+        await session.rollback()
+        raise VersionConflictError() from exc
+    return obj
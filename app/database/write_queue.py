@@ -0,0 +1,196 @@
+# app/database/write_queue.py
+
+"""
+📥 Group commit: small write transactions queued and committed together.
+
+Short, frequent writes (OTP issue/verify, token revocations, audit batches)
+each pay for a transaction and, on SQLite, for the write lock and a WAL
+append. `WriteQueue` runs them on one background task instead:
+
+1. `await queue.submit(job)` puts an `async def job(session) -> result` on a
+   bounded queue and waits for its outcome
+2. the task takes one job, plus whatever else is already queued (up to
+   `write_batch_size`), and runs them in one session, each job inside its own
+   SAVEPOINT, so a failing job rolls back alone and gets its exception
+3. one COMMIT for the batch; only then are the callers' futures resolved, so
+   `submit` returning means the write is durable. If the COMMIT fails, every
+   caller in the batch gets the error
+4. on shutdown (`WriteQueue.stop`, called by the app lifespan) a batch in
+   flight finishes, then the jobs still queued run before `stop` returns
+
+Jobs must not commit or roll back the session themselves. In SQLite
+single-writer mode the queue's sessions are pinned to the writer connection.
+Before `start()` (e.g. CLI scripts, tests) `submit` runs the job in its own
+session and transaction.
+
+Usage:
+    async def record_login(session: AsyncSession) -> None:
+        await session.execute(update(UserAuth).where(...).values(last_login_at=func.now()))
+
+    await get_write_queue().submit(record_login)
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.config.settings import settings
+from app.database.sqlite import RoutingSession
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteJob = Callable[[AsyncSession], Awaitable[T]]
+_Entry = Tuple[WriteJob[Any], "asyncio.Future[Any]"]
+
+
+class WriteQueueStoppedError(Exception):
+    """Raised to callers whose job was discarded by `stop(drain=False)`."""
+
+
+# --------------------------------------
+# 📊 Counters
+# --------------------------------------
+@dataclass
+class WriteQueueStats:
+    """Counters for observing the queue."""
+
+    submitted: int = 0
+    committed: int = 0
+    failed: int = 0
+    batches: int = 0
+
+
+# --------------------------------------
+# ✍️ Queue
+# --------------------------------------
+class WriteQueue:
+    """
+    Bounded queue of write jobs drained by one background task.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        maxsize: int,
+        batch_size: int,
+    ) -> None:
+        self.batch_size = batch_size
+        self.stats = WriteQueueStats()
+        self._session_factory = session_factory
+        self._queue: "asyncio.Queue[_Entry]" = asyncio.Queue(maxsize=maxsize)
+        self._batch: List[_Entry] = []  # taken off the queue, not committed
+        self._writing = asyncio.Lock()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    @classmethod
+    def from_settings(
+        cls, session_factory: async_sessionmaker[AsyncSession]
+    ) -> "WriteQueue":
+        return cls(
+            session_factory,
+            maxsize=settings.write_queue_size,
+            batch_size=settings.write_batch_size,
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Spawn the writer task (call from a running event loop)."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run(), name="write-queue")
+
+    async def stop(self, drain: bool = True) -> None:
+        """
+        Stop the writer task; with `drain`, run every queued job first (also
+        when the task has died), otherwise fail them with
+        `WriteQueueStoppedError`.
+        """
+        if self._task is None:
+            return
+        async with self._writing:  # never cancel a batch half-way
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        while self._batch or not self._queue.empty():
+            while len(self._batch) < self.batch_size and not self._queue.empty():
+                self._batch.append(self._queue.get_nowait())
+            batch, self._batch = self._batch, []
+            if drain:
+                await self._run_batch(batch)
+                continue
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(WriteQueueStoppedError("Write queue stopped"))
+
+    async def submit(self, job: WriteJob[T]) -> T:
+        """
+        Run `job` in the next batch and return its result once committed.
+
+        Waits for room when the queue is full (backpressure).
+        """
+        self.stats.submitted += 1
+        if not self.running:
+            try:
+                async with self._session() as session:
+                    result = await job(session)
+                    await session.commit()
+            except Exception:
+                self.stats.failed += 1
+                raise
+            self.stats.committed += 1
+            return result
+        future: "asyncio.Future[T]" = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, future))
+        return await future
+
+    def _session(self) -> AsyncSession:
+        session = self._session_factory()
+        if isinstance(session.sync_session, RoutingSession):
+            session.sync_session.pin_writer()
+        return session
+
+    async def _run_batch(self, batch: List[_Entry]) -> None:
+        outcomes: List[Tuple["asyncio.Future[Any]", Any, Optional[BaseException]]] = []
+        try:
+            async with self._session() as session:
+                for job, future in batch:
+                    if future.cancelled():
+                        continue
+                    try:
+                        async with session.begin_nested():
+                            outcomes.append((future, await job(session), None))
+                    except Exception as exc:
+                        outcomes.append((future, None, exc))
+                await session.commit()
+        except Exception as exc:
+            logger.exception("Failed to commit a batch of %d write jobs", len(batch))
+            outcomes = [(future, None, exc) for _, future in batch]
+
+        self.stats.batches += 1
+        for future, result, error in outcomes:
+            if error is None:
+                self.stats.committed += 1
+            else:
+                self.stats.failed += 1
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    async def _run(self) -> None:
+        while True:
+            # One job, plus whatever else is already queued, up to `batch_size`
+            self._batch.append(await self._queue.get())
+            while len(self._batch) < self.batch_size and not self._queue.empty():
+                self._batch.append(self._queue.get_nowait())
+            async with self._writing:
+                await self._run_batch(self._batch)
+                self._batch = []
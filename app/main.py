@@ -0,0 +1,60 @@
+# app/main.py
+
+"""
+🚀 Application entrypoint.
+
+Run locally with:
+    uvicorn app.main:app --reload
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+
+from app.api.domains.user.services.audit_service import get_audit_writer
+from app.api.domains.user.services.authz_snapshot import get_authz_snapshot
+from app.api.domains.user.services.invalidation_bus import get_invalidation_bus
+from app.api.domains.user.services.otp_service import get_otp_service
+from app.api.domains.user.services.shard_replication import get_reference_replicator
+from app.api.router import api_router
+from app.database.session import dispose_engines, get_sessionmaker, get_write_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Start background workers on startup; drain them and close the pool on shutdown.
+    """
+    writes = get_write_queue()
+    writes.start()
+    bus = get_invalidation_bus()
+    await bus.start()
+    replicator = get_reference_replicator()
+    await replicator.start()
+    authz = get_authz_snapshot()
+    await authz.start()
+    audit = get_audit_writer()
+    audit.start()
+    otp = get_otp_service()
+    otp.dispatcher.start()
+    sweeper = asyncio.create_task(
+        otp.run_sweeper(get_sessionmaker()), name="otp-sweeper"
+    )
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        await asyncio.gather(sweeper, return_exceptions=True)
+        await otp.dispatcher.stop()
+        await writes.stop()  # its last batches may still record audit events
+        await audit.stop()
+        await authz.stop()
+        await replicator.stop()
+        await bus.stop()
+        await dispose_engines()
+
+
+app = FastAPI(title="fastapi-microservice-starter-kit", lifespan=lifespan)
+app.include_router(api_router, prefix="/api")
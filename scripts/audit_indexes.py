@@ -0,0 +1,84 @@
+# scripts/audit_indexes.py
+
+"""
+🔎 Index audit command.
+
+Compares the indexes declared on `Base.metadata` with the ones present in
+the database at `settings.database_url` (or `--url`), and prints sizes,
+usage statistics and low-selectivity warnings.
+
+Usage:
+    python -m scripts.audit_indexes
+    python -m scripts.audit_indexes --url sqlite+aiosqlite:///./dev.db --json
+"""
+
+import argparse
+import asyncio
+import json
+from typing import List, Optional
+
+from app.database.base import Base
+from app.database.index_audit import IndexReport, run_index_audit
+from app.database.session import create_engine
+
+
+def _format_size(size: Optional[int]) -> str:
+    """Render a byte count in a compact human-readable form."""
+    if size is None:
+        return "-"
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f}{unit}" if unit == "B" else f"{value:.1f}{unit}"
+        value /= 1024
+    return f"{value:.1f}GiB"
+
+
+def _print_table(reports: List[IndexReport]) -> None:
+    """Print the audit as an aligned text table."""
+    header = ("TABLE", "INDEX", "COLUMNS", "UNIQUE", "STATUS", "SIZE", "SCANS")
+    rows = [
+        (
+            r.table,
+            r.name or "<unnamed>",
+            ",".join(r.columns),
+            "yes" if r.unique else "no",
+            r.status,
+            _format_size(r.size_bytes),
+            "-" if r.scans is None else str(r.scans),
+        )
+        for r in reports
+    ]
+    widths = [max(len(str(v)) for v in col) for col in zip(header, *rows)]
+    for row in (header, *rows):
+        print("  ".join(str(v).ljust(w) for v, w in zip(row, widths)))
+
+    warnings = [(r, w) for r in reports for w in r.warnings]
+    if warnings:
+        print()
+        for report, warning in warnings:
+            print(f"⚠️  {report.table}.{report.name}: {warning}")
+
+
+async def main(url: Optional[str], as_json: bool) -> int:
+    """Run the audit and return a process exit code (1 on drift)."""
+    engine = create_engine(url)
+    try:
+        reports = await run_index_audit(engine, Base.metadata)
+    finally:
+        await engine.dispose()
+
+    if as_json:
+        print(json.dumps([r.as_dict() for r in reports], indent=2))
+    else:
+        _print_table(reports)
+
+    return 1 if any(r.status != "ok" for r in reports) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audit database indexes")
+    parser.add_argument("--url", help="Database URL (defaults to settings)")
+    parser.add_argument("--json", action="store_true", help="Emit JSON output")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(main(args.url, args.json)))
@@ -0,0 +1,199 @@
+# scripts/bench_prefork.py
+
+"""
+⏱️ Worker startup and memory: `scripts/serve.py` with and without preload.
+
+For each mode the benchmark starts the pre-fork server on a scratch SQLite
+database (cloned from the schema template and seeded with one user that may
+list users), then reports:
+
+- `first 200`: time from launch until the first authenticated
+  `GET /api/users` succeeds (time-to-first-request)
+- `ready`: mean worker time from fork to accepting connections
+- `first req`: mean latency of the first request served by each worker
+  (new connection per request; the listening socket spreads them)
+- per-worker memory from `/proc/<pid>/smaps_rollup` after `--requests`
+  requests: RSS, PSS (shared pages split between sharers) and private KiB
+
+Linux only (smaps_rollup).
+
+Usage:
+    python -m scripts.bench_prefork
+    python -m scripts.bench_prefork --workers 8 --requests 400
+"""
+
+import argparse
+import asyncio
+import os
+import queue
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+# --------------------------------------
+# 🌱 Scratch database + token
+# --------------------------------------
+async def _seed(url: str) -> Tuple[int, int, List[int]]:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    from app.api.domains.user.models.privilege import Privilege
+    from app.api.domains.user.models.role import Role
+    from app.api.domains.user.models.user import User
+    from app.api.domains.user.services.privilege_catalog import privilege_catalog
+    from app.database.session import create_engine
+
+    engine = create_engine(url)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+            privilege = Privilege(name="view_users")
+            role = Role(name="bench", privileges=[privilege])
+            session.add(role)
+            await session.flush()
+            users = [User(first_name=f"bench{i}", role_id=role.id) for i in range(100)]
+            session.add_all(users)
+            await session.commit()
+            # The scratch database's whole catalog, for encoding the token here
+            privilege_catalog.replace({privilege.name: privilege.id}, [privilege.id])
+            return users[0].id, role.id, [privilege.id]
+    finally:
+        await engine.dispose()
+
+
+def prepare(directory: Path) -> Tuple[str, str]:
+    """Clone the schema template, seed it, and return `(database URL, token)`."""
+    from app.api.domains.user.services.token_service import get_token_service
+    from app.database.bootstrap import SqliteSchemaTemplate
+
+    url = SqliteSchemaTemplate().clone(directory / "bench.db")
+    user_id, role_id, privilege_ids = asyncio.run(_seed(url))
+    token = get_token_service().issue_pair(user_id, role_id, privilege_ids).access_token
+    return url, token
+
+
+# --------------------------------------
+# 🚀 One server run
+# --------------------------------------
+def _get(url: str, token: str) -> int:
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            response.read()
+            return response.status
+    except OSError:
+        return 0
+
+
+def _memory(pid: int) -> Dict[str, int]:
+    from scripts.serve import memory_kib
+
+    return memory_kib(pid)
+
+
+def run_mode(
+    preload: bool, args: argparse.Namespace, env: Dict[str, str], token: str
+) -> Dict[str, Any]:
+    command = [
+        sys.executable,
+        "-m",
+        "scripts.serve",
+        "--workers",
+        str(args.workers),
+        "--port",
+        str(args.port),
+    ]
+    if not preload:
+        command.append("--no-preload")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        command,
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    lines: "queue.Queue[str]" = queue.Queue()
+    threading.Thread(
+        target=lambda: [lines.put(line) for line in process.stdout], daemon=True
+    ).start()
+
+    url = f"http://127.0.0.1:{args.port}/api/users?limit=10"
+    try:
+        while _get(url, token) != 200:
+            if process.poll() is not None or time.perf_counter() - started > 60:
+                raise SystemExit("Server did not come up")
+            time.sleep(0.005)
+        first_ok = time.perf_counter() - started
+
+        ready: Dict[int, float] = {}
+        while len(ready) < args.workers:
+            fields = dict(
+                part.split("=", 1)
+                for part in lines.get(timeout=30).split()
+                if "=" in part
+            )
+            if "pid" in fields:
+                ready[int(fields["pid"])] = float(fields["ready_ms"])
+
+        latencies = []
+        for _ in range(args.requests):
+            request_started = time.perf_counter()
+            _get(url, token)
+            latencies.append((time.perf_counter() - request_started) * 1000)
+
+        memory = [_memory(pid) for pid in ready]
+    finally:
+        process.send_signal(signal.SIGTERM)
+        process.wait(timeout=30)
+
+    return {
+        "mode": "preload" if preload else "no-preload",
+        "first_ok_ms": first_ok * 1000,
+        "ready_ms": statistics.mean(ready.values()),
+        "first_req_ms": statistics.mean(latencies[: args.workers]),
+        "steady_req_ms": statistics.median(latencies[args.workers :] or latencies),
+        "rss": statistics.mean(m.get("rss", 0) for m in memory),
+        "pss": statistics.mean(m.get("pss", 0) for m in memory),
+        "private": statistics.mean(m.get("private", 0) for m in memory),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-fork preload benchmark.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    directory = Path(tempfile.mkdtemp(prefix="bench-prefork-"))
+    os.environ.setdefault("JWT_SECRET_KEY", "bench-" + "x" * 32)
+    os.environ.setdefault("OTP_SECRET_KEY", "bench")
+    url, token = prepare(directory)
+    env = {**os.environ, "DATABASE_URL": url, "PYTHONPATH": str(ROOT)}
+
+    results = [run_mode(False, args, env, token), run_mode(True, args, env, token)]
+    print(f"workers={args.workers} requests={args.requests} (memory per worker, KiB)")
+    print(
+        f"{'mode':<11} {'first 200':>10} {'ready':>8} {'first req':>10} {'steady':>8} "
+        f"{'RSS':>8} {'PSS':>8} {'private':>8}"
+    )
+    for r in results:
+        print(
+            f"{r['mode']:<11} {r['first_ok_ms']:>8.0f}ms {r['ready_ms']:>6.0f}ms "
+            f"{r['first_req_ms']:>8.1f}ms {r['steady_req_ms']:>6.1f}ms "
+            f"{r['rss']:>8.0f} {r['pss']:>8.0f} {r['private']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# scripts/bench_search.py
+
+"""
+⏱️ User search latency benchmark over a synthetic SQLite database.
+
+A fresh database file gets the app schema (from the models, so including
+the `user_search` FTS5 index) and `--users` users with one email identity
+each, built from a small name vocabulary so terms are realistically
+repetitive. Documents are written by `reindex_users`, as in production.
+
+Each query is then run `--repeat` times per mode through `search_users`
+(first page of 20) and p50 / p95 / max latencies are printed.
+
+Usage:
+    python -m scripts.bench_search
+    python -m scripts.bench_search --users 5000000 --dir /var/lib/app
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import insert, pool, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_identity import (
+    IdentityType,
+    UserIdentity,
+    identity_lookup_key,
+)
+from app.api.domains.user.models.user_search import optimize_index, reindex_users
+from app.api.domains.user.repositories.user_search_repository import search_users
+from app.database.bootstrap import create_schema
+from app.database.session import create_engine
+
+FIRST_NAMES = (
+    "james mary john patricia robert jennifer michael linda william elizabeth "
+    "david barbara richard susan joseph jessica thomas sarah charles karen "
+    "priya wei mohammed fatima hiroshi yuki olga ivan sofia mateo"
+).split()
+LAST_NAMES = (
+    "smith johnson williams brown jones garcia miller davis rodriguez martinez "
+    "hernandez lopez gonzalez wilson anderson thomas taylor moore jackson martin "
+    "nguyen tanaka kowalski schmidt rossi dubois silva kim patel okafor"
+).split()
+DOMAINS = ("example.com", "mail.test", "corp.example", "inbox.test")
+
+QUERIES = ("smi", "john smi", "garcia", "patel@corp", "0042", "jhon smiht", "xyzq")
+
+BATCH = 10_000
+
+
+async def populate(engine: AsyncEngine, users: int) -> None:
+    """Insert `users` users (+ one email each) and index them."""
+    rng = random.Random(42)
+    async with engine.begin() as connection:
+        role_id = (
+            await connection.execute(
+                insert(Role).values(name="bench").returning(Role.id)
+            )
+        ).scalar_one()
+    for start in range(0, users, BATCH):
+        people = [
+            (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))
+            for _ in range(min(BATCH, users - start))
+        ]
+        async with engine.begin() as connection:
+            ids = (
+                (
+                    await connection.execute(
+                        insert(User).returning(User.id, sort_by_parameter_order=True),
+                        [
+                            {
+                                "first_name": first.title(),
+                                "last_name": last.title(),
+                                "role_id": role_id,
+                            }
+                            for first, last in people
+                        ],
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            emails = [
+                f"{first}.{last}{start + i:07d}@{DOMAINS[i % len(DOMAINS)]}"
+                for i, (first, last) in enumerate(people)
+            ]
+            await connection.execute(
+                insert(UserIdentity),
+                [
+                    {
+                        "user_id": user_id,
+                        "type": IdentityType.EMAIL,
+                        "value": email,
+                        "lookup_key": identity_lookup_key(IdentityType.EMAIL, email),
+                        "is_primary": True,
+                    }
+                    for user_id, email in zip(ids, emails)
+                ],
+            )
+            await connection.run_sync(reindex_users, ids)
+    async with engine.begin() as connection:
+        await connection.run_sync(optimize_index)
+
+
+async def time_query(
+    engine: AsyncEngine, query: str, mode: str, repeat: int
+) -> List[float]:
+    timings = []
+    async with AsyncSession(engine) as session:
+        await session.scalar(select(User.id).limit(1))  # warm the connection
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await search_users(session, query, mode=mode, limit=20)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main(args: argparse.Namespace) -> None:
+    directory = Path(args.dir or tempfile.mkdtemp(prefix="bench-search-"))
+    path = directory / "bench-search.db"
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    engine = create_engine(f"sqlite+aiosqlite:///{path}", poolclass=pool.NullPool)
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(create_schema)
+        started = time.perf_counter()
+        await populate(engine, args.users)
+        print(
+            f"📁 {path}  users={args.users:,} indexed in {time.perf_counter() - started:.1f}s"
+        )
+
+        print(f"{'mode':<10} {'query':<12} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+        for mode in ("substring", "fuzzy"):
+            for query in QUERIES:
+                timings = sorted(await time_query(engine, query, mode, args.repeat))
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(
+                    f"{mode:<10} {query:<12} {statistics.median(timings):>8.2f} "
+                    f"{p95:>8.2f} {timings[-1]:>8.2f}"
+                )
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="User search latency benchmark.")
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--dir", help="Directory for the database file (default: temp)")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,144 @@
+# scripts/bench_serialization.py
+
+"""
+⏱️ Serialization micro-benchmark for user-domain list payloads.
+
+Builds synthetic `GET /users?fields=…` pages (each user with nested `role`,
+role privilege names and `identities`) and times three ways of turning one
+page into response bytes:
+
+- `jsonable_encoder`: `jsonable_encoder(UserPage(...))` + `JSONResponse`
+  (FastAPI's generic path, e.g. with a custom response class)
+- `response_model`: validate against `UserPage` with a `TypeAdapter`, then
+  `dump_json` (FastAPI's path for routes with a response model)
+- `fast`: `FastJSONResponse(UserPageView(...))` (what `GET /users` returns)
+
+No database is needed.
+
+Usage:
+    python -m scripts.bench_serialization
+    python -m scripts.bench_serialization --sizes 1000 10000 50000 --repeat 7
+"""
+
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.api.domains.user.models.user import Gender
+from app.api.domains.user.models.user_identity import IdentityType
+from app.api.domains.user.schemas.read_models import UserPageView
+from app.api.domains.user.schemas.user import UserPage
+from app.api.utils.responses import FastJSONResponse
+
+FIELDS = [
+    "id",
+    "first_name",
+    "last_name",
+    "gender",
+    "dob",
+    "is_active",
+    "created_at",
+    "role.name",
+    "role.privileges.name",
+    "identities.type",
+    "identities.value",
+    "identities.is_primary",
+]
+
+
+def build_items(count: int) -> List[Dict[str, Any]]:
+    """Users shaped like `FieldSelection.project()` output for `FIELDS`."""
+    privileges = [{"name": f"privilege_{i:02d}"} for i in range(12)]
+    roles = [{"name": f"role_{i}", "privileges": privileges} for i in range(8)]
+    genders = list(Gender)
+    created = datetime(2026, 1, 1, 9, 30)
+    return [
+        {
+            "id": i,
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "gender": genders[i % len(genders)],
+            "dob": date(1980, 1, 1) + timedelta(days=i % 9000),
+            "is_active": i % 7 != 0,
+            "created_at": created + timedelta(seconds=i),
+            "role": roles[i % len(roles)],
+            "identities": [
+                {
+                    "type": IdentityType.EMAIL,
+                    "value": f"user{i}@example.com",
+                    "is_primary": True,
+                },
+                {
+                    "type": IdentityType.MOBILE,
+                    "value": f"+1555{i:07d}",
+                    "is_primary": False,
+                },
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def _timed(fn: Callable[[], bytes], repeat: int) -> tuple:
+    """Best-of-`repeat` wall time in ms, and the produced bytes."""
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, body
+
+
+def run(sizes: List[int], repeat: int) -> None:
+    adapter = TypeAdapter(UserPage)
+    header = ("USERS", "PATH", "BEST ms", "SIZE KiB", "SPEEDUP")
+    print("  ".join(f"{h:>16}" for h in header))
+
+    for size in sizes:
+        items = build_items(size)
+        page = {"items": items, "fields": FIELDS, "offset": 0, "limit": size}
+
+        paths = {
+            "jsonable_encoder": lambda: (
+                JSONResponse(jsonable_encoder(UserPage(**page))).body
+            ),
+            "response_model": lambda: adapter.dump_json(adapter.validate_python(page)),
+            "fast": lambda: FastJSONResponse(UserPageView(**page)).body,
+        }
+        results = {name: _timed(fn, repeat) for name, fn in paths.items()}
+
+        # ✅ All paths must produce the same document
+        reference = json.loads(results["jsonable_encoder"][1])
+        for name, (_, body) in results.items():
+            if json.loads(body) != reference:
+                raise SystemExit(f"{name} output differs from jsonable_encoder")
+
+        baseline = results["jsonable_encoder"][0]
+        for name, (ms, body) in results.items():
+            row = (
+                size,
+                name,
+                f"{ms:.1f}",
+                f"{len(body) / 1024:.0f}",
+                f"{baseline / ms:.1f}x",
+            )
+            print("  ".join(f"{str(v):>16}" for v in row))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# scripts/bench_sqlite.py
+
+"""
+⏱️ SQLite write-throughput benchmark: stock PRAGMAs vs the tuned profile.
+
+For each profile a fresh database file gets the app schema (from the
+models), then:
+
+- `commit/row`: one INSERT + COMMIT per row (typical request write)
+- `concurrent`: `--writers` connections doing the same at once, with a
+  reader scanning the table in a loop (lock errors are counted, not fatal)
+- `batched`: `--batch` rows per transaction
+
+`stock` is SQLite's own defaults (rollback journal, synchronous=FULL, no
+busy wait, 2 MiB cache, foreign keys off); `tuned` is
+`SqlitePragmas.from_settings()`.
+
+Usage:
+    python -m scripts.bench_sqlite
+    python -m scripts.bench_sqlite --rows 5000 --writers 8 --dir /var/lib/app
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from sqlalchemy import func, insert, pool, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.api.domains.user.models.privilege import Privilege
+from app.database.bootstrap import create_schema
+from app.database.session import create_engine
+from app.database.sqlite import SqlitePragmas
+
+PROFILES: Dict[str, SqlitePragmas] = {
+    "stock": SqlitePragmas(
+        journal_mode="DELETE",
+        synchronous="FULL",
+        busy_timeout_ms=0,
+        cache_size_kib=2000,
+        mmap_size_bytes=0,
+        foreign_keys=False,
+    ),
+    "tuned": SqlitePragmas.from_settings(),
+}
+
+privileges = Privilege.__table__
+
+
+async def commit_per_row(engine: AsyncEngine, prefix: str, rows: int) -> int:
+    """Insert `rows` rows, one transaction each; returns lock errors."""
+    errors = 0
+    async with engine.connect() as connection:
+        for i in range(rows):
+            try:
+                await connection.execute(
+                    insert(privileges).values(name=f"{prefix}_{i}", description="bench")
+                )
+                await connection.commit()
+            except OperationalError:
+                await connection.rollback()
+                errors += 1
+    return errors
+
+
+async def reader(engine: AsyncEngine, stop: asyncio.Event) -> int:
+    scans = 0
+    async with engine.connect() as connection:
+        while not stop.is_set():
+            try:
+                await connection.scalar(select(func.count()).select_from(privileges))
+                scans += 1
+            except OperationalError:
+                pass
+            await connection.rollback()
+    return scans
+
+
+async def bench_profile(
+    name: str,
+    pragmas: SqlitePragmas,
+    directory: Path,
+    rows: int,
+    writers: int,
+    batch: int,
+) -> List[Tuple[str, float, str]]:
+    path = directory / f"bench-{name}.db"
+    for suffix in ("", "-wal", "-shm", "-journal"):
+        Path(f"{path}{suffix}").unlink(missing_ok=True)
+    engine = create_engine(
+        f"sqlite+aiosqlite:///{path}", sqlite_pragmas=pragmas, poolclass=pool.NullPool
+    )
+    results = []
+    try:
+        async with engine.begin() as connection:
+            await connection.run_sync(create_schema)
+
+        started = time.perf_counter()
+        await commit_per_row(engine, "single", rows)
+        results.append(("commit/row", rows / (time.perf_counter() - started), ""))
+
+        stop = asyncio.Event()
+        scan_task = asyncio.ensure_future(reader(engine, stop))
+        started = time.perf_counter()
+        errors = await asyncio.gather(
+            *(commit_per_row(engine, f"w{w}", rows // writers) for w in range(writers))
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        scans = await scan_task
+        done = writers * (rows // writers) - sum(errors)
+        results.append(
+            (
+                "concurrent",
+                done / elapsed,
+                f"{sum(errors)} lock errors, {scans} reader scans",
+            )
+        )
+
+        started = time.perf_counter()
+        async with engine.connect() as connection:
+            for start in range(0, rows, batch):
+                await connection.execute(
+                    insert(privileges),
+                    [
+                        {"name": f"batch_{i}", "description": "bench"}
+                        for i in range(start, min(start + batch, rows))
+                    ],
+                )
+                await connection.commit()
+        results.append(("batched", rows / (time.perf_counter() - started), ""))
+    finally:
+        await engine.dispose()
+    return results
+
+
+async def main(args: argparse.Namespace) -> None:
+    directory = Path(args.dir or tempfile.mkdtemp(prefix="bench-sqlite-"))
+    print(f"📁 {directory}  rows={args.rows} writers={args.writers} batch={args.batch}")
+    print(f"{'profile':<8} {'workload':<12} {'rows/s':>10}")
+    for name, pragmas in PROFILES.items():
+        for workload, rate, note in await bench_profile(
+            name, pragmas, directory, args.rows, args.writers, args.batch
+        ):
+            print(f"{name:<8} {workload:<12} {rate:>10,.0f}  {note}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite PRAGMA profile benchmark.")
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument(
+        "--dir", help="Directory for the database files (default: temp)"
+    )
+    asyncio.run(main(parser.parse_args()))
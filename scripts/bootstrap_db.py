@@ -0,0 +1,79 @@
+# scripts/bootstrap_db.py
+
+"""
+🧱 Create a database schema straight from the models, or check for drift.
+
+`bootstrap` runs `create_all` on an empty database and stamps the Alembic
+head: much faster than replaying every revision, for ephemeral environments
+and CI. `--check-drift` verifies the shortcut is safe by migrating a scratch
+in-memory SQLite database through every revision and diffing it against the
+models (or, with `--url`, diffing that existing database); it exits 1 if
+anything differs.
+
+Usage:
+    python -m scripts.bootstrap_db --url sqlite+aiosqlite:///./preview.db
+    python -m scripts.bootstrap_db --check-drift
+    python -m scripts.bootstrap_db --check-drift --url mysql+aiomysql://...
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import Any, List, Optional
+
+from sqlalchemy import pool
+
+from app.database.bootstrap import bootstrap_schema, migration_drift, schema_drift
+from app.database.session import create_engine
+
+
+async def bootstrap(url: Optional[str]) -> None:
+    engine = create_engine(url, poolclass=pool.NullPool)
+    try:
+        started = time.perf_counter()
+        head = await bootstrap_schema(engine)
+    except RuntimeError as exc:
+        raise SystemExit(f"❌ {exc}; use `alembic upgrade head` instead")
+    finally:
+        await engine.dispose()
+    print(
+        f"✅ schema created and stamped at {head} in {time.perf_counter() - started:.2f}s"
+    )
+
+
+async def database_drift(url: Optional[str]) -> List[Any]:
+    engine = create_engine(url, poolclass=pool.NullPool)
+    try:
+        async with engine.connect() as connection:
+            return await connection.run_sync(schema_drift)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bootstrap a schema from the models.")
+    parser.add_argument("--url", help="Database URL (default: DATABASE_URL)")
+    parser.add_argument(
+        "--check-drift",
+        action="store_true",
+        help="Diff migrations (or --url's database) against the models; exit 1 on drift",
+    )
+    args = parser.parse_args()
+
+    if not args.check_drift:
+        asyncio.run(bootstrap(args.url))
+        return
+
+    diffs = asyncio.run(database_drift(args.url)) if args.url else migration_drift()
+    if not diffs:
+        print("✅ no drift between migrations and models")
+        return
+    print(f"❌ {len(diffs)} difference(s) between migrations and models:")
+    for diff in diffs:
+        print(f"   {diff}")
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
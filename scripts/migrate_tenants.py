@@ -0,0 +1,263 @@
+# scripts/migrate_tenants.py
+
+"""
+🏢 Parallel Alembic upgrades across many tenant databases.
+
+`scripts/migrations/env.py` migrates the one database in `DATABASE_URL`.
+This runner starts one `alembic upgrade` subprocess per tenant with that
+tenant's URL in `DATABASE_URL` (never on the command line, so passwords do
+not show up in process listings), at most `--workers` at a time.
+
+For every tenant it records the revision before and after, the duration and
+the error (stderr tail) in a JSON state file, rewritten atomically after each
+tenant. With `--resume`, tenants that already reached the target revision
+in a previous run are skipped; tenants whose database is already at the
+target are skipped without starting Alembic at all.
+
+Tenant file: one tenant per line, `<name> <url>` (or just `<url>`, named
+after the database); blank lines and lines starting with `#` are ignored.
+
+Usage:
+    python -m scripts.migrate_tenants --tenants tenants.txt --workers 16
+    python -m scripts.migrate_tenants --tenants tenants.txt --resume
+    python -m scripts.migrate_tenants --tenants tenants.txt --revision 9a3c5e1f7b20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import pool
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+ROOT = Path(__file__).resolve().parent.parent
+STDERR_TAIL = 2000
+
+
+# --------------------------------------
+# 🏢 Tenants and results
+# --------------------------------------
+@dataclass(frozen=True)
+class Tenant:
+    name: str
+    url: str
+
+
+@dataclass
+class TenantResult:
+    """Outcome of one tenant's upgrade (persisted in the state file)."""
+
+    status: str  # "ok" | "skipped" | "failed"
+    from_revision: Optional[str] = None
+    to_revision: Optional[str] = None
+    seconds: float = 0.0
+    error: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+def read_tenants(path: Path) -> List[Tenant]:
+    """Parse the tenant file; names must be unique."""
+    tenants: Dict[str, Tenant] = {}
+    for number, line in enumerate(path.read_text().splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split()
+        if len(parts) == 1:
+            url = parts[0]
+            name = Path(make_url(url).database or "").stem or url
+        elif len(parts) == 2:
+            name, url = parts
+        else:
+            raise SystemExit(f"{path}:{number}: expected '<name> <url>'")
+        if name in tenants:
+            raise SystemExit(f"{path}:{number}: duplicate tenant '{name}'")
+        tenants[name] = Tenant(name=name, url=url)
+    return list(tenants.values())
+
+
+# --------------------------------------
+# 💾 Resumable state file
+# --------------------------------------
+class StateFile:
+    """Per-tenant results keyed by tenant name (URLs are never written)."""
+
+    def __init__(self, path: Path, target: str, resume: bool) -> None:
+        self.path = path
+        self.target = target
+        self.results: Dict[str, TenantResult] = {}
+        if resume and path.exists():
+            data = json.loads(path.read_text())
+            self.results = {
+                name: TenantResult(**result)
+                for name, result in data.get("tenants", {}).items()
+            }
+
+    def done(self, tenant: Tenant) -> bool:
+        """True if a previous run brought this tenant to the target revision."""
+        result = self.results.get(tenant.name)
+        return (
+            result is not None
+            and result.status in ("ok", "skipped")
+            and result.to_revision == self.target
+        )
+
+    def record(self, tenant: Tenant, result: TenantResult) -> None:
+        result.finished_at = datetime.now(timezone.utc).isoformat()
+        self.results[tenant.name] = result
+        payload = {
+            "target": self.target,
+            "tenants": {name: asdict(r) for name, r in sorted(self.results.items())},
+        }
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, indent=2))
+        os.replace(tmp, self.path)  # atomic: a crash never leaves half a file
+
+
+# --------------------------------------
+# 🚀 Upgrading one tenant
+# --------------------------------------
+async def current_revision(url: str) -> Optional[str]:
+    """Read the tenant's `alembic_version` (None for an empty database)."""
+    engine = create_async_engine(url, poolclass=pool.NullPool)
+    try:
+        async with engine.connect() as connection:
+            return await connection.run_sync(
+                lambda sync_conn: MigrationContext.configure(
+                    sync_conn
+                ).get_current_revision()
+            )
+    finally:
+        await engine.dispose()
+
+
+async def upgrade_tenant(tenant: Tenant, target: str, timeout: float) -> TenantResult:
+    """Upgrade one tenant in an `alembic` subprocess and report the outcome."""
+    started = time.perf_counter()
+    result = TenantResult(status="failed")
+    try:
+        result.from_revision = await current_revision(tenant.url)
+        if result.from_revision == target:
+            result.status = "skipped"
+            result.to_revision = target
+            return result
+
+        # Same cwd as this runner, so relative SQLite paths resolve identically
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "alembic",
+            "-c",
+            str(ROOT / "alembic.ini"),
+            "upgrade",
+            target,
+            env={**os.environ, "DATABASE_URL": tenant.url, "PYTHONPATH": str(ROOT)},
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            result.error = f"Timed out after {timeout:.0f}s"
+            return result
+
+        result.to_revision = await current_revision(tenant.url)
+        if process.returncode == 0:
+            result.status = "ok"
+        else:
+            result.error = stderr.decode(errors="replace")[-STDERR_TAIL:]
+    except Exception as exc:
+        result.error = f"{type(exc).__name__}: {str(exc).splitlines()[0]}"
+    finally:
+        result.seconds = round(time.perf_counter() - started, 3)
+    return result
+
+
+# --------------------------------------
+# 🧵 Bounded fan-out
+# --------------------------------------
+async def run(
+    tenants: List[Tenant], workers: int, state: StateFile, timeout: float
+) -> Dict[str, TenantResult]:
+    """Upgrade all pending tenants, at most `workers` at a time."""
+    semaphore = asyncio.Semaphore(workers)
+    pending = [tenant for tenant in tenants if not state.done(tenant)]
+    print(f"🎯 target {state.target}: {len(pending)} of {len(tenants)} tenants pending")
+
+    async def one(tenant: Tenant) -> None:
+        async with semaphore:
+            result = await upgrade_tenant(tenant, state.target, timeout)
+        state.record(tenant, result)
+        icon = {"ok": "✅", "skipped": "⏭️", "failed": "❌"}[result.status]
+        print(
+            f"{icon} {tenant.name}: {result.from_revision} → {result.to_revision} "
+            f"({result.seconds:.1f}s){'' if result.error is None else ' ' + result.error.splitlines()[-1]}"
+        )
+
+    await asyncio.gather(*(one(tenant) for tenant in pending))
+    return {tenant.name: state.results[tenant.name] for tenant in pending}
+
+
+def resolve_target(revision: str) -> str:
+    """Resolve `head` (or a prefix) to a concrete revision ID."""
+    script = ScriptDirectory.from_config(Config(str(ROOT / "alembic.ini")))
+    resolved = script.get_revision(revision)
+    if resolved is None:
+        raise SystemExit(f"Unknown revision '{revision}'")
+    return resolved.revision
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Upgrade many tenant databases in parallel."
+    )
+    parser.add_argument("--tenants", type=Path, required=True, help="Tenant list file")
+    parser.add_argument(
+        "--revision", default="head", help="Target revision (default: head)"
+    )
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent upgrades")
+    parser.add_argument(
+        "--state", type=Path, default=Path("migrate_tenants_state.json")
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="Skip tenants already done"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=1800.0, help="Seconds per tenant"
+    )
+    args = parser.parse_args()
+
+    target = resolve_target(args.revision)
+    tenants = read_tenants(args.tenants)
+    state = StateFile(args.state, target, resume=args.resume)
+
+    started = time.perf_counter()
+    results = asyncio.run(run(tenants, max(1, args.workers), state, args.timeout))
+    failed = sorted(
+        name for name, result in results.items() if result.status == "failed"
+    )
+
+    print(
+        f"\n🏁 {len(results) - len(failed)} succeeded, {len(failed)} failed "
+        f"in {time.perf_counter() - started:.1f}s (state: {args.state})"
+    )
+    if failed:
+        print("❌ failed: " + ", ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
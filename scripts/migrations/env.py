@@ -7,6 +7,8 @@ Purpose:
 - Dynamically load DB URL from .env (.ini fallback)
 - Enable both offline (SQL script) and online (live DB) migrations
 - Handle SQLAlchemy async engines (aiosqlite, aiomysql)
+- Reuse a caller's connection passed as `config.attributes["connection"]`
+  (e.g. `app/database/bootstrap.py` migrating a scratch database)
 - Register metadata for autogenerate support
 """
 
@@ -14,13 +16,16 @@ import asyncio
 from logging.config import fileConfig
 from typing import Optional
 
-from sqlalchemy import pool
+from sqlalchemy import Connection, pool
 from sqlalchemy.ext.asyncio import async_engine_from_config
 from alembic import context
 
 # 🧠 SQLAlchemy base metadata (includes all defined models)
 from app.database.base import Base
 
+# 🔎 Hand-managed search index tables, skipped by autogenerate
+from app.api.domains.user.models.user_search import include_object
+
 # 🔧 Load DB connection string from .env (via Pydantic Settings)
 from app.api.config.settings import settings
 
@@ -53,6 +58,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         compare_type=True,
+        include_object=include_object,
         dialect_opts={"paramstyle": "named"},
     )
 
@@ -82,6 +88,7 @@ async def run_migrations_online() -> None:
                 connection=sync_conn,
                 target_metadata=target_metadata,
                 compare_type=True,
+                include_object=include_object,
             )
         )
         # 🚀 Apply the migrations
@@ -90,14 +97,35 @@ async def run_migrations_online() -> None:
     await engine.dispose()
 
 
+def run_migrations_on_connection(connection: Connection) -> None:
+    """
+    Run Alembic migrations on a (sync) connection supplied by the caller.
+
+    Use Case:
+    - Programmatic upgrades from code that already holds a connection,
+      e.g. inside `AsyncConnection.run_sync(...)`
+    """
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        compare_type=True,
+        include_object=include_object,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
 def run() -> None:
     """
     Entrypoint for Alembic.
 
     Automatically routes to offline or online mode based on command.
     """
+    connection = config.attributes.get("connection")
     if context.is_offline_mode():
         run_migrations_offline()
+    elif connection is not None:
+        run_migrations_on_connection(connection)
     else:
         asyncio.run(run_migrations_online())
 
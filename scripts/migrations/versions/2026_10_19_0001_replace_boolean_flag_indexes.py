@@ -0,0 +1,66 @@
+"""⚡ Replace low-selectivity boolean indexes with composite indexes
+
+Drops the single-column indexes on boolean flags (`user.is_active`,
+`user_identity.is_verified`, `user_identity.is_primary`), which the planner
+almost never chooses but every write has to maintain, and replaces them with
+composite indexes matching real access patterns:
+
+- `user (role_id, is_active)`: active users in a role; supersedes `ix_user_role_id`
+- `user_identity (user_id, is_primary)`: identities / primary identity of a user;
+  supersedes `ix_user_identity_user_id`
+
+Composites are created before the old indexes are dropped so foreign keys on
+`role_id` / `user_id` always keep a usable index (required by MySQL).
+
+Revision ID: 5b8e2f7c1d04
+Revises: cc7dc0185304
+Create Date: 2026-10-19 09:12:40.118204
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic.
+revision: str = "5b8e2f7c1d04"
+down_revision: Union[str, Sequence[str], None] = "cc7dc0185304"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """🆙 Create composite indexes, then drop the boolean flag indexes."""
+    op.create_index(
+        "ix_user_role_id_is_active", "user", ["role_id", "is_active"], unique=False
+    )
+    op.create_index(
+        "ix_user_identity_user_id_is_primary",
+        "user_identity",
+        ["user_id", "is_primary"],
+        unique=False,
+    )
+
+    op.drop_index("ix_user_is_active", table_name="user")
+    op.drop_index("ix_user_role_id", table_name="user")
+    op.drop_index("ix_user_identity_is_verified", table_name="user_identity")
+    op.drop_index("ix_user_identity_is_primary", table_name="user_identity")
+    op.drop_index("ix_user_identity_user_id", table_name="user_identity")
+
+
+def downgrade() -> None:
+    """🔽 Restore the original single-column indexes, then drop the composites."""
+    op.create_index(
+        "ix_user_identity_user_id", "user_identity", ["user_id"], unique=False
+    )
+    op.create_index(
+        "ix_user_identity_is_primary", "user_identity", ["is_primary"], unique=False
+    )
+    op.create_index(
+        "ix_user_identity_is_verified", "user_identity", ["is_verified"], unique=False
+    )
+    op.create_index("ix_user_role_id", "user", ["role_id"], unique=False)
+    op.create_index("ix_user_is_active", "user", ["is_active"], unique=False)
+
+    op.drop_index("ix_user_identity_user_id_is_primary", table_name="user_identity")
+    op.drop_index("ix_user_role_id_is_active", table_name="user")
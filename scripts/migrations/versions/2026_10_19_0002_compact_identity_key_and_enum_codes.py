@@ -0,0 +1,211 @@
+"""🔑 Compact identity lookup key and small-integer enum codes
+
+- Adds `user_identity.lookup_key` (BINARY(16)): a BLAKE2b hash of the normalized
+  (type, oauth_provider, value) triple with its own unique constraint, replacing
+  the wide `uq_user_identity_value` (type, value, oauth_provider) constraint.
+  A NULL provider hashes as "", so duplicates can no longer slip through on MySQL.
+- Stores `user_identity.type` and `user.gender` as SMALLINT codes instead of
+  native ENUM / VARCHAR values.
+
+Existing rows are converted in place; the hash is computed in Python with a
+frozen copy of the normalization rules so this revision never changes meaning.
+
+Revision ID: 8d41c6a0e9b3
+Revises: 5b8e2f7c1d04
+Create Date: 2026-10-19 10:03:17.502611
+"""
+
+import hashlib
+import re
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic.
+revision: str = "8d41c6a0e9b3"
+down_revision: Union[str, Sequence[str], None] = "5b8e2f7c1d04"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 🔢 Frozen code tables (stored enum name → code)
+IDENTITY_TYPE_CODES = {"EMAIL": 1, "MOBILE": 2, "OAUTH": 3}
+GENDER_CODES = {"male": 1, "female": 2, "other": 3, "prefer_not_to_say": 4}
+
+# 🧱 BINARY(16) on MySQL; BLOB on SQLite (which has no BINARY type)
+LOOKUP_KEY_TYPE = sa.BINARY(16).with_variant(sa.LargeBinary(16), "sqlite")
+
+_MOBILE_NOISE = re.compile(r"[\s\-().]")
+
+
+def _lookup_key(type_name: str, value: str, provider: Optional[str]) -> bytes:
+    """Frozen copy of `identity_lookup_key` as of this revision."""
+    type_value = type_name.lower()
+    value = value.strip()
+    if type_value == "email":
+        value = value.lower()
+    elif type_value == "mobile":
+        value = _MOBILE_NOISE.sub("", value)
+    material = "\x1f".join((type_value, (provider or "").strip().lower(), value))
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).digest()
+
+
+def _case(column: sa.ColumnClause, codes: dict, reverse: bool = False) -> sa.Case:
+    """Build a CASE expression mapping stored values to codes (or back)."""
+    pairs = [(code, name) if reverse else (name, code) for name, code in codes.items()]
+    return sa.case(dict(pairs), value=column)
+
+
+# 🧱 Lightweight table stubs for the data conversion (dialect-quoted by SQLAlchemy)
+_identity_types = sa.table(
+    "user_identity",
+    sa.column("type", sa.String()),
+    sa.column("type_code", sa.SmallInteger()),
+    sa.column("type_name", sa.String()),
+)
+_user_genders = sa.table(
+    "user",
+    sa.column("gender", sa.String()),
+    sa.column("gender_code", sa.SmallInteger()),
+    sa.column("gender_name", sa.String()),
+)
+
+
+def upgrade() -> None:
+    """🆙 Add `lookup_key`, convert enums to SMALLINT codes, swap unique constraint."""
+    bind = op.get_bind()
+
+    # 1️⃣ Add the new columns as nullable so existing rows can be converted
+    with op.batch_alter_table("user_identity") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "lookup_key",
+                LOOKUP_KEY_TYPE,
+                nullable=True,
+                comment="16-byte hash of normalized identity",
+            )
+        )
+        batch_op.add_column(sa.Column("type_code", sa.SmallInteger(), nullable=True))
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.add_column(sa.Column("gender_code", sa.SmallInteger(), nullable=True))
+
+    # 2️⃣ Convert data
+    op.execute(
+        _identity_types.update().values(
+            type_code=_case(_identity_types.c.type, IDENTITY_TYPE_CODES)
+        )
+    )
+    op.execute(
+        _user_genders.update()
+        .where(_user_genders.c.gender.is_not(None))
+        .values(gender_code=_case(_user_genders.c.gender, GENDER_CODES))
+    )
+
+    identity = sa.table(
+        "user_identity",
+        sa.column("id", sa.Integer()),
+        sa.column("type", sa.String()),
+        sa.column("value", sa.String()),
+        sa.column("oauth_provider", sa.String()),
+        sa.column("lookup_key", LOOKUP_KEY_TYPE),
+    )
+    rows = bind.execute(
+        sa.select(
+            identity.c.id, identity.c.type, identity.c.value, identity.c.oauth_provider
+        )
+    ).all()
+    if rows:
+        bind.execute(
+            identity.update()
+            .where(identity.c.id == sa.bindparam("_id"))
+            .values(lookup_key=sa.bindparam("_key")),
+            [
+                {"_id": r.id, "_key": _lookup_key(r.type, r.value, r.oauth_provider)}
+                for r in rows
+            ],
+        )
+
+    # 3️⃣ Swap columns and constraints
+    with op.batch_alter_table("user_identity") as batch_op:
+        batch_op.drop_constraint("uq_user_identity_value", type_="unique")
+        batch_op.drop_column("type")
+        batch_op.alter_column(
+            "type_code",
+            new_column_name="type",
+            existing_type=sa.SmallInteger(),
+            nullable=False,
+            comment="Identity type code: 1=email, 2=mobile, 3=oauth",
+        )
+        batch_op.alter_column(
+            "lookup_key", existing_type=LOOKUP_KEY_TYPE, nullable=False
+        )
+        batch_op.create_unique_constraint("uq_user_identity_lookup_key", ["lookup_key"])
+
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_column("gender")
+        batch_op.alter_column(
+            "gender_code",
+            new_column_name="gender",
+            existing_type=sa.SmallInteger(),
+            nullable=True,
+            comment="Gender code: 1=male, 2=female, 3=other, 4=prefer_not_to_say",
+        )
+
+
+def downgrade() -> None:
+    """🔽 Restore ENUM columns and the composite unique constraint; drop `lookup_key`."""
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "gender_name",
+                sa.Enum("male", "female", "other", "prefer_not_to_say", name="gender"),
+                nullable=True,
+            )
+        )
+    op.execute(
+        _user_genders.update()
+        .where(_user_genders.c.gender.is_not(None))
+        .values(gender_name=_case(_user_genders.c.gender, GENDER_CODES, reverse=True))
+    )
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_column("gender")
+        batch_op.alter_column(
+            "gender_name",
+            new_column_name="gender",
+            existing_type=sa.Enum(
+                "male", "female", "other", "prefer_not_to_say", name="gender"
+            ),
+            nullable=True,
+            comment="Optional gender enum",
+        )
+
+    with op.batch_alter_table("user_identity") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "type_name",
+                sa.Enum("EMAIL", "MOBILE", "OAUTH", name="identity_type"),
+                nullable=True,
+            )
+        )
+    op.execute(
+        _identity_types.update().values(
+            type_name=_case(_identity_types.c.type, IDENTITY_TYPE_CODES, reverse=True)
+        )
+    )
+    with op.batch_alter_table("user_identity") as batch_op:
+        batch_op.drop_constraint("uq_user_identity_lookup_key", type_="unique")
+        batch_op.drop_column("lookup_key")
+        batch_op.drop_column("type")
+        batch_op.alter_column(
+            "type_name",
+            new_column_name="type",
+            existing_type=sa.Enum("EMAIL", "MOBILE", "OAUTH", name="identity_type"),
+            nullable=False,
+            comment="Identity type: email, mobile, or oauth",
+        )
+
+    # Separate batch: the constraint must see the renamed `type` column
+    with op.batch_alter_table("user_identity") as batch_op:
+        batch_op.create_unique_constraint(
+            "uq_user_identity_value", ["type", "value", "oauth_provider"]
+        )
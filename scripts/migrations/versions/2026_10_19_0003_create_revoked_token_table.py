@@ -0,0 +1,124 @@
+"""🚫 Create `revoked_token` table
+
+Authoritative revocation list for stateless access/refresh tokens. Each
+process mirrors it into an in-memory Bloom filter; only filter hits query
+this table, through `ix_revoked_token_kind_subject`.
+
+Revision ID: c2f9a7d35e18
+Revises: 8d41c6a0e9b3
+Create Date: 2026-10-19 11:26:52.870334
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic.
+revision: str = "c2f9a7d35e18"
+down_revision: Union[str, Sequence[str], None] = "8d41c6a0e9b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """🆙 Create `revoked_token` with lookup and pruning indexes."""
+    op.create_table(
+        "revoked_token",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            autoincrement=True,
+            nullable=False,
+            comment="Primary key",
+        ),
+        sa.Column(
+            "kind",
+            sa.SmallInteger(),
+            nullable=False,
+            comment="Entry kind code: 1=token, 2=user",
+        ),
+        sa.Column(
+            "subject",
+            sa.String(length=64),
+            nullable=False,
+            comment="Token jti or user ID",
+        ),
+        sa.Column(
+            "not_before",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            comment="Revocation instant",
+        ),
+        sa.Column(
+            "expires_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            comment="When the entry can be pruned",
+        ),
+        sa.Column(
+            "reason",
+            sa.String(length=64),
+            nullable=True,
+            comment="Why the token(s) were revoked",
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+            comment="Creation timestamp",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+            comment="Last update timestamp",
+        ),
+        sa.Column(
+            "created_by",
+            sa.Integer(),
+            nullable=True,
+            comment="ID of user who created this entry",
+        ),
+        sa.Column(
+            "updated_by",
+            sa.Integer(),
+            nullable=True,
+            comment="ID of user who last updated this entry",
+        ),
+        sa.Column(
+            "deleted_at", sa.DateTime(), nullable=True, comment="Soft delete timestamp"
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_revoked_token_id"),
+        sa.ForeignKeyConstraint(
+            ["created_by"],
+            ["user.id"],
+            ondelete="SET NULL",
+            name="fk_revoked_token_created_by",
+        ),
+        sa.ForeignKeyConstraint(
+            ["updated_by"],
+            ["user.id"],
+            ondelete="SET NULL",
+            name="fk_revoked_token_updated_by",
+        ),
+    )
+
+    op.create_index(
+        "ix_revoked_token_kind_subject",
+        "revoked_token",
+        ["kind", "subject"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_revoked_token_expires_at", "revoked_token", ["expires_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """🔽 Drop `revoked_token` and its indexes."""
+    op.drop_index("ix_revoked_token_expires_at", table_name="revoked_token")
+    op.drop_index("ix_revoked_token_kind_subject", table_name="revoked_token")
+    op.drop_table("revoked_token")
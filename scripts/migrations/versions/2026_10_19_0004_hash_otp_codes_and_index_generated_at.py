@@ -0,0 +1,63 @@
+"""🔢 Store OTPs as keyed hashes and index `otp_generated_at`
+
+- Renames `user_identity.otp_code` (plaintext, String(10)) to `otp_hash`
+  (HMAC-SHA256 hex, String(64)). Outstanding plaintext codes are discarded;
+  affected users simply request a new code.
+- Adds `ix_user_identity_otp_generated_at` so the expiry sweeper can range-scan
+  expired codes in small batches instead of scanning the table.
+
+Revision ID: 4e7b1a9c0f62
+Revises: c2f9a7d35e18
+Create Date: 2026-10-19 12:41:08.215947
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic.
+revision: str = "4e7b1a9c0f62"
+down_revision: Union[str, Sequence[str], None] = "c2f9a7d35e18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """🆙 Discard plaintext codes, widen/rename the column, add the sweep index."""
+    op.execute(
+        "UPDATE user_identity SET otp_code = NULL, otp_generated_at = NULL, wrong_otp_count = 0"
+    )
+
+    with op.batch_alter_table("user_identity") as batch_op:
+        batch_op.alter_column(
+            "otp_code",
+            new_column_name="otp_hash",
+            existing_type=sa.String(length=10),
+            type_=sa.String(length=64),
+            existing_nullable=True,
+            comment="HMAC-SHA256 (hex) of the last OTP sent",
+        )
+
+    op.create_index(
+        "ix_user_identity_otp_generated_at",
+        "user_identity",
+        ["otp_generated_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """🔽 Drop the sweep index and restore the plaintext `otp_code` column (emptied)."""
+    op.drop_index("ix_user_identity_otp_generated_at", table_name="user_identity")
+
+    op.execute("UPDATE user_identity SET otp_hash = NULL, otp_generated_at = NULL")
+    with op.batch_alter_table("user_identity") as batch_op:
+        batch_op.alter_column(
+            "otp_hash",
+            new_column_name="otp_code",
+            existing_type=sa.String(length=64),
+            type_=sa.String(length=10),
+            existing_nullable=True,
+            comment="Last OTP sent",
+        )
@@ -0,0 +1,89 @@
+"""📜 Create `audit_event` table
+
+Append-only change log for user-domain tables, written asynchronously in
+batches. `actor_id` deliberately has no FK so history survives user deletion.
+
+Revision ID: 9a3c5e1f7b20
+Revises: 4e7b1a9c0f62
+Create Date: 2026-10-19 14:03:37.508112
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic.
+revision: str = "9a3c5e1f7b20"
+down_revision: Union[str, Sequence[str], None] = "4e7b1a9c0f62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """🆙 Create `audit_event` with entity-history and time-range indexes."""
+    op.create_table(
+        "audit_event",
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            autoincrement=True,
+            nullable=False,
+            comment="Primary key",
+        ),
+        sa.Column(
+            "occurred_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+            comment="Commit time of the audited change",
+        ),
+        sa.Column(
+            "actor_id",
+            sa.Integer(),
+            nullable=True,
+            comment="User ID of the actor, if known",
+        ),
+        sa.Column(
+            "entity",
+            sa.String(length=64),
+            nullable=False,
+            comment="Table name of the audited row",
+        ),
+        sa.Column(
+            "entity_id",
+            sa.String(length=64),
+            nullable=False,
+            comment="Primary key of the audited row",
+        ),
+        sa.Column(
+            "action",
+            sa.SmallInteger(),
+            nullable=False,
+            comment="Action code: 1=insert, 2=update, 3=delete",
+        ),
+        sa.Column(
+            "changes",
+            sa.JSON(),
+            nullable=False,
+            comment="Changed columns as {column: [old, new]}",
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_audit_event_id"),
+    )
+
+    op.create_index(
+        "ix_audit_event_entity_entity_id",
+        "audit_event",
+        ["entity", "entity_id", "occurred_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_event_occurred_at", "audit_event", ["occurred_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """🔽 Drop `audit_event` and its indexes."""
+    op.drop_index("ix_audit_event_occurred_at", table_name="audit_event")
+    op.drop_index("ix_audit_event_entity_entity_id", table_name="audit_event")
+    op.drop_table("audit_event")
@@ -0,0 +1,44 @@
+"""🔢 Add `version_id` to `user`, `role` and `user_auth`
+
+Row version counters for optimistic concurrency (`version_id_col`), exposed
+through the API as ETag / If-Match. Existing rows start at version 1.
+
+Revision ID: 6f2d8b4a1c93
+Revises: 9a3c5e1f7b20
+Create Date: 2026-10-19 15:12:09.734521
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic.
+revision: str = "6f2d8b4a1c93"
+down_revision: Union[str, Sequence[str], None] = "9a3c5e1f7b20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ("user", "role", "user_auth")
+
+
+def upgrade() -> None:
+    """🆙 Add `version_id` (NOT NULL, default 1) to every versioned table."""
+    for table in VERSIONED_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "version_id",
+                sa.Integer(),
+                server_default="1",
+                nullable=False,
+                comment="Row version for optimistic concurrency (ETag)",
+            ),
+        )
+
+
+def downgrade() -> None:
+    """🔽 Drop `version_id` from every versioned table."""
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("version_id")
@@ -0,0 +1,74 @@
+"""🚚 Create `data_backfill` checkpoint table
+
+One progress row per named data backfill (`app/database/backfill.py`), so
+chunked backfills can resume and contract revisions can check completion.
+
+Revision ID: 3b9e6d2f8a41
+Revises: 6f2d8b4a1c93
+Create Date: 2026-10-19 16:22:05.114620
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic.
+revision: str = "3b9e6d2f8a41"
+down_revision: Union[str, Sequence[str], None] = "6f2d8b4a1c93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """🆙 Create `data_backfill`."""
+    op.create_table(
+        "data_backfill",
+        sa.Column(
+            "name",
+            sa.String(length=128),
+            nullable=False,
+            comment="Unique backfill name",
+        ),
+        sa.Column(
+            "last_key",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Last processed primary key",
+        ),
+        sa.Column(
+            "rows_changed",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Rows changed so far",
+        ),
+        sa.Column(
+            "chunks", sa.Integer(), nullable=False, comment="Chunks committed so far"
+        ),
+        sa.Column(
+            "started_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+            comment="When the backfill first ran",
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+            comment="When the last chunk was committed",
+        ),
+        sa.Column(
+            "completed_at",
+            sa.DateTime(timezone=True),
+            nullable=True,
+            comment="Set once all rows were processed",
+        ),
+        sa.PrimaryKeyConstraint("name", name="pk_data_backfill_name"),
+    )
+
+
+def downgrade() -> None:
+    """🔽 Drop `data_backfill`."""
+    op.drop_table("data_backfill")
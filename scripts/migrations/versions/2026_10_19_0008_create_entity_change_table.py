@@ -0,0 +1,77 @@
+"""📣 Create `entity_change` feed table
+
+Short-lived change feed behind the cross-worker invalidation bus: one row
+per changed cached entity, written in the changing transaction and polled
+by `changed_at` as the fallback to the Unix datagram broadcast.
+
+Revision ID: 9c4e1a7b5d20
+Revises: 3b9e6d2f8a41
+Create Date: 2026-10-19 17:41:38.502917
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic.
+revision: str = "9c4e1a7b5d20"
+down_revision: Union[str, Sequence[str], None] = "3b9e6d2f8a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """🆙 Create `entity_change` with its polling index."""
+    op.create_table(
+        "entity_change",
+        sa.Column(
+            "id",
+            sa.BigInteger().with_variant(sa.Integer(), "sqlite"),
+            autoincrement=True,
+            nullable=False,
+            comment="Primary key",
+        ),
+        sa.Column(
+            "origin",
+            sa.String(length=64),
+            nullable=False,
+            comment="Process that committed the change",
+        ),
+        sa.Column(
+            "seq",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Per-origin transaction sequence number",
+        ),
+        sa.Column(
+            "entity",
+            sa.String(length=64),
+            nullable=False,
+            comment="Changed entity (table name)",
+        ),
+        sa.Column(
+            "entity_id",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Primary key of the changed row",
+        ),
+        sa.Column(
+            "changed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+            comment="Database time of the change",
+        ),
+        sa.PrimaryKeyConstraint("id", name="pk_entity_change_id"),
+    )
+
+    op.create_index(
+        "ix_entity_change_changed_at", "entity_change", ["changed_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """🔽 Drop `entity_change` and its index."""
+    op.drop_index("ix_entity_change_changed_at", table_name="entity_change")
+    op.drop_table("entity_change")
@@ -0,0 +1,65 @@
+"""🔎 Create `user_search` full-text index
+
+Search index over user names and identity values: an FTS5 trigram virtual
+table on SQLite, an ngram FULLTEXT table on MySQL (other dialects: none).
+Existing users are indexed by the `user_search_index` backfill, chunk by
+chunk; it can also be run out of band with `python -m scripts.run_backfill`.
+
+Revision ID: 5e8a2c7d1f94
+Revises: 9c4e1a7b5d20
+Create Date: 2026-10-19 18:57:12.330871
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.api.domains.user.models.user_search import optimize_index, reindex_users
+from app.database.backfill import Backfill, run_backfills_in_migration
+
+# Revision identifiers, used by Alembic.
+revision: str = "5e8a2c7d1f94"
+down_revision: Union[str, Sequence[str], None] = "9c4e1a7b5d20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILLS = [
+    Backfill(
+        name="user_search_index",
+        table=sa.table("user", sa.column("id")),
+        apply=reindex_users,
+    ),
+]
+
+
+def upgrade() -> None:
+    """🆙 Create the dialect's search index, then index every user."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE user_search USING fts5(name, identities, tokenize='trigram')"
+        )
+        op.execute(
+            "INSERT INTO user_search(user_search, rank) VALUES ('rank', 'bm25(2.0, 1.0)')"
+        )
+    elif dialect == "mysql":
+        op.execute(
+            "CREATE TABLE user_search ("
+            " user_id BIGINT NOT NULL PRIMARY KEY,"
+            " name VARCHAR(255) NOT NULL,"
+            " identities TEXT NOT NULL,"
+            " FULLTEXT KEY ft_user_search (name, identities) WITH PARSER ngram"
+            ") ENGINE=InnoDB DEFAULT CHARSET=utf8mb4"
+        )
+    else:
+        return
+    run_backfills_in_migration(BACKFILLS)
+    optimize_index(op.get_bind())
+
+
+def downgrade() -> None:
+    """🔽 Drop the search index and forget its backfill."""
+    if op.get_bind().dialect.name in ("sqlite", "mysql"):
+        op.execute("DROP TABLE IF EXISTS user_search")
+    op.execute(sa.text("DELETE FROM data_backfill WHERE name = 'user_search_index'"))
@@ -0,0 +1,118 @@
+"""🧩 Prepare user tables for sharding by user ID
+
+- Drops the `created_by` / `updated_by` → `user.id` foreign keys: the actor
+  may live on another shard (users are only ever soft-deleted, so their
+  `ON DELETE SET NULL` never fired)
+- Creates `id_block` (global primary key counters for sharded tables),
+  seeded above each table's current largest ID
+- Creates `identity_shard` (identity lookup key → user ID) on the global
+  database; entries are written by the app while sharding is on
+
+Every database (global and shards) runs the same revision chain.
+
+Revision ID: b7d3f19a6c2e
+Revises: 5e8a2c7d1f94
+Create Date: 2026-10-19 20:14:51.907364
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.database.types import fixed_binary
+
+# Revision identifiers, used by Alembic.
+revision: str = "b7d3f19a6c2e"
+down_revision: Union[str, Sequence[str], None] = "5e8a2c7d1f94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables with actor columns, and the sharded tables whose IDs `id_block` hands out
+AUDITED_TABLES = (
+    "privilege",
+    "role",
+    "role_privilege",
+    "user",
+    "user_auth",
+    "user_identity",
+    "revoked_token",
+)
+SHARDED_TABLES = ("user", "user_auth", "user_identity")
+
+
+def upgrade() -> None:
+    """🆙 Drop actor FKs; create and seed `id_block`; create `identity_shard`."""
+    for table in AUDITED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f"fk_{table}_created_by", type_="foreignkey")
+            batch_op.drop_constraint(f"fk_{table}_updated_by", type_="foreignkey")
+
+    op.create_table(
+        "id_block",
+        sa.Column(
+            "name",
+            sa.String(length=64),
+            nullable=False,
+            comment="Table the IDs are allocated for",
+        ),
+        sa.Column(
+            "next_id", sa.BigInteger(), nullable=False, comment="First unreserved ID"
+        ),
+        sa.PrimaryKeyConstraint("name", name="pk_id_block_name"),
+    )
+    id_block = sa.table("id_block", sa.column("name"), sa.column("next_id"))
+    for table in SHARDED_TABLES:
+        ids = sa.table(table, sa.column("id"))
+        op.execute(
+            id_block.insert().from_select(
+                ["name", "next_id"],
+                sa.select(
+                    sa.literal(table), sa.func.coalesce(sa.func.max(ids.c.id), 0) + 1
+                ),
+            )
+        )
+
+    op.create_table(
+        "identity_shard",
+        sa.Column(
+            "lookup_key",
+            fixed_binary(16),
+            nullable=False,
+            comment="Lookup key of the identity",
+        ),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            nullable=False,
+            comment="User ID owning the identity",
+        ),
+        sa.PrimaryKeyConstraint("lookup_key", name="pk_identity_shard_lookup_key"),
+    )
+    op.create_index(
+        "ix_identity_shard_user_id", "identity_shard", ["user_id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """🔽 Drop `identity_shard` and `id_block`; restore the actor FKs."""
+    op.drop_index("ix_identity_shard_user_id", table_name="identity_shard")
+    op.drop_table("identity_shard")
+    op.drop_table("id_block")
+
+    for table in reversed(AUDITED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_foreign_key(
+                f"fk_{table}_created_by",
+                "user",
+                ["created_by"],
+                ["id"],
+                ondelete="SET NULL",
+            )
+            batch_op.create_foreign_key(
+                f"fk_{table}_updated_by",
+                "user",
+                ["updated_by"],
+                ["id"],
+                ondelete="SET NULL",
+            )
@@ -0,0 +1,32 @@
+"""🚫 Index `revoked_token.created_at` for overlapping filter refreshes
+
+Workers now refresh their revocation Bloom filter by `created_at`, looking
+back `revocation_lookback_seconds`, instead of by `id`: an entry whose
+transaction commits after one with a higher `id` is no longer skipped.
+
+Revision ID: e3a8c51f7b09
+Revises: b7d3f19a6c2e
+Create Date: 2026-10-19 22:08:13.460218
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+revision: str = "e3a8c51f7b09"
+down_revision: Union[str, Sequence[str], None] = "b7d3f19a6c2e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """🆙 Add the refresh index."""
+    op.create_index(
+        "ix_revoked_token_created_at", "revoked_token", ["created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """🔽 Drop the refresh index."""
+    op.drop_index("ix_revoked_token_created_at", table_name="revoked_token")
@@ -0,0 +1,46 @@
+"""🔢 Add `version_id` to `user_identity` and `privilege`
+
+List and detail ETags sum `version_id` over every embedded relation. Without
+a counter, an identity value edit or a privilege rename within the same
+`updated_at` second left the validators unchanged (a stale 304). Existing
+rows start at version 1.
+
+Revision ID: 4c9e2a7d1f58
+Revises: e3a8c51f7b09
+Create Date: 2026-10-19 23:41:52.118304
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic.
+revision: str = "4c9e2a7d1f58"
+down_revision: Union[str, Sequence[str], None] = "e3a8c51f7b09"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ("user_identity", "privilege")
+
+
+def upgrade() -> None:
+    """🆙 Add `version_id` (NOT NULL, default 1) to both tables."""
+    for table in VERSIONED_TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                "version_id",
+                sa.Integer(),
+                server_default="1",
+                nullable=False,
+                comment="Row version for optimistic concurrency (ETag)",
+            ),
+        )
+
+
+def downgrade() -> None:
+    """🔽 Drop `version_id` from both tables."""
+    for table in VERSIONED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("version_id")
@@ -0,0 +1,73 @@
+"""🔢 Add a stable token bit position to `privilege`
+
+Access tokens encode privileges as a bitmap. Positions used to be each
+privilege's rank by ID, which shifts whenever a row appears below existing
+IDs or disappears. `privilege.bit` stores the position instead; the app
+reserves new ones from the `privilege_bit` counter in `id_block`, which
+only grows.
+
+Existing rows keep the position they had (rank by ID, from 0), so tokens
+issued before the upgrade still decode to the same privileges. The counter
+is seeded past them (counters start at 1, positions at 0).
+
+Revision ID: 8f2b6d4e1a93
+Revises: 4c9e2a7d1f58
+Create Date: 2026-10-20 09:12:37.540218
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# Revision identifiers, used by Alembic.
+revision: str = "8f2b6d4e1a93"
+down_revision: Union[str, Sequence[str], None] = "4c9e2a7d1f58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """🆙 Add `privilege.bit`, backfill it by ID rank and seed its counter."""
+    op.add_column(
+        "privilege",
+        sa.Column(
+            "bit",
+            sa.Integer(),
+            nullable=True,
+            comment="Position of the privilege in access token bitmaps",
+        ),
+    )
+
+    privilege = sa.table("privilege", sa.column("id"), sa.column("bit"))
+    connection = op.get_bind()
+    ids = connection.execute(
+        sa.select(privilege.c.id).order_by(privilege.c.id)
+    ).scalars()
+    for bit, pid in enumerate(list(ids)):
+        connection.execute(
+            privilege.update().where(privilege.c.id == pid).values(bit=bit)
+        )
+
+    id_block = sa.table("id_block", sa.column("name"), sa.column("next_id"))
+    op.execute(
+        id_block.insert().from_select(
+            ["name", "next_id"],
+            sa.select(
+                sa.literal("privilege_bit"),
+                sa.func.coalesce(sa.func.max(privilege.c.bit), -1) + 2,
+            ),
+        )
+    )
+
+    with op.batch_alter_table("privilege") as batch_op:
+        batch_op.alter_column("bit", existing_type=sa.Integer(), nullable=False)
+        batch_op.create_unique_constraint("uq_privilege_bit", ["bit"])
+
+
+def downgrade() -> None:
+    """🔽 Drop `privilege.bit` and its counter."""
+    op.execute("DELETE FROM id_block WHERE name = 'privilege_bit'")
+    with op.batch_alter_table("privilege") as batch_op:
+        batch_op.drop_constraint("uq_privilege_bit", type_="unique")
+        batch_op.drop_column("bit")
@@ -0,0 +1,94 @@
+# scripts/run_backfill.py
+
+"""
+🚚 Run the data backfills declared by an Alembic revision, out of band.
+
+A revision lists its data steps in a module-level `BACKFILLS` list (see
+`app/database/backfill.py`). This command runs them against the live
+database, chunk by chunk with throttling, resuming from each backfill's
+checkpoint, so large tables can be backfilled while the app keeps serving
+and the contract revision can be deployed afterwards.
+
+Usage:
+    python -m scripts.run_backfill 3b9e6d2f8a41
+    python -m scripts.run_backfill 3b9e6d2f8a41 --chunk-size 5000 --throttle 1.0
+    python -m scripts.run_backfill 3b9e6d2f8a41 --max-chunks 100 --url mysql+aiomysql://...
+"""
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+from typing import List
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from app.database.backfill import Backfill, BackfillProgress, run_backfill
+from app.database.session import create_engine
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_backfills(revision: str) -> List[Backfill]:
+    """Import the revision module and return its `BACKFILLS`."""
+    script = ScriptDirectory.from_config(Config(str(ROOT / "alembic.ini")))
+    found = script.get_revision(revision)
+    if found is None:
+        raise SystemExit(f"Unknown revision '{revision}'")
+    backfills = getattr(found.module, "BACKFILLS", None)
+    if not backfills:
+        raise SystemExit(f"Revision {found.revision} declares no BACKFILLS")
+    return list(backfills)
+
+
+async def run(args: argparse.Namespace) -> List[BackfillProgress]:
+    engine = create_engine(args.url)
+    results = []
+    try:
+        async with engine.connect() as connection:
+            for backfill in load_backfills(args.revision):
+                results.append(
+                    await connection.run_sync(
+                        run_backfill,
+                        backfill,
+                        chunk_size=args.chunk_size,
+                        pause_seconds=args.pause,
+                        throttle_ratio=args.throttle,
+                        max_chunks=args.max_chunks,
+                    )
+                )
+    finally:
+        await engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a revision's data backfills.")
+    parser.add_argument(
+        "revision", help="Revision ID (or unique prefix) declaring BACKFILLS"
+    )
+    parser.add_argument("--url", default=None, help="Database URL (default: settings)")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument(
+        "--pause", type=float, default=0.0, help="Seconds to sleep per chunk"
+    )
+    parser.add_argument(
+        "--throttle", type=float, default=0.0, help="Sleep this × chunk time"
+    )
+    parser.add_argument(
+        "--max-chunks", type=int, default=None, help="Stop after N chunks"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    for progress in asyncio.run(run(args)):
+        state = "✅ completed" if progress.completed else "⏸️ paused"
+        print(
+            f"{state} {progress.name}: {progress.rows_changed} rows in "
+            f"{progress.chunks} chunks (last key {progress.last_key})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# scripts/serve.py
+
+"""
+🚀 Pre-fork server: preload the app once, then fork uvicorn workers.
+
+`uvicorn --workers N` spawns fresh interpreters, so every worker imports the
+app, configures the mappers and compiles its hot statements on its own, and
+holds a private copy of all of it. Here the master process instead:
+
+1. imports `app.main` (models, routers, settings) with the GC disabled, so
+   no collection punches holes into the pages about to be shared
+2. runs `configure_mappers()` and the hot reads of
+   `warm_user_queries` (engine compiled-statement cache), then disposes the
+   pool so no connection crosses the fork
+3. `gc.freeze()`s everything it built and forks `--workers` children on one
+   shared listening socket
+
+Frozen objects are never traversed by the children's collector, so their
+pages stay shared copy-on-write instead of being dirtied by GC bookkeeping.
+The master supervises: a worker that dies is replaced, SIGTERM/SIGINT stop
+all workers gracefully.
+
+Each worker prints one line when it is ready to serve: startup time since
+the fork and its memory (RSS / PSS / private, from `/proc/<pid>/smaps_rollup`
+on Linux); `--no-preload` runs the same server with every import done after
+the fork, for comparison (see `scripts/bench_prefork.py`).
+
+Usage:
+    python -m scripts.serve --workers 4 --port 8000
+    python -m scripts.serve --workers 4 --no-preload
+"""
+
+import argparse
+import asyncio
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import uvicorn
+
+logger = logging.getLogger("prefork")
+
+
+# --------------------------------------
+# 📏 Memory
+# --------------------------------------
+def memory_kib(pid: int) -> Dict[str, int]:
+    """`Rss`, `Pss` and private (`Private_Clean + Private_Dirty`) in KiB; {} if unavailable."""
+    try:
+        text = Path(f"/proc/{pid}/smaps_rollup").read_text()
+    except OSError:
+        return {}
+    fields = {}
+    for line in text.splitlines()[1:]:
+        key, _, value = line.partition(":")
+        fields[key] = int(value.split()[0])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+# --------------------------------------
+# 🔥 Preload (master)
+# --------------------------------------
+async def _warm_up() -> int:
+    from app.api.domains.user.services.warmup import warm_user_queries
+    from app.database.session import dispose_engines, get_sessionmaker
+
+    try:
+        async with get_sessionmaker()() as session:
+            return await warm_user_queries(session)
+    finally:
+        # 🔌 Compiled cache stays with the engine; connections must not cross the fork
+        await dispose_engines()
+
+
+def preload(warm: bool) -> None:
+    """Import and prepare everything workers share, then freeze it."""
+    gc.disable()
+    started = time.perf_counter()
+
+    from sqlalchemy.orm import configure_mappers
+
+    import app.main  # noqa: F401
+
+    configure_mappers()
+    warmed = 0
+    if warm:
+        try:
+            warmed = asyncio.run(_warm_up())
+        except Exception as exc:
+            # A database that is not up yet must not keep the server down
+            logger.warning("Statement warm-up skipped: %s", exc)
+
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        "🔥 preloaded in %.0f ms (%d statements warmed, %d objects frozen)",
+        (time.perf_counter() - started) * 1000,
+        warmed,
+        gc.get_freeze_count(),
+    )
+
+
+# --------------------------------------
+# 👷 Worker
+# --------------------------------------
+async def _serve(
+    sock: socket.socket, args: argparse.Namespace, forked_at: float
+) -> None:
+    from app.main import app
+
+    config = uvicorn.Config(
+        app,
+        log_level=args.log_level,
+        access_log=False,
+        lifespan="on",
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+    server = uvicorn.Server(config)
+
+    async def report_ready() -> None:
+        while not server.started:
+            if server.should_exit:
+                return
+            await asyncio.sleep(0.005)
+        memory = memory_kib(os.getpid())
+        line = (
+            f"👷 worker pid={os.getpid()} ready_ms={(time.perf_counter() - forked_at) * 1000:.0f}"
+            + "".join(f" {key}_kib={value}" for key, value in memory.items())
+        )
+        # One write per line: workers share stdout and must not interleave
+        os.write(sys.stdout.fileno(), (line + "\n").encode())
+
+    reporter = asyncio.create_task(report_ready())
+    try:
+        await server.serve(sockets=[sock])
+    finally:
+        reporter.cancel()
+
+
+def run_worker(sock: socket.socket, args: argparse.Namespace) -> None:
+    forked_at = time.perf_counter()
+    # Back to default signal handling; uvicorn installs its own in `serve`
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    gc.enable()
+    asyncio.run(_serve(sock, args, forked_at))
+
+
+# --------------------------------------
+# 🧭 Master
+# --------------------------------------
+def bind(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def spawn(sock: socket.socket, args: argparse.Namespace) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(sock, args)
+        except BaseException:
+            logger.exception("Worker crashed")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def supervise(sock: socket.socket, args: argparse.Namespace) -> int:
+    """Fork the workers, replace any that die, stop them all on a signal."""
+    workers: Dict[int, float] = {}
+    stopping: Optional[int] = None
+
+    def stop(signum: int, _frame: object) -> None:
+        nonlocal stopping
+        stopping = signum
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(args.workers):
+        workers[spawn(sock, args)] = time.monotonic()
+    logger.info(
+        "🧭 master pid=%d serving on %s:%d with %d workers",
+        os.getpid(),
+        args.host,
+        args.port,
+        args.workers,
+    )
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = workers.pop(pid, None)
+        if started is None or stopping is not None:
+            continue
+        logger.warning("Worker %d exited with status %d; restarting", pid, status)
+        if time.monotonic() - started < 1.0:
+            time.sleep(1.0)  # crash loop: do not spin
+        workers[spawn(sock, args)] = time.monotonic()
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Pre-fork uvicorn server with a preloaded app."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--graceful-timeout", type=int, default=30)
+    parser.add_argument("--log-level", default="warning")
+    parser.add_argument(
+        "--no-preload",
+        action="store_true",
+        help="Import the app in each worker instead",
+    )
+    parser.add_argument("--no-warm", action="store_true", help="Skip statement warm-up")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if not hasattr(os, "fork"):
+        raise SystemExit("Pre-fork serving needs os.fork (Linux / macOS)")
+    sock = bind(args.host, args.port, args.backlog)
+    if not args.no_preload:
+        preload(warm=not args.no_warm)
+    sys.exit(supervise(sock, args))
+
+
+if __name__ == "__main__":
+    main()
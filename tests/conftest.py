@@ -0,0 +1,61 @@
+# tests/conftest.py
+
+"""
+🧪 Shared fixtures: SQLite databases cloned from the schema template.
+
+Every test gets fresh database files copied from one `SqliteSchemaTemplate`
+(built from the models once per schema fingerprint), so no test replays the
+migrations or sees another test's rows. Engines are built here rather than
+through the process-wide getters in `app/database/session.py`, which are
+cached per process and configured from `settings`.
+"""
+
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, List
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.database.bootstrap import SqliteSchemaTemplate
+from app.database.session import create_engine
+from app.database.sqlite import SqlitePragmas
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def schema_template(tmp_path_factory: pytest.TempPathFactory) -> SqliteSchemaTemplate:
+    """One template per test run, built from `Base.metadata`."""
+    return SqliteSchemaTemplate(tmp_path_factory.mktemp("schema-templates"))
+
+
+@pytest.fixture
+def database_url(
+    schema_template: SqliteSchemaTemplate, tmp_path: Path
+) -> Callable[[str], str]:
+    """Clone the template to `<tmp_path>/<name>.db` and return its async URL."""
+
+    def clone(name: str) -> str:
+        return schema_template.clone(tmp_path / f"{name}.db")
+
+    return clone
+
+
+@pytest.fixture
+async def engines() -> AsyncIterator[Callable[..., AsyncEngine]]:
+    """`create_engine` with the default PRAGMAs; every engine is disposed after the test."""
+    created: List[AsyncEngine] = []
+
+    def make(
+        url: str, pragmas: SqlitePragmas = SqlitePragmas(), **kwargs: Any
+    ) -> AsyncEngine:
+        engine = create_engine(url, sqlite_pragmas=pragmas, **kwargs)
+        created.append(engine)
+        return engine
+
+    yield make
+    for engine in created:
+        await engine.dispose()
@@ -0,0 +1,139 @@
+# tests/test_audit_writer.py
+
+"""
+📜 `AuditWriter`: the overflow policies of its bounded queue, and the flush
+of collected and queued events when the app lifespan stops it.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.domains.user.models.audit_event import AuditAction, AuditEvent
+from app.api.domains.user.services.audit_service import AuditWriter
+from app.database.write_queue import WriteQueue
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def sessions(
+    database_url: Callable[[str], str], engines: Callable[..., AsyncEngine]
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engines(database_url("app")), expire_on_commit=False)
+
+
+def _writer(
+    sessions: async_sessionmaker[AsyncSession],
+    maxsize: int = 100,
+    overflow: str = "drop_oldest",
+    flush_interval: float = 60.0,
+) -> AuditWriter:
+    return AuditWriter(
+        maxsize=maxsize,
+        batch_size=50,
+        flush_interval=flush_interval,
+        overflow=overflow,
+        writes=WriteQueue(sessions, maxsize=100, batch_size=64),
+    )
+
+
+def _events(*entity_ids: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "actor_id": None,
+            "entity": "user",
+            "entity_id": str(entity_id),
+            "action": AuditAction.UPDATE,
+            "changes": {"is_active": [True, False]},
+        }
+        for entity_id in entity_ids
+    ]
+
+
+async def _written(sessions: async_sessionmaker[AsyncSession]) -> List[str]:
+    async with sessions() as session:
+        stmt = select(AuditEvent.entity_id).order_by(AuditEvent.id)
+        return list(await session.scalars(stmt))
+
+
+# --------------------------------------
+# 🚰 Overflow
+# --------------------------------------
+@pytest.mark.parametrize(
+    ("overflow", "kept"),
+    [("drop_oldest", ["4", "5"]), ("drop_new", ["1", "2"])],
+)
+async def test_a_full_queue_drops_by_policy(
+    sessions: async_sessionmaker[AsyncSession], overflow: str, kept: List[str]
+) -> None:
+    writer = _writer(sessions, maxsize=2, overflow=overflow)
+    writer.start()
+    writer.submit(_events(1, 2, 3, 4, 5))  # no await: the writer cannot drain
+    assert writer.stats.enqueued == 5 if overflow == "drop_oldest" else 2
+    assert writer.stats.dropped == 3
+
+    await writer.stop()
+    assert await _written(sessions) == kept
+    assert writer.stats.written == 2
+
+
+async def test_events_are_ignored_while_stopped(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    writer = _writer(sessions)
+    writer.submit(_events(1))
+    writer.start()
+    await writer.stop()
+    assert await _written(sessions) == []
+    assert writer.stats.enqueued == 0
+
+
+# --------------------------------------
+# 🛑 Shutdown flush
+# --------------------------------------
+async def test_stop_flushes_without_waiting_for_the_interval(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    writer = _writer(sessions, flush_interval=3600)
+    writer.start()
+    writer.submit(_events(1, 2))
+    await asyncio.sleep(0.05)  # the writer has taken both and waits for more
+    writer.submit(_events(3))
+
+    await asyncio.wait_for(writer.stop(), timeout=5)
+    assert await _written(sessions) == ["1", "2", "3"]
+    assert not writer.running
+
+
+async def test_stop_writes_what_a_dead_writer_left_queued(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    writer = _writer(sessions, flush_interval=0.01)
+    writer.start()
+    writer.submit(_events(1, 2))
+    await asyncio.sleep(0.2)
+    assert await _written(sessions) == ["1", "2"]
+
+    # The writer task dies (e.g. killed by a bug) with events still queued
+    writer.submit(_events(3, 4))
+    task = writer._task
+    assert task is not None
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    await writer.stop()
+    assert await _written(sessions) == ["1", "2", "3", "4"]
+
+
+async def test_stop_without_drain_discards(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    writer = _writer(sessions)
+    writer.start()
+    writer.submit(_events(1))
+    await writer.stop(drain=False)
+    assert await _written(sessions) == []
@@ -0,0 +1,104 @@
+# tests/test_authz_snapshot.py
+
+"""
+🗺️ Snapshot file safety: the default location is a private app directory,
+files are written privately and atomically, and only a file owned by the
+current user and writable by no one else is loaded.
+"""
+
+import os
+import stat
+from pathlib import Path
+
+import pytest
+
+from app.api.domains.user.services.authz_snapshot import (
+    APP_DIR_NAME,
+    AuthzGraph,
+    default_snapshot_path,
+    read_snapshot,
+    write_snapshot,
+)
+
+GRAPH = AuthzGraph(
+    version="v1",
+    privileges={"view_users": 1, "manage_users": 2},
+    privilege_bits={1: 0, 2: 1},
+    role_privileges={1: frozenset({1, 2})},
+)
+
+
+def _mode(path: Path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+@pytest.fixture
+def cache_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    return tmp_path
+
+
+# --------------------------------------
+# 📁 Default location
+# --------------------------------------
+def test_default_path_is_in_a_private_app_directory(cache_home: Path) -> None:
+    path = default_snapshot_path()
+    assert path.parent == cache_home / APP_DIR_NAME
+    assert _mode(path.parent) == 0o700
+
+
+def test_an_existing_app_directory_is_made_private(cache_home: Path) -> None:
+    directory = cache_home / APP_DIR_NAME
+    directory.mkdir(mode=0o755)
+    directory.chmod(0o755)
+    default_snapshot_path()
+    assert _mode(directory) == 0o700
+
+
+def test_an_app_directory_owned_by_someone_else_is_refused(
+    cache_home: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (cache_home / APP_DIR_NAME).mkdir()
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(cache_home).st_uid + 1)
+    with pytest.raises(PermissionError):
+        default_snapshot_path()
+
+
+# --------------------------------------
+# 💾 Write / read
+# --------------------------------------
+def test_snapshots_are_written_privately_and_atomically(tmp_path: Path) -> None:
+    path = tmp_path / "state" / "snapshot.json"
+    write_snapshot(path, GRAPH)
+    write_snapshot(path, GRAPH)
+
+    assert read_snapshot(path) == GRAPH
+    assert _mode(path) == 0o600
+    assert _mode(path.parent) == 0o700
+    assert sorted(p.name for p in path.parent.iterdir()) == ["snapshot.json"]
+
+
+@pytest.mark.parametrize("mode", [0o620, 0o602, 0o666])
+def test_a_file_writable_by_others_is_ignored(tmp_path: Path, mode: int) -> None:
+    path = tmp_path / "snapshot.json"
+    write_snapshot(path, GRAPH)
+    path.chmod(mode)
+    assert read_snapshot(path) is None
+
+
+def test_a_file_owned_by_someone_else_is_ignored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "snapshot.json"
+    write_snapshot(path, GRAPH)
+    monkeypatch.setattr(os, "getuid", lambda: path.stat().st_uid + 1)
+    assert read_snapshot(path) is None
+
+
+def test_a_symlink_is_not_followed(tmp_path: Path) -> None:
+    target = tmp_path / "elsewhere.json"
+    write_snapshot(target, GRAPH)
+    link = tmp_path / "snapshot.json"
+    link.symlink_to(target)
+    assert read_snapshot(link) is None
+    assert read_snapshot(tmp_path / "missing.json") is None
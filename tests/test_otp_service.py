@@ -0,0 +1,147 @@
+# tests/test_otp_service.py
+
+"""
+🔢 `OtpService.verify`: a code works once, never after it expires, and
+concurrent wrong guesses (batched by the write queue) cannot spend more
+than `otp_max_attempts`.
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import AsyncIterator, Callable, List
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.config.settings import settings
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_identity import IdentityType, UserIdentity
+from app.api.domains.user.services.otp_service import (
+    LoggingOtpSender,
+    OtpDispatcher,
+    OtpService,
+)
+from app.api.utils.clock import utcnow
+from app.database.write_queue import WriteQueue
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def sessions(
+    database_url: Callable[[str], str],
+    engines: Callable[..., AsyncEngine],
+    monkeypatch: pytest.MonkeyPatch,
+) -> async_sessionmaker[AsyncSession]:
+    monkeypatch.setattr(settings, "otp_secret_key", "test-otp-key")
+    return async_sessionmaker(engines(database_url("app")), expire_on_commit=False)
+
+
+@pytest.fixture
+async def identity_id(sessions: async_sessionmaker[AsyncSession]) -> int:
+    async with sessions() as session:
+        role = Role(name="Member")
+        session.add(role)
+        await session.flush()
+        user = User(first_name="Ada", last_name="Lovelace", role_id=role.id)
+        user.identities = [UserIdentity(type=IdentityType.EMAIL, value="ada@x.io")]
+        session.add(user)
+        await session.commit()
+        return user.identities[0].id
+
+
+@pytest.fixture
+async def otp(
+    sessions: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[OtpService]:
+    writes = WriteQueue(sessions, maxsize=100, batch_size=64)
+    service = OtpService(
+        OtpDispatcher(LoggingOtpSender(), maxsize=10, workers=1), writes
+    )
+    writes.start()
+    service.dispatcher.start()
+    yield service
+    await service.dispatcher.stop(drain=False)
+    await writes.stop()
+
+
+async def _issue(otp: OtpService, identity_id: int) -> str:
+    """Issue a code and return it as delivered."""
+    await otp.issue(identity_id)
+    await otp.dispatcher.stop()  # drains the queue
+    otp.dispatcher.start()
+    sender = otp.dispatcher.sender
+    assert isinstance(sender, LoggingOtpSender)
+    return sender.sent[-1].code
+
+
+async def _identity(
+    sessions: async_sessionmaker[AsyncSession], identity_id: int
+) -> UserIdentity:
+    async with sessions() as session:
+        return (
+            await session.scalars(
+                select(UserIdentity).where(UserIdentity.id == identity_id)
+            )
+        ).one()
+
+
+def _wrong(code: str) -> str:
+    return str((int(code) + 1) % 10**settings.otp_length).zfill(settings.otp_length)
+
+
+async def test_a_code_verifies_only_once(
+    otp: OtpService, sessions: async_sessionmaker[AsyncSession], identity_id: int
+) -> None:
+    code = await _issue(otp, identity_id)
+    assert await otp.verify(identity_id, code)
+    assert not await otp.verify(identity_id, code)
+
+    identity = await _identity(sessions, identity_id)
+    assert identity.is_verified
+    assert identity.otp_hash is None
+    # The second attempt had no code to guess against: nothing is counted
+    assert identity.wrong_otp_count == 0
+
+
+async def test_an_expired_code_is_rejected(
+    otp: OtpService, sessions: async_sessionmaker[AsyncSession], identity_id: int
+) -> None:
+    code = await _issue(otp, identity_id)
+    async with sessions() as session:
+        await session.execute(
+            update(UserIdentity)
+            .where(UserIdentity.id == identity_id)
+            .values(
+                otp_generated_at=utcnow()
+                - timedelta(seconds=settings.otp_ttl_seconds + 1)
+            )
+        )
+        await session.commit()
+
+    assert not await otp.verify(identity_id, code)
+    assert not (await _identity(sessions, identity_id)).is_verified
+
+
+async def test_concurrent_wrong_guesses_stop_at_the_attempt_limit(
+    otp: OtpService, sessions: async_sessionmaker[AsyncSession], identity_id: int
+) -> None:
+    code = await _issue(otp, identity_id)
+    guesses = 4 * settings.otp_max_attempts
+    results: List[bool] = await asyncio.gather(
+        *(otp.verify(identity_id, _wrong(code)) for _ in range(guesses))
+    )
+    assert not any(results)
+    assert otp.writes.stats.batches < guesses  # the guesses shared COMMITs
+
+    identity = await _identity(sessions, identity_id)
+    assert identity.wrong_otp_count == settings.otp_max_attempts
+    assert identity.otp_locked_until is not None
+    assert identity.otp_hash is None  # the outstanding code is discarded
+    # Locked: even the right code no longer works
+    assert not await otp.verify(identity_id, code)
+    assert (await _identity(sessions, identity_id)).wrong_otp_count == (
+        settings.otp_max_attempts
+    )
@@ -0,0 +1,175 @@
+# tests/test_preconditions.py
+
+"""
+🏷️ Conditional requests: `If-Match` parsing (weak and malformed tags are a
+400, a stale version a 412) and `If-None-Match` answered with 304.
+"""
+
+from typing import Any, Callable, Dict
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from starlette.requests import Request
+
+from app.api.domains.user.controllers.user_controller import get_user, patch_user
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.user import User
+from app.api.domains.user.repositories.loaders import UserLoaders
+from app.api.domains.user.schemas.user import UserRead, UserUpdate
+from app.api.domains.user.services.token_service import Principal
+from app.api.utils.preconditions import (
+    Validators,
+    parse_if_match,
+    require_if_match,
+    version_etag,
+)
+
+pytestmark = pytest.mark.anyio
+
+ADMIN = Principal(
+    user_id=1,
+    role_id=1,
+    privilege_bits=-1,
+    token_id="t",
+    issued_at=0,
+    expires_at=2**31,
+)
+
+
+def _request(headers: Dict[str, str]) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "query_string": b"",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+# --------------------------------------
+# 🔒 If-Match
+# --------------------------------------
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [('"3"', 3), (' "3.9f2c" ', 3), ("*", None)],
+)
+def test_if_match_yields_the_version(value: str, expected: Any) -> None:
+    assert parse_if_match(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "detail"),
+    [
+        ('W/"3"', "If-Match must be a single strong ETag"),
+        ('"3", "4"', "If-Match must be a single strong ETag"),
+        ("3", "Malformed ETag"),
+        ('"v3"', "Malformed ETag"),
+        ('".abc"', "Malformed ETag"),
+    ],
+)
+def test_weak_or_malformed_if_match_is_a_400(value: str, detail: str) -> None:
+    with pytest.raises(HTTPException) as caught:
+        require_if_match(value)
+    assert caught.value.status_code == 400
+    assert caught.value.detail == detail
+
+
+def test_missing_if_match_is_a_428() -> None:
+    with pytest.raises(HTTPException) as caught:
+        require_if_match(None)
+    assert caught.value.status_code == 428
+
+
+# --------------------------------------
+# 🔁 If-None-Match
+# --------------------------------------
+@pytest.mark.parametrize(
+    ("header", "matches"),
+    [
+        ('"3"', True),
+        ('W/"3"', True),  # weak comparison
+        ('"2", W/"3"', True),
+        ("*", True),
+        ('"2"', False),
+        ("3", False),  # malformed: never matches
+    ],
+)
+def test_if_none_match_uses_weak_comparison(header: str, matches: bool) -> None:
+    validators = Validators(etag=version_etag(3))
+    assert validators.not_modified(_request({"If-None-Match": header})) is matches
+
+
+# --------------------------------------
+# 👤 Endpoints
+# --------------------------------------
+@pytest.fixture
+async def sessions(
+    database_url: Callable[[str], str], engines: Callable[..., AsyncEngine]
+) -> async_sessionmaker[AsyncSession]:
+    sessions = async_sessionmaker(engines(database_url("app")), expire_on_commit=False)
+    async with sessions() as session:
+        role = Role(name="Member")
+        session.add(role)
+        await session.flush()
+        session.add(User(first_name="Ada", last_name="Lovelace", role_id=role.id))
+        await session.commit()
+    return sessions
+
+
+async def _get(session: AsyncSession, headers: Dict[str, str]) -> Any:
+    response = Response()
+    result = await get_user(
+        1, _request(headers), response, None, session, UserLoaders(session)
+    )
+    return result, response
+
+
+async def test_a_stale_if_match_is_a_412(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessions() as session:
+        _, response = await _get(session, {})
+        etag = response.headers["etag"]
+        version = require_if_match(etag)
+
+        updated = await patch_user(
+            1,
+            UserUpdate.model_validate({"first_name": "Augusta"}),
+            Response(),
+            version,
+            ADMIN,
+            session,
+        )
+        assert updated.first_name == "Augusta"
+
+        # The same tag again: the user changed in between
+        with pytest.raises(HTTPException) as caught:
+            await patch_user(
+                1,
+                UserUpdate.model_validate({"first_name": "Ada"}),
+                Response(),
+                version,
+                ADMIN,
+                session,
+            )
+        assert caught.value.status_code == 412
+
+
+async def test_a_matching_if_none_match_is_a_304(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessions() as session:
+        user, response = await _get(session, {})
+        assert isinstance(user, UserRead)
+        etag = response.headers["etag"]
+
+        not_modified, _ = await _get(session, {"If-None-Match": f"W/{etag}"})
+        assert isinstance(not_modified, Response)
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
+
+        changed, _ = await _get(session, {"If-None-Match": '"0"'})
+        assert isinstance(changed, UserRead)
@@ -0,0 +1,154 @@
+# tests/test_privilege_catalog.py
+
+"""
+📚 Token privilege bitmaps: stable bit positions stored on `privilege`,
+the base64url encoding, and `require_privileges` across catalog changes.
+"""
+
+from typing import Callable, List
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.deps import auth
+from app.api.deps.auth import require_privileges
+from app.api.domains.user.models.privilege import Privilege
+from app.api.domains.user.repositories.role_repository import (
+    get_privilege_bits,
+    get_privilege_name_map,
+)
+from app.api.domains.user.services.privilege_catalog import PrivilegeCatalog
+from app.api.domains.user.services.token_service import (
+    Principal,
+    decode_privilege_bitmap,
+    encode_privilege_bitmap,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def sessions(
+    database_url: Callable[[str], str], engines: Callable[..., AsyncEngine]
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engines(database_url("app")), expire_on_commit=False)
+
+
+@pytest.fixture
+def catalog(monkeypatch: pytest.MonkeyPatch) -> PrivilegeCatalog:
+    """A private catalog behind `require_privileges`."""
+    catalog = PrivilegeCatalog(max_age=60)
+    monkeypatch.setattr(auth, "privilege_catalog", catalog)
+    return catalog
+
+
+async def _create(session: AsyncSession, *names: str) -> List[Privilege]:
+    privileges = [Privilege(name=name) for name in names]
+    session.add_all(privileges)
+    await session.commit()
+    return privileges
+
+
+async def _reload(session: AsyncSession, catalog: PrivilegeCatalog) -> None:
+    catalog.replace(
+        await get_privilege_name_map(session), await get_privilege_bits(session)
+    )
+
+
+def _principal(bitmap: int) -> Principal:
+    # Round-trip through the token encoding, as `verify_access_token` does
+    bits = decode_privilege_bitmap(encode_privilege_bitmap(bitmap))
+    return Principal(
+        user_id=1,
+        role_id=1,
+        privilege_bits=bits,
+        token_id="t",
+        issued_at=0,
+        expires_at=0,
+    )
+
+
+async def _allowed(principal: Principal, *names: str) -> bool:
+    try:
+        await require_privileges(*names)(principal=principal)
+    except HTTPException as exc:
+        assert exc.status_code == 403
+        return False
+    return True
+
+
+# --------------------------------------
+# 🧮 Encoding
+# --------------------------------------
+@pytest.mark.parametrize("bitmap", [0, 1, 0b1010, 1 << 7, 1 << 8, (1 << 200) - 1])
+def test_bitmap_round_trips(bitmap: int) -> None:
+    encoded = encode_privilege_bitmap(bitmap)
+    assert "=" not in encoded
+    assert decode_privilege_bitmap(encoded) == bitmap
+
+
+def test_catalog_maps_ids_to_their_stored_positions() -> None:
+    catalog = PrivilegeCatalog(max_age=60)
+    catalog.replace({"view": 10, "edit": 20}, {10: 3, 20: 0, 30: 1})
+    assert catalog.bitmap([10, 20]) == 0b1001
+    assert catalog.resolve(["edit"]) == 0b1
+    assert catalog.resolve(["edit", "unknown"]) is None
+    assert catalog.bitmap([40]) is None
+
+
+# --------------------------------------
+# 🔢 Stable positions
+# --------------------------------------
+async def test_positions_are_reserved_in_insert_order(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessions() as session:
+        view, edit = await _create(session, "view_users", "edit_users")
+        (delete_,) = await _create(session, "delete_users")
+        assert [view.bit, edit.bit, delete_.bit] == [0, 1, 2]
+        assert await get_privilege_bits(session) == {
+            view.id: 0,
+            edit.id: 1,
+            delete_.id: 2,
+        }
+
+
+async def test_positions_of_deleted_privileges_are_not_reused(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    async with sessions() as session:
+        _, edit, _ = await _create(session, "view_users", "edit_users", "export")
+        await session.execute(delete(Privilege).where(Privilege.id == edit.id))
+        await session.commit()
+        (audit,) = await _create(session, "view_audit")
+        assert audit.bit == 3
+        assert sorted((await get_privilege_bits(session)).values()) == [0, 2, 3]
+
+
+async def test_require_privileges_reads_old_tokens_after_a_catalog_change(
+    sessions: async_sessionmaker[AsyncSession], catalog: PrivilegeCatalog
+) -> None:
+    async with sessions() as session:
+        view, edit, export = await _create(session, "view_users", "edit", "export")
+        await _reload(session, catalog)
+        exporter = _principal(catalog.bitmap([export.id]) or 0)
+        editor = _principal(catalog.bitmap([edit.id]) or 0)
+        assert await _allowed(exporter, "export")
+        assert not await _allowed(exporter, "view_users")
+
+        # A privilege below `export` disappears and a new one is created
+        await session.execute(delete(Privilege).where(Privilege.id == view.id))
+        await session.commit()
+        await _create(session, "view_audit")
+        await _reload(session, catalog)
+
+    # Tokens issued before the change still mean the same privileges
+    assert await _allowed(exporter, "export")
+    assert await _allowed(editor, "edit")
+    assert not await _allowed(editor, "export")
+    assert not await _allowed(exporter, "view_audit")
+    assert not await _allowed(editor, "view_audit")
+    # A privilege that no longer exists is never granted
+    assert not await _allowed(exporter, "view_users")
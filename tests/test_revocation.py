@@ -0,0 +1,169 @@
+# tests/test_revocation.py
+
+"""
+🚫 `RevocationStore`: revoked token IDs through the Bloom filter (false
+positives are confirmed against the table), user revocations through the
+in-memory `not_before` map, and refresh tokens older than that map.
+"""
+
+import time
+import uuid
+from datetime import timedelta
+from itertools import count
+from typing import Callable
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.domains.user.models.revoked_token import RevocationKind, RevokedToken
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.user import User
+from app.api.domains.user.services import token_service
+from app.api.domains.user.services.revocation_service import RevocationStore
+from app.api.domains.user.services.token_service import (
+    RefreshDeniedError,
+    TokenService,
+)
+from app.api.utils.bloom import BloomFilter
+from app.api.utils.clock import utcnow
+from app.database.write_queue import WriteQueue
+
+pytestmark = pytest.mark.anyio
+
+CAPACITY, ERROR_RATE = 100, 0.5  # small and loose: false positives are easy to find
+SECRET = "test-secret-key-of-at-least-32-bytes"
+
+
+@pytest.fixture
+def sessions(
+    database_url: Callable[[str], str], engines: Callable[..., AsyncEngine]
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engines(database_url("app")), expire_on_commit=False)
+
+
+@pytest.fixture
+def store(sessions: async_sessionmaker[AsyncSession]) -> RevocationStore:
+    return RevocationStore(
+        CAPACITY,
+        ERROR_RATE,
+        refresh_interval=3600,
+        user_window=300,
+        writes=WriteQueue(sessions, maxsize=100, batch_size=64),
+    )
+
+
+async def _user(session: AsyncSession) -> User:
+    role = Role(name="Member")
+    session.add(role)
+    await session.flush()
+    user = User(first_name="Ada", last_name="Lovelace", role_id=role.id)
+    session.add(user)
+    await session.commit()
+    return user
+
+
+def _now() -> int:
+    return int(time.time())
+
+
+# --------------------------------------
+# 🎟️ Token IDs (Bloom filter)
+# --------------------------------------
+async def test_filter_false_positives_are_cleared_by_the_table(
+    sessions: async_sessionmaker[AsyncSession], store: RevocationStore
+) -> None:
+    async with sessions() as session:
+        await store.revoke_token("revoked", utcnow() + timedelta(hours=1))
+        await store.rebuild(session)
+
+        # Same size and hash functions, so the same false positives
+        probe = BloomFilter(CAPACITY, ERROR_RATE)
+        probe.add("revoked")
+        lookalike = next(key for key in (f"jti-{i}" for i in count()) if key in probe)
+
+        assert not await store.is_revoked(1, lookalike, _now(), session=session)
+        assert store.stats.filter_hits == 1
+        assert store.stats.confirmed == 0
+
+        assert await store.is_revoked(1, "revoked", _now(), session=session)
+        assert store.stats.confirmed == 1
+
+
+# --------------------------------------
+# 👤 User revocations (not_before map)
+# --------------------------------------
+async def test_user_revocations_are_answered_without_a_query(
+    sessions: async_sessionmaker[AsyncSession], store: RevocationStore
+) -> None:
+    async with sessions() as session:
+        await store.rebuild(session)
+        before = _now()
+        await store.revoke_users(session, [7], reason="deactivated")
+        await session.commit()
+
+        assert await store.is_revoked(7, uuid.uuid4().hex, before, session=session)
+        assert not await store.is_revoked(7, uuid.uuid4().hex, before + 2)
+        assert not await store.is_revoked(8, uuid.uuid4().hex, before)
+        assert store.stats.filter_hits == 0
+
+
+async def test_orm_user_changes_reach_other_workers_on_refresh(
+    sessions: async_sessionmaker[AsyncSession], store: RevocationStore
+) -> None:
+    async with sessions() as session:
+        user = await _user(session)
+        issued = _now()
+        assert not await store.is_revoked(user.id, "a", issued, session=session)
+
+        user.is_active = False  # the before_flush hook appends a USER entry
+        await session.commit()
+        await store.refresh(session)
+        assert await store.is_revoked(user.id, "a", issued, session=session)
+
+
+async def test_old_user_revocations_leave_the_map_but_still_deny_older_tokens(
+    sessions: async_sessionmaker[AsyncSession], store: RevocationStore
+) -> None:
+    now = utcnow()
+    async with sessions() as session:
+        await session.execute(
+            insert(RevokedToken).values(
+                kind=RevocationKind.USER,
+                subject="7",
+                not_before=now - timedelta(hours=2),
+                expires_at=now + timedelta(days=1),
+            )
+        )
+        await session.commit()
+        await store.rebuild(session)
+
+        hour = 3600
+        assert await store.is_revoked(7, "r1", _now() - 3 * hour, session=session)
+        assert not await store.is_revoked(7, "r2", _now() - hour, session=session)
+        assert not await store.is_revoked(7, "a", _now(), session=session)
+
+
+# --------------------------------------
+# 🔄 Refresh after revoke
+# --------------------------------------
+async def test_refresh_is_denied_after_the_user_is_revoked(
+    sessions: async_sessionmaker[AsyncSession],
+    store: RevocationStore,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(token_service, "get_revocation_store", lambda: store)
+    tokens = TokenService(
+        algorithm="HS256",
+        signing_key=SECRET,
+        verification_key=SECRET,
+        issuer="tests",
+        access_ttl=300,
+        refresh_ttl=3600,
+    )
+    pair = tokens.issue_pair(7, 1, [])
+    async with sessions() as session:
+        await store.revoke_users(session, [7], reason="deactivated")
+        await session.commit()
+        with pytest.raises(RefreshDeniedError):
+            await tokens.refresh(session, pair.refresh_token)
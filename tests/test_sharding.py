@@ -0,0 +1,239 @@
+# tests/test_sharding.py
+
+"""
+🧩 User sharding over three template databases: a global one and two
+shards split by ID range (`s0`: users 1-10, `s1`: users 11 and up).
+
+Covers fan-out pagination (`fetch_page`), identity → shard resolution
+through `identity_shard`, and set-based bulk UPDATEs across shards.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.domains.user.models.identity_shard import IdentityShard
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_identity import IdentityType, UserIdentity
+from app.api.domains.user.repositories.user_identity_repository import (
+    get_identity,
+    identity_exists,
+)
+from app.api.domains.user.repositories.user_repository import list_user_ids
+from app.api.domains.user.services.shard_replication import ReferenceReplicator
+from app.api.domains.user.services.user_bulk_service import (
+    deactivate_users,
+    reassign_role,
+)
+from app.database.id_blocks import IdAllocator
+from app.database.sharding import (
+    GLOBAL_SHARD,
+    RangeShardMap,
+    ShardRoutingSession,
+    fetch_page,
+)
+
+pytestmark = pytest.mark.anyio
+
+USERS = 20
+
+
+@dataclass
+class ShardedDatabases:
+    """Session factory, engines and file paths of one sharded test setup."""
+
+    sessions: async_sessionmaker[AsyncSession]
+    engines: Dict[str, AsyncEngine]
+    paths: Dict[str, str]
+    admin_id: int
+    guest_id: int
+
+    def query(self, name: str, sql: str) -> List[Any]:
+        """Run `sql` on database `name` directly, outside any session."""
+        connection = sqlite3.connect(self.paths[name])
+        try:
+            return connection.execute(sql).fetchall()
+        finally:
+            connection.close()
+
+    def record_user_identity_queries(self) -> List[str]:
+        """Names of the databases that run a statement on `user_identity` from now on."""
+        seen: List[str] = []
+        for name, engine in self.engines.items():
+
+            def _record(
+                conn: Any, cursor: Any, statement: str, *args: Any, name: str = name
+            ) -> None:
+                if "FROM user_identity" in statement:
+                    seen.append(name)
+
+            event.listen(engine.sync_engine, "before_cursor_execute", _record)
+        return seen
+
+
+def _email(index: int) -> str:
+    return f"user{index}@example.com"
+
+
+@pytest.fixture
+async def sharded(
+    database_url: Callable[[str], str], engines: Callable[..., AsyncEngine]
+) -> ShardedDatabases:
+    urls = {name: database_url(name) for name in (GLOBAL_SHARD, "s0", "s1")}
+    shard_engines = {name: engines(url) for name, url in urls.items()}
+    sessions = async_sessionmaker(
+        sync_session_class=ShardRoutingSession,
+        shards={name: engine.sync_engine for name, engine in shard_engines.items()},
+        shard_map=RangeShardMap({"s0": 1, "s1": 11}),
+        allocator=IdAllocator(),
+        expire_on_commit=False,
+    )
+
+    async with sessions() as session:
+        admin, guest = Role(name="Admin"), Role(name="Guest")
+        session.add_all([admin, guest])
+        await session.commit()
+        # 🪞 Roles are written globally; users reference the shards' copies
+        await ReferenceReplicator(
+            source=shard_engines[GLOBAL_SHARD],
+            shards={n: e for n, e in shard_engines.items() if n != GLOBAL_SHARD},
+            refresh_interval=60,
+        ).sync()
+
+        for index in range(1, USERS + 1):
+            user = User(first_name=f"User{index}", last_name="Test", role_id=admin.id)
+            user.identities = [
+                UserIdentity(type=IdentityType.EMAIL, value=_email(index))
+            ]
+            session.add(user)
+        await session.commit()
+
+    return ShardedDatabases(
+        sessions=sessions,
+        engines=shard_engines,
+        paths={name: url.split("///", 1)[1] for name, url in urls.items()},
+        admin_id=admin.id,
+        guest_id=guest.id,
+    )
+
+
+# --------------------------------------
+# 🗺️ Placement
+# --------------------------------------
+async def test_users_live_on_the_shard_of_their_id(sharded: ShardedDatabases) -> None:
+    assert sharded.query("s0", "SELECT min(id), max(id) FROM user") == [(1, 10)]
+    assert sharded.query("s1", "SELECT min(id), max(id) FROM user") == [(11, 20)]
+    assert sharded.query(GLOBAL_SHARD, "SELECT count(*) FROM user") == [(0,)]
+    assert sharded.query(GLOBAL_SHARD, "SELECT count(*) FROM identity_shard") == [
+        (USERS,)
+    ]
+
+
+# --------------------------------------
+# 📄 Fan-out pagination
+# --------------------------------------
+async def test_pages_are_cut_after_merging_shards(sharded: ShardedDatabases) -> None:
+    async with sharded.sessions() as session:
+        assert await list_user_ids(session, offset=0, limit=5) == [1, 2, 3, 4, 5]
+        # 🔀 Straddles the shard boundary
+        assert await list_user_ids(session, offset=7, limit=6) == list(range(8, 14))
+        assert await list_user_ids(session, offset=15, limit=10) == list(range(16, 21))
+        assert await list_user_ids(session, offset=USERS, limit=5) == []
+
+
+async def test_fetch_page_follows_a_descending_order(
+    sharded: ShardedDatabases,
+) -> None:
+    stmt = select(User.id, User.first_name).order_by(User.id.desc())
+    async with sharded.sessions() as session:
+        rows = await fetch_page(session, stmt, 8, 4, key=lambda row: -row.id)
+    assert [row.id for row in rows] == [12, 11, 10, 9]
+
+
+# --------------------------------------
+# 🧭 Identity → shard resolution
+# --------------------------------------
+async def test_identity_lookups_query_only_the_owning_shard(
+    sharded: ShardedDatabases,
+) -> None:
+    seen = sharded.record_user_identity_queries()
+    async with sharded.sessions() as session:
+        identity = await get_identity(session, IdentityType.EMAIL, _email(15))
+        assert identity is not None and identity.user_id == 15
+        assert seen == ["s1"]
+
+        seen.clear()
+        assert await identity_exists(session, IdentityType.EMAIL, _email(3))
+        assert seen == ["s0"]
+
+
+async def test_unknown_identities_query_a_single_shard(
+    sharded: ShardedDatabases,
+) -> None:
+    seen = sharded.record_user_identity_queries()
+    async with sharded.sessions() as session:
+        assert await get_identity(session, IdentityType.EMAIL, "nobody@x.io") is None
+        assert not await identity_exists(session, IdentityType.EMAIL, "nobody@x.io")
+    assert len(seen) == 2 and len(set(seen)) == 1
+
+
+async def test_identity_index_follows_re_keying(sharded: ShardedDatabases) -> None:
+    async with sharded.sessions() as session:
+        identity = await get_identity(session, IdentityType.EMAIL, _email(12))
+        assert identity is not None
+        identity.value = "renamed@example.com"
+        await session.commit()
+
+        assert not await identity_exists(session, IdentityType.EMAIL, _email(12))
+        moved = await get_identity(session, IdentityType.EMAIL, "renamed@example.com")
+        assert moved is not None and moved.user_id == 12
+        entries = await session.scalars(
+            select(IdentityShard.user_id).where(IdentityShard.user_id == 12)
+        )
+        assert list(entries) == [12]
+
+
+# --------------------------------------
+# 📦 Bulk UPDATEs
+# --------------------------------------
+async def test_reassign_role_updates_every_shard(sharded: ShardedDatabases) -> None:
+    async with sharded.sessions() as session:
+        result = await reassign_role(
+            session, sharded.guest_id, from_role_id=sharded.admin_id, chunk_size=3
+        )
+    assert result.affected == USERS
+    assert result.chunks == 7
+    for shard in ("s0", "s1"):
+        assert sharded.query(
+            shard, "SELECT DISTINCT role_id, version_id FROM user"
+        ) == [(sharded.guest_id, 2)]
+
+
+async def test_bulk_updates_touch_only_the_listed_users(
+    sharded: ShardedDatabases,
+) -> None:
+    async with sharded.sessions() as session:
+        result = await deactivate_users(
+            session, user_ids=[2, 9, 12, 19, 99], chunk_size=2
+        )
+        assert result.affected == 4
+        # Already inactive users are skipped on the second pass
+        again = await deactivate_users(session, user_ids=[9, 12, 13])
+        assert again.affected == 1
+
+    inactive = "SELECT id FROM user WHERE NOT is_active ORDER BY id"
+    assert sharded.query("s0", inactive) == [(2,), (9,)]
+    assert sharded.query("s1", inactive) == [(12,), (13,), (19,)]
+
+
+async def test_bulk_updates_by_role_span_shards(sharded: ShardedDatabases) -> None:
+    async with sharded.sessions() as session:
+        result = await deactivate_users(session, role_id=sharded.admin_id)
+        assert result.affected == USERS
+        stmt = select(User.id).where(User.is_active.is_(True))
+        assert list(await session.scalars(stmt)) == []
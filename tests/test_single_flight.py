@@ -0,0 +1,169 @@
+# tests/test_single_flight.py
+
+"""
+🛬 Single-flight reads: concurrent callers for one key share one execution,
+an exception reaches every waiter, and nothing is cached afterwards. Token
+issuing for many users of one role costs one privilege query.
+"""
+
+import asyncio
+from typing import Any, Callable, FrozenSet, List
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.domains.user.models.privilege import Privilege
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.role_privilege import RolePrivilege
+from app.api.domains.user.models.user import User
+from app.api.domains.user.repositories import role_repository
+from app.api.domains.user.services import coalesced_reads, token_service
+from app.api.domains.user.services.privilege_catalog import PrivilegeCatalog
+from app.api.domains.user.services.token_service import TokenService
+from app.api.utils.single_flight import SingleFlight
+
+pytestmark = pytest.mark.anyio
+
+CALLERS = 10
+SECRET = "test-secret-key-of-at-least-32-bytes"
+
+
+# --------------------------------------
+# 🛬 SingleFlight
+# --------------------------------------
+async def test_concurrent_callers_share_one_execution() -> None:
+    flight: SingleFlight[str, int] = SingleFlight("test")
+    started = 0
+
+    async def load() -> int:
+        nonlocal started
+        started += 1
+        await asyncio.sleep(0.01)
+        return 42
+
+    results = await asyncio.gather(*(flight.do("k", load) for _ in range(CALLERS)))
+    assert results == [42] * CALLERS
+    assert started == 1
+    assert flight.stats.executions == 1
+    assert flight.stats.coalesced == CALLERS - 1
+    assert flight.in_flight == 0
+
+    # Nothing is cached: the next call runs again
+    assert await flight.do("k", load) == 42
+    assert started == 2
+
+
+async def test_an_exception_reaches_every_waiter() -> None:
+    flight: SingleFlight[str, int] = SingleFlight("test")
+
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise LookupError("gone")
+
+    results = await asyncio.gather(
+        *(flight.do("k", fail) for _ in range(CALLERS)), return_exceptions=True
+    )
+    assert all(isinstance(result, LookupError) for result in results)
+    assert flight.stats.executions == 1
+    assert flight.stats.errors == 1
+    assert flight.in_flight == 0
+
+
+async def test_a_cancelled_caller_does_not_cancel_the_others() -> None:
+    flight: SingleFlight[str, int] = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def load() -> int:
+        await release.wait()
+        return 7
+
+    first = asyncio.ensure_future(flight.do("k", load))
+    second = asyncio.ensure_future(flight.do("k", load))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    assert await second == 7
+    assert first.cancelled()
+
+
+# --------------------------------------
+# 🎟️ Token issuing
+# --------------------------------------
+@pytest.fixture
+async def role_members(
+    database_url: Callable[[str], str],
+    engines: Callable[..., AsyncEngine],
+    monkeypatch: pytest.MonkeyPatch,
+) -> List[User]:
+    engine = engines(database_url("app"))
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(coalesced_reads, "get_sessionmaker", lambda: sessions)
+
+    async with sessions() as session:
+        view, edit = Privilege(name="view_users"), Privilege(name="edit_users")
+        role = Role(name="Admin")
+        session.add_all([view, edit, role])
+        await session.flush()
+        session.add_all(
+            [
+                RolePrivilege(role_id=role.id, privilege_id=view.id),
+                RolePrivilege(role_id=role.id, privilege_id=edit.id),
+            ]
+        )
+        users = [
+            User(first_name=f"User{index}", role_id=role.id) for index in range(CALLERS)
+        ]
+        session.add_all(users)
+        await session.commit()
+
+    catalog = PrivilegeCatalog(max_age=60)
+    catalog.replace(
+        {"view_users": view.id, "edit_users": edit.id},
+        {view.id: view.bit, edit.id: edit.bit},
+    )
+    monkeypatch.setattr(token_service, "privilege_catalog", catalog)
+    return users
+
+
+def _tokens() -> TokenService:
+    return TokenService("HS256", SECRET, SECRET, "tests", 300, 3600)
+
+
+def _count_privilege_queries(monkeypatch: pytest.MonkeyPatch) -> List[int]:
+    calls: List[int] = []
+
+    async def counted(session: AsyncSession, role_id: int) -> FrozenSet[int]:
+        calls.append(role_id)
+        await asyncio.sleep(0.01)  # keep the query in flight for every caller
+        return await role_repository.get_role_privilege_ids(session, role_id)
+
+    monkeypatch.setattr(coalesced_reads, "get_role_privilege_ids", counted)
+    return calls
+
+
+async def test_concurrent_logins_share_one_privilege_query(
+    role_members: List[User], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = _count_privilege_queries(monkeypatch)
+    tokens = _tokens()
+    pairs = await asyncio.gather(*(tokens.issue_for_user(u) for u in role_members))
+
+    assert calls == [role_members[0].role_id]
+    principals = {tokens.verify_access_token(p.access_token) for p in pairs}
+    assert {p.privilege_bits for p in principals} == {0b11}
+    assert {p.user_id for p in principals} == {u.id for u in role_members}
+
+
+async def test_a_failed_privilege_query_fails_every_login(
+    role_members: List[User], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def broken(session: AsyncSession, role_id: int) -> Any:
+        await asyncio.sleep(0.01)
+        raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(coalesced_reads, "get_role_privilege_ids", broken)
+    tokens = _tokens()
+    results = await asyncio.gather(
+        *(tokens.issue_for_user(u) for u in role_members), return_exceptions=True
+    )
+    assert all(isinstance(result, ConnectionError) for result in results)
@@ -0,0 +1,111 @@
+# tests/test_sqlite_routing.py
+
+"""
+🪶 `RoutingSession` (SQLite single-writer mode): reads go to the
+`query_only` reader pool until the session's first write, then to the
+writer until the transaction ends.
+"""
+
+from dataclasses import replace
+from typing import Callable, List
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.domains.user.models.role import Role
+from app.database.sqlite import RoutingSession, SqlitePragmas, install_single_writer
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def routing(
+    database_url: Callable[[str], str], engines: Callable[..., AsyncEngine]
+) -> async_sessionmaker[AsyncSession]:
+    """Sessions over one writer connection and a reader pool, as `get_sessionmaker`."""
+    url = database_url("app")
+    writer = engines(url, pool_size=1, max_overflow=0)
+    install_single_writer(writer.sync_engine)
+    reader = engines(
+        url,
+        replace(SqlitePragmas(), journal_mode=None, query_only=True),
+        pool_size=2,
+        max_overflow=0,
+    )
+    return async_sessionmaker(
+        sync_session_class=RoutingSession,
+        writer=writer.sync_engine,
+        reader=reader.sync_engine,
+        expire_on_commit=False,
+    )
+
+
+def _routing(session: AsyncSession) -> RoutingSession:
+    sync_session = session.sync_session
+    assert isinstance(sync_session, RoutingSession)
+    return sync_session
+
+
+def _bind_for_select(session: AsyncSession) -> Engine:
+    return _routing(session).get_bind(clause=select(Role.id))
+
+
+async def _role_names(session: AsyncSession) -> List[str]:
+    return list(await session.scalars(select(Role.name).order_by(Role.name)))
+
+
+async def test_reads_go_to_the_reader_before_any_write(
+    routing: async_sessionmaker[AsyncSession],
+) -> None:
+    async with routing() as session:
+        assert await _role_names(session) == []
+        assert _bind_for_select(session) is _routing(session)._reader
+        assert not _routing(session)._writing
+
+
+async def test_flushed_rows_are_read_back_in_the_same_transaction(
+    routing: async_sessionmaker[AsyncSession],
+) -> None:
+    async with routing() as session:
+        session.add(Role(name="Admin"))
+        await session.flush()
+        # The reader's snapshot has no uncommitted rows: this must hit the writer
+        assert await _role_names(session) == ["Admin"]
+        assert _bind_for_select(session) is _routing(session)._writer
+
+
+async def test_core_writes_pin_the_writer(
+    routing: async_sessionmaker[AsyncSession],
+) -> None:
+    async with routing() as session:
+        await session.execute(insert(Role).values(name="Guest"))
+        assert await _role_names(session) == ["Guest"]
+
+
+async def test_writer_is_released_when_the_transaction_ends(
+    routing: async_sessionmaker[AsyncSession],
+) -> None:
+    async with routing() as session:
+        session.add(Role(name="Admin"))
+        await session.commit()
+        assert _bind_for_select(session) is _routing(session)._reader
+        assert await _role_names(session) == ["Admin"]
+
+        await session.execute(insert(Role).values(name="Guest"))
+        await session.rollback()
+        assert _bind_for_select(session) is _routing(session)._reader
+        assert await _role_names(session) == ["Admin"]
+
+
+async def test_readers_do_not_wait_for_an_open_write(
+    routing: async_sessionmaker[AsyncSession],
+) -> None:
+    async with routing() as writing, routing() as reading:
+        writing.add(Role(name="Admin"))
+        await writing.flush()  # holds the write lock (BEGIN IMMEDIATE)
+        assert await _role_names(reading) == []
+        await writing.commit()
+        await reading.rollback()  # end the old read snapshot
+        assert await _role_names(reading) == ["Admin"]
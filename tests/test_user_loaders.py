@@ -0,0 +1,162 @@
+# tests/test_user_loaders.py
+
+"""
+📦 Request-scoped batching: `BatchLoader` (one call per tick, memoized,
+errors to every waiter) and the user read path built on `UserLoaders`,
+whose query count does not grow with the number of users.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_auth import UserAuth
+from app.api.domains.user.models.user_identity import IdentityType, UserIdentity
+from app.api.domains.user.repositories.loaders import UserLoaders
+from app.api.domains.user.repositories.user_repository import get_users_by_ids
+from app.api.utils.batch_loader import BatchLoader
+from app.database.fieldsets import FieldSelection
+
+pytestmark = pytest.mark.anyio
+
+FIELDS = "id,first_name,role.name,auth.username,identities.value"
+
+
+# --------------------------------------
+# 📦 BatchLoader
+# --------------------------------------
+async def test_loads_in_one_tick_share_one_batch() -> None:
+    calls: List[List[int]] = []
+
+    async def squares(keys: List[int]) -> Dict[int, int]:
+        calls.append(keys)
+        return {key: key * key for key in keys if key != 0}
+
+    loader: BatchLoader[int, int] = BatchLoader(squares, default=lambda: -1)
+    assert await asyncio.gather(*(loader.load(k) for k in (3, 1, 3, 0))) == [
+        9,
+        1,
+        9,
+        -1,
+    ]
+    assert calls == [[3, 1, 0]]
+
+    # Memoized for the loader's lifetime: no second call
+    assert await loader.load_many([1, 3]) == [1, 9]
+    assert loader.batches == 1
+
+
+async def test_a_failed_batch_reaches_every_waiter_and_is_retried() -> None:
+    attempts = 0
+
+    async def flaky(keys: List[int]) -> Dict[int, int]:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("database went away")
+        return {key: key for key in keys}
+
+    loader: BatchLoader[int, int] = BatchLoader(flaky)
+    results = await asyncio.gather(
+        *(loader.load(key) for key in (1, 2, 3)), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await loader.load_many([1, 2, 3]) == [1, 2, 3]
+    assert attempts == 2
+
+
+# --------------------------------------
+# 👤 User reads
+# --------------------------------------
+@pytest.fixture
+async def sessions(
+    database_url: Callable[[str], str], engines: Callable[..., AsyncEngine]
+) -> async_sessionmaker[AsyncSession]:
+    sessions = async_sessionmaker(engines(database_url("app")), expire_on_commit=False)
+    async with sessions() as session:
+        roles = [Role(name="Admin"), Role(name="Guest")]
+        session.add_all(roles)
+        await session.flush()
+        for index in range(1, 31):
+            user = User(
+                first_name=f"User{index}",
+                role_id=roles[index % 2].id,
+                identities=[
+                    UserIdentity(type=IdentityType.EMAIL, value=f"u{index}@x.io"),
+                    UserIdentity(type=IdentityType.MOBILE, value=f"+6140000{index:04}"),
+                ],
+            )
+            if index % 3:
+                user.auth = UserAuth(username=f"user{index}", password_hash="x")
+            session.add(user)
+        await session.commit()
+    return sessions
+
+
+def _count_queries(engine: Any) -> List[str]:
+    statements: List[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    return statements
+
+
+@pytest.mark.parametrize("count", [1, 5, 30])
+async def test_relationships_cost_one_query_each_whatever_the_page_size(
+    sessions: async_sessionmaker[AsyncSession], count: int
+) -> None:
+    selection = FieldSelection.parse(User, FIELDS)
+    async with sessions() as session:
+        statements = _count_queries(session.bind)
+        items = await get_users_by_ids(
+            session, selection, list(range(1, count + 1)), UserLoaders(session)
+        )
+
+    # users + role + auth + identities
+    assert len(statements) == 4
+    assert len(items) == count
+    first = items[0]
+    assert first["role"] == {"name": "Guest"}
+    assert first["auth"] == {"username": "user1"}
+    assert sorted(i["value"] for i in first["identities"]) == [
+        "+61400000001",
+        "u1@x.io",
+    ]
+    if count >= 3:
+        assert items[2]["auth"] is None
+
+
+async def test_loaders_are_memoized_for_the_request(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    selection = FieldSelection.parse(User, FIELDS)
+    async with sessions() as session:
+        loaders = UserLoaders(session)
+        statements = _count_queries(session.bind)
+        await get_users_by_ids(session, selection, [1, 2, 3], loaders)
+        statements.clear()
+        detail = await get_users_by_ids(session, selection, [2], loaders)
+
+    assert len(statements) == 1  # the user row; relationships are memoized
+    assert detail[0]["role"] == {"name": "Admin"}
+
+
+async def test_nested_selections_keep_the_orm_loaders(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    selection = FieldSelection.parse(
+        User, "id,role.name,role.privileges.name", max_depth=3
+    )
+    async with sessions() as session:
+        items = await get_users_by_ids(session, selection, [1, 2])
+    assert [item["role"] for item in items] == [
+        {"name": "Guest", "privileges": []},
+        {"name": "Admin", "privileges": []},
+    ]
@@ -0,0 +1,140 @@
+# tests/test_user_search.py
+
+"""
+🔎 User search on SQLite: trigram substring and fuzzy matches, short terms,
+ranking before the candidate cap, and the `LIKE` fallback used on
+databases without a search index.
+"""
+
+from datetime import datetime, timezone
+from typing import Callable, Iterator, List
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.config.settings import settings
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.user import User
+from app.api.domains.user.models.user_identity import IdentityType, UserIdentity
+from app.api.domains.user.repositories import user_search_repository
+from app.api.domains.user.repositories.user_search_repository import (
+    SearchQueryError,
+    search_users,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+def _user(first: str, last: str, email: str, role: Role) -> User:
+    user = User(first_name=first, last_name=last, role_id=role.id)
+    user.identities = [UserIdentity(type=IdentityType.EMAIL, value=email)]
+    return user
+
+
+@pytest.fixture(params=["index", "like"])
+def index(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Search through the FTS5 index, or through the `LIKE` fallback."""
+    if request.param == "like":
+        monkeypatch.delitem(user_search_repository._SEARCHES, "sqlite")
+    return str(request.param)
+
+
+@pytest.fixture
+async def sessions(
+    database_url: Callable[[str], str], engines: Callable[..., AsyncEngine]
+) -> async_sessionmaker[AsyncSession]:
+    sessions = async_sessionmaker(engines(database_url("app")), expire_on_commit=False)
+    async with sessions() as session:
+        role = Role(name="Member")
+        session.add(role)
+        await session.flush()
+        # Inserted first: the only matches for "smith" are in identities
+        session.add_all(
+            [
+                _user("Alice", "Brown", "smith.alice@x.io", role),
+                _user("Carol", "Green", "smithc@x.io", role),
+                _user("John", "Smith", "john@x.io", role),
+                _user("Johnny", "Smithers", "jsmithers@x.io", role),
+                _user("Jane", "Doe", "jane@x.io", role),
+            ]
+        )
+        deleted = _user("John", "Deleted", "gone@x.io", role)
+        session.add(deleted)
+        await session.flush()
+        deleted.deleted_at = datetime.now(timezone.utc)
+        await session.commit()
+    return sessions
+
+
+async def _names(
+    sessions: async_sessionmaker[AsyncSession], query: str, mode: str = "substring"
+) -> List[str]:
+    async with sessions() as session:
+        hits = await search_users(session, query, mode=mode)
+        users = [await session.get_one(User, hit.user_id) for hit in hits]
+        return [f"{user.first_name} {user.last_name}" for user in users]
+
+
+# --------------------------------------
+# 🔤 Matching
+# --------------------------------------
+async def test_substring_matches_inside_words_and_identities(
+    sessions: async_sessionmaker[AsyncSession], index: str
+) -> None:
+    assert await _names(sessions, "ohn mit") == ["John Smith", "Johnny Smithers"]
+    assert await _names(sessions, "JANE@X") == ["Jane Doe"]
+    assert await _names(sessions, "john deleted") == []
+
+
+async def test_short_terms_are_ignored_unless_none_is_left(
+    sessions: async_sessionmaker[AsyncSession], index: str
+) -> None:
+    assert await _names(sessions, "j doe") == ["Jane Doe"]
+    with pytest.raises(SearchQueryError):
+        await _names(sessions, "jo d")
+
+
+async def test_fuzzy_tolerates_typos(
+    sessions: async_sessionmaker[AsyncSession],
+) -> None:
+    # Substring needs every trigram; fuzzy ranks by the trigrams shared
+    assert await _names(sessions, "jhon smiht") == []
+    names = await _names(sessions, "jhon smiht", mode="fuzzy")
+    assert set(names[:2]) == {"John Smith", "Johnny Smithers"}
+    assert "Jane Doe" not in names
+
+
+async def test_like_fuzzy_matches_any_term(
+    sessions: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delitem(user_search_repository._SEARCHES, "sqlite")
+    assert await _names(sessions, "johnny smith", mode="fuzzy") == [
+        "Johnny Smithers",
+        "John Smith",
+        "Alice Brown",
+        "Carol Green",
+    ]
+
+
+# --------------------------------------
+# 🏅 Ranking
+# --------------------------------------
+@pytest.fixture
+def one_candidate(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    monkeypatch.setattr(settings, "user_search_candidates", 1)
+    yield
+
+
+async def test_names_rank_above_identities(
+    sessions: async_sessionmaker[AsyncSession], index: str
+) -> None:
+    names = await _names(sessions, "smith")
+    assert set(names[:2]) == {"John Smith", "Johnny Smithers"}
+    assert set(names[2:]) == {"Alice Brown", "Carol Green"}
+
+
+async def test_the_candidate_cap_keeps_the_best_match(
+    sessions: async_sessionmaker[AsyncSession], index: str, one_candidate: None
+) -> None:
+    # Not the first match in index order (an identity-only match)
+    assert await _names(sessions, "smith") in (["John Smith"], ["Johnny Smithers"])
@@ -0,0 +1,194 @@
+# tests/test_write_queue.py
+
+"""
+📥 `WriteQueue` in SQLite single-writer mode: concurrent jobs share one
+COMMIT, a failing job rolls back alone (with its audit events), a failed
+COMMIT reaches every caller, and `stop` drains or fails what is queued.
+"""
+
+import asyncio
+from dataclasses import replace
+from typing import Any, AsyncIterator, Callable, List, Tuple
+
+import pytest
+from sqlalchemy import event, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.api.domains.user.models.audit_event import AuditEvent
+from app.api.domains.user.models.role import Role
+from app.api.domains.user.models.user import User
+from app.api.domains.user.services import audit_service
+from app.api.domains.user.services.audit_service import AuditWriter
+from app.database.sqlite import RoutingSession, SqlitePragmas, install_single_writer
+from app.database.write_queue import WriteQueue, WriteQueueStoppedError
+
+pytestmark = pytest.mark.anyio
+
+JOBS = 20
+
+Sessions = async_sessionmaker[AsyncSession]
+
+
+@pytest.fixture
+def routing(
+    database_url: Callable[[str], str], engines: Callable[..., AsyncEngine]
+) -> Tuple[Sessions, AsyncEngine]:
+    """Single-writer sessions (as `get_sessionmaker`) and the writer engine."""
+    url = database_url("app")
+    writer = engines(url, pool_size=1, max_overflow=0)
+    install_single_writer(writer.sync_engine)
+    reader = engines(
+        url,
+        replace(SqlitePragmas(), journal_mode=None, query_only=True),
+        pool_size=2,
+        max_overflow=0,
+    )
+    sessions = async_sessionmaker(
+        sync_session_class=RoutingSession,
+        writer=writer.sync_engine,
+        reader=reader.sync_engine,
+        expire_on_commit=False,
+    )
+    return sessions, writer
+
+
+@pytest.fixture
+async def writes(routing: Tuple[Sessions, AsyncEngine]) -> AsyncIterator[WriteQueue]:
+    queue = WriteQueue(routing[0], maxsize=100, batch_size=64)
+    queue.start()
+    yield queue
+    await queue.stop(drain=False)
+
+
+def _add_role(name: str, fail: bool = False) -> Callable[[AsyncSession], Any]:
+    async def job(session: AsyncSession) -> str:
+        session.add(Role(name=name))
+        await session.flush()
+        if fail:
+            raise LookupError(name)
+        return name
+
+    return job
+
+
+def _count_commits(engine: AsyncEngine) -> List[int]:
+    commits: List[int] = []
+    event.listen(engine.sync_engine, "commit", lambda conn: commits.append(1))
+    return commits
+
+
+async def _roles(sessions: Sessions) -> List[str]:
+    async with sessions() as session:
+        return list(await session.scalars(select(Role.name).order_by(Role.id)))
+
+
+# --------------------------------------
+# 📦 Group commit
+# --------------------------------------
+async def test_concurrent_jobs_share_one_commit(
+    routing: Tuple[Sessions, AsyncEngine], writes: WriteQueue
+) -> None:
+    sessions, writer = routing
+    commits = _count_commits(writer)
+    names = [f"role-{i}" for i in range(JOBS)]
+
+    assert await asyncio.gather(*(writes.submit(_add_role(n)) for n in names)) == names
+    assert writes.stats.batches == 1
+    assert writes.stats.committed == JOBS
+    assert len(commits) == 1
+    assert await _roles(sessions) == names
+
+
+async def test_a_failing_job_rolls_back_alone(
+    routing: Tuple[Sessions, AsyncEngine],
+    writes: WriteQueue,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sessions, _ = routing
+    audit = AuditWriter(
+        maxsize=100,
+        batch_size=50,
+        flush_interval=60,
+        overflow="drop_new",
+        writes=writes,
+    )
+    monkeypatch.setattr(audit_service, "get_audit_writer", lambda: audit)
+    audit.start()
+
+    results = await asyncio.gather(
+        writes.submit(_add_role("kept")),
+        writes.submit(_add_role("failed", fail=True)),
+        writes.submit(_add_role("also-kept")),
+        return_exceptions=True,
+    )
+    assert results[0] == "kept" and results[2] == "also-kept"
+    assert isinstance(results[1], LookupError)
+    assert writes.stats.batches == 1
+    assert (writes.stats.committed, writes.stats.failed) == (2, 1)
+    assert await _roles(sessions) == ["kept", "also-kept"]
+
+    # Only the committed jobs' audit events survive the SAVEPOINT rollback
+    await audit.stop()
+    async with sessions() as session:
+        audited = list(await session.scalars(select(AuditEvent.changes)))
+    assert sorted(changes["name"][1] for changes in audited) == ["also-kept", "kept"]
+
+
+async def test_a_failed_commit_reaches_every_caller(
+    routing: Tuple[Sessions, AsyncEngine], writes: WriteQueue
+) -> None:
+    sessions, _ = routing
+
+    async def orphan(session: AsyncSession) -> None:
+        # Checked only at COMMIT: the job itself succeeds, the batch does not
+        await session.execute(text("PRAGMA defer_foreign_keys = ON"))
+        session.add(User(first_name="Orphan", role_id=999))
+        await session.flush()
+
+    jobs = [_add_role(f"role-{i}") for i in range(JOBS)] + [orphan]
+    results = await asyncio.gather(
+        *(writes.submit(job) for job in jobs), return_exceptions=True
+    )
+
+    assert all(isinstance(result, IntegrityError) for result in results)
+    assert writes.stats.failed == JOBS + 1
+    assert await _roles(sessions) == []
+    # The queue keeps serving after a failed batch
+    assert await writes.submit(_add_role("after")) == "after"
+
+
+# --------------------------------------
+# 🛑 Shutdown
+# --------------------------------------
+@pytest.mark.parametrize("drain", [True, False])
+async def test_stop_drains_or_fails_queued_jobs(
+    routing: Tuple[Sessions, AsyncEngine], writes: WriteQueue, drain: bool
+) -> None:
+    sessions, _ = routing
+    release = asyncio.Event()
+
+    async def slow(session: AsyncSession) -> str:
+        await release.wait()
+        session.add(Role(name="in-flight"))
+        return "in-flight"
+
+    in_flight = asyncio.ensure_future(writes.submit(slow))
+    await asyncio.sleep(0.01)  # the writer has taken it and waits
+    queued = [
+        asyncio.ensure_future(writes.submit(_add_role(f"queued-{i}"))) for i in range(3)
+    ]
+    await asyncio.sleep(0)
+    stopping = asyncio.ensure_future(writes.stop(drain=drain))
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.wait_for(stopping, timeout=5)
+
+    assert await in_flight == "in-flight"  # a batch in flight always finishes
+    results = await asyncio.gather(*queued, return_exceptions=True)
+    if drain:
+        assert results == ["queued-0", "queued-1", "queued-2"]
+        assert len(await _roles(sessions)) == 4
+    else:
+        assert all(isinstance(r, WriteQueueStoppedError) for r in results)
+        assert await _roles(sessions) == ["in-flight"]